@@ -1,8 +1,16 @@
 ﻿import logging
+import math
 import os
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 from app.routers import worker
+from app.services.connectors.factory import CONNECTOR_PREWARM, prewarm
 
 # 로깅 설정 (비밀번호 로그 노출 방지 위해 INFO 레벨)
 logging.basicConfig(
@@ -10,17 +18,44 @@ logging.basicConfig(
     format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
 )
 
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # DB 드라이버 사전 로드는 /health 응답을 막지 않도록 백그라운드에서
+    if CONNECTOR_PREWARM:
+        threading.Thread(target=prewarm, name='connector-prewarm', daemon=True).start()
+    yield
+
+
 app = FastAPI(
     title='ERDAI Python Worker',
     description='DB 메타데이터 추출 · 관계 추론 · ERD 빌드',
     version='0.1.0',
     docs_url='/docs',
     redoc_url=None,
+    lifespan=lifespan,
 )
 
 app.include_router(worker.router, prefix='/worker')
 
 
+def _finite(value: object) -> object:
+    # NaN/Infinity는 JSON으로 쓸 수 없으므로 중첩된 값까지 찾아 문자열로 바꾼다
+    if isinstance(value, float) and not math.isfinite(value):
+        return repr(value)
+    if isinstance(value, dict):
+        return {k: _finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(v) for v in value]
+    return value
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error_handler(_: Request, exc: RequestValidationError) -> JSONResponse:
+    # 기본 핸들러와 같은 422. 입력에 남은 NaN/Infinity 때문에 응답 직렬화가 500으로 깨지지 않게 한다
+    return JSONResponse(status_code=422, content={'detail': _finite(jsonable_encoder(exc.errors()))})
+
+
 @app.get('/health', tags=['system'])
 def root_health() -> dict:
     return {'ok': True, 'env': os.getenv('APP_ENV', 'local')}
@@ -4,10 +4,11 @@ from pydantic import BaseModel, model_validator
 
 class DbConnectionRequest(BaseModel):
     """Node API <-> Worker 공통 연결 요청 모델 (snake_case: Python 컨벤션)"""
-    db_type:      Literal['mysql', 'mssql', 'oracle']
+    db_type:      Literal['mysql', 'mssql', 'oracle', 'postgresql']
     host:         str
     port:         int
-    database:     Optional[str] = None   # mysql / mssql
+    database:     Optional[str] = None   # mysql / mssql / postgresql
+    db_schema:    Optional[str] = None   # postgresql (기본 public)
     service_name: Optional[str] = None   # oracle
     sid:          Optional[str] = None   # oracle
     username:     str
@@ -15,19 +16,41 @@ class DbConnectionRequest(BaseModel):
 
     @model_validator(mode='after')
     def check_db_specific_fields(self) -> 'DbConnectionRequest':
-        if self.db_type in ('mysql', 'mssql') and not self.database:
+        if self.db_type in ('mysql', 'mssql', 'postgresql') and not self.database:
             raise ValueError(f'{self.db_type}는 database 필드가 필요합니다.')
         if self.db_type == 'oracle' and not self.service_name and not self.sid:
             raise ValueError('oracle은 service_name 또는 sid 중 하나가 필요합니다.')
         return self
 
+    @property
+    def target_schema(self) -> Optional[str]:
+        """
+        메타데이터 추출 대상 스키마.
+        postgresql: db_schema > 'public', 그 외: database > service_name > sid
+        """
+        if self.db_type == 'postgresql':
+            return self.db_schema or 'public'
+        return self.database or self.service_name or self.sid
+
 
 class TestConnectionRequest(DbConnectionRequest):
     pass
 
 
 class ExtractMetadataRequest(DbConnectionRequest):
-    pass
+    include_stats: bool = False          # 테이블 행 수/크기 근사 통계 포함
+    include_indexes: bool = False        # 인덱스 키 컬럼 포함 (analyze-indexes 입력)
+    store_key: Optional[str] = None      # 지정 시 추출 결과를 스키마 저장소에 저장 (검색 색인 생성)
+
+
+class ExtractFileRequest(BaseModel):
+    """오프라인 파일(SQLite DB / DDL 스크립트) 메타데이터 추출 요청"""
+    source_type: Literal['sqlite', 'ddl']
+    path:        str                     # OFFLINE_SCHEMA_DIR 기준 상대 경로
+    schema_name: Optional[str] = None    # 결과 스키마명 (기본: 파일명)
+    dialect:     Literal['generic', 'mysql', 'mssql', 'oracle', 'postgresql'] = 'generic'   # ddl
+    encoding:    str = 'utf-8'                                                            # ddl
+    include_indexes: bool = False
 
 
 class TestConnectionResponse(BaseModel):
@@ -35,3 +58,16 @@ class TestConnectionResponse(BaseModel):
     message:    str
     db_version: Optional[str] = None
     error_code: Optional[str] = None
+
+
+class AdmissionStats(BaseModel):
+    """대상 DB(host:port)별 동시 실행 제한 지표"""
+    target:       str
+    limit:        int
+    active:       int
+    queued:       int
+    admitted:     int
+    rejected:     int                    # 마감 초과로 거절
+    avg_queue_ms: float                  # 승인 1건당 평균 대기
+    max_queue_ms: float
+    avg_hold_ms:  Optional[float] = None # 슬롯 평균 점유 시간 (EWMA)
@@ -1,9 +1,10 @@
-﻿from typing import Literal, Optional
-from pydantic import BaseModel
+﻿from typing import Literal, Optional, get_args
+from pydantic import BaseModel, Field, model_validator
 from app.models.metadata import SchemaMetadata
 
 ConfidenceLevel = Literal['FK', 'HIGH', 'MEDIUM', 'LOW']
 Cardinality = Literal['1:1', '1:N', 'N:1', 'N:M']
+ExportFormat = Literal['dbml', 'mermaid', 'plantuml', 'dot', 'ddl_mysql', 'ddl_mssql', 'ddl_oracle', 'jsonld']
 
 
 class InferredRelation(BaseModel):
@@ -32,18 +33,158 @@ class ErdTable(BaseModel):
     comment: str = ''
     domain: str = ''
     columns: list[ErdColumn]
+    row_count: Optional[int] = None      # 카탈로그 근사값 (hot 테이블 강조용)
+    data_bytes: Optional[int] = None
+
+
+class JunctionTable(BaseModel):
+    table: str
+    targets: list[str]           # PK 컬럼이 참조하는 테이블 (선언 순서)
+    columns: list[str]           # 참조 컬럼 (targets와 같은 순서)
+
+
+class GraphAnalysis(BaseModel):
+    min_confidence: str
+    table_count: int
+    edge_count: int
+    junction_tables: list[JunctionTable] = []
+    many_to_many: list[InferredRelation] = []   # junction 경유 N:M
+    cycles: list[list[str]] = []                # SCC별 대표 순환 경로 (처음 = 마지막)
+    self_references: list[str] = []
+    orphan_tables: list[str] = []
+    clusters: list[list[str]] = []              # 크기 2 이상 SCC (큰 순)
+
+
+class DomainGroup(BaseModel):
+    domain: str
+    tables: list[str]
+
+
+class DomainClustering(BaseModel):
+    domains: list[DomainGroup]                  # 큰 순, 관계/prefix가 없는 테이블은 마지막 ETC
+    modularity: float                           # prefix 허브 포함 그래프의 modularity
+
+
+class UnindexedForeignKey(BaseModel):
+    table: str
+    columns: list[str]
+    ref_table: str
+    ref_columns: list[str]
+    source: Literal['FK', 'INFERRED']
+    confidence: ConfidenceLevel
+    row_count: Optional[int] = None      # 카탈로그 근사값 (수집된 경우)
+    suggested_ddl: str
+
+
+class RedundantIndex(BaseModel):
+    table: str
+    index: str
+    columns: list[str]
+    covered_by: str
+    reason: Literal['DUPLICATE', 'PREFIX']   # 같은 키 / 다른 인덱스 키의 선두 부분
+
+
+class IndexReport(BaseModel):
+    indexes_collected: bool
+    index_count: int = 0
+    min_confidence: str
+    unindexed_foreign_keys: list[UnindexedForeignKey] = []   # 큰 테이블 우선
+    redundant_indexes: list[RedundantIndex] = []
 
 
 class ErdGraph(BaseModel):
     tables: list[ErdTable]
     relations: list[InferredRelation]
     extracted_at: str
+    analysis: Optional[GraphAnalysis] = None
 
 
 class InferRelationsRequest(BaseModel):
     metadata: SchemaMetadata
 
 
+class IncrementalInferRequest(BaseModel):
+    """스키마 변경분만 다시 추론 (결과는 전체 재추론과 같음)"""
+    metadata: SchemaMetadata                        # 변경 반영 후 전체 메타데이터
+    previous_relations: list[InferredRelation]      # 직전 infer-relations 결과 (캐시)
+    added_tables: list[str] = []
+    changed_tables: list[str] = []                  # 컬럼/PK/FK/코멘트가 바뀐 테이블
+    removed_tables: list[str] = []
+
+
+class RelationDelta(BaseModel):
+    added: list[InferredRelation] = []
+    removed: list[InferredRelation] = []
+    updated: list[InferredRelation] = []            # 같은 관계(source/target/confidence)의 점수·근거 변경
+
+
+class IncrementalInferResponse(BaseModel):
+    relations: list[InferredRelation]
+    delta: RelationDelta
+    recomputed_tables: int                          # 다시 추론한 source 테이블 수
+    full_recompute: bool                            # 변경 범위가 커서 전체 재추론으로 처리
+
+
+class BatchInferItem(BaseModel):
+    """배치 추론 대상 1개: metadata / schema_key / metadata_hash 중 하나"""
+    key:           Optional[str] = None             # 결과 식별자 (기본: schema_key > metadata_hash > schema_name)
+    metadata:      Optional[SchemaMetadata] = None
+    schema_key:    Optional[str] = None             # 스키마 저장소에 저장된 스키마
+    metadata_hash: Optional[str] = None             # 저장소의 메타데이터 내용 해시 (재업로드 없이 참조)
+
+    @model_validator(mode='after')
+    def check_one_source(self) -> 'BatchInferItem':
+        if sum(v is not None for v in (self.metadata, self.schema_key, self.metadata_hash)) != 1:
+            raise ValueError('metadata, schema_key, metadata_hash 중 하나만 지정해야 합니다.')
+        return self
+
+    @property
+    def label(self) -> str:
+        return self.key or self.schema_key or self.metadata_hash or self.metadata.schema_name  # type: ignore[union-attr]
+
+
+class BatchInferRequest(BaseModel):
+    items: list[BatchInferItem]
+
+
 class BuildErdRequest(BaseModel):
     metadata: SchemaMetadata
     relations: list[InferredRelation]
+
+
+class ExportBundleRequest(BuildErdRequest):
+    formats: list[ExportFormat] = list(get_args(ExportFormat))   # zip에 담을 형식 (기본: 전체)
+
+
+# 화면 좌표 절대값 상한 (NaN/inf/과대 좌표로 렌더 장면 색인이 폭증하지 않도록)
+POSITION_LIMIT = 1_000_000.0
+
+
+class NodePosition(BaseModel):
+    x: float = Field(allow_inf_nan=False, ge=-POSITION_LIMIT, le=POSITION_LIMIT)
+    y: float = Field(allow_inf_nan=False, ge=-POSITION_LIMIT, le=POSITION_LIMIT)
+
+
+class RenderErdRequest(BaseModel):
+    """서버측 ERD 이미지 렌더링 등록 (좌표가 없는 테이블은 도메인 격자 배치)"""
+    graph: ErdGraph
+    positions: dict[str, NodePosition] = {}   # 테이블명 -> 화면 좌표 (클라이언트 레이아웃, 좌상단)
+    tile_size: int = 512                      # 타일 한 변 픽셀 (128 ~ 2048)
+
+
+class TileLevel(BaseModel):
+    zoom: int
+    scale: float                              # 원본 좌표 1 = scale 픽셀
+    columns: int                              # 타일 열/행 수
+    rows: int
+    detail: Literal['full', 'label', 'box']   # 컬럼까지 / 테이블명만 / 박스만
+
+
+class RenderManifest(BaseModel):
+    graph_hash: str                           # 타일 URL 키 (그래프 + 좌표 + tile_size 내용 해시)
+    width: int                                # 원본 크기 (zoom = max_zoom, scale 1)
+    height: int
+    tile_size: int
+    max_zoom: int
+    table_count: int
+    levels: list[TileLevel]
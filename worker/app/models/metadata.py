@@ -29,13 +29,27 @@ class FkMeta(BaseModel):
     delete_rule:      str = 'NO ACTION'
 
 
+class IndexMeta(BaseModel):
+    """인덱스 정보 (include_indexes 요청 시)"""
+    name:       str
+    columns:    list[str]        = Field(default_factory=list)   # 키 순서, 식 항목은 '(expression)'
+    unique:     bool = False
+    primary:    bool = False
+    index_type: str = ''         # 'BTREE' | 'HASH' | 'FULLTEXT' | 'NONCLUSTERED' | ...
+
+
 class TableMeta(BaseModel):
     name:       str
     comment:    str = ''
-    domain:     str = ''          # 테이블 prefix 기반 도메인
+    domain:     str = ''          # prefix + 관계 연결성 클러스터링 도메인 (domain_service)
     columns:    list[ColumnMeta] = Field(default_factory=list)
     pk_columns: list[str]        = Field(default_factory=list)
     fk_refs:    list[FkMeta]     = Field(default_factory=list)
+    indexes:    list[IndexMeta]  = Field(default_factory=list)
+    # 카탈로그 근사 통계 (include_stats 요청 시, 모르면 None)
+    row_count:   Optional[int] = None
+    data_bytes:  Optional[int] = None
+    index_bytes: Optional[int] = None
 
 
 class SchemaMetadata(BaseModel):
@@ -49,3 +63,24 @@ class SchemaMetadata(BaseModel):
     fk_count:     int
     tables:       list[TableMeta]
     extracted_at: str             # ISO 8601 UTC
+    stats_collected: bool = False
+    total_rows:      Optional[int] = None
+    total_bytes:     Optional[int] = None   # data + index
+    indexes_collected: bool = False
+
+
+class CatalogQueryTiming(BaseModel):
+    """카탈로그 쿼리 변형 1건의 실행 결과"""
+    kind:       str            # 'columns' | 'fks' | 'stats' | 'indexes'
+    variant:    str
+    selected:   bool           # extract-metadata가 실제로 사용하는 변형 여부
+    rows:       int = 0
+    elapsed_ms: float = 0.0
+    error:      Optional[str] = None
+
+
+class CatalogReport(BaseModel):
+    """/worker/catalog-report 응답: 서버 버전별 변형 선택 확인용"""
+    db_version:     str
+    server_version: str           # 변형 선택에 사용한 파싱 버전 (예: '8.0.36')
+    timings:        list[CatalogQueryTiming]
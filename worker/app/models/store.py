@@ -0,0 +1,65 @@
+﻿"""
+스키마 저장소(SQLite) 요청/응답 모델
+
+extract-metadata 결과와 추론 관계를 정규화해 저장하고
+컬럼명/참조 테이블/코멘트 조회 결과만 돌려준다 (스키마 전체 로드 없음).
+"""
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+from app.models.erd import InferredRelation
+from app.models.metadata import ColumnMeta, SchemaMetadata
+
+
+class StoreSchemaRequest(BaseModel):
+    schema_key: Optional[str] = None     # 저장 키 (Node 스냅샷 id 등, 기본: schema_name). 같은 키는 교체
+    metadata:   SchemaMetadata
+    relations:  list[InferredRelation] = Field(default_factory=list)
+
+
+class StoredSchema(BaseModel):
+    schema_key:     str
+    schema_name:    str
+    extracted_at:   str
+    stored_at:      str
+    table_count:    int
+    column_count:   int
+    relation_count: int
+    metadata_hash:  Optional[str] = None   # 원본 메타데이터 내용 해시 (배치 추론에서 재업로드 없이 참조)
+
+
+class ColumnHit(BaseModel):
+    table:     str
+    column:    str
+    data_type: str
+    nullable:  bool
+    is_pk:     bool
+    comment:   str = ''
+
+
+class SearchHit(BaseModel):
+    kind:           Literal['table', 'column']
+    table:          str
+    column:         Optional[str] = None
+    data_type:      Optional[str] = None
+    comment:        str = ''
+    score:          float
+    matched_fields: list[str]            # 'name' | 'comment' | 'type'
+
+
+class SearchResult(BaseModel):
+    query: str
+    total: int
+    page:  int
+    size:  int
+    hits:  list[SearchHit]
+
+
+class StoredTable(BaseModel):
+    name:      str
+    comment:   str = ''
+    domain:    str = ''
+    row_count: Optional[int] = None
+    columns:   list[ColumnMeta]
+    outgoing:  list[InferredRelation]    # 이 테이블이 참조
+    incoming:  list[InferredRelation]    # 이 테이블을 참조
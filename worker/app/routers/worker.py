@@ -1,25 +1,57 @@
 ﻿import logging
+import re
+from pathlib import PurePath
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import PlainTextResponse
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 
 from app.models.connection import (
+    AdmissionStats,
+    ExtractFileRequest,
     ExtractMetadataRequest,
     TestConnectionRequest,
     TestConnectionResponse,
 )
-from app.models.metadata import SchemaMetadata
+from app.models.metadata import CatalogReport, SchemaMetadata
 from app.models.erd import (
+    BatchInferRequest,
+    IncrementalInferRequest,
+    IncrementalInferResponse,
     InferredRelation,
     InferRelationsRequest,
     BuildErdRequest,
+    DomainClustering,
+    DomainGroup,
     ErdGraph,
+    ExportBundleRequest,
+    ExportFormat,
+    GraphAnalysis,
+    IndexReport,
+    RenderErdRequest,
+    RenderManifest,
+)
+from app.models.store import (
+    ColumnHit,
+    SearchResult,
+    StoreSchemaRequest,
+    StoredSchema,
+    StoredTable,
 )
 from app.services.connectors.base import ConnectorError, UnsupportedDbTypeError
-from app.services.connectors.factory import make_connector
-from app.services.metadata_service import extract_metadata
-from app.services.inference_service import infer_relations
-from app.services.export_service import build_dbml, build_mermaid
+from app.services.connectors.factory import make_connector, make_file_connector
+from app.services.admission import BULK, AdmissionRejectedError, admission_stats
+from app.services.connection_guard import admitted, circuit, guarded_test
+from app.services.single_flight import coalesce, extraction_key, metadata_key
+from app.services.metadata_service import catalog_report, extract_metadata
+from app.services.inference_service import infer_relations, infer_relations_incremental
+from app.services.batch_inference import infer_batch
+from app.services.erd_service import build_erd_graph
+from app.services.graph_service import analyze_graph
+from app.services.domain_service import cluster_domains
+from app.services.index_service import analyze_indexes
+from app.services.schema_store import SchemaStoreError, get_store
+from app.services.export_service import build_dbml, build_mermaid, render_exports, stream_export_bundle
+from app.services.render_service import RenderError, register_graph, render_image, render_tile
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=['worker'])
@@ -31,6 +63,22 @@ def health() -> dict:
     return {'ok': True}
 
 
+# ── /worker/admission ─────────────────────────────────────────────────────────
+def _busy_http_error(e: AdmissionRejectedError) -> HTTPException:
+    """대상 DB 대기열 마감 초과 -> 503 + Retry-After"""
+    return HTTPException(
+        status_code=503,
+        detail={'message': e.message, 'errorCode': e.error_code},
+        headers={'Retry-After': str(int(e.retry_after) + 1)},
+    )
+
+
+@router.get('/admission', response_model=list[AdmissionStats])
+def admission_stats_endpoint() -> list[AdmissionStats]:
+    """대상 DB별 동시 실행/대기열 지표 (대기 시간, 거절 수)"""
+    return [AdmissionStats(**row) for row in admission_stats()]
+
+
 # ── /worker/test-connection ────────────────────────────────────────────────────
 @router.post('/test-connection', response_model=TestConnectionResponse)
 def test_connection(req: TestConnectionRequest) -> TestConnectionResponse:
@@ -43,10 +91,12 @@ def test_connection(req: TestConnectionRequest) -> TestConnectionResponse:
         req.db_type, req.host, req.port, req.username,
     )
     try:
-        connector = make_connector(req)
-        result = connector.test()
+        result = guarded_test(req, lambda: make_connector(req).test())
         return TestConnectionResponse(**result)
 
+    except ConnectorError as e:
+        # 드라이버 로드 실패(DRIVER_UNAVAILABLE) 등 연결 시도 전 실패
+        return TestConnectionResponse(success=False, message=e.message, error_code=e.error_code)
     except UnsupportedDbTypeError as e:
         raise HTTPException(
             status_code=501,
@@ -64,9 +114,9 @@ def extract_metadata_endpoint(req: ExtractMetadataRequest) -> SchemaMetadata:
     스키마 전체 메타데이터 추출.
     pymysql은 블로킹 I/O지만 FastAPI가 내부적으로 threadpool에서 실행.
 
-    schema 결정 우선순위: database > service_name > sid
+    schema 결정: DbConnectionRequest.target_schema
     """
-    schema = req.database or req.service_name or req.sid
+    schema = req.target_schema
     if not schema:
         raise HTTPException(
             status_code=400,
@@ -74,19 +124,42 @@ def extract_metadata_endpoint(req: ExtractMetadataRequest) -> SchemaMetadata:
         )
 
     logger.info(
-        'extract-metadata: db_type=%s host=%s:%d schema=%s user=%s',
+        'extract-metadata: db_type=%s host=%s:%d schema=%s user=%s stats=%s indexes=%s',
         req.db_type, req.host, req.port, schema, req.username,
+        req.include_stats, req.include_indexes,
     )
 
     try:
-        connector = make_connector(req)
-        return extract_metadata(connector, schema)
+        store = get_store() if req.store_key else None
+
+        key = extraction_key(req)
 
+        def run() -> SchemaMetadata:
+            with admitted(req, BULK), circuit(req):
+                connector = make_connector(req)
+                # 연결 끊김으로 실패한 같은 추출을 다시 요청하면 체크포인트부터 이어서 진행
+                return extract_metadata(
+                    connector, schema,
+                    include_stats=req.include_stats,
+                    include_indexes=req.include_indexes,
+                    checkpoint_key=key,
+                )
+
+        # 같은 대상/스키마/옵션의 추출이 진행 중이면 그 결과를 함께 받는다
+        result = coalesce(key, run)
+        if store is not None:
+            store.save(result, [], req.store_key)
+        return result
+
+    except SchemaStoreError as e:
+        raise _store_http_error(e)
     except UnsupportedDbTypeError as e:
         raise HTTPException(
             status_code=501,
             detail={'message': f"'{e.db_type}' 커넥터는 아직 구현되지 않았습니다."},
         )
+    except AdmissionRejectedError as e:
+        raise _busy_http_error(e)
     except ConnectorError as e:
         raise HTTPException(
             status_code=400,
@@ -97,42 +170,136 @@ def extract_metadata_endpoint(req: ExtractMetadataRequest) -> SchemaMetadata:
         raise HTTPException(500, detail={'message': '메타데이터 추출 중 오류가 발생했습니다.'})
 
 
+# ── /worker/extract-metadata-file ─────────────────────────────────────────────
+@router.post('/extract-metadata-file', response_model=SchemaMetadata)
+def extract_metadata_file_endpoint(req: ExtractFileRequest) -> SchemaMetadata:
+    """
+    네트워크 없이 로컬 SQLite DB 또는 DDL 스크립트에서 메타데이터 추출.
+    path는 OFFLINE_SCHEMA_DIR 하위 상대 경로만 허용.
+
+    schema 결정: schema_name > 파일명(확장자 제외)
+    """
+    schema = req.schema_name or PurePath(req.path).stem
+
+    logger.info(
+        'extract-metadata-file: source_type=%s path=%s dialect=%s schema=%s',
+        req.source_type, req.path, req.dialect, schema,
+    )
+
+    try:
+        connector = make_file_connector(req)
+        return extract_metadata(connector, schema, include_indexes=req.include_indexes)
+
+    except UnsupportedDbTypeError as e:
+        raise HTTPException(
+            status_code=501,
+            detail={'message': f"'{e.db_type}' 커넥터는 아직 구현되지 않았습니다."},
+        )
+    except ConnectorError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={'message': e.message, 'errorCode': e.error_code},
+        )
+    except Exception as e:
+        logger.error('extract-metadata-file unexpected: %s', e)
+        raise HTTPException(500, detail={'message': '메타데이터 추출 중 오류가 발생했습니다.'})
+
+
+# ── /worker/catalog-report ────────────────────────────────────────────────────
+@router.post('/catalog-report', response_model=CatalogReport)
+def catalog_report_endpoint(req: ExtractMetadataRequest) -> CatalogReport:
+    """
+    서버 버전/권한별 카탈로그 쿼리 변형 선택 결과와 변형별 실행 시간.
+    모든 변형을 실제 실행하므로 운영 DB에서는 필요할 때만 호출한다.
+    """
+    schema = req.target_schema
+    if not schema:
+        raise HTTPException(
+            status_code=400,
+            detail={'message': 'database, service_name, sid 중 하나가 필요합니다.'},
+        )
+
+    logger.info(
+        'catalog-report: db_type=%s host=%s:%d schema=%s user=%s',
+        req.db_type, req.host, req.port, schema, req.username,
+    )
+
+    try:
+        with admitted(req, BULK), circuit(req):
+            connector = make_connector(req)
+            return catalog_report(connector, schema)
+
+    except UnsupportedDbTypeError as e:
+        raise HTTPException(
+            status_code=501,
+            detail={'message': f"'{e.db_type}' 커넥터는 아직 구현되지 않았습니다."},
+        )
+    except AdmissionRejectedError as e:
+        raise _busy_http_error(e)
+    except ConnectorError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={'message': e.message, 'errorCode': e.error_code},
+        )
+    except Exception as e:
+        logger.error('catalog-report unexpected: %s', e)
+        raise HTTPException(500, detail={'message': '카탈로그 리포트 생성 중 오류가 발생했습니다.'})
+
+
 # ── /worker/infer-relations ────────────────────────────────────────────────────
 @router.post('/infer-relations', response_model=list[InferredRelation])
 def infer_relations_endpoint(req: InferRelationsRequest) -> list[InferredRelation]:
-    return infer_relations(req.metadata)
+    return coalesce(metadata_key(req.metadata), lambda: infer_relations(req.metadata))
+
+
+@router.post('/infer-relations/incremental', response_model=IncrementalInferResponse)
+def infer_relations_incremental_endpoint(req: IncrementalInferRequest) -> IncrementalInferResponse:
+    """직전 추론 결과 + 추가/변경/삭제 테이블 목록으로 영향 받는 테이블만 다시 추론"""
+    try:
+        return infer_relations_incremental(
+            req.metadata, req.previous_relations,
+            req.added_tables, req.changed_tables, req.removed_tables,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail={'message': str(e)})
+
+
+@router.post('/infer-relations/batch')
+def infer_relations_batch_endpoint(req: BatchInferRequest) -> StreamingResponse:
+    """여러 스키마(본문 또는 저장소 참조)를 프로세스 풀에서 추론, 끝나는 순서대로 NDJSON 스트리밍"""
+    return StreamingResponse(infer_batch(req.items), media_type='application/x-ndjson')
 
 
 # ── /worker/build-erd ─────────────────────────────────────────────────────────
 @router.post('/build-erd', response_model=ErdGraph)
 def build_erd_endpoint(req: BuildErdRequest) -> ErdGraph:
-    tables = []
-    for table in req.metadata.tables:
-        columns = []
-        fk_cols = {fk.column_name for fk in table.fk_refs}
-        for col in table.columns:
-            columns.append({
-                'name': col.name,
-                'data_type': col.data_type,
-                'nullable': col.nullable,
-                'is_pk': col.is_pk,
-                'is_fk': col.name in fk_cols,
-                'comment': col.comment or '',
-            })
-        tables.append({
-            'name': table.name,
-            'comment': table.comment or '',
-            'domain': table.domain or '',
-            'columns': columns,
-        })
-
-    return ErdGraph(
-        tables=tables,
-        relations=req.relations,
-        extracted_at=req.metadata.extracted_at,
+    return build_erd_graph(req.metadata, req.relations)
+
+
+# ── /worker/analyze-graph ─────────────────────────────────────────────────────
+@router.post('/analyze-graph', response_model=GraphAnalysis)
+def analyze_graph_endpoint(req: BuildErdRequest) -> GraphAnalysis:
+    return analyze_graph(req.metadata, req.relations)
+
+
+# ── /worker/cluster-domains ───────────────────────────────────────────────────
+@router.post('/cluster-domains', response_model=DomainClustering)
+def cluster_domains_endpoint(req: BuildErdRequest) -> DomainClustering:
+    """prefix + 관계 연결성 도메인 클러스터 (도메인별 부분 그래프 로드용, 입력 해시별 캐시)"""
+    result = cluster_domains(req.metadata, req.relations)
+    return DomainClustering(
+        domains=[DomainGroup(domain=domain, tables=tables) for domain, tables in result.groups],
+        modularity=result.modularity,
     )
 
 
+# ── /worker/analyze-indexes ───────────────────────────────────────────────────
+@router.post('/analyze-indexes', response_model=IndexReport)
+def analyze_indexes_endpoint(req: BuildErdRequest) -> IndexReport:
+    """인덱스 없는 FK 조인 / 중복 인덱스 리포트 (include_indexes로 추출한 메타데이터 필요)"""
+    return analyze_indexes(req.metadata, req.relations)
+
+
 # ── /worker/export/dbml ───────────────────────────────────────────────────────
 @router.post('/export/dbml', response_class=PlainTextResponse)
 def export_dbml(req: BuildErdRequest) -> str:
@@ -143,3 +310,168 @@ def export_dbml(req: BuildErdRequest) -> str:
 @router.post('/export/mermaid', response_class=PlainTextResponse)
 def export_mermaid(req: BuildErdRequest) -> str:
     return build_mermaid(req.metadata, req.relations)
+
+
+# ── /worker/export/bundle ─────────────────────────────────────────────────────
+@router.post('/export/bundle')
+def export_bundle(req: ExportBundleRequest) -> StreamingResponse:
+    """여러 형식을 메타데이터 1회 순회로 만들어 zip으로 스트리밍"""
+    # 헤더는 latin-1 -> 스키마명의 ASCII 외 문자는 '_'
+    filename = re.sub(r'[^0-9A-Za-z_.-]+', '_', req.metadata.schema_name).strip('_.') or 'schema'
+    return StreamingResponse(
+        stream_export_bundle(req.metadata, req.relations, req.formats),
+        media_type='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{filename}-export.zip"'},
+    )
+
+
+# ── /worker/export/{format} ───────────────────────────────────────────────────
+_EXPORT_MEDIA_TYPES = {'jsonld': 'application/ld+json', 'dot': 'text/vnd.graphviz'}
+
+
+@router.post('/export/{export_format}')
+def export_format(export_format: ExportFormat, req: BuildErdRequest) -> Response:
+    """plantuml / dot / ddl_mysql / ddl_mssql / ddl_oracle / jsonld (dbml, mermaid 포함)"""
+    text = render_exports(req.metadata, req.relations, (export_format,))[export_format]
+    return Response(
+        content=text,
+        media_type=f"{_EXPORT_MEDIA_TYPES.get(export_format, 'text/plain')}; charset=utf-8",
+    )
+
+
+# ── /worker/render ────────────────────────────────────────────────────────────
+_IMAGE_MEDIA_TYPES = {'svg': 'image/svg+xml', 'png': 'image/png'}
+
+
+def _render_http_error(e: RenderError) -> HTTPException:
+    status = {'NOT_FOUND': 404, 'TOO_LARGE': 413}.get(e.error_code, 400)
+    return HTTPException(status_code=status, detail={'message': e.message, 'errorCode': e.error_code})
+
+
+def _image_response(data: bytes, fmt: str, etag: str) -> Response:
+    # graph_hash는 내용 해시라 같은 URL의 이미지는 바뀌지 않는다
+    return Response(
+        content=data,
+        media_type=_IMAGE_MEDIA_TYPES[fmt],
+        headers={'ETag': f'"{etag}"', 'Cache-Control': 'public, max-age=86400, immutable'},
+    )
+
+
+@router.post('/render/erd', response_model=RenderManifest)
+def render_erd_endpoint(req: RenderErdRequest) -> RenderManifest:
+    """ERD 이미지 렌더링 등록 -> graph_hash + zoom 단계별 타일 격자"""
+    try:
+        return register_graph(req.graph, req.positions, req.tile_size)
+    except RenderError as e:
+        raise _render_http_error(e)
+
+
+@router.get('/render/erd/{graph_hash}/image.{fmt}')
+def render_erd_image(
+    graph_hash: str,
+    fmt: str,
+    zoom: int | None = Query(default=None, ge=0),
+) -> Response:
+    """다이어그램 전체 1장 (svg 기본 원본 크기, png 기본 zoom 0)"""
+    if fmt not in _IMAGE_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail={'message': f'지원하지 않는 이미지 형식입니다: {fmt}'})
+    try:
+        data = render_image(graph_hash, fmt, zoom)  # type: ignore[arg-type]
+    except RenderError as e:
+        raise _render_http_error(e)
+    return _image_response(data, fmt, f'{graph_hash}-{"full" if zoom is None else zoom}')
+
+
+@router.get('/render/erd/{graph_hash}/tiles/{zoom}/{x}/{y}.{fmt}')
+def render_erd_tile(graph_hash: str, zoom: int, x: int, y: int, fmt: str) -> Response:
+    """zoom 단계의 (x, y) 타일 (svg: 글자 포함, png: 글자 대신 막대)"""
+    if fmt not in _IMAGE_MEDIA_TYPES:
+        raise HTTPException(status_code=404, detail={'message': f'지원하지 않는 이미지 형식입니다: {fmt}'})
+    try:
+        data = render_tile(graph_hash, zoom, x, y, fmt)  # type: ignore[arg-type]
+    except RenderError as e:
+        raise _render_http_error(e)
+    return _image_response(data, fmt, f'{graph_hash}-{zoom}-{x}-{y}')
+
+
+# ── /worker/store ─────────────────────────────────────────────────────────────
+def _store_http_error(e: SchemaStoreError) -> HTTPException:
+    status = {'NOT_FOUND': 404, 'STORE_DISABLED': 503}.get(e.error_code, 400)
+    return HTTPException(status_code=status, detail={'message': e.message, 'errorCode': e.error_code})
+
+
+@router.post('/store/schemas', response_model=StoredSchema)
+def store_schema_endpoint(req: StoreSchemaRequest) -> StoredSchema:
+    """추출 메타데이터 + 추론 관계를 저장소에 저장 (같은 schema_key는 교체)"""
+    try:
+        return get_store().save(req.metadata, req.relations, req.schema_key)
+    except SchemaStoreError as e:
+        raise _store_http_error(e)
+
+
+@router.get('/store/schemas', response_model=list[StoredSchema])
+def list_stored_schemas() -> list[StoredSchema]:
+    try:
+        return get_store().list_schemas()
+    except SchemaStoreError as e:
+        raise _store_http_error(e)
+
+
+@router.delete('/store/schemas/{schema_key}')
+def delete_stored_schema(schema_key: str) -> dict:
+    try:
+        get_store().delete(schema_key)
+        return {'ok': True}
+    except SchemaStoreError as e:
+        raise _store_http_error(e)
+
+
+@router.get('/store/schemas/{schema_key}/columns', response_model=list[ColumnHit])
+def stored_columns(
+    schema_key: str,
+    name: str | None = None,
+    comment: str | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+) -> list[ColumnHit]:
+    """name: 컬럼명 일치 (어떤 테이블에 X 컬럼이 있는가) / comment: 코멘트 포함 검색"""
+    if bool(name) == bool(comment):
+        raise HTTPException(status_code=400, detail={'message': 'name, comment 중 하나만 지정해주세요.'})
+    try:
+        store = get_store()
+        if name:
+            return store.tables_with_column(schema_key, name, limit, offset)
+        return store.columns_by_comment(schema_key, comment, limit, offset)
+    except SchemaStoreError as e:
+        raise _store_http_error(e)
+
+
+@router.get('/store/schemas/{schema_key}/search', response_model=SearchResult)
+def search_stored_schema(
+    schema_key: str,
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=200),
+) -> SearchResult:
+    """테이블/컬럼명, 데이터 타입, 코멘트 전문 검색 (토큰/prefix/한글 2-gram, 점수순)"""
+    try:
+        return get_store().search(schema_key, q, page, size)
+    except SchemaStoreError as e:
+        raise _store_http_error(e)
+
+
+@router.get('/store/schemas/{schema_key}/tables/{table}', response_model=StoredTable)
+def stored_table(schema_key: str, table: str) -> StoredTable:
+    try:
+        return get_store().table(schema_key, table)
+    except SchemaStoreError as e:
+        raise _store_http_error(e)
+
+
+@router.get('/store/schemas/{schema_key}/tables/{table}/referenced-by', response_model=list[InferredRelation])
+def stored_referencing(schema_key: str, table: str, min_confidence: str = 'LOW') -> list[InferredRelation]:
+    """table을 참조하는 관계 (실제 FK + 추론)"""
+    try:
+        return get_store().referencing(schema_key, table, min_confidence)
+    except SchemaStoreError as e:
+        raise _store_http_error(e)
@@ -0,0 +1,165 @@
+﻿"""
+대상 DB(host:port)별 동시 실행 제한 + 우선순위 대기열 (admission control)
+
+한 고객 DB에 extract-metadata가 몰리면 작은 인스턴스(MSSQL 등)가 포화되어 DBA에게
+차단될 수 있다. 대상별로 동시에 실행되는 카탈로그 작업 수를 제한하고, 초과 요청은
+우선순위 대기열에서 기다린다.
+
+- 우선순위: INTERACTIVE(연결 테스트) > BULK(메타데이터 추출 / 카탈로그 리포트), 같은 순위는 도착 순
+- 마감: 예상 대기가 ADMISSION_MAX_WAIT를 넘으면 기다리지 않고 즉시 거절한다.
+    예상 대기 = (앞선 대기 수 // 동시 한도 + 1) x 대상별 평균 점유 시간 (EWMA)
+  대기를 시작했더라도 마감까지 차례가 오지 않으면 대기열에서 빠지며 거절한다.
+- 슬롯은 반납 시 대기열 맨 앞 요청에 바로 넘긴다 (새로 온 요청이 끼어들지 않음)
+- 지표: 대상별 승인/거절 수, 대기 시간 합계/최대, 현재 실행/대기 수, 평균 점유 시간
+
+환경 변수:
+  TARGET_MAX_CONCURRENCY  대상별 동시 실행 한도 (기본 2, 0이면 비활성)
+  ADMISSION_MAX_WAIT      대기 마감 초 (기본 10)
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Generator
+
+from app.services.connectors.base import ConnectorError
+
+logger = logging.getLogger(__name__)
+
+TARGET_MAX_CONCURRENCY = int(os.getenv('TARGET_MAX_CONCURRENCY', '2'))
+ADMISSION_MAX_WAIT     = float(os.getenv('ADMISSION_MAX_WAIT', '10'))
+
+INTERACTIVE, BULK = 0, 1
+
+_HOLD_EWMA = 0.2      # 평균 점유 시간 갱신 비중
+
+
+class AdmissionRejectedError(ConnectorError):
+    """대상 DB 대기열 마감 초과로 실행하지 않고 거절"""
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            f'대상 DB에 실행 중인 요청이 많습니다. {int(retry_after) + 1}초 후 다시 시도해주세요.',
+            'TARGET_BUSY',
+        )
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted')
+
+    def __init__(self) -> None:
+        self.event   = threading.Event()
+        self.granted = False
+
+
+class _Target:
+    __slots__ = ('active', 'queue', 'avg_hold', 'admitted', 'rejected', 'queue_time', 'queue_time_max')
+
+    def __init__(self) -> None:
+        self.active = 0
+        self.queue: list[tuple[int, int, _Waiter]] = []    # (priority, seq, waiter) heap
+        self.avg_hold: float | None = None
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_time = 0.0
+        self.queue_time_max = 0.0
+
+
+class AdmissionController:
+    """대상별 동시 한도 + 우선순위 대기열"""
+
+    def __init__(self, limit: int, max_wait: float) -> None:
+        self._limit    = limit
+        self._max_wait = max_wait
+        self._targets: dict[str, _Target] = {}
+        self._seq  = itertools.count()
+        self._lock = threading.Lock()
+
+    def acquire(self, target: str, priority: int) -> float:
+        """슬롯 확보까지 기다린 초. 마감을 넘길 요청은 AdmissionRejectedError."""
+        with self._lock:
+            t = self._targets.setdefault(target, _Target())
+            if t.active < self._limit and not t.queue:
+                t.active += 1
+                t.admitted += 1
+                return 0.0
+            if t.avg_hold is not None:
+                ahead = sum(1 for p, _, _ in t.queue if p <= priority)
+                estimate = (ahead // self._limit + 1) * t.avg_hold
+                if estimate > self._max_wait:
+                    t.rejected += 1
+                    logger.warning('admission rejected: %s (예상 대기 %.1fs)', target, estimate)
+                    raise AdmissionRejectedError(estimate)
+            waiter = _Waiter()
+            heapq.heappush(t.queue, (priority, next(self._seq), waiter))
+
+        started = time.monotonic()
+        waiter.event.wait(self._max_wait)
+        waited = time.monotonic() - started
+        with self._lock:
+            if not waiter.granted:
+                t.queue = [entry for entry in t.queue if entry[2] is not waiter]
+                heapq.heapify(t.queue)
+                t.rejected += 1
+                logger.warning('admission timeout: %s (대기 %.1fs)', target, waited)
+                raise AdmissionRejectedError(t.avg_hold or self._max_wait)
+            t.queue_time += waited
+            t.queue_time_max = max(t.queue_time_max, waited)
+        return waited
+
+    def release(self, target: str, held: float) -> None:
+        """슬롯 반납 (held: 점유 초). 대기 중인 요청이 있으면 그대로 넘긴다."""
+        with self._lock:
+            t = self._targets[target]
+            t.avg_hold = held if t.avg_hold is None else t.avg_hold + _HOLD_EWMA * (held - t.avg_hold)
+            if t.queue:
+                _, _, waiter = heapq.heappop(t.queue)
+                waiter.granted = True
+                t.admitted += 1
+                waiter.event.set()
+            else:
+                t.active -= 1
+
+    def stats(self) -> list[dict]:
+        with self._lock:
+            return [
+                {
+                    'target':          target,
+                    'limit':           self._limit,
+                    'active':          t.active,
+                    'queued':          len(t.queue),
+                    'admitted':        t.admitted,
+                    'rejected':        t.rejected,
+                    'avg_queue_ms':    round(t.queue_time / t.admitted * 1000, 1) if t.admitted else 0.0,
+                    'max_queue_ms':    round(t.queue_time_max * 1000, 1),
+                    'avg_hold_ms':     round(t.avg_hold * 1000, 1) if t.avg_hold is not None else None,
+                }
+                for target, t in sorted(self._targets.items())
+            ]
+
+
+_controller = AdmissionController(TARGET_MAX_CONCURRENCY, ADMISSION_MAX_WAIT)
+
+
+@contextmanager
+def admit(target: str, priority: int) -> Generator[None, None, None]:
+    """대상 슬롯을 확보한 동안 블록 실행 (TARGET_MAX_CONCURRENCY <= 0이면 제한 없음)"""
+    if TARGET_MAX_CONCURRENCY <= 0:
+        yield
+        return
+    controller = _controller
+    waited = controller.acquire(target, priority)
+    if waited >= 1.0:
+        logger.info('admission: %s 대기 %.1fs 후 실행', target, waited)
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        controller.release(target, time.monotonic() - started)
+
+
+def admission_stats() -> list[dict]:
+    return _controller.stats()
@@ -0,0 +1,152 @@
+﻿"""
+여러 스키마 관계 추론 배치 (야간 일괄 추론용)
+
+스키마마다 /worker/infer-relations를 따로 호출하면 요청 왕복과 메타데이터 업로드가
+스키마 수만큼 반복된다. 배치는 요청 1건으로 여러 스키마를 받아 프로세스 풀에서
+스키마 단위로 병렬 추론하고, 끝나는 순서대로 NDJSON 한 줄씩 스트리밍한다.
+
+- 입력: 메타데이터 본문 또는 스키마 저장소 참조(schema_key / metadata_hash)
+- 동시 제출은 풀 크기만큼만 유지한다. 같은 풀을 쓰는 다른 요청의 shard가
+  배치 전체 뒤로 밀리지 않고, 저장소 로드도 앞선 추론과 겹쳐 진행된다.
+- 풀 프로세스 안에서는 shard 오프로드를 끈다 (풀 안에서 풀을 다시 만들지 않음).
+- CPU_OFFLOAD_WORKERS <= 1이면 호출 스레드에서 순서대로 실행한다.
+
+출력 줄 (application/x-ndjson):
+  result  {type, index, key, metadata_hash, table_count, relation_count, seconds, relations}
+  error   {type, index, key, message, error_code}
+  summary {type, schemas, succeeded, failed, workers, wall_seconds, infer_seconds}
+    infer_seconds = 스키마별 추론 시간 합 (wall_seconds 대비 병렬 효과)
+"""
+import hashlib
+import json
+import logging
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from app.models.erd import BatchInferItem
+from app.models.metadata import SchemaMetadata
+from app.services import cpu_offload
+from app.services.inference_service import infer_relations
+from app.services.schema_store import SchemaStoreError, get_store
+
+logger = logging.getLogger(__name__)
+
+
+def _infer(metadata: SchemaMetadata, offload: bool = True) -> tuple[str, int, float]:
+    """-> (관계 목록 JSON, 관계 수, 추론 초)"""
+    started = time.perf_counter()
+    relations = infer_relations(metadata, offload=offload)
+    elapsed = time.perf_counter() - started
+    return json.dumps([r.model_dump() for r in relations], ensure_ascii=False), len(relations), elapsed
+
+
+def _infer_in_pool(payload: str) -> tuple[str, int, float]:
+    # 풀 프로세스 안에서는 shard 오프로드 비활성 (중첩 풀 방지)
+    return _infer(SchemaMetadata.model_validate_json(payload), offload=False)
+
+
+def _resolve(item: BatchInferItem) -> tuple[SchemaMetadata, str]:
+    """(메타데이터, 메타데이터 JSON) - JSON은 metadata_hash 계산과 풀 전달에 쓴다"""
+    if item.metadata is not None:
+        metadata = item.metadata
+    else:
+        try:
+            metadata = get_store().load_metadata(item.schema_key, item.metadata_hash)
+        except (zlib.error, ValidationError) as e:
+            # 손상된 스냅샷 (압축 해제 / 모델 검증 실패)은 해당 항목만 실패 처리
+            logger.error('batch infer snapshot load failed: %s (%s)', item.label, e)
+            raise SchemaStoreError('저장된 메타데이터를 읽을 수 없습니다.', 'CORRUPT_SNAPSHOT') from e
+    return metadata, metadata.model_dump_json()
+
+
+def _line(record: dict, relations_json: str | None = None) -> str:
+    text = json.dumps(record, ensure_ascii=False)
+    if relations_json is not None:
+        # 워커가 직렬화한 관계 목록을 다시 파싱하지 않고 그대로 붙인다
+        text = text[:-1] + ', "relations": ' + relations_json + '}'
+    return text + '\n'
+
+
+def infer_batch(items: list[BatchInferItem]) -> Iterator[str]:
+    """스키마별 추론 결과를 끝나는 순서대로 NDJSON 줄로 (마지막 줄은 summary)"""
+    started = time.perf_counter()
+    workers = cpu_offload.CPU_OFFLOAD_WORKERS if cpu_offload.CPU_OFFLOAD_WORKERS > 1 else 1
+    succeeded = failed = 0
+    infer_seconds = 0.0
+
+    def result(index: int, item: BatchInferItem, digest: str, table_count: int,
+               outcome: tuple[str, int, float]) -> str:
+        nonlocal succeeded, infer_seconds
+        relations_json, relation_count, seconds = outcome
+        succeeded += 1
+        infer_seconds += seconds
+        return _line({
+            'type': 'result', 'index': index, 'key': item.label, 'metadata_hash': digest,
+            'table_count': table_count, 'relation_count': relation_count, 'seconds': round(seconds, 3),
+        }, relations_json)
+
+    def error(index: int, item: BatchInferItem, message: str, error_code: str) -> str:
+        nonlocal failed
+        failed += 1
+        return _line({'type': 'error', 'index': index, 'key': item.label,
+                      'message': message, 'error_code': error_code})
+
+    pending = iter(enumerate(items))
+    running: dict[Future, tuple[int, BatchInferItem, str, int]] = {}
+    pool = cpu_offload.get_pool() if workers > 1 else None
+    try:
+        while True:
+            # 풀 크기만큼 채운다 (저장소 로드 실패는 바로 error 줄)
+            while len(running) < workers:
+                nxt = next(pending, None)
+                if nxt is None:
+                    break
+                index, item = nxt
+                try:
+                    metadata, payload = _resolve(item)
+                except SchemaStoreError as e:
+                    yield error(index, item, e.message, e.error_code)
+                    continue
+                digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+                table_count = len(metadata.tables)
+                if pool is None:
+                    try:
+                        outcome = _infer(metadata)
+                    except Exception as e:
+                        logger.error('batch infer failed: %s (%s)', item.label, e)
+                        yield error(index, item, '관계 추론 중 오류가 발생했습니다.', 'INFER_FAILED')
+                    else:
+                        yield result(index, item, digest, table_count, outcome)
+                    continue
+                running[pool.submit(_infer_in_pool, payload)] = (index, item, digest, table_count)
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, item, digest, table_count = running.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logger.error('batch infer failed: %s (%s)', item.label, e)
+                    yield error(index, item, '관계 추론 중 오류가 발생했습니다.', 'INFER_FAILED')
+                else:
+                    yield result(index, item, digest, table_count, outcome)
+    finally:
+        # 클라이언트 연결이 끊기면 아직 시작하지 않은 추론은 취소
+        for future in running:
+            future.cancel()
+
+    wall = time.perf_counter() - started
+    logger.info(
+        'batch infer: schemas=%d ok=%d failed=%d workers=%d wall=%.1fs infer=%.1fs',
+        len(items), succeeded, failed, workers, wall, infer_seconds,
+    )
+    yield _line({
+        'type': 'summary', 'schemas': len(items), 'succeeded': succeeded, 'failed': failed,
+        'workers': workers, 'wall_seconds': round(wall, 3), 'infer_seconds': round(infer_seconds, 3),
+    })
@@ -0,0 +1,136 @@
+﻿"""
+코멘트 의미 일치 인덱스 (관계 추론 보조)
+
+테이블 코멘트를 한 번 토큰화해 TF-IDF 가중치 역색인을 만들고,
+컬럼 코멘트 -> 테이블 친화도(cosine)를 posting 조회만으로 계산한다.
+
+토큰화:
+  - 한글 연속 구간: 2-gram (+ 3자 이상이면 구간 전체)
+    '고객번호' -> 고객, 객번, 번호, 고객번호 / '고객 ID' -> 고객, id
+    띄어쓰기가 달라도 같은 2-gram이 남아 일치한다.
+  - 영문/숫자: name_matching 규칙(camelCase 분리, 약어 확장, 단수화)
+흔한 토큰(번호, 코드, 정보 ...)은 IDF가 낮아 자연스럽게 영향이 줄어든다.
+
+환경 변수:
+  COMMENT_MATCH_MIN_SIMILARITY  코멘트 일치로 인정할 최소 cosine (기본 0.5)
+"""
+import math
+import os
+import re
+from collections import Counter
+from typing import Iterable
+
+from app.services.name_matching import name_tokens
+
+COMMENT_MATCH_MIN_SIMILARITY = float(os.getenv('COMMENT_MATCH_MIN_SIMILARITY', '0.5'))
+
+_HANGUL_RE = re.compile(r'[가-힣]+')
+_LATIN_RE  = re.compile(r'[0-9A-Za-z]+')
+
+
+def comment_tokens(text: str) -> list[str]:
+    """코멘트 -> 토큰 목록 (중복 포함, TF 계산용)"""
+    tokens: list[str] = []
+    for run in _HANGUL_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+            continue
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        if len(run) > 2:
+            tokens.append(run)
+    for word in _LATIN_RE.findall(text):
+        tokens.extend(name_tokens(word, strip_prefix=False))
+    return tokens
+
+
+class CommentIndex:
+    """테이블 코멘트 TF-IDF 역색인"""
+
+    # 전체 문서의 이 비율 이상에 나오는 토큰은 조회에서 제외 (IDF≈0, posting만 김)
+    _COMMON_RATIO = 0.5
+
+    def __init__(self, docs: Iterable[tuple[str, str]]) -> None:
+        """docs: (테이블명, 코멘트)"""
+        self.names: list[str] = []
+        term_freqs: list[Counter] = []
+        df: Counter = Counter()
+        for name, comment in docs:
+            tf = Counter(comment_tokens(comment)) if comment else Counter()
+            self.names.append(name)
+            term_freqs.append(tf)
+            df.update(tf.keys())
+
+        n = len(self.names)
+        self._idf = {t: math.log((n + 1) / (c + 1)) + 1.0 for t, c in df.items()}
+        self._common = {t for t, c in df.items() if n >= 4 and c >= n * self._COMMON_RATIO}
+
+        # posting: token -> [(문서 idx, 정규화 가중치)], 문서별 가중치는 단건 유사도용
+        self._postings: dict[str, list[tuple[int, float]]] = {}
+        self._doc_weights: list[dict[str, float]] = []
+        self._index: dict[str, list[int]] = {}
+        self._queries: dict[str, list[tuple[str, float]]] = {}
+        for idx, tf in enumerate(term_freqs):
+            weights = {t: (1 + math.log(f)) * self._idf[t] for t, f in tf.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            doc = {t: w / norm for t, w in weights.items()}
+            self._doc_weights.append(doc)
+            self._index.setdefault(self.names[idx], []).append(idx)
+            for t, dw in doc.items():
+                self._postings.setdefault(t, []).append((idx, dw))
+
+    def _query(self, comment: str) -> list[tuple[str, float]]:
+        """질의 토큰별 정규화 가중치 (흔한 토큰 제외, 토큰 등장 순서). 같은 코멘트는 재사용."""
+        query = self._queries.get(comment)
+        if query is not None:
+            return query
+        # 테이블 코멘트에 없는 토큰('번호', '코드' 같은 부가어)은 질의 norm에서 제외
+        tf = Counter(t for t in comment_tokens(comment) if t in self._postings)
+        query = []
+        if tf:
+            weights = {t: (1 + math.log(f)) * self._idf[t] for t, f in tf.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            query = [(t, w / norm) for t, w in weights.items() if t not in self._common]
+        self._queries[comment] = query
+        return query
+
+    def _scores(self, comment: str) -> dict[int, float]:
+        scores: dict[int, float] = {}
+        for t, qw in self._query(comment):
+            for idx, dw in self._postings[t]:
+                scores[idx] = scores.get(idx, 0.0) + qw * dw
+        return scores
+
+    def affinity(self, comment: str) -> dict[str, float]:
+        """컬럼 코멘트와 각 테이블 코멘트의 cosine 유사도 (0 초과만)"""
+        return {self.names[idx]: round(s, 3) for idx, s in self._scores(comment).items()}
+
+    def similarity(self, comment: str, name: str) -> float:
+        """
+        컬럼 코멘트와 테이블 1개의 cosine (affinity(comment).get(name, 0.0)과 같은 값).
+        대상 테이블이 정해진 경우 전체 posting 대신 그 문서 가중치만 본다.
+        """
+        query = self._query(comment)
+        # 같은 이름이 여럿이면 affinity처럼 마지막으로 점수가 잡힌 문서 (질의 토큰 순서, 문서 순서)
+        found: tuple[int, int, float] | None = None
+        for idx in self._index.get(name, ()):
+            doc = self._doc_weights[idx]
+            first, score = -1, 0.0
+            for pos, (t, qw) in enumerate(query):
+                dw = doc.get(t)
+                if dw is not None:
+                    if first < 0:
+                        first = pos
+                    score += qw * dw
+            if first >= 0 and (found is None or (first, idx) > found[:2]):
+                found = (first, idx, score)
+        return round(found[2], 3) if found else 0.0
+
+    def best(self, comment: str, exclude: str | None = None) -> tuple[str, float] | None:
+        """친화도 최고 테이블 (동률은 선언 순서)"""
+        best: tuple[int, float] | None = None
+        for idx, s in sorted(self._scores(comment).items()):
+            if self.names[idx] == exclude:
+                continue
+            if best is None or s > best[1]:
+                best = (idx, s)
+        return (self.names[best[0]], round(best[1], 3)) if best else None
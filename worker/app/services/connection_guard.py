@@ -0,0 +1,223 @@
+﻿"""
+연결 테스트 결과 캐시 + 대상 DB별 circuit breaker
+
+UI가 /worker/test-connection을 반복 호출해도 매번 실제 연결을 열지 않도록
+최근 성공 결과를 짧은 TTL로 캐시한다. 또 host:port 단위로 연속 연결 실패를 세어
+임계치를 넘으면 일정 시간 즉시 실패(fast-fail)시키고, 이후 probe 1건이
+성공해야 다시 열어준다.
+
+- 캐시 키: 자격증명을 포함한 sha256 해시 (평문 비밀번호는 보관하지 않음)
+- breaker 키: host:port (네트워크 수준 장애만 집계: CONNECTION_REFUSED / TIMEOUT)
+- 실제 연결은 admission의 대상별 슬롯 안에서 실행한다 (연결 테스트는 INTERACTIVE 우선).
+  슬롯을 먼저 잡고 breaker를 확인하므로, 대기열 거절은 breaker 상태에 반영되지 않는다.
+
+환경 변수:
+  CONN_TEST_CACHE_TTL        테스트 결과 캐시 TTL 초 (기본 10, 0이면 비활성)
+  CIRCUIT_FAILURE_THRESHOLD  breaker open까지 연속 실패 횟수 (기본 3)
+  CIRCUIT_RESET_TIMEOUT      open 유지 시간 초, 이후 probe 허용 (기본 30)
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Generator
+
+from app.models.connection import DbConnectionRequest
+from app.services.admission import INTERACTIVE, AdmissionRejectedError, admit
+from app.services.connectors.base import ConnectorError
+
+logger = logging.getLogger(__name__)
+
+CONN_TEST_CACHE_TTL       = float(os.getenv('CONN_TEST_CACHE_TTL', '10'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '3'))
+CIRCUIT_RESET_TIMEOUT     = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+
+_CACHE_MAX_ENTRIES = 1024
+
+# breaker가 집계하는 error_code (인증 실패 등은 호스트가 살아 있다는 뜻이므로 제외)
+_NETWORK_ERROR_CODES = {'CONNECTION_REFUSED', 'TIMEOUT'}
+
+
+class CircuitOpenError(ConnectorError):
+    """breaker open 상태라 연결을 시도하지 않고 즉시 실패"""
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            f'연속 연결 실패로 일시 차단되었습니다. {int(retry_after) + 1}초 후 다시 시도해주세요.',
+            'CONNECTION_REFUSED',
+        )
+
+
+def target_key(req: DbConnectionRequest) -> str:
+    return f'{req.host}:{req.port}'
+
+
+def credential_hash(req: DbConnectionRequest) -> str:
+    """연결 요청 전체(비밀번호 포함)의 해시. 로그/키로 써도 자격증명이 노출되지 않는다."""
+    raw = '\x1f'.join([
+        req.db_type, req.host, str(req.port),
+        req.database or '', req.service_name or '', req.sid or '',
+        req.username, req.password,
+    ])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class _Circuit:
+    failures:  int = 0
+    opened_at: float | None = None
+    probing:   bool = False
+
+
+class CircuitBreaker:
+    """host:port 단위 circuit breaker (closed -> open -> half-open probe -> closed)"""
+
+    def __init__(self, threshold: int, reset_timeout: float) -> None:
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, target: str) -> float | None:
+        """
+        호출 허용 여부. 허용이면 None, 차단이면 재시도까지 남은 초.
+        open 상태에서 reset_timeout이 지나면 probe 1건만 통과시킨다.
+        """
+        with self._lock:
+            c = self._circuits.get(target)
+            if c is None or c.opened_at is None:
+                return None
+            remaining = c.opened_at + self._reset_timeout - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if c.probing:
+                return self._reset_timeout
+            c.probing = True
+            return None
+
+    def record(self, target: str, ok: bool) -> None:
+        with self._lock:
+            c = self._circuits.setdefault(target, _Circuit())
+            c.probing = False
+            if ok:
+                if c.opened_at is not None:
+                    logger.info('circuit closed: %s', target)
+                del self._circuits[target]
+                return
+            c.failures += 1
+            if c.opened_at is not None or c.failures >= self._threshold:
+                if c.opened_at is None:
+                    logger.warning('circuit open: %s (failures=%d)', target, c.failures)
+                c.opened_at = time.monotonic()
+
+    def release(self, target: str) -> None:
+        """결과 판정 없이 끝난 probe(예: 인증 실패) 해제 — 호스트 도달은 확인됨"""
+        self.record(target, ok=True)
+
+
+_breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT)
+_cache: dict[str, tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key: str) -> dict | None:
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is None:
+            return None
+        expires, result = hit
+        if expires < time.monotonic():
+            del _cache[key]
+            return None
+        return result
+
+
+def _cache_put(key: str, result: dict) -> None:
+    if CONN_TEST_CACHE_TTL <= 0:
+        return
+    now = time.monotonic()
+    with _cache_lock:
+        if len(_cache) >= _CACHE_MAX_ENTRIES:
+            for k in [k for k, (exp, _) in _cache.items() if exp < now]:
+                del _cache[k]
+            if len(_cache) >= _CACHE_MAX_ENTRIES:
+                _cache.pop(next(iter(_cache)))
+        _cache[key] = (now + CONN_TEST_CACHE_TTL, result)
+
+
+def record_result(req: DbConnectionRequest, ok: bool, error_code: str | None = None) -> None:
+    """연결 결과를 breaker에 반영 (네트워크 장애가 아닌 실패는 도달 성공으로 취급)"""
+    if ok or error_code not in _NETWORK_ERROR_CODES:
+        _breaker.release(target_key(req))
+    else:
+        _breaker.record(target_key(req), ok=False)
+
+
+def check_circuit(req: DbConnectionRequest) -> None:
+    """breaker가 열려 있으면 CircuitOpenError로 즉시 실패"""
+    retry_after = _breaker.acquire(target_key(req))
+    if retry_after is not None:
+        raise CircuitOpenError(retry_after)
+
+
+@contextmanager
+def circuit(req: DbConnectionRequest) -> Generator[None, None, None]:
+    """
+    breaker 확인 후 블록 실행, 결과를 breaker에 반영한다.
+    breaker가 열려 있으면 블록을 실행하지 않고 CircuitOpenError.
+    """
+    check_circuit(req)
+    try:
+        yield
+    except ConnectorError as e:
+        record_result(req, ok=False, error_code=e.error_code)
+        raise
+    except BaseException:
+        record_result(req, ok=False)
+        raise
+    record_result(req, ok=True)
+
+
+@contextmanager
+def admitted(req: DbConnectionRequest, priority: int) -> Generator[None, None, None]:
+    """대상(host:port) 동시 실행 슬롯을 확보한 동안 블록 실행 (admission 참고)"""
+    with admit(target_key(req), priority):
+        yield
+
+
+def guarded_test(req: DbConnectionRequest, run: Callable[[], dict]) -> dict:
+    """
+    캐시 -> 대상 슬롯(INTERACTIVE) -> breaker -> 실제 테스트 순으로 처리한 connector.test() 결과 dict.
+    run은 실제 연결 테스트를 수행하는 callable.
+    """
+    key = credential_hash(req)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        with admitted(req, INTERACTIVE):
+            return _run_test(req, key, run)
+    except AdmissionRejectedError as e:
+        return {'success': False, 'message': e.message, 'error_code': e.error_code}
+
+
+def _run_test(req: DbConnectionRequest, key: str, run: Callable[[], dict]) -> dict:
+    try:
+        check_circuit(req)
+    except CircuitOpenError as e:
+        return {'success': False, 'message': e.message, 'error_code': e.error_code}
+
+    try:
+        result = run()
+    except Exception:
+        _breaker.release(target_key(req))
+        raise
+    record_result(req, bool(result.get('success')), result.get('error_code'))
+    # 실패는 캐시하지 않는다 (방화벽/비밀번호를 고친 뒤 바로 다시 시험할 수 있게)
+    if result.get('success'):
+        _cache_put(key, result)
+    return result
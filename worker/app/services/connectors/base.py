@@ -9,12 +9,42 @@ MSSQL / Oracle 등은 이 클래스를 상속해 구현한다.
   4. extract_columns_raw() -> 컬럼 메타 raw row
   5. extract_fks_raw()     -> FK 메타 raw row
 
+선택 구현:
+  extract_stats_raw()  -> 테이블 통계 raw row (catalog_queries에 'stats' 변형 선언 시)
+                          카탈로그의 근사값만 사용하고 COUNT(*)는 실행하지 않는다.
+  extract_indexes_raw() -> 인덱스 키 컬럼 raw row (catalog_queries에 'indexes' 변형 선언 시)
+  transient_error()     -> 재연결 후 다시 시도할 수 있는 드라이버 에러 판별 (연결 끊김 등)
+
 세부 변환은 metadata_service가 처리한다.
+
+카탈로그 쿼리 튜닝:
+  커넥터는 catalog_queries에 종류(kind)별 SQL 변형을 우선순위 순으로 선언하고
+  run_catalog_query()로 실행한다. 서버 버전(min_version)과 권한(probe_sql)을
+  만족하는 첫 변형이 선택되며, 실행 시간은 catalog_timings에 기록된다.
+
+테이블 범위 배치:
+  컬럼 변형에 range_column(테이블명 컬럼 식)을 선언하고 'tables' 변형(테이블명 목록)이
+  있으면 extract_columns_range_raw()로 (after, upto] 테이블 범위만 조회할 수 있다.
+  조건은 SQL 마지막 ORDER BY 앞에 붙이므로 WHERE 절이 있는 쿼리여야 한다.
+
+타임아웃(초)은 모든 커넥터가 공통으로 사용한다.
+  DB_CONNECT_TIMEOUT  연결 수립 (기본 5)
+  DB_QUERY_TIMEOUT    카탈로그 쿼리 1건 (기본 120)
 """
+import logging
+import os
+import re
+import time
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Any, Generator
 
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '5'))
+QUERY_TIMEOUT   = int(os.getenv('DB_QUERY_TIMEOUT', '120'))
+
 
 class ConnectorError(Exception):
     """커넥터 에러: 라우터에서 HTTP 응답으로 변환"""
@@ -31,8 +61,40 @@ class UnsupportedDbTypeError(Exception):
         super().__init__(f"Unsupported db_type: {db_type}")
 
 
+@dataclass(frozen=True)
+class CatalogQuery:
+    """카탈로그 쿼리 변형 1건"""
+    kind:        str                    # 'columns' | 'fks' | ...
+    variant:     str                    # 타이밍 리포트에 표시되는 이름
+    sql:         str
+    min_version: tuple[int, ...] = ()   # 이 버전 이상에서만 사용
+    probe_sql:   str | None = None      # 권한 확인용 (실패 시 변형 제외)
+    range_column: str | None = None     # 테이블 범위 배치용 테이블명 컬럼 식 (없으면 배치 불가)
+
+
+_VERSION_RE = re.compile(r'\d+(?:\.\d+)+')
+
+
+def parse_version(version: str) -> tuple[int, ...]:
+    """버전 문자열에서 첫 번째 'x.y[.z...]' 를 정수 tuple로 추출 (없으면 ())"""
+    m = _VERSION_RE.search(version or '')
+    return tuple(int(p) for p in m.group(0).split('.')) if m else ()
+
+
 class BaseConnector(ABC):
 
+    # 종류별 변형을 우선순위(최적 -> fallback) 순으로 선언
+    catalog_queries: tuple[CatalogQuery, ...] = ()
+
+    # 범위 조건 바인드 자리 표시자 (드라이버 paramstyle, {i}: 범위 값 순번)
+    range_marker = '%s'
+
+    def __init__(self) -> None:
+        # 연결 단위 캐시: 서버 버전, 종류별 선택 변형, run_catalog_query 실행 기록
+        self._server_version: tuple[int, ...] | None = None
+        self._selected_queries: dict[str, CatalogQuery] = {}
+        self._catalog_timings: list[dict] = []
+
     @abstractmethod
     @contextmanager
     def connection(self) -> Generator[Any, None, None]:
@@ -62,3 +124,155 @@ class BaseConnector(ABC):
     def extract_fks_raw(self, conn: Any, schema: str) -> list[dict]:
         """FK raw row 목록"""
         ...
+
+    def extract_stats_raw(self, conn: Any, schema: str) -> list[dict]:
+        """
+        테이블 근사 통계 raw row 목록 (스키마당 쿼리 1건)
+        키: table_name, row_count, data_bytes, index_bytes (모르면 None)
+        """
+        if not any(q.kind == 'stats' for q in self.catalog_queries):
+            return []
+        return self.run_catalog_query(conn, 'stats', schema)
+
+    def extract_indexes_raw(self, conn: Any, schema: str) -> list[dict]:
+        """
+        인덱스 키 컬럼 raw row 목록 (스키마당 쿼리 1건, 인덱스 x 키 컬럼마다 1행)
+        키: table_name, index_name, index_type, is_unique('Y'/'N'), is_primary('Y'/'N'),
+            col_no(키 내 순서, 1부터), column_name(식 인덱스 항목은 None)
+        """
+        if not any(q.kind == 'indexes' for q in self.catalog_queries):
+            return []
+        return self.run_catalog_query(conn, 'indexes', schema)
+
+    def transient_error(self, exc: BaseException) -> ConnectorError | None:
+        """
+        재연결 후 다시 시도할 수 있는 에러(연결 끊김 등)면 사용자 메시지로 변환한 ConnectorError,
+        아니면 None (드라이버별 구현)
+        """
+        return None
+
+    # ── 테이블 범위 배치 ─────────────────────────────────────────────────────
+
+    def extract_table_names(self, conn: Any, schema: str) -> list[str]:
+        """스키마 테이블명 목록 (DB 정렬 순서, 'tables' 변형이 없으면 [])"""
+        if not any(q.kind == 'tables' for q in self.catalog_queries):
+            return []
+        return [r['table_name'] for r in self.run_catalog_query(conn, 'tables', schema)]
+
+    def supports_table_ranges(self, conn: Any) -> bool:
+        return (
+            any(q.kind == 'tables' for q in self.catalog_queries)
+            and self.select_query(conn, 'columns').range_column is not None
+        )
+
+    def extract_columns_range_raw(
+        self, conn: Any, schema: str, after: str | None, upto: str | None,
+    ) -> list[dict]:
+        """after < table_name <= upto 범위 컬럼 raw row (None은 열린 끝)"""
+        return self.run_catalog_query(conn, 'columns', schema, table_range=(after, upto))
+
+    def _range_sql(
+        self, sql: str, column: str, after: str | None, upto: str | None,
+    ) -> tuple[str, tuple[str, ...]]:
+        """마지막 ORDER BY 앞에 (after, upto] 조건을 넣는다 -> (SQL, 범위 바인드 값)"""
+        conds: list[str] = []
+        params: list[str] = []
+        for op, value in (('>', after), ('<=', upto)):
+            if value is not None:
+                conds.append(f'{column} {op} {self.range_marker.format(i=len(params))}')
+                params.append(value)
+        if not conds:
+            return sql, ()
+        head, sep, order = sql.rpartition('ORDER BY')
+        if not sep:
+            head, order = sql, ''
+        return f"{head.rstrip()}\n  AND {' AND '.join(conds)}\n{sep}{order}", tuple(params)
+
+    # ── 카탈로그 쿼리 변형 선택/실행 ──────────────────────────────────────────
+
+    @abstractmethod
+    def _fetch(self, conn: Any, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
+        """schema(+ 범위 값 params)를 바인딩해 실행하고 소문자 키 dict 목록 반환 (드라이버별 구현)"""
+        ...
+
+    def _run_query(
+        self,
+        conn: Any,
+        query: CatalogQuery,
+        schema: str,
+        table_range: tuple[str | None, str | None] | None = None,
+    ) -> list[dict]:
+        """변형 실행. 후처리가 필요한 변형은 하위 클래스에서 확장한다."""
+        if table_range is None:
+            return self._fetch(conn, query.sql, schema)
+        if query.range_column is None:
+            raise ConnectorError(f'테이블 범위 조회를 지원하지 않는 변형입니다: {query.variant}', 'UNKNOWN')
+        sql, params = self._range_sql(query.sql, query.range_column, *table_range)
+        return self._fetch(conn, sql, schema, params)
+
+    def server_version(self, conn: Any) -> tuple[int, ...]:
+        """비교 가능한 서버 버전 tuple (기본: get_db_version 문자열 파싱)"""
+        if self._server_version is None:
+            self._server_version = parse_version(self.get_db_version(conn))
+        return self._server_version
+
+    def applicable_queries(self, conn: Any, kind: str) -> list[CatalogQuery]:
+        """현재 서버 버전/권한에서 사용 가능한 변형 목록 (우선순위 순)"""
+        version = self.server_version(conn)
+        out = []
+        for q in self.catalog_queries:
+            if q.kind != kind or version < q.min_version:
+                continue
+            if q.probe_sql:
+                try:
+                    cur = conn.cursor()
+                    cur.execute(q.probe_sql)
+                    cur.fetchall()
+                except Exception:
+                    logger.info('catalog variant skipped (probe failed): %s', q.variant)
+                    # 실패한 probe가 트랜잭션을 abort 상태로 만드는 DB(PostgreSQL) 대비
+                    try:
+                        conn.rollback()
+                    except Exception:
+                        pass
+                    continue
+            out.append(q)
+        return out
+
+    def select_query(self, conn: Any, kind: str) -> CatalogQuery:
+        if kind not in self._selected_queries:
+            candidates = self.applicable_queries(conn, kind)
+            if not candidates:
+                raise ConnectorError(f'사용 가능한 카탈로그 쿼리가 없습니다: {kind}', 'UNKNOWN')
+            self._selected_queries[kind] = candidates[0]
+        return self._selected_queries[kind]
+
+    @property
+    def catalog_timings(self) -> list[dict]:
+        """run_catalog_query 실행 기록: {'kind', 'variant', 'rows', 'elapsed_ms'}"""
+        return self._catalog_timings
+
+    def run_catalog_query(
+        self,
+        conn: Any,
+        kind: str,
+        schema: str,
+        query: CatalogQuery | None = None,
+        table_range: tuple[str | None, str | None] | None = None,
+    ) -> list[dict]:
+        """선택된(또는 지정된) 변형을 실행하고 소요 시간을 기록한다. table_range: (after, upto]"""
+        query = query or self.select_query(conn, kind)
+        started = time.perf_counter()
+        rows = self._run_query(conn, query, schema, table_range)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.catalog_timings.append({
+            'kind': kind,
+            'variant': query.variant,
+            'rows': len(rows),
+            'elapsed_ms': round(elapsed_ms, 2),
+        })
+        logger.info(
+            'catalog query: kind=%s variant=%s rows=%d elapsed=%.1fms',
+            kind, query.variant, len(rows), elapsed_ms,
+        )
+        return rows
@@ -0,0 +1,75 @@
+﻿"""
+DDL 스크립트 파일 커넥터 (네트워크 없음)
+
+덤프/마이그레이션 SQL 파일을 ddl_parser로 한 번만 스트리밍 해석해
+다른 커넥터와 같은 raw row를 돌려준다. connection()이 넘기는 conn은
+파싱 결과(DdlSchema)이며, 컬럼/FK/인덱스 조회는 모두 이 결과를 재사용한다.
+"""
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Generator
+
+from .base import BaseConnector, ConnectorError
+from .ddl_parser import DIALECTS, DdlSchema, parse_ddl
+
+
+class DdlFileConnector(BaseConnector):
+
+    def __init__(self, path: str, dialect: str = 'generic', encoding: str = 'utf-8') -> None:
+        super().__init__()
+        if dialect not in DIALECTS:
+            raise ConnectorError(f'지원하지 않는 DDL dialect: {dialect}', 'UNKNOWN')
+        self._path = Path(path)
+        self._dialect = dialect
+        self._encoding = encoding
+
+    @contextmanager
+    def connection(self) -> Generator[DdlSchema, None, None]:
+        yield self._parse()
+
+    def _parse(self) -> DdlSchema:
+        if not self._path.is_file():
+            raise ConnectorError(f'파일이 존재하지 않습니다: {self._path.name}', 'CONNECTION_REFUSED')
+
+        started = time.perf_counter()
+        try:
+            # utf-8-sig: BOM 유무와 무관하게 처리
+            encoding = 'utf-8-sig' if self._encoding.lower().replace('_', '-') == 'utf-8' else self._encoding
+            with open(self._path, encoding=encoding, errors='replace', newline='') as fp:
+                schema = parse_ddl(fp, self._dialect)
+        except (OSError, LookupError) as e:
+            raise ConnectorError(f'DDL 파일을 읽을 수 없습니다: {e}', 'UNKNOWN') from e
+
+        self.catalog_timings.append({
+            'kind': 'ddl',
+            'variant': self._dialect,
+            'rows': len(schema.tables),
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        })
+        return schema
+
+    def get_db_version(self, conn: Any) -> str:
+        return f'DDL script ({self._dialect})'
+
+    def test(self) -> dict:
+        if not self._path.is_file():
+            return {
+                'success': False,
+                'message': f'파일이 존재하지 않습니다: {self._path.name}',
+                'error_code': 'CONNECTION_REFUSED',
+            }
+        return {'success': True, 'message': '연결 성공', 'db_version': f'DDL script ({self._dialect})'}
+
+    def _fetch(self, conn: Any, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
+        # 카탈로그 쿼리 없음: raw row는 파싱 결과(conn)에서 바로 만든다
+        raise ConnectorError('DDL 스크립트에는 카탈로그 쿼리가 없습니다.', 'UNKNOWN')
+
+    def extract_columns_raw(self, conn: DdlSchema, schema: str) -> list[dict]:
+        return conn.column_rows(schema)
+
+    def extract_fks_raw(self, conn: DdlSchema, schema: str) -> list[dict]:
+        return conn.fk_rows()
+
+    def extract_indexes_raw(self, conn: DdlSchema, schema: str) -> list[dict]:
+        return conn.index_rows()
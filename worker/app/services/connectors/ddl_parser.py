@@ -0,0 +1,892 @@
+﻿"""
+DDL 스크립트 스트리밍 파서
+
+수백 MB 덤프(mysqldump, pg_dump, SSMS/Oracle 스크립트)를 한 번만 읽으면서
+CREATE TABLE / CREATE INDEX / ALTER TABLE ... ADD / COMMENT ON / sp_addextendedproperty 만
+해석해 extract_metadata가 소비하는 raw row(컬럼/FK/인덱스)를 만든다.
+
+- 청크 단위로 읽고 문자열·주석·인용 식별자 상태를 청크 경계 너머로 유지한다.
+- 관심 없는 문장(INSERT 등)은 본문을 버퍼에 쌓지 않고 끝(;)만 찾는다.
+- 문장 구분: ';' (+ mssql/generic의 GO 라인). 프로시저 본문 내부 ';'는 구분하지 않는다.
+- pg_dump의 COPY ... FROM stdin; 뒤 데이터 줄은 '\\.' 줄까지 해석 없이 건너뛴다.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import IO, Iterator
+
+CHUNK_SIZE = 1 << 20
+
+# 개행 없는 긴 줄을 자를 수 있는 위치: 여러 글자 토큰(--, /*, */, \x 이스케이프, $tag$, GO)을
+# 이어 갈 수 없는 문자 바로 뒤 (공백 뒤는 GO 줄 판정이 잘릴 수 있어 제외)
+_CUT_RE = re.compile(r'(?<=[^-/*\\$A-Za-z_\s])')
+_CUT_WINDOW = 4096
+
+# 버퍼에 유지할 문장의 첫 키워드
+_INTERESTING_RE = re.compile(r'(CREATE|ALTER|COMMENT|EXEC|EXECUTE)\b', re.I)
+
+# pg_dump 데이터 블록: COPY ... FROM stdin; 다음 줄부터 '\.' 줄까지
+_COPY_RE = re.compile(r'COPY\b', re.I)
+_COPY_STDIN_RE = re.compile(r'COPY\b.*\bFROM\s+STDIN\b', re.I | re.S)
+_COPY_END_RE = re.compile(r'^\\\.[ \t]*\r?$', re.M)
+
+
+@dataclass(frozen=True)
+class _Dialect:
+    normal_re: re.Pattern        # 일반 상태에서 찾을 토큰
+    skip_re:   re.Pattern        # 관심 없는 문장 본문을 문자열째 한 번에 건너뛰는 패턴
+    string_re: re.Pattern        # 문자열 본문 종료 탐색 ('\\.' 이스케이프 포함 여부)
+    token_re:  re.Pattern        # 문장 토크나이저
+    backslash_escape: bool
+
+
+_ANSI_STR  = r"'[^']*(?:''[^']*)*'"
+_MYSQL_STR = r"'(?:[^'\\]|\\.|'')*'"
+
+_IDENT_QUOTES = {'"': r'"[^"]*"', '`': r'`[^`]*`', '[': r'\[[^\]]*\]'}
+
+
+def _dialect(
+    ident_quotes: str,
+    backslash_escape: bool = False,
+    hash_comment: bool = False,
+    go_separator: bool = False,
+    dollar_quote: bool = False,
+) -> _Dialect:
+    string_pat = _MYSQL_STR if backslash_escape else _ANSI_STR
+    quoted_ident = '|'.join(_IDENT_QUOTES[q] for q in ident_quotes)
+
+    # 일반 상태 토큰: 문자열/식별자 시작, 문장 끝, 주석 시작, (GO 라인, $tag$)
+    normal = [f"[{re.escape(chr(39) + ident_quotes)};{'#' if hash_comment else ''}]", '--', r'/\*']
+    if go_separator:
+        normal.append(r'^[ \t]*GO[ \t]*\r?$')
+    if dollar_quote:
+        normal.append(r'\$[A-Za-z_]*\$')
+
+    # 건너뛰기: 특수 문자가 아닌 연속 구간 | 완결된 문자열/식별자 | 주석이 아닌 '-', '/'
+    stop = "'" + ident_quotes + ';-/' + ('#' if hash_comment else '') + \
+        ('\n' if go_separator else '') + ('$' if dollar_quote else '')
+    skip = [f'[^{re.escape(stop)}]+', string_pat, quoted_ident, '-(?!-)', r'/(?!\*)']
+    if go_separator:
+        skip.append(r'\n(?![ \t]*GO[ \t]*\r?$)')
+    if dollar_quote:
+        skip.append(r'\$(?![A-Za-z_]*\$)')
+
+    return _Dialect(
+        normal_re=re.compile('|'.join(normal), re.M | re.I),
+        skip_re=re.compile(f"(?:{'|'.join(skip)})*", re.M | re.I | re.S),
+        string_re=re.compile(r"\\.|'", re.S) if backslash_escape else re.compile("'"),
+        token_re=re.compile(
+            rf"""
+            (?P<str>[Nn]?{string_pat})
+          | (?P<qid>{quoted_ident})
+          | (?P<word>[^\W\d][\w$#]*)
+          | (?P<num>\d+(?:\.\d+)?)
+          | (?P<op>\S)
+            """,
+            re.X | re.S,
+        ),
+        backslash_escape=backslash_escape,
+    )
+
+
+_DIALECTS: dict[str, _Dialect] = {
+    'generic':    _dialect('"`[', go_separator=True),
+    'mysql':      _dialect('"`', backslash_escape=True, hash_comment=True),
+    'mssql':      _dialect('"[', go_separator=True),
+    'oracle':     _dialect('"'),
+    'postgresql': _dialect('"', dollar_quote=True),
+}
+
+DIALECTS = tuple(_DIALECTS)
+
+_CLOSERS = {
+    '"':  re.compile(r'"'),
+    '`':  re.compile(r'`'),
+    '[':  re.compile(r'\]'),
+    '/*': re.compile(r'\*/'),
+    '--': re.compile(r'\n'),
+    '#':  re.compile(r'\n'),
+}
+
+
+# ── 1단계: 문장 분리 (single pass) ───────────────────────────────────────────
+
+def _safe_cut(text: str) -> int:
+    """개행 없는 text에서 토큰이 걸치지 않는 마지막 경계 (없으면 0: 다음 청크와 합쳐 다시 본다)"""
+    end = len(text)
+    while end > 0:
+        start = max(0, end - _CUT_WINDOW)
+        cut = 0
+        for m in _CUT_RE.finditer(text, start, end):
+            cut = m.start()
+        if cut:
+            return cut
+        end = start
+    return 0
+
+
+def iter_statements(
+    fp: IO[str],
+    dialect: str = 'generic',
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """fp에서 관심 문장(CREATE/ALTER/COMMENT/EXEC)만 주석을 제거해 순서대로 반환"""
+    spec = _DIALECTS[dialect]
+    closer: re.Pattern | None = None   # 현재 열린 문자열/주석/식별자의 종료 패턴
+    closer_keep = True                 # 종료 전까지의 텍스트를 문장에 포함할지
+    in_string = False
+
+    buf: list[str] = []
+    buf_len = 0
+    decided = False
+    skip = False
+    copy_data = False                  # COPY ... FROM stdin 데이터 줄 건너뛰는 중
+
+    def append(piece: str) -> None:
+        nonlocal buf_len, decided, skip
+        if skip or not piece:
+            return
+        buf.append(piece)
+        buf_len += len(piece)
+        if not decided and buf_len >= 16:
+            head = ''.join(buf).lstrip()
+            if len(head) >= 16:
+                decided = True
+                # COPY 문은 짧으므로 FROM stdin 여부를 보려고 버퍼에 둔다
+                if not _INTERESTING_RE.match(head) and not _COPY_RE.match(head):
+                    skip = True
+                    buf.clear()
+
+    def flush() -> str | None:
+        nonlocal buf_len, decided, skip, copy_data
+        stmt = None
+        if not skip and buf:
+            text = ''.join(buf).strip()
+            if text and _INTERESTING_RE.match(text):
+                stmt = text
+            elif _COPY_STDIN_RE.match(text):
+                copy_data = True
+        buf.clear()
+        buf_len = 0
+        decided = False
+        skip = False
+        return stmt
+
+    carry = ''
+    line_start = True                  # seg가 줄 처음에서 시작하는지 (^ 판정용)
+    while True:
+        chunk = fp.read(chunk_size)
+        eof = not chunk
+        text = carry + chunk
+        if eof:
+            cut = len(text)
+        else:
+            cut = text.rfind('\n') + 1
+            if cut == 0:
+                # 개행 없는 긴 줄(extended INSERT 등): 토큰이 걸치지 않는 경계까지만 처리
+                cut = _safe_cut(text)
+        seg, carry = text[:cut], text[cut:]
+        seg_line_start = line_start
+        if cut:
+            line_start = seg[-1] == '\n'
+
+        pos, n = 0, len(seg)
+        while pos < n:
+            if copy_data:
+                m = _COPY_END_RE.search(seg, pos)
+                if m is not None and m.start() == 0 and not seg_line_start:
+                    m = _COPY_END_RE.search(seg, 1)
+                if m is None:
+                    break
+                pos, copy_data = m.end(), False
+            elif closer is None:
+                if skip:
+                    pos = spec.skip_re.match(seg, pos).end()   # type: ignore[union-attr]
+                    if pos >= n:
+                        break
+                m = spec.normal_re.search(seg, pos)
+                if m is None:
+                    append(seg[pos:])
+                    break
+                append(seg[pos:m.start()])
+                tok = m.group(0)
+                pos = m.end()
+                if m.start() == 0 and not seg_line_start and tok.strip().upper() == 'GO':
+                    append(tok)   # 줄 중간에서 자른 조각의 'GO'는 구분자가 아님
+                elif tok == ';' or tok.strip().upper() == 'GO':
+                    stmt = flush()
+                    if stmt:
+                        yield stmt
+                elif tok == "'":
+                    append(tok)
+                    closer, closer_keep, in_string = spec.string_re, True, True
+                elif tok.startswith('$'):
+                    append(tok)
+                    closer, closer_keep, in_string = re.compile(re.escape(tok)), True, False
+                else:
+                    keep = tok in ('"', '`', '[')
+                    if keep:
+                        append(tok)
+                    closer, closer_keep, in_string = _CLOSERS[tok], keep, False
+            else:
+                m = closer.search(seg, pos)
+                if m is None:
+                    if closer_keep:
+                        append(seg[pos:])
+                    break
+                if in_string and m.group(0) != "'":
+                    # 백슬래시 이스케이프: 문자열 계속
+                    append(seg[pos:m.end()])
+                    pos = m.end()
+                    continue
+                append(seg[pos:m.end()] if closer_keep else ' ')
+                pos = m.end()
+                closer, in_string = None, False
+
+        if eof:
+            break
+
+    stmt = flush()
+    if stmt:
+        yield stmt
+
+
+# ── 2단계: 문장 해석 ──────────────────────────────────────────────────────────
+
+@dataclass
+class DdlColumn:
+    name:      str
+    data_type: str
+    nullable:  bool = True
+    is_pk:     bool = False
+    unique:    bool = False
+    default:   str | None = None
+    extra:     str = ''
+    comment:   str = ''
+
+
+@dataclass
+class DdlForeignKey:
+    constraint_name: str
+    columns:         list[str]
+    ref_table:       str
+    ref_columns:     list[str]
+    update_rule:     str = 'NO ACTION'
+    delete_rule:     str = 'NO ACTION'
+
+
+@dataclass
+class DdlIndex:
+    name:       str
+    columns:    list[str | None]          # 식 인덱스 항목은 None
+    unique:     bool = False
+    primary:    bool = False
+    index_type: str = 'BTREE'
+
+
+@dataclass
+class DdlTable:
+    name:    str
+    schema:  str = ''
+    comment: str = ''
+    columns: list[DdlColumn] = field(default_factory=list)
+    fks:     list[DdlForeignKey] = field(default_factory=list)
+    indexes: list[DdlIndex] = field(default_factory=list)
+
+    def column(self, name: str) -> DdlColumn | None:
+        lname = name.lower()
+        for c in self.columns:
+            if c.name.lower() == lname:
+                return c
+        return None
+
+
+# 컬럼 정의에서 데이터 타입이 끝나는 키워드
+_COLUMN_STOP = {
+    'NOT', 'NULL', 'DEFAULT', 'PRIMARY', 'REFERENCES', 'COMMENT', 'AUTO_INCREMENT',
+    'AUTOINCREMENT', 'IDENTITY', 'UNIQUE', 'CHECK', 'CONSTRAINT', 'COLLATE',
+    'GENERATED', 'ON', 'AS', 'CHARSET', 'ENABLE', 'DISABLE', 'SPARSE', 'ROWGUIDCOL',
+    'KEY', 'INVISIBLE', 'VISIBLE',
+}
+
+# 테이블 수준 제약/인덱스 정의 시작 키워드
+_TABLE_CONSTRAINT = {
+    'CONSTRAINT', 'PRIMARY', 'FOREIGN', 'UNIQUE', 'KEY', 'INDEX', 'FULLTEXT',
+    'SPATIAL', 'CHECK', 'EXCLUDE', 'LIKE', 'PERIOD',
+}
+
+_FK_ACTIONS = {
+    'CASCADE': 'CASCADE', 'RESTRICT': 'RESTRICT',
+    'SET NULL': 'SET NULL', 'SET DEFAULT': 'SET DEFAULT', 'NO ACTION': 'NO ACTION',
+}
+
+
+class DdlSchema:
+    """파싱된 DDL 스키마. apply()로 문장을 반영하고 raw row로 내보낸다."""
+
+    def __init__(self, dialect: str = 'generic') -> None:
+        self.dialect = dialect
+        self._spec = _DIALECTS[dialect]
+        self.tables: dict[str, DdlTable] = {}   # key: 소문자 테이블명
+
+    # ── 토큰 유틸 ────────────────────────────────────────────────────────────
+
+    def _tokens(self, stmt: str) -> list[tuple[str, str]]:
+        return [(m.lastgroup, m.group(m.lastgroup)) for m in self._spec.token_re.finditer(stmt)]  # type: ignore[arg-type]
+
+    def _unquote(self, kind: str, value: str) -> str:
+        if kind == 'qid':
+            return value[1:-1]
+        if kind == 'str':
+            body = value[1:] if value[0] in 'Nn' else value
+            body = body[1:-1]
+            if self._spec.backslash_escape:
+                body = re.sub(r'\\(.)', r'\1', body)
+            return body.replace("''", "'")
+        return value
+
+    @staticmethod
+    def _upper(tok: tuple[str, str]) -> str:
+        return tok[1].upper() if tok[0] == 'word' else ''
+
+    def _qualified_name(self, toks: list, i: int) -> tuple[str, str, int]:
+        """toks[i]부터 a.b.c 이름 -> (schema, name, 다음 인덱스)"""
+        parts = [self._unquote(*toks[i])]
+        i += 1
+        while i + 1 < len(toks) and toks[i][1] == '.':
+            parts.append(self._unquote(*toks[i + 1]))
+            i += 2
+        schema = parts[-2] if len(parts) >= 2 else ''
+        return schema, parts[-1], i
+
+    @staticmethod
+    def _split_top(toks: list, sep: str = ',') -> list[list]:
+        out: list[list] = [[]]
+        depth = 0
+        for t in toks:
+            if t[1] == '(':
+                depth += 1
+            elif t[1] == ')':
+                depth -= 1
+            if depth == 0 and t[0] == 'op' and t[1] == sep:
+                out.append([])
+            else:
+                out[-1].append(t)
+        return [part for part in out if part]
+
+    @staticmethod
+    def _matching_paren(toks: list, i: int) -> int:
+        depth = 0
+        for j in range(i, len(toks)):
+            if toks[j][1] == '(':
+                depth += 1
+            elif toks[j][1] == ')':
+                depth -= 1
+                if depth == 0:
+                    return j
+        return len(toks)
+
+    @staticmethod
+    def _render(toks: list) -> str:
+        """토큰 -> 'varchar(100)', 'numeric(12,2)', 'double precision', 'text[]'"""
+        out = ''
+        prev = ''
+        for kind, value in toks:
+            if kind == 'qid':
+                value = value[1:-1]
+            if out and value not in '(),[]' and prev not in '(,[':
+                out += ' '
+            out += value
+            prev = value
+        return out
+
+    def _column_list(self, toks: list, i: int) -> tuple[list[str], int]:
+        """toks[i] == '(' 인 컬럼 목록 -> (이름 목록, ')' 다음 인덱스)"""
+        end = self._matching_paren(toks, i)
+        cols = []
+        for part in self._split_top(toks[i + 1:end]):
+            # ASC/DESC, 길이 prefix(col(10)) 등은 무시
+            cols.append(self._unquote(*part[0]))
+        return cols, end + 1
+
+    def _index_columns(self, toks: list, i: int) -> tuple[list[str | None], int]:
+        """인덱스 키 목록: col, col(10), col DESC -> 이름 / lower(col), (expr) -> None"""
+        end = self._matching_paren(toks, i)
+        cols: list[str | None] = []
+        for part in self._split_top(toks[i + 1:end]):
+            is_name = part[0][0] in ('word', 'qid')
+            if is_name and len(part) > 1 and part[1][1] == '(':
+                # MySQL 길이 prefix col(10)만 컬럼으로 인정
+                is_name = len(part) > 3 and part[2][0] == 'num' and part[3][1] == ')'
+            cols.append(self._unquote(*part[0]) if is_name else None)
+        return cols, end + 1
+
+    def _pk_name(self, table: DdlTable, cname: str) -> str:
+        if cname:
+            return cname
+        return 'PRIMARY' if self.dialect == 'mysql' else f'pk_{table.name}'
+
+    def _fk_actions(self, toks: list, i: int, fk: DdlForeignKey) -> int:
+        while i + 2 < len(toks) and self._upper(toks[i]) == 'ON':
+            which = self._upper(toks[i + 1])
+            action = self._upper(toks[i + 2])
+            step = 3
+            if action in ('SET', 'NO') and i + 3 < len(toks):
+                action = f'{action} {self._upper(toks[i + 3])}'
+                step = 4
+            action = _FK_ACTIONS.get(action, action)
+            if which == 'DELETE':
+                fk.delete_rule = action
+            elif which == 'UPDATE':
+                fk.update_rule = action
+            i += step
+        return i
+
+    def _references(self, toks: list, i: int, fk: DdlForeignKey) -> int:
+        """toks[i] == 'REFERENCES'"""
+        _, ref, i = self._qualified_name(toks, i + 1)
+        fk.ref_table = ref
+        if i < len(toks) and toks[i][1] == '(':
+            fk.ref_columns, i = self._column_list(toks, i)
+        return self._fk_actions(toks, i, fk)
+
+    # ── 문장별 처리 ──────────────────────────────────────────────────────────
+
+    def apply(self, stmt: str) -> None:
+        toks = self._tokens(stmt)
+        if not toks:
+            return
+        head = self._upper(toks[0])
+        if head == 'CREATE':
+            if not self._create_index(toks):
+                self._create_table(toks)
+        elif head == 'ALTER':
+            self._alter_table(toks)
+        elif head == 'COMMENT':
+            self._comment_on(toks)
+        elif head in ('EXEC', 'EXECUTE'):
+            self._extended_property(toks)
+
+    def _create_table(self, toks: list) -> None:
+        i = 1
+        while i < len(toks) and self._upper(toks[i]) in (
+            'OR', 'REPLACE', 'GLOBAL', 'LOCAL', 'UNLOGGED',
+        ):
+            i += 1
+        if i >= len(toks) or self._upper(toks[i]) in ('TEMPORARY', 'TEMP'):
+            return
+        if self._upper(toks[i]) != 'TABLE':
+            return
+        i += 1
+        if self._upper(toks[i]) == 'IF':   # IF NOT EXISTS
+            i += 3
+        schema, name, i = self._qualified_name(toks, i)
+        if i >= len(toks) or toks[i][1] != '(':
+            return   # CREATE TABLE ... AS SELECT / PARTITION OF 등
+
+        end = self._matching_paren(toks, i)
+        table = DdlTable(name=name, schema=schema)
+        for part in self._split_top(toks[i + 1:end]):
+            self._table_element(table, part)
+
+        # 테이블 옵션: COMMENT [=] '...'
+        j = end + 1
+        while j < len(toks):
+            if self._upper(toks[j]) == 'COMMENT':
+                k = j + 1
+                if k < len(toks) and toks[k][1] == '=':
+                    k += 1
+                if k < len(toks) and toks[k][0] == 'str':
+                    table.comment = self._unquote(*toks[k])
+                break
+            j += 1
+
+        self.tables[name.lower()] = table
+
+    def _create_index(self, toks: list) -> bool:
+        """CREATE [UNIQUE] [CLUSTERED|NONCLUSTERED|BITMAP] INDEX ... ON t [USING m] (...)"""
+        i = 1
+        unique = False
+        index_type = 'BTREE'
+        while i < len(toks) and self._upper(toks[i]) in (
+            'UNIQUE', 'CLUSTERED', 'NONCLUSTERED', 'BITMAP', 'FULLTEXT', 'SPATIAL',
+        ):
+            up = self._upper(toks[i])
+            if up == 'UNIQUE':
+                unique = True
+            elif up != 'NONCLUSTERED':
+                index_type = up
+            i += 1
+        if i >= len(toks) or self._upper(toks[i]) != 'INDEX':
+            return False
+        i += 1
+        while i < len(toks) and self._upper(toks[i]) in ('CONCURRENTLY', 'IF', 'NOT', 'EXISTS'):
+            i += 1
+
+        name = ''
+        if i < len(toks) and self._upper(toks[i]) != 'ON':
+            _, name, i = self._qualified_name(toks, i)
+        if i >= len(toks) or self._upper(toks[i]) != 'ON':
+            return True
+        i += 1
+        if i < len(toks) and self._upper(toks[i]) == 'ONLY':
+            i += 1
+        _, tname, i = self._qualified_name(toks, i)
+        table = self.tables.get(tname.lower())
+        if table is None:
+            return True
+        if i + 1 < len(toks) and self._upper(toks[i]) == 'USING':
+            index_type = self._upper(toks[i + 1])
+            i += 2
+        if i < len(toks) and toks[i][1] == '(':
+            cols, _ = self._index_columns(toks, i)
+            table.indexes.append(DdlIndex(
+                name=name or f'ix_{table.name}_{len(table.indexes) + 1}',
+                columns=cols, unique=unique, index_type=index_type,
+            ))
+        return True
+
+    def _is_constraint(self, part: list) -> bool:
+        """테이블 요소가 제약/인덱스 정의인지 (key/period/like 같은 이름의 컬럼과 구분)"""
+        kw = self._upper(part[0])
+        if part[0][0] != 'word' or kw not in _TABLE_CONSTRAINT:
+            return False
+        nxt = self._upper(part[1]) if len(part) > 1 else ''
+
+        if kw in ('KEY', 'INDEX', 'FULLTEXT', 'SPATIAL'):
+            # [FULLTEXT|SPATIAL] [KEY|INDEX] [name] [USING type] (col, ...)
+            # 'key varchar(10)' / 'key nvarchar(max)' 같은 컬럼은 괄호 안이 길이
+            j = 1
+            if kw in ('FULLTEXT', 'SPATIAL') and nxt in ('KEY', 'INDEX'):
+                j += 1
+            if j < len(part) and part[j][0] in ('word', 'qid') and self._upper(part[j]) != 'USING':
+                j += 1
+            if j < len(part) and self._upper(part[j]) in ('CLUSTERED', 'NONCLUSTERED'):
+                j += 1
+            if j < len(part) and self._upper(part[j]) == 'USING':
+                j += 2
+            if j + 1 >= len(part) or part[j][1] != '(':
+                return False
+            first = part[j + 1]
+            return first[1] == '(' or (first[0] in ('word', 'qid') and self._upper(first) != 'MAX')
+        if kw == 'PERIOD':
+            return nxt == 'FOR'                     # PERIOD FOR SYSTEM_TIME (...)
+        if kw == 'EXCLUDE':
+            return nxt == 'USING' or (len(part) > 1 and part[1][1] == '(')
+        if kw == 'LIKE':
+            # LIKE [schema.]tbl [INCLUDING ...]: 앞서 정의된 테이블이거나 LIKE 옵션/스키마 한정이 있을 때
+            if len(part) < 2 or part[1][0] not in ('word', 'qid'):
+                return False
+            _, name, j = self._qualified_name(part, 1)
+            if j >= len(part):
+                return j > 2 or name.lower() in self.tables
+            return self._upper(part[j]) in ('INCLUDING', 'EXCLUDING')
+        return True
+
+    def _table_element(self, table: DdlTable, part: list) -> None:
+        if self._is_constraint(part):
+            self._constraint(table, part)
+        else:
+            self._column_def(table, part)
+
+    def _constraint(self, table: DdlTable, part: list) -> None:
+        i = 0
+        cname = ''
+        if self._upper(part[0]) == 'CONSTRAINT':
+            cname = self._unquote(*part[1])
+            i = 2
+        kw = self._upper(part[i]) if i < len(part) else ''
+
+        if kw == 'PRIMARY':
+            j = i + 2
+            while j < len(part) and part[j][1] != '(':
+                j += 1   # CLUSTERED / NONCLUSTERED
+            if j < len(part):
+                cols, _ = self._column_list(part, j)
+                for c in cols:
+                    col = table.column(c)
+                    if col:
+                        col.is_pk = True
+                        col.nullable = False
+                table.indexes.append(DdlIndex(
+                    name=self._pk_name(table, cname), columns=list(cols), unique=True, primary=True,
+                ))
+
+        elif kw == 'FOREIGN':
+            j = i + 2
+            if j < len(part) and part[j][1] != '(':
+                j += 1   # MySQL: FOREIGN KEY idx_name (...)
+            cols, j = self._column_list(part, j)
+            fk = DdlForeignKey(
+                constraint_name=cname or f'fk_{table.name}_{"_".join(cols)}',
+                columns=cols, ref_table='', ref_columns=[],
+            )
+            if j < len(part) and self._upper(part[j]) == 'REFERENCES':
+                self._references(part, j, fk)
+                table.fks.append(fk)
+
+        elif kw == 'UNIQUE':
+            j = i + 1
+            name = cname
+            while j < len(part) and part[j][1] != '(':
+                if not name and part[j][0] in ('word', 'qid') \
+                        and self._upper(part[j]) not in ('KEY', 'INDEX', 'CLUSTERED', 'NONCLUSTERED'):
+                    name = self._unquote(*part[j])
+                j += 1
+            if j < len(part):
+                cols, _ = self._index_columns(part, j)
+                if len(cols) == 1 and cols[0]:
+                    col = table.column(cols[0])
+                    if col:
+                        col.unique = True
+                table.indexes.append(DdlIndex(
+                    name=name or f'uq_{table.name}_{len(table.indexes) + 1}',
+                    columns=cols, unique=True,
+                ))
+
+        elif kw in ('KEY', 'INDEX', 'FULLTEXT', 'SPATIAL'):
+            # MySQL: [FULLTEXT|SPATIAL] {KEY|INDEX} name [USING BTREE] (...)
+            j = i + 1
+            name = ''
+            index_type = kw if kw in ('FULLTEXT', 'SPATIAL') else 'BTREE'
+            while j < len(part) and part[j][1] != '(':
+                up = self._upper(part[j])
+                if up == 'USING' and j + 1 < len(part):
+                    index_type = self._upper(part[j + 1])
+                    j += 2
+                    continue
+                if up not in ('KEY', 'INDEX', 'CLUSTERED', 'NONCLUSTERED') and part[j][0] in ('word', 'qid'):
+                    name = self._unquote(*part[j])
+                j += 1
+            if j < len(part):
+                cols, _ = self._index_columns(part, j)
+                table.indexes.append(DdlIndex(
+                    name=name or f'ix_{table.name}_{len(table.indexes) + 1}',
+                    columns=cols, index_type=index_type,
+                ))
+
+    def _column_def(self, table: DdlTable, part: list) -> None:
+        name = self._unquote(*part[0])
+        i = 1
+        type_toks = []
+        depth = 0
+        while i < len(part):
+            t = part[i]
+            up = self._upper(t)
+            if depth == 0 and up in _COLUMN_STOP:
+                break
+            if depth == 0 and up == 'CHARACTER' and i + 1 < len(part) \
+                    and self._upper(part[i + 1]) == 'SET':
+                break
+            if t[1] == '(':
+                depth += 1
+            elif t[1] == ')':
+                depth -= 1
+            type_toks.append(t)
+            i += 1
+
+        col = DdlColumn(name=name, data_type=self._render(type_toks))
+        pending_constraint = ''
+        while i < len(part):
+            up = self._upper(part[i])
+            if up == 'NOT' and i + 1 < len(part) and self._upper(part[i + 1]) == 'NULL':
+                col.nullable = False
+                i += 2
+            elif up == 'NULL':
+                i += 1
+            elif up == 'PRIMARY':
+                col.is_pk = True
+                col.nullable = False
+                table.indexes.append(DdlIndex(
+                    name=self._pk_name(table, pending_constraint), columns=[name],
+                    unique=True, primary=True,
+                ))
+                i += 2
+            elif up == 'UNIQUE':
+                col.unique = True
+                table.indexes.append(DdlIndex(
+                    name=pending_constraint or name, columns=[name], unique=True,
+                ))
+                i += 1
+            elif up == 'CONSTRAINT' and i + 1 < len(part):
+                pending_constraint = self._unquote(*part[i + 1])
+                i += 2
+            elif up == 'DEFAULT':
+                j = i + 1
+                depth = 0
+                while j < len(part):
+                    if depth == 0 and j > i + 1 and self._upper(part[j]) in _COLUMN_STOP:
+                        break
+                    if part[j][1] == '(':
+                        depth += 1
+                    elif part[j][1] == ')':
+                        depth -= 1
+                    j += 1
+                default = self._render(part[i + 1:j])
+                col.default = None if default.upper() == 'NULL' else default
+                i = j
+            elif up in ('AUTO_INCREMENT', 'AUTOINCREMENT'):
+                col.extra = 'auto_increment'
+                i += 1
+            elif up == 'IDENTITY':
+                col.extra = 'identity'
+                i += 1
+                if i < len(part) and part[i][1] == '(':
+                    i = self._matching_paren(part, i) + 1
+            elif up == 'GENERATED':
+                rest = ' '.join(self._upper(t) for t in part[i:i + 6])
+                col.extra = 'identity' if 'IDENTITY' in rest else 'generated'
+                i += 1
+            elif up == 'COMMENT' and i + 1 < len(part) and part[i + 1][0] == 'str':
+                col.comment = self._unquote(*part[i + 1])
+                i += 2
+            elif up == 'REFERENCES':
+                fk = DdlForeignKey(
+                    constraint_name=pending_constraint or f'fk_{table.name}_{name}',
+                    columns=[name], ref_table='', ref_columns=[],
+                )
+                i = self._references(part, i, fk)
+                table.fks.append(fk)
+            elif up == 'ON' and i + 2 < len(part) and self._upper(part[i + 1]) == 'UPDATE':
+                col.extra = f'on update {part[i + 2][1]}'
+                i += 3
+            else:
+                i += 1
+
+        table.columns.append(col)
+
+    def _alter_table(self, toks: list) -> None:
+        if len(toks) < 3 or self._upper(toks[1]) != 'TABLE':
+            return
+        i = 2
+        while i < len(toks) and self._upper(toks[i]) in ('ONLY', 'IF', 'EXISTS'):
+            i += 1
+        _, name, i = self._qualified_name(toks, i)
+        table = self.tables.get(name.lower())
+        if table is None:
+            return
+        # MSSQL: WITH CHECK ADD ... / NOCHECK
+        while i < len(toks) and self._upper(toks[i]) != 'ADD':
+            i += 1
+        for clause in self._split_top(toks[i:]):
+            if self._upper(clause[0]) != 'ADD':
+                continue
+            body = clause[1:]
+            if not body:
+                continue
+            if self._upper(body[0]) == 'COLUMN':
+                body = body[1:]
+            self._table_element(table, body)
+
+    def _comment_on(self, toks: list) -> None:
+        # COMMENT ON TABLE a.b IS '...' / COMMENT ON COLUMN a.b.c IS '...'
+        if len(toks) < 6 or self._upper(toks[1]) != 'ON':
+            return
+        target = self._upper(toks[2])
+        i = 3
+        parts = [self._unquote(*toks[i])]
+        i += 1
+        while i + 1 < len(toks) and toks[i][1] == '.':
+            parts.append(self._unquote(*toks[i + 1]))
+            i += 2
+        if i + 1 >= len(toks) or self._upper(toks[i]) != 'IS' or toks[i + 1][0] != 'str':
+            return
+        text = self._unquote(*toks[i + 1])
+        if target == 'TABLE':
+            table = self.tables.get(parts[-1].lower())
+            if table:
+                table.comment = text
+        elif target == 'COLUMN' and len(parts) >= 2:
+            table = self.tables.get(parts[-2].lower())
+            col = table.column(parts[-1]) if table else None
+            if col:
+                col.comment = text
+
+    def _extended_property(self, toks: list) -> None:
+        # EXEC sp_addextendedproperty N'MS_Description', N'값', N'SCHEMA', N'dbo',
+        #      N'TABLE', N'tbl' [, N'COLUMN', N'col']   (named 파라미터도 같은 순서)
+        words = [t[1].lower() for t in toks if t[0] == 'word']
+        if 'sp_addextendedproperty' not in words:
+            return
+        strs = [self._unquote(*t) for t in toks if t[0] == 'str']
+        if len(strs) < 6 or strs[0] != 'MS_Description':
+            return
+        value = strs[1]
+        levels = {strs[k].upper(): strs[k + 1] for k in range(2, len(strs) - 1, 2)}
+        table = self.tables.get(levels.get('TABLE', '').lower())
+        if table is None:
+            return
+        if 'COLUMN' in levels:
+            col = table.column(levels['COLUMN'])
+            if col:
+                col.comment = value
+        else:
+            table.comment = value
+
+    # ── raw row 내보내기 (metadata_service 입력 형식) ──────────────────────────
+
+    def column_rows(self, schema: str) -> list[dict]:
+        rows = []
+        for table in sorted(self.tables.values(), key=lambda t: t.name):
+            for no, col in enumerate(table.columns, start=1):
+                rows.append({
+                    'schema_name':    table.schema or schema,
+                    'table_name':     table.name,
+                    'table_comment':  table.comment,
+                    'col_no':         no,
+                    'column_name':    col.name,
+                    'data_type':      col.data_type,
+                    'nullable_yn':    'Y' if col.nullable else 'N',
+                    'key_type':       'PRI' if col.is_pk else ('UNI' if col.unique else ''),
+                    'pk_yn':          'Y' if col.is_pk else 'N',
+                    'default_value':  col.default,
+                    'extra_info':     col.extra,
+                    'column_comment': col.comment,
+                })
+        return rows
+
+    def fk_rows(self) -> list[dict]:
+        rows = []
+        for table in sorted(self.tables.values(), key=lambda t: t.name):
+            for fk in table.fks:
+                ref_cols = fk.ref_columns
+                if not ref_cols:
+                    # REFERENCES t (컬럼 생략) -> 대상 PK
+                    ref = self.tables.get(fk.ref_table.lower())
+                    ref_cols = [c.name for c in ref.columns if c.is_pk] if ref else []
+                for col, ref_col in zip(fk.columns, ref_cols):
+                    rows.append({
+                        'table_name':             table.name,
+                        'column_name':            col,
+                        'constraint_name':        fk.constraint_name,
+                        'referenced_table_name':  fk.ref_table,
+                        'referenced_column_name': ref_col,
+                        'update_rule':            fk.update_rule,
+                        'delete_rule':            fk.delete_rule,
+                    })
+        return rows
+
+
+    def index_rows(self) -> list[dict]:
+        rows = []
+        for table in sorted(self.tables.values(), key=lambda t: t.name):
+            for index in table.indexes:
+                for no, col in enumerate(index.columns, start=1):
+                    rows.append({
+                        'table_name':  table.name,
+                        'index_name':  index.name,
+                        'index_type':  index.index_type,
+                        'is_unique':   'Y' if index.unique else 'N',
+                        'is_primary':  'Y' if index.primary else 'N',
+                        'col_no':      no,
+                        'column_name': col,
+                    })
+        return rows
+
+
+def parse_ddl(fp: IO[str], dialect: str = 'generic', chunk_size: int = CHUNK_SIZE) -> DdlSchema:
+    """DDL 스트림을 한 번 읽어 DdlSchema 생성"""
+    schema = DdlSchema(dialect)
+    for stmt in iter_statements(fp, dialect, chunk_size):
+        schema.apply(stmt)
+    return schema
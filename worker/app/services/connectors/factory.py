@@ -1,17 +1,89 @@
 ﻿"""
 커넥터 팩토리
 - db_type에 따라 구체 커넥터를 생성한다.
+- 커넥터 모듈(과 DB 드라이버)은 해당 db_type을 처음 쓸 때 import한다.
+  쓰지 않는 드라이버는 로드하지 않으므로 기동이 빠르고, 네이티브 라이브러리가 없는
+  드라이버가 있어도 worker는 뜨며 그 db_type 요청만 DRIVER_UNAVAILABLE로 실패한다.
+- CONNECTOR_PREWARM(쉼표 구분 db_type 또는 all)은 기동 직후 백그라운드에서 미리 로드한다.
+- 오프라인 파일(SQLite / DDL)은 OFFLINE_SCHEMA_DIR 하위 경로만 허용한다.
 """
-from app.models.connection import DbConnectionRequest
-from app.services.connectors.base import BaseConnector, UnsupportedDbTypeError
-from app.services.connectors.mysql_connector import MySQLConnector
-from app.services.connectors.mssql_connector import MSSQLConnector
-from app.services.connectors.oracle_connector import OracleConnector
+import importlib
+import logging
+import os
+import time
+from pathlib import Path
+
+from app.models.connection import DbConnectionRequest, ExtractFileRequest
+from app.services.connectors.base import BaseConnector, ConnectorError, UnsupportedDbTypeError
+
+logger = logging.getLogger(__name__)
+
+OFFLINE_SCHEMA_DIR = os.getenv('OFFLINE_SCHEMA_DIR', '')
+CONNECTOR_PREWARM  = os.getenv('CONNECTOR_PREWARM', '')
+
+# db_type / source_type -> (커넥터 모듈, 클래스명)
+_CONNECTOR_MODULES = {
+    'mysql':      ('app.services.connectors.mysql_connector', 'MySQLConnector'),
+    'mssql':      ('app.services.connectors.mssql_connector', 'MSSQLConnector'),
+    'oracle':     ('app.services.connectors.oracle_connector', 'OracleConnector'),
+    'postgresql': ('app.services.connectors.postgres_connector', 'PostgresConnector'),
+    'sqlite':     ('app.services.connectors.sqlite_connector', 'SQLiteConnector'),
+    'ddl':        ('app.services.connectors.ddl_connector', 'DdlFileConnector'),
+}
+
+_loaded: dict[str, type[BaseConnector]] = {}
+
+
+def connector_class(db_type: str) -> type[BaseConnector]:
+    """db_type의 커넥터 클래스 (처음 호출 시 모듈 + 드라이버 import)"""
+    cls = _loaded.get(db_type)
+    if cls is not None:
+        return cls
+    spec = _CONNECTOR_MODULES.get(db_type)
+    if spec is None:
+        raise UnsupportedDbTypeError(db_type)
+    module_name, class_name = spec
+    try:
+        module = importlib.import_module(module_name)
+    except (ImportError, OSError) as e:
+        # 드라이버 미설치 / 네이티브 라이브러리 누락
+        logger.error('connector load failed: %s (%s)', db_type, e)
+        raise ConnectorError(f"'{db_type}' DB 드라이버를 불러올 수 없습니다.", 'DRIVER_UNAVAILABLE')
+    cls = _loaded[db_type] = getattr(module, class_name)
+    return cls
+
+
+def loaded_connectors() -> list[str]:
+    return sorted(_loaded)
+
+
+def prewarm(db_types: str = CONNECTOR_PREWARM) -> dict[str, float]:
+    """
+    쉼표 구분 db_type(또는 all)의 커넥터를 미리 로드하고 db_type -> 소요 초.
+    로드 실패는 기록만 하고 넘어간다 (해당 db_type 요청에서 다시 시도).
+    """
+    names = [n.strip() for n in db_types.split(',') if n.strip()]
+    if names == ['all']:
+        names = list(_CONNECTOR_MODULES)
+    elapsed: dict[str, float] = {}
+    for name in names:
+        started = time.perf_counter()
+        try:
+            connector_class(name)
+        except (ConnectorError, UnsupportedDbTypeError) as e:
+            logger.warning('connector prewarm skipped: %s (%s)', name, e)
+            continue
+        elapsed[name] = time.perf_counter() - started
+    if elapsed:
+        logger.info('connector prewarm: %s', ', '.join(f'{k}={v * 1000:.0f}ms' for k, v in elapsed.items()))
+    return elapsed
 
 
 def make_connector(req: DbConnectionRequest) -> BaseConnector:
+    cls = connector_class(req.db_type)
+
     if req.db_type == 'mysql':
-        return MySQLConnector(
+        return cls(
             host=req.host,
             port=req.port,
             database=req.database,   # type: ignore[arg-type]
@@ -20,7 +92,7 @@ def make_connector(req: DbConnectionRequest) -> BaseConnector:
         )
 
     if req.db_type == 'mssql':
-        return MSSQLConnector(
+        return cls(
             host=req.host,
             port=req.port,
             database=req.database,   # type: ignore[arg-type]
@@ -29,7 +101,7 @@ def make_connector(req: DbConnectionRequest) -> BaseConnector:
         )
 
     if req.db_type == 'oracle':
-        return OracleConnector(
+        return cls(
             host=req.host,
             port=req.port,
             service_name=req.service_name,
@@ -38,4 +110,37 @@ def make_connector(req: DbConnectionRequest) -> BaseConnector:
             password=req.password,
         )
 
+    if req.db_type == 'postgresql':
+        return cls(
+            host=req.host,
+            port=req.port,
+            database=req.database,   # type: ignore[arg-type]
+            username=req.username,
+            password=req.password,
+        )
+
     raise UnsupportedDbTypeError(req.db_type)
+
+
+def resolve_offline_path(path: str) -> Path:
+    """OFFLINE_SCHEMA_DIR 기준 경로 해석 (디렉터리 밖 접근 차단)"""
+    if not OFFLINE_SCHEMA_DIR:
+        raise ConnectorError('오프라인 파일 추출이 비활성화되어 있습니다. (OFFLINE_SCHEMA_DIR 미설정)', 'PERMISSION_DENIED')
+    base = Path(OFFLINE_SCHEMA_DIR).resolve()
+    target = (base / path).resolve()
+    if not target.is_relative_to(base):
+        raise ConnectorError('허용되지 않은 경로입니다.', 'PERMISSION_DENIED')
+    return target
+
+
+def make_file_connector(req: ExtractFileRequest) -> BaseConnector:
+    path = str(resolve_offline_path(req.path))
+    cls = connector_class(req.source_type)
+
+    if req.source_type == 'sqlite':
+        return cls(path)
+
+    if req.source_type == 'ddl':
+        return cls(path, dialect=req.dialect, encoding=req.encoding)
+
+    raise UnsupportedDbTypeError(req.source_type)
@@ -6,10 +6,267 @@ from typing import Any, Generator
 
 import pymssql
 
-from .base import BaseConnector, ConnectorError
+from .base import (
+    CONNECT_TIMEOUT,
+    QUERY_TIMEOUT,
+    BaseConnector,
+    CatalogQuery,
+    ConnectorError,
+    parse_version,
+)
+
+# sys 카탈로그 뷰: object_id 기준 조인 (INFORMATION_SCHEMA 뷰 + OBJECT_ID() 행별 호출 회피)
+_SQL_COLUMNS_SYS = """
+SELECT
+    s.name AS schema_name,
+    t.name AS table_name,
+    ISNULL(CAST(ep_t.value AS NVARCHAR(4000)), '') AS table_comment,
+    c.column_id AS col_no,
+    c.name AS column_name,
+    tn.type_name +
+      CASE
+        WHEN tn.type_name IN ('varchar', 'char', 'varbinary', 'binary')
+          THEN '(' + CAST(c.max_length AS VARCHAR) + ')'
+        WHEN tn.type_name IN ('nvarchar', 'nchar')
+          THEN '(' + CAST(CASE WHEN c.max_length = -1 THEN -1 ELSE c.max_length / 2 END AS VARCHAR) + ')'
+        WHEN tn.type_name IN ('tinyint', 'smallint', 'int', 'bigint', 'decimal', 'numeric',
+                              'money', 'smallmoney', 'float', 'real')
+          THEN '(' + CAST(c.precision AS VARCHAR) + ',' + CAST(c.scale AS VARCHAR) + ')'
+        ELSE ''
+      END AS data_type,
+    CASE WHEN c.is_nullable = 1 THEN 'Y' ELSE 'N' END AS nullable_yn,
+    '' AS key_type,
+    'N' AS pk_yn,
+    dc.definition AS default_value,
+    '' AS extra_info,
+    ISNULL(CAST(ep_c.value AS NVARCHAR(4000)), '') AS column_comment
+FROM sys.tables t
+JOIN sys.schemas s
+  ON s.schema_id = t.schema_id
+JOIN sys.columns c
+  ON c.object_id = t.object_id
+JOIN sys.types ty
+  ON ty.user_type_id = c.user_type_id
+CROSS APPLY (
+    -- 별칭 타입은 기반 시스템 타입명 (INFORMATION_SCHEMA.DATA_TYPE와 같게), CLR 타입은 그대로
+    SELECT CASE WHEN ty.is_user_defined = 1 AND ty.is_assembly_type = 0
+                THEN TYPE_NAME(c.system_type_id) ELSE ty.name END AS type_name
+) tn
+LEFT JOIN sys.default_constraints dc
+  ON dc.object_id = c.default_object_id
+LEFT JOIN sys.extended_properties ep_t
+  ON ep_t.class = 1
+ AND ep_t.major_id = t.object_id
+ AND ep_t.minor_id = 0
+ AND ep_t.name = 'MS_Description'
+LEFT JOIN sys.extended_properties ep_c
+  ON ep_c.class = 1
+ AND ep_c.major_id = c.object_id
+ AND ep_c.minor_id = c.column_id
+ AND ep_c.name = 'MS_Description'
+WHERE s.name = %s
+  AND t.is_ms_shipped = 0
+ORDER BY t.name, c.column_id
+"""
+
+# fallback: INFORMATION_SCHEMA (OBJECT_ID는 행당 1회만 계산)
+_SQL_COLUMNS_INFORMATION_SCHEMA = """
+SELECT
+    c.TABLE_SCHEMA AS schema_name,
+    c.TABLE_NAME AS table_name,
+    ISNULL(ep_t.value, '') AS table_comment,
+    c.ORDINAL_POSITION AS col_no,
+    c.COLUMN_NAME AS column_name,
+    c.DATA_TYPE +
+      CASE
+        WHEN c.CHARACTER_MAXIMUM_LENGTH IS NOT NULL THEN '(' + CAST(c.CHARACTER_MAXIMUM_LENGTH AS VARCHAR) + ')'
+        WHEN c.NUMERIC_PRECISION IS NOT NULL THEN '(' + CAST(c.NUMERIC_PRECISION AS VARCHAR) + ',' + CAST(c.NUMERIC_SCALE AS VARCHAR) + ')'
+        ELSE ''
+      END AS data_type,
+    CASE WHEN c.IS_NULLABLE = 'NO' THEN 'N' ELSE 'Y' END AS nullable_yn,
+    '' AS key_type,
+    'N' AS pk_yn,
+    c.COLUMN_DEFAULT AS default_value,
+    '' AS extra_info,
+    ISNULL(ep_c.value, '') AS column_comment
+FROM INFORMATION_SCHEMA.COLUMNS c
+CROSS APPLY (SELECT OBJECT_ID(QUOTENAME(c.TABLE_SCHEMA) + '.' + QUOTENAME(c.TABLE_NAME)) AS object_id) o
+LEFT JOIN sys.extended_properties ep_t
+  ON ep_t.major_id = o.object_id
+ AND ep_t.minor_id = 0
+ AND ep_t.name = 'MS_Description'
+LEFT JOIN sys.extended_properties ep_c
+  ON ep_c.major_id = o.object_id
+ AND ep_c.minor_id = c.ORDINAL_POSITION
+ AND ep_c.name = 'MS_Description'
+WHERE c.TABLE_SCHEMA = %s
+ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+"""
+
+_SQL_FKS_SYS = """
+SELECT
+    tp.name AS table_name,
+    cp.name AS column_name,
+    fk.name AS constraint_name,
+    tr.name AS referenced_table_name,
+    cr.name AS referenced_column_name,
+    REPLACE(fk.update_referential_action_desc, '_', ' ') AS update_rule,
+    REPLACE(fk.delete_referential_action_desc, '_', ' ') AS delete_rule
+FROM sys.foreign_keys fk
+JOIN sys.foreign_key_columns fkc
+  ON fkc.constraint_object_id = fk.object_id
+JOIN sys.tables tp
+  ON tp.object_id = fkc.parent_object_id
+JOIN sys.schemas s
+  ON s.schema_id = tp.schema_id
+JOIN sys.columns cp
+  ON cp.object_id = fkc.parent_object_id
+ AND cp.column_id = fkc.parent_column_id
+JOIN sys.tables tr
+  ON tr.object_id = fkc.referenced_object_id
+JOIN sys.columns cr
+  ON cr.object_id = fkc.referenced_object_id
+ AND cr.column_id = fkc.referenced_column_id
+WHERE s.name = %s
+ORDER BY tp.name, fkc.constraint_column_id
+"""
+
+_SQL_FKS_INFORMATION_SCHEMA = """
+SELECT
+    kcu.TABLE_NAME AS table_name,
+    kcu.COLUMN_NAME AS column_name,
+    rc.CONSTRAINT_NAME AS constraint_name,
+    kcu2.TABLE_NAME AS referenced_table_name,
+    kcu2.COLUMN_NAME AS referenced_column_name,
+    rc.UPDATE_RULE AS update_rule,
+    rc.DELETE_RULE AS delete_rule
+FROM INFORMATION_SCHEMA.REFERENTIAL_CONSTRAINTS rc
+JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu
+  ON rc.CONSTRAINT_NAME = kcu.CONSTRAINT_NAME
+JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu2
+  ON rc.UNIQUE_CONSTRAINT_NAME = kcu2.CONSTRAINT_NAME
+ AND kcu.ORDINAL_POSITION = kcu2.ORDINAL_POSITION
+WHERE kcu.TABLE_SCHEMA = %s
+ORDER BY kcu.TABLE_NAME, kcu.ORDINAL_POSITION
+"""
+
+# 행 수/페이지 수: dm_db_partition_stats (VIEW DATABASE STATE 필요)
+_SQL_STATS_DM = """
+SELECT
+    t.name AS table_name,
+    SUM(CASE WHEN ps.index_id IN (0, 1) THEN ps.row_count ELSE 0 END) AS row_count,
+    CAST(SUM(CASE WHEN ps.index_id IN (0, 1) THEN ps.used_page_count ELSE 0 END) AS BIGINT) * 8192 AS data_bytes,
+    CAST(SUM(CASE WHEN ps.index_id > 1 THEN ps.used_page_count ELSE 0 END) AS BIGINT) * 8192 AS index_bytes
+FROM sys.tables t
+JOIN sys.schemas s
+  ON s.schema_id = t.schema_id
+JOIN sys.dm_db_partition_stats ps
+  ON ps.object_id = t.object_id
+WHERE s.name = %s
+GROUP BY t.name
+"""
+
+# 권한이 없으면 sys.partitions + sys.allocation_units (메타데이터 가시성만 필요)
+_SQL_STATS_PARTITIONS = """
+SELECT
+    t.name AS table_name,
+    r.row_count AS row_count,
+    pg.data_pages * 8192 AS data_bytes,
+    pg.index_pages * 8192 AS index_bytes
+FROM sys.tables t
+JOIN sys.schemas s
+  ON s.schema_id = t.schema_id
+OUTER APPLY (
+    SELECT SUM(p.rows) AS row_count
+    FROM sys.partitions p
+    WHERE p.object_id = t.object_id
+      AND p.index_id IN (0, 1)
+) r
+OUTER APPLY (
+    SELECT
+        CAST(SUM(CASE WHEN p.index_id IN (0, 1) THEN au.used_pages ELSE 0 END) AS BIGINT) AS data_pages,
+        CAST(SUM(CASE WHEN p.index_id > 1 THEN au.used_pages ELSE 0 END) AS BIGINT) AS index_pages
+    FROM sys.partitions p
+    JOIN sys.allocation_units au
+      ON au.container_id = p.partition_id
+    WHERE p.object_id = t.object_id
+) pg
+WHERE s.name = %s
+"""
+
+# 키 컬럼만 (key_ordinal > 0: INCLUDE 컬럼/columnstore 제외), heap(type 0) 제외
+_SQL_INDEXES = """
+SELECT
+    t.name AS table_name,
+    i.name AS index_name,
+    i.type_desc AS index_type,
+    CASE WHEN i.is_unique = 1 THEN 'Y' ELSE 'N' END AS is_unique,
+    CASE WHEN i.is_primary_key = 1 THEN 'Y' ELSE 'N' END AS is_primary,
+    ic.key_ordinal AS col_no,
+    c.name AS column_name
+FROM sys.indexes i
+JOIN sys.tables t
+  ON t.object_id = i.object_id
+JOIN sys.schemas s
+  ON s.schema_id = t.schema_id
+JOIN sys.index_columns ic
+  ON ic.object_id = i.object_id
+ AND ic.index_id = i.index_id
+JOIN sys.columns c
+  ON c.object_id = ic.object_id
+ AND c.column_id = ic.column_id
+WHERE s.name = %s
+  AND i.type > 0
+  AND i.is_hypothetical = 0
+  AND ic.key_ordinal > 0
+ORDER BY t.name, i.name, ic.key_ordinal
+"""
+
+# SQL Server 2005(9.0)+ 에서 sys 카탈로그 뷰 사용
+# 테이블 범위 배치 경계용 (뷰 포함: 범위 양 끝은 열려 있으므로 상위 집합이면 충분)
+_SQL_TABLES = """
+SELECT TABLE_NAME AS table_name
+FROM INFORMATION_SCHEMA.TABLES
+WHERE TABLE_SCHEMA = %s
+ORDER BY TABLE_NAME
+"""
+
+_CATALOG_QUERIES = (
+    CatalogQuery('columns', 'sys_catalog',        _SQL_COLUMNS_SYS, min_version=(9, 0),
+                 range_column='t.name'),
+    CatalogQuery('columns', 'information_schema', _SQL_COLUMNS_INFORMATION_SCHEMA,
+                 range_column='c.TABLE_NAME'),
+    CatalogQuery('tables',  'information_schema', _SQL_TABLES),
+    CatalogQuery('fks',     'sys_catalog',        _SQL_FKS_SYS, min_version=(9, 0)),
+    CatalogQuery('fks',     'information_schema', _SQL_FKS_INFORMATION_SCHEMA),
+    CatalogQuery('stats',   'dm_partition_stats', _SQL_STATS_DM, min_version=(9, 0),
+                 probe_sql='SELECT TOP 1 1 FROM sys.dm_db_partition_stats'),
+    CatalogQuery('stats',   'sys_partitions',     _SQL_STATS_PARTITIONS, min_version=(9, 0)),
+    CatalogQuery('indexes', 'sys_catalog',        _SQL_INDEXES, min_version=(9, 0)),
+)
+
+# pymssql 에러 코드 (SQL Server 메시지 번호 / DB-Lib 코드) -> 사용자 메시지 매핑
+_MSSQL_ERROR_MAP: dict[int, tuple[str, str]] = {
+    18456: ('인증 실패: 사용자명 또는 비밀번호를 확인해주세요.', 'AUTH_FAILED'),
+    4060:  ('DB가 존재하지 않거나 접근 권한이 없습니다.', 'PERMISSION_DENIED'),
+    20002: ('연결 실패: 호스트 또는 포트를 확인해주세요.', 'CONNECTION_REFUSED'),
+    20009: ('연결 실패: 호스트 또는 포트를 확인해주세요.', 'CONNECTION_REFUSED'),
+    20003: ('연결 시간이 초과되었습니다.', 'TIMEOUT'),
+}
+
+# 쿼리 도중 연결이 끊긴 경우 (재연결 후 재시도 대상, DB-Lib 코드)
+_MSSQL_TRANSIENT_CODES = {
+    20004,   # Read from the server failed
+    20006,   # Write to the server failed
+    20017,   # Unexpected EOF from the server
+    20047,   # DBPROCESS is dead or not enabled
+}
 
 
 class MSSQLConnector(BaseConnector):
+
+    catalog_queries = _CATALOG_QUERIES
+
     def __init__(
         self,
         host: str,
@@ -17,13 +274,18 @@ class MSSQLConnector(BaseConnector):
         database: str,
         username: str,
         password: str,
+        connect_timeout: int = CONNECT_TIMEOUT,
+        query_timeout: int = QUERY_TIMEOUT,
     ) -> None:
+        super().__init__()
         self._cfg = {
             'server': host,
             'port': port,
             'user': username,
             'password': password,
             'database': database,
+            'login_timeout': connect_timeout,
+            'timeout': query_timeout,
         }
         self._database = database
 
@@ -31,7 +293,7 @@ class MSSQLConnector(BaseConnector):
     def connection(self) -> Generator[Any, None, None]:
         conn = None
         try:
-            conn = pymssql.connect(**self._cfg)
+            conn = self._connect()
             yield conn
         finally:
             if conn:
@@ -40,6 +302,23 @@ class MSSQLConnector(BaseConnector):
                 except Exception:
                     pass
 
+    def _connect(self) -> Any:
+        try:
+            return pymssql.connect(**self._cfg)
+        except pymssql.Error as e:
+            # e.args: ((code, message),) 또는 (code, message)
+            first = e.args[0] if e.args else None
+            code = first[0] if isinstance(first, tuple) else first
+            if not isinstance(code, int):
+                code = -1
+            msg, err_code = _MSSQL_ERROR_MAP.get(
+                code,
+                (f'DB 연결 오류 (code={code})', 'CONNECTION_REFUSED'),
+            )
+            raise ConnectorError(msg, err_code) from e
+        except Exception as e:
+            raise ConnectorError(f'연결 중 오류: {e}', 'UNKNOWN') from e
+
     def get_db_version(self, conn: Any) -> str:
         cur = conn.cursor()
         cur.execute('SELECT @@VERSION')
@@ -51,64 +330,34 @@ class MSSQLConnector(BaseConnector):
             with self.connection() as conn:
                 version = self.get_db_version(conn)
             return {'success': True, 'message': '연결 성공', 'db_version': version}
+        except ConnectorError as e:
+            return {'success': False, 'message': e.message, 'error_code': e.error_code}
         except Exception as e:
             return {'success': False, 'message': f'연결 실패: {e}', 'error_code': 'CONNECTION_REFUSED'}
 
-    def extract_columns_raw(self, conn: Any, schema: str) -> list[dict]:
-        sql = """
-        SELECT
-            c.TABLE_SCHEMA AS schema_name,
-            c.TABLE_NAME AS table_name,
-            ISNULL(ep_t.value, '') AS table_comment,
-            c.ORDINAL_POSITION AS col_no,
-            c.COLUMN_NAME AS column_name,
-            c.DATA_TYPE +
-              CASE
-                WHEN c.CHARACTER_MAXIMUM_LENGTH IS NOT NULL THEN '(' + CAST(c.CHARACTER_MAXIMUM_LENGTH AS VARCHAR) + ')'
-                WHEN c.NUMERIC_PRECISION IS NOT NULL THEN '(' + CAST(c.NUMERIC_PRECISION AS VARCHAR) + ',' + CAST(c.NUMERIC_SCALE AS VARCHAR) + ')'
-                ELSE ''
-              END AS data_type,
-            CASE WHEN c.IS_NULLABLE = 'NO' THEN 'N' ELSE 'Y' END AS nullable_yn,
-            '' AS key_type,
-            'N' AS pk_yn,
-            c.COLUMN_DEFAULT AS default_value,
-            '' AS extra_info,
-            ISNULL(ep_c.value, '') AS column_comment
-        FROM INFORMATION_SCHEMA.COLUMNS c
-        LEFT JOIN sys.extended_properties ep_t
-          ON ep_t.major_id = OBJECT_ID(c.TABLE_SCHEMA + '.' + c.TABLE_NAME)
-         AND ep_t.minor_id = 0
-         AND ep_t.name = 'MS_Description'
-        LEFT JOIN sys.extended_properties ep_c
-          ON ep_c.major_id = OBJECT_ID(c.TABLE_SCHEMA + '.' + c.TABLE_NAME)
-         AND ep_c.minor_id = c.ORDINAL_POSITION
-         AND ep_c.name = 'MS_Description'
-        WHERE c.TABLE_SCHEMA = %s
-        ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
-        """
+    def server_version(self, conn: Any) -> tuple[int, ...]:
+        if self._server_version is None:
+            cur = conn.cursor()
+            cur.execute("SELECT CAST(SERVERPROPERTY('ProductVersion') AS VARCHAR(32))")
+            row = cur.fetchone()
+            self._server_version = parse_version(row[0] if row else '')
+        return self._server_version
+
+    def transient_error(self, exc: BaseException) -> ConnectorError | None:
+        if isinstance(exc, pymssql.OperationalError) and exc.args:
+            first = exc.args[0]
+            code = first[0] if isinstance(first, tuple) else first
+            if code in _MSSQL_TRANSIENT_CODES:
+                return ConnectorError(f'연결이 끊어졌습니다. (code={code})', 'CONNECTION_REFUSED')
+        return None
+
+    def _fetch(self, conn: Any, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
         cur = conn.cursor(as_dict=True)
-        cur.execute(sql, (schema,))
+        cur.execute(sql, (schema, *params))
         return list(cur.fetchall())
 
+    def extract_columns_raw(self, conn: Any, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'columns', schema)
+
     def extract_fks_raw(self, conn: Any, schema: str) -> list[dict]:
-        sql = """
-        SELECT
-            kcu.TABLE_NAME AS table_name,
-            kcu.COLUMN_NAME AS column_name,
-            rc.CONSTRAINT_NAME AS constraint_name,
-            kcu2.TABLE_NAME AS referenced_table_name,
-            kcu2.COLUMN_NAME AS referenced_column_name,
-            rc.UPDATE_RULE AS update_rule,
-            rc.DELETE_RULE AS delete_rule
-        FROM INFORMATION_SCHEMA.REFERENTIAL_CONSTRAINTS rc
-        JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu
-          ON rc.CONSTRAINT_NAME = kcu.CONSTRAINT_NAME
-        JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu2
-          ON rc.UNIQUE_CONSTRAINT_NAME = kcu2.CONSTRAINT_NAME
-         AND kcu.ORDINAL_POSITION = kcu2.ORDINAL_POSITION
-        WHERE kcu.TABLE_SCHEMA = %s
-        ORDER BY kcu.TABLE_NAME, kcu.ORDINAL_POSITION
-        """
-        cur = conn.cursor(as_dict=True)
-        cur.execute(sql, (schema,))
-        return list(cur.fetchall())
+        return self.run_catalog_query(conn, 'fks', schema)
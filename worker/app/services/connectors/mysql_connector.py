@@ -11,11 +11,25 @@ import pymysql
 import pymysql.cursors
 import pymysql.err
 
-from .base import BaseConnector, ConnectorError
+from .base import (
+    CONNECT_TIMEOUT,
+    QUERY_TIMEOUT,
+    BaseConnector,
+    CatalogQuery,
+    ConnectorError,
+    parse_version,
+)
 
 logger = logging.getLogger(__name__)
 
 # SQL (agent/db-connection.md)
+#
+# MySQL 8.0+: information_schema가 data dictionary 뷰이므로 columns/tables 조인을
+#             한 번에 처리하는 편이 가장 빠르다. (performance_schema에는 컬럼
+#             카탈로그가 없어 대상이 아님)
+# MySQL 5.x / MariaDB: information_schema 테이블이 임시 테이블로 materialize된 뒤
+#             인덱스 없이 조인되므로, 컬럼과 테이블 코멘트를 따로 조회해
+#             Python에서 합친다 (information_schema_split).
 
 _SQL_COLUMNS = """
 SELECT
@@ -40,15 +54,40 @@ WHERE c.table_schema = %s
 ORDER BY c.table_name, c.ordinal_position
 """
 
+_SQL_COLUMNS_SPLIT = """
+SELECT
+    c.table_schema  AS schema_name,
+    c.table_name    AS table_name,
+    c.ordinal_position AS col_no,
+    c.column_name   AS column_name,
+    c.column_type   AS data_type,
+    CASE WHEN c.is_nullable = 'NO' THEN 'N' ELSE 'Y' END AS nullable_yn,
+    c.column_key    AS key_type,
+    CASE WHEN c.column_key = 'PRI' THEN 'Y' ELSE 'N' END AS pk_yn,
+    c.column_default  AS default_value,
+    c.extra           AS extra_info,
+    c.column_comment  AS column_comment
+FROM information_schema.columns c
+WHERE c.table_schema = %s
+ORDER BY c.table_name, c.ordinal_position
+"""
+
+_SQL_TABLE_COMMENTS = """
+SELECT table_name AS table_name, table_comment AS table_comment
+FROM information_schema.tables
+WHERE table_schema = %s
+  AND table_type   = 'BASE TABLE'
+"""
+
 _SQL_FKS = """
 SELECT
-    k.table_name,
-    k.column_name,
-    k.constraint_name,
-    k.referenced_table_name,
-    k.referenced_column_name,
-    rc.update_rule,
-    rc.delete_rule
+    k.table_name             AS table_name,
+    k.column_name            AS column_name,
+    k.constraint_name        AS constraint_name,
+    k.referenced_table_name  AS referenced_table_name,
+    k.referenced_column_name AS referenced_column_name,
+    rc.update_rule           AS update_rule,
+    rc.delete_rule           AS delete_rule
 FROM information_schema.key_column_usage k
 LEFT JOIN information_schema.referential_constraints rc
   ON  rc.constraint_schema = k.table_schema
@@ -58,6 +97,51 @@ WHERE k.table_schema           = %s
 ORDER BY k.table_name, k.ordinal_position
 """
 
+# table_rows/data_length: InnoDB 통계 기반 근사값 (COUNT(*) 없음)
+_SQL_STATS = """
+SELECT
+    table_name   AS table_name,
+    table_rows   AS row_count,
+    data_length  AS data_bytes,
+    index_length AS index_bytes
+FROM information_schema.tables
+WHERE table_schema = %s
+  AND table_type   = 'BASE TABLE'
+"""
+
+# 인덱스 키 컬럼 (MySQL 8.0.13+ 함수 인덱스는 column_name이 NULL)
+_SQL_INDEXES = """
+SELECT
+    table_name   AS table_name,
+    index_name   AS index_name,
+    index_type   AS index_type,
+    CASE WHEN non_unique = 0 THEN 'Y' ELSE 'N' END AS is_unique,
+    CASE WHEN index_name = 'PRIMARY' THEN 'Y' ELSE 'N' END AS is_primary,
+    seq_in_index AS col_no,
+    column_name  AS column_name
+FROM information_schema.statistics
+WHERE table_schema = %s
+ORDER BY table_name, index_name, seq_in_index
+"""
+
+# 테이블 범위 배치 경계용 (뷰 포함: 범위 양 끝은 열려 있으므로 상위 집합이면 충분)
+_SQL_TABLES = """
+SELECT table_name AS table_name
+FROM information_schema.tables
+WHERE table_schema = %s
+ORDER BY table_name
+"""
+
+_CATALOG_QUERIES = (
+    CatalogQuery('columns', 'information_schema_dd',    _SQL_COLUMNS, min_version=(8, 0),
+                 range_column='c.table_name'),
+    CatalogQuery('columns', 'information_schema_split', _SQL_COLUMNS_SPLIT, range_column='c.table_name'),
+    CatalogQuery('tables',  'information_schema',       _SQL_TABLES),
+    CatalogQuery('fks',     'information_schema',       _SQL_FKS),
+    CatalogQuery('stats',   'information_schema',       _SQL_STATS),
+    CatalogQuery('indexes', 'information_schema',       _SQL_INDEXES),
+)
+
 # pymysql OperationalError 코드 -> 사용자 메시지 매핑
 _MYSQL_ERROR_MAP: dict[int, tuple[str, str]] = {
     1045: ('인증 실패: 사용자명 또는 비밀번호를 확인해주세요.', 'AUTH_FAILED'),
@@ -65,12 +149,18 @@ _MYSQL_ERROR_MAP: dict[int, tuple[str, str]] = {
     1049: ('DB가 존재하지 않습니다.', 'CONNECTION_REFUSED'),
     2003: ('연결 실패: 호스트 또는 포트를 확인해주세요.', 'CONNECTION_REFUSED'),
     2005: ('알 수 없는 호스트입니다.', 'CONNECTION_REFUSED'),
+    2006: ('서버 연결이 끊어졌습니다.', 'CONNECTION_REFUSED'),
     2013: ('연결이 끊어졌습니다.', 'CONNECTION_REFUSED'),
 }
 
+# 쿼리 도중 연결이 끊긴 경우 (재연결 후 재시도 대상)
+_MYSQL_TRANSIENT_CODES = {2006, 2013}
+
 
 class MySQLConnector(BaseConnector):
 
+    catalog_queries = _CATALOG_QUERIES
+
     def __init__(
         self,
         host:     str,
@@ -78,7 +168,10 @@ class MySQLConnector(BaseConnector):
         database: str,
         username: str,
         password: str,           # 로그에 미노출
+        connect_timeout: int = CONNECT_TIMEOUT,
+        query_timeout:   int = QUERY_TIMEOUT,
     ) -> None:
+        super().__init__()
         self._database = database
         # password는 _cfg 내부에만 보관
         self._cfg: dict[str, Any] = {
@@ -88,7 +181,9 @@ class MySQLConnector(BaseConnector):
             'user':            username,
             'password':        password,
             'charset':         'utf8mb4',
-            'connect_timeout': 5,
+            'connect_timeout': connect_timeout,
+            'read_timeout':    query_timeout,
+            'write_timeout':   query_timeout,
             'cursorclass':     pymysql.cursors.DictCursor,
         }
 
@@ -136,12 +231,51 @@ class MySQLConnector(BaseConnector):
         except ConnectorError as e:
             return {'success': False, 'message': e.message, 'error_code': e.error_code}
 
-    def extract_columns_raw(self, conn: Any, schema: str) -> list[dict]:
+    def server_version(self, conn: Any) -> tuple[int, ...]:
+        # MariaDB 10.x는 MySQL 8 data dictionary가 없으므로 5.7 계열로 취급
+        if self._server_version is None:
+            version = self.get_db_version(conn)
+            self._server_version = (5, 7) if 'mariadb' in version.lower() else parse_version(version)
+        return self._server_version
+
+    def transient_error(self, exc: BaseException) -> ConnectorError | None:
+        if isinstance(exc, pymysql.err.OperationalError) and exc.args:
+            code = exc.args[0]
+            if code in _MYSQL_TRANSIENT_CODES:
+                return ConnectorError(*_MYSQL_ERROR_MAP[code])
+        return None
+
+    def _fetch(self, conn: Any, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
         with conn.cursor() as cur:
-            cur.execute(_SQL_COLUMNS, (schema,))
-            return cur.fetchall()   # list[dict] via DictCursor
+            cur.execute(sql, (schema, *params))
+            return list(cur.fetchall())   # list[dict] via DictCursor
+
+    def _run_query(
+        self,
+        conn: Any,
+        query: CatalogQuery,
+        schema: str,
+        table_range: tuple[str | None, str | None] | None = None,
+    ) -> list[dict]:
+        rows = super()._run_query(conn, query, schema, table_range)
+        if query.variant != 'information_schema_split':
+            return rows
+        # BASE TABLE만 남기고 테이블 코멘트 병합 (범위 배치면 같은 범위만)
+        sql, params = _SQL_TABLE_COMMENTS, ()
+        if table_range is not None:
+            sql, params = self._range_sql(sql, 'table_name', *table_range)
+        comments = {
+            r['table_name']: r['table_comment']
+            for r in self._fetch(conn, sql, schema, params)
+        }
+        return [
+            {**r, 'table_comment': comments[r['table_name']]}
+            for r in rows
+            if r['table_name'] in comments
+        ]
+
+    def extract_columns_raw(self, conn: Any, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'columns', schema)
 
     def extract_fks_raw(self, conn: Any, schema: str) -> list[dict]:
-        with conn.cursor() as cur:
-            cur.execute(_SQL_FKS, (schema,))
-            return cur.fetchall()
+        return self.run_catalog_query(conn, 'fks', schema)
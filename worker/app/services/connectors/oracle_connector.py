@@ -6,10 +6,178 @@ from typing import Any, Generator
 
 import oracledb
 
-from .base import BaseConnector, ConnectorError
+from .base import (
+    CONNECT_TIMEOUT,
+    QUERY_TIMEOUT,
+    BaseConnector,
+    CatalogQuery,
+    ConnectorError,
+    parse_version,
+)
+
+# all_* 뷰는 행마다 접근 권한을 검사하므로 조회 가능한 스키마가 많을수록 느리다.
+# SELECT ANY DICTIONARY / SELECT_CATALOG_ROLE 이 있으면 dba_* 뷰를 사용한다.
+_COLUMNS_TEMPLATE = """
+SELECT
+    c.owner AS schema_name,
+    c.table_name AS table_name,
+    tc.comments AS table_comment,
+    c.column_id AS col_no,
+    c.column_name AS column_name,
+    c.data_type ||
+      CASE
+        WHEN c.data_type IN ('VARCHAR2', 'CHAR') THEN '(' || c.data_length || ')'
+        WHEN c.data_type IN ('NUMBER') AND c.data_precision IS NOT NULL THEN '(' || c.data_precision || ',' || c.data_scale || ')'
+        ELSE ''
+      END AS data_type,
+    CASE WHEN c.nullable = 'N' THEN 'N' ELSE 'Y' END AS nullable_yn,
+    '' AS key_type,
+    'N' AS pk_yn,
+    c.data_default AS default_value,
+    '' AS extra_info,
+    cc.comments AS column_comment
+FROM {prefix}_tab_columns c
+LEFT JOIN {prefix}_tab_comments tc
+  ON tc.owner = :schema AND tc.table_name = c.table_name
+LEFT JOIN {prefix}_col_comments cc
+  ON cc.owner = :schema AND cc.table_name = c.table_name AND cc.column_name = c.column_name
+WHERE c.owner = :schema
+ORDER BY c.table_name, c.column_id
+"""
+
+_FKS_TEMPLATE = """
+SELECT
+    a.table_name AS table_name,
+    a.column_name AS column_name,
+    a.constraint_name AS constraint_name,
+    c_pk.table_name AS referenced_table_name,
+    b.column_name AS referenced_column_name,
+    'NO ACTION' AS update_rule,
+    'NO ACTION' AS delete_rule
+FROM {prefix}_cons_columns a
+JOIN {prefix}_constraints c
+  ON a.owner = c.owner AND a.constraint_name = c.constraint_name
+JOIN {prefix}_constraints c_pk
+  ON c.r_owner = c_pk.owner AND c.r_constraint_name = c_pk.constraint_name
+JOIN {prefix}_cons_columns b
+  ON b.owner = c_pk.owner AND b.constraint_name = c_pk.constraint_name AND b.position = a.position
+WHERE c.constraint_type = 'R'
+  AND a.owner = :schema
+  AND c.owner = :schema
+ORDER BY a.table_name, a.position
+"""
+
+_DBA_PROBE = 'SELECT 1 FROM dba_tab_columns WHERE ROWNUM = 1'
+
+# num_rows: 마지막 통계 수집(DBMS_STATS) 기준 근사값. 세그먼트 크기는 dba_segments 필요.
+_SQL_STATS_SEGMENTS = """
+SELECT
+    t.table_name AS table_name,
+    t.num_rows AS row_count,
+    ts.bytes AS data_bytes,
+    ix.bytes AS index_bytes
+FROM dba_tables t
+LEFT JOIN (
+    SELECT segment_name, SUM(bytes) AS bytes
+    FROM dba_segments
+    WHERE owner = :schema
+      AND segment_type LIKE 'TABLE%'
+    GROUP BY segment_name
+) ts
+  ON ts.segment_name = t.table_name
+LEFT JOIN (
+    SELECT i.table_name, SUM(s.bytes) AS bytes
+    FROM dba_indexes i
+    JOIN dba_segments s
+      ON s.owner = i.owner AND s.segment_name = i.index_name
+    WHERE i.table_owner = :schema
+      AND s.segment_type LIKE 'INDEX%'
+    GROUP BY i.table_name
+) ix
+  ON ix.table_name = t.table_name
+WHERE t.owner = :schema
+"""
+
+# 세그먼트 조회 권한이 없으면 num_rows * avg_row_len 으로 데이터 크기 근사
+_SQL_STATS_ALL_TABLES = """
+SELECT
+    table_name AS table_name,
+    num_rows AS row_count,
+    num_rows * avg_row_len AS data_bytes,
+    NULL AS index_bytes
+FROM all_tables
+WHERE owner = :schema
+"""
+
+# 함수 기반 인덱스 항목은 숨은 가상 컬럼명(SYS_NC...$)으로 나온다. LOB 인덱스 제외.
+_INDEXES_TEMPLATE = """
+SELECT
+    i.table_name AS table_name,
+    i.index_name AS index_name,
+    i.index_type AS index_type,
+    CASE WHEN i.uniqueness = 'UNIQUE' THEN 'Y' ELSE 'N' END AS is_unique,
+    CASE WHEN pk.constraint_name IS NOT NULL THEN 'Y' ELSE 'N' END AS is_primary,
+    ic.column_position AS col_no,
+    ic.column_name AS column_name
+FROM {prefix}_indexes i
+JOIN {prefix}_ind_columns ic
+  ON ic.index_owner = i.owner AND ic.index_name = i.index_name
+LEFT JOIN {prefix}_constraints pk
+  ON pk.owner = i.table_owner AND pk.table_name = i.table_name
+ AND pk.constraint_type = 'P' AND pk.index_name = i.index_name
+WHERE i.table_owner = :schema
+  AND i.index_type <> 'LOB'
+ORDER BY i.table_name, i.index_name, ic.column_position
+"""
+
+# 테이블 범위 배치 경계용
+_SQL_TABLES = """
+SELECT table_name AS table_name
+FROM all_tables
+WHERE owner = :schema
+ORDER BY table_name
+"""
+
+_CATALOG_QUERIES = (
+    CatalogQuery('columns', 'dba_views', _COLUMNS_TEMPLATE.format(prefix='dba'), probe_sql=_DBA_PROBE,
+                 range_column='c.table_name'),
+    CatalogQuery('columns', 'all_views', _COLUMNS_TEMPLATE.format(prefix='all'), range_column='c.table_name'),
+    CatalogQuery('tables',  'all_tables', _SQL_TABLES),
+    CatalogQuery('fks',     'dba_views', _FKS_TEMPLATE.format(prefix='dba'), probe_sql=_DBA_PROBE),
+    CatalogQuery('fks',     'all_views', _FKS_TEMPLATE.format(prefix='all')),
+    CatalogQuery('stats',   'dba_segments', _SQL_STATS_SEGMENTS,
+                 probe_sql='SELECT 1 FROM dba_segments WHERE ROWNUM = 1'),
+    CatalogQuery('stats',   'all_tables',   _SQL_STATS_ALL_TABLES),
+    CatalogQuery('indexes', 'dba_views', _INDEXES_TEMPLATE.format(prefix='dba'), probe_sql=_DBA_PROBE),
+    CatalogQuery('indexes', 'all_views', _INDEXES_TEMPLATE.format(prefix='all')),
+)
+
+# oracledb 에러 코드 (ORA-/DPY-) -> 사용자 메시지 매핑
+_ORACLE_ERROR_MAP: dict[str, tuple[str, str]] = {
+    'ORA-01017': ('인증 실패: 사용자명 또는 비밀번호를 확인해주세요.', 'AUTH_FAILED'),
+    'ORA-01045': ('권한 부족: CREATE SESSION 권한이 없습니다.', 'PERMISSION_DENIED'),
+    'ORA-12514': ('서비스명을 찾을 수 없습니다.', 'CONNECTION_REFUSED'),
+    'ORA-12505': ('SID를 찾을 수 없습니다.', 'CONNECTION_REFUSED'),
+    'ORA-12170': ('연결 시간이 초과되었습니다.', 'TIMEOUT'),
+    'DPY-6005':  ('연결 실패: 호스트 또는 포트를 확인해주세요.', 'CONNECTION_REFUSED'),
+    'DPY-4024':  ('쿼리 시간이 초과되었습니다.', 'TIMEOUT'),
+}
+
+# 쿼리 도중 연결이 끊긴 경우 (재연결 후 재시도 대상)
+_ORACLE_TRANSIENT_CODES = {
+    'ORA-03113',   # end-of-file on communication channel
+    'ORA-03114',   # not connected to ORACLE
+    'ORA-03135',   # connection lost contact
+    'DPY-1001',    # not connected to database
+    'DPY-4011',    # the database or network closed the connection
+}
 
 
 class OracleConnector(BaseConnector):
+
+    catalog_queries = _CATALOG_QUERIES
+    range_marker = ':b{i}'
+
     def __init__(
         self,
         host: str,
@@ -18,7 +186,10 @@ class OracleConnector(BaseConnector):
         sid: str | None,
         username: str,
         password: str,
+        connect_timeout: int = CONNECT_TIMEOUT,
+        query_timeout: int = QUERY_TIMEOUT,
     ) -> None:
+        super().__init__()
         if service_name:
             dsn = oracledb.makedsn(host, port, service_name=service_name)
         else:
@@ -27,13 +198,15 @@ class OracleConnector(BaseConnector):
             'user': username,
             'password': password,
             'dsn': dsn,
+            'tcp_connect_timeout': connect_timeout,
         }
+        self._query_timeout_ms = query_timeout * 1000
 
     @contextmanager
     def connection(self) -> Generator[Any, None, None]:
         conn = None
         try:
-            conn = oracledb.connect(**self._cfg)
+            conn = self._connect()
             yield conn
         finally:
             if conn:
@@ -42,6 +215,21 @@ class OracleConnector(BaseConnector):
                 except Exception:
                     pass
 
+    def _connect(self) -> Any:
+        try:
+            conn = oracledb.connect(**self._cfg)
+        except oracledb.Error as e:
+            code = getattr(e.args[0], 'full_code', '') if e.args else ''
+            msg, err_code = _ORACLE_ERROR_MAP.get(
+                code,
+                (f'DB 연결 오류 (code={code or "?"})', 'CONNECTION_REFUSED'),
+            )
+            raise ConnectorError(msg, err_code) from e
+        except Exception as e:
+            raise ConnectorError(f'연결 중 오류: {e}', 'UNKNOWN') from e
+        conn.call_timeout = self._query_timeout_ms
+        return conn
+
     def get_db_version(self, conn: Any) -> str:
         cur = conn.cursor()
         cur.execute("SELECT banner FROM v$version WHERE banner LIKE 'Oracle%'")
@@ -53,70 +241,35 @@ class OracleConnector(BaseConnector):
             with self.connection() as conn:
                 version = self.get_db_version(conn)
             return {'success': True, 'message': '연결 성공', 'db_version': version}
+        except ConnectorError as e:
+            return {'success': False, 'message': e.message, 'error_code': e.error_code}
         except Exception as e:
             return {'success': False, 'message': f'연결 실패: {e}', 'error_code': 'CONNECTION_REFUSED'}
 
-    def extract_columns_raw(self, conn: Any, schema: str) -> list[dict]:
-        sql = """
-        SELECT
-            c.owner AS schema_name,
-            c.table_name AS table_name,
-            tc.comments AS table_comment,
-            c.column_id AS col_no,
-            c.column_name AS column_name,
-            c.data_type ||
-              CASE
-                WHEN c.data_type IN ('VARCHAR2', 'CHAR') THEN '(' || c.data_length || ')'
-                WHEN c.data_type IN ('NUMBER') AND c.data_precision IS NOT NULL THEN '(' || c.data_precision || ',' || c.data_scale || ')'
-                ELSE ''
-              END AS data_type,
-            CASE WHEN c.nullable = 'N' THEN 'N' ELSE 'Y' END AS nullable_yn,
-            '' AS key_type,
-            'N' AS pk_yn,
-            c.data_default AS default_value,
-            '' AS extra_info,
-            cc.comments AS column_comment
-        FROM all_tab_columns c
-        LEFT JOIN all_tab_comments tc
-          ON tc.owner = c.owner AND tc.table_name = c.table_name
-        LEFT JOIN all_col_comments cc
-          ON cc.owner = c.owner AND cc.table_name = c.table_name AND cc.column_name = c.column_name
-        WHERE c.owner = :schema
-        ORDER BY c.table_name, c.column_id
-        """
+    def server_version(self, conn: Any) -> tuple[int, ...]:
+        if self._server_version is None:
+            version = getattr(conn, 'version', None) or self.get_db_version(conn)
+            self._server_version = parse_version(version)
+        return self._server_version
+
+    def transient_error(self, exc: BaseException) -> ConnectorError | None:
+        if isinstance(exc, oracledb.Error) and exc.args:
+            code = getattr(exc.args[0], 'full_code', '')
+            if code in _ORACLE_TRANSIENT_CODES:
+                return ConnectorError(f'연결이 끊어졌습니다. ({code})', 'CONNECTION_REFUSED')
+        return None
+
+    def _fetch(self, conn: Any, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
         cur = conn.cursor()
-        cur.execute(sql, schema=schema.upper())
+        cur.execute(sql, schema=schema.upper(), **{f'b{i}': v for i, v in enumerate(params)})
         cols = [d[0].lower() for d in cur.description]
         rows = []
         for r in cur.fetchall():
             rows.append({cols[i]: r[i] for i in range(len(cols))})
         return rows
 
+    def extract_columns_raw(self, conn: Any, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'columns', schema)
+
     def extract_fks_raw(self, conn: Any, schema: str) -> list[dict]:
-        sql = """
-        SELECT
-            a.table_name AS table_name,
-            a.column_name AS column_name,
-            a.constraint_name AS constraint_name,
-            c_pk.table_name AS referenced_table_name,
-            b.column_name AS referenced_column_name,
-            'NO ACTION' AS update_rule,
-            'NO ACTION' AS delete_rule
-        FROM all_cons_columns a
-        JOIN all_constraints c
-          ON a.owner = c.owner AND a.constraint_name = c.constraint_name
-        JOIN all_constraints c_pk
-          ON c.r_owner = c_pk.owner AND c.r_constraint_name = c_pk.constraint_name
-        JOIN all_cons_columns b
-          ON b.owner = c_pk.owner AND b.constraint_name = c_pk.constraint_name AND b.position = a.position
-        WHERE c.constraint_type = 'R'
-          AND a.owner = :schema
-        ORDER BY a.table_name, a.position
-        """
-        cur = conn.cursor()
-        cur.execute(sql, schema=schema.upper())
-        cols = [d[0].lower() for d in cur.description]
-        rows = []
-        for r in cur.fetchall():
-            rows.append({cols[i]: r[i] for i in range(len(cols))})
-        return rows
+        return self.run_catalog_query(conn, 'fks', schema)
@@ -0,0 +1,308 @@
+﻿"""
+PostgreSQL 커넥터 (psycopg 3 기반)
+
+pg_catalog에서 스키마 단위 set-based 쿼리로 컬럼 · PK · 코멘트 · FK를 한 번에 가져온다.
+(obj_description()/col_description() 같은 행별 함수 호출 대신 pg_description 조인)
+
+대형 스키마는 서버 사이드(named) 커서로 PG_FETCH_SIZE 행씩 나눠 받는다.
+"""
+import os
+from contextlib import contextmanager
+from typing import Any, Generator
+
+import psycopg
+from psycopg.rows import dict_row
+
+from .base import (
+    CONNECT_TIMEOUT,
+    QUERY_TIMEOUT,
+    BaseConnector,
+    CatalogQuery,
+    ConnectorError,
+)
+
+PG_FETCH_SIZE = int(os.getenv('PG_FETCH_SIZE', '5000'))
+
+# PostgreSQL 10+: 파티션 자식 테이블 제외, identity 컬럼 표시
+_SQL_COLUMNS = """
+SELECT
+    n.nspname AS schema_name,
+    c.relname AS table_name,
+    COALESCE(td.description, '') AS table_comment,
+    a.attnum AS col_no,
+    a.attname AS column_name,
+    pg_catalog.format_type(a.atttypid, a.atttypmod) AS data_type,
+    CASE WHEN a.attnotnull THEN 'N' ELSE 'Y' END AS nullable_yn,
+    CASE WHEN pk.conrelid IS NOT NULL THEN 'PRI' ELSE '' END AS key_type,
+    CASE WHEN pk.conrelid IS NOT NULL THEN 'Y' ELSE 'N' END AS pk_yn,
+    pg_catalog.pg_get_expr(ad.adbin, ad.adrelid) AS default_value,
+    {extra} AS extra_info,
+    COALESCE(cd.description, '') AS column_comment
+FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n
+  ON n.oid = c.relnamespace
+JOIN pg_catalog.pg_attribute a
+  ON a.attrelid = c.oid
+ AND a.attnum > 0
+ AND NOT a.attisdropped
+LEFT JOIN pg_catalog.pg_attrdef ad
+  ON ad.adrelid = c.oid
+ AND ad.adnum = a.attnum
+LEFT JOIN pg_catalog.pg_constraint pk
+  ON pk.conrelid = c.oid
+ AND pk.contype = 'p'
+ AND a.attnum = ANY (pk.conkey)
+LEFT JOIN pg_catalog.pg_description td
+  ON td.objoid = c.oid
+ AND td.classoid = 'pg_catalog.pg_class'::regclass
+ AND td.objsubid = 0
+LEFT JOIN pg_catalog.pg_description cd
+  ON cd.objoid = c.oid
+ AND cd.classoid = 'pg_catalog.pg_class'::regclass
+ AND cd.objsubid = a.attnum
+WHERE n.nspname = %s
+  AND c.relkind IN ({relkinds})
+  {partition_filter}
+ORDER BY c.relname, a.attnum
+"""
+
+_SQL_FKS = """
+SELECT
+    c.relname AS table_name,
+    a.attname AS column_name,
+    con.conname AS constraint_name,
+    rc.relname AS referenced_table_name,
+    ra.attname AS referenced_column_name,
+    CASE con.confupdtype
+      WHEN 'r' THEN 'RESTRICT' WHEN 'c' THEN 'CASCADE'
+      WHEN 'n' THEN 'SET NULL' WHEN 'd' THEN 'SET DEFAULT' ELSE 'NO ACTION'
+    END AS update_rule,
+    CASE con.confdeltype
+      WHEN 'r' THEN 'RESTRICT' WHEN 'c' THEN 'CASCADE'
+      WHEN 'n' THEN 'SET NULL' WHEN 'd' THEN 'SET DEFAULT' ELSE 'NO ACTION'
+    END AS delete_rule
+FROM pg_catalog.pg_constraint con
+JOIN pg_catalog.pg_namespace n
+  ON n.oid = con.connamespace
+JOIN pg_catalog.pg_class c
+  ON c.oid = con.conrelid
+JOIN pg_catalog.pg_class rc
+  ON rc.oid = con.confrelid
+CROSS JOIN LATERAL unnest(con.conkey, con.confkey) WITH ORDINALITY AS k(attnum, ref_attnum, ord)
+JOIN pg_catalog.pg_attribute a
+  ON a.attrelid = con.conrelid
+ AND a.attnum = k.attnum
+JOIN pg_catalog.pg_attribute ra
+  ON ra.attrelid = con.confrelid
+ AND ra.attnum = k.ref_attnum
+WHERE con.contype = 'f'
+  AND n.nspname = %s
+ORDER BY c.relname, k.ord
+"""
+
+# reltuples: VACUUM/ANALYZE 기준 근사값 (PostgreSQL 14+ 미수집 테이블은 -1 -> NULL)
+_SQL_STATS = """
+SELECT
+    c.relname AS table_name,
+    CASE WHEN c.reltuples < 0 THEN NULL ELSE c.reltuples::bigint END AS row_count,
+    pg_catalog.pg_table_size(c.oid) AS data_bytes,
+    pg_catalog.pg_indexes_size(c.oid) AS index_bytes
+FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n
+  ON n.oid = c.relnamespace
+WHERE n.nspname = %s
+  AND c.relkind IN ('r', 'p')
+"""
+
+# indkey 0 = 식 인덱스 항목 (column_name NULL). 11+는 INCLUDE 컬럼을 제외(indnkeyatts).
+_SQL_INDEXES = """
+SELECT
+    c.relname AS table_name,
+    ic.relname AS index_name,
+    am.amname AS index_type,
+    CASE WHEN x.indisunique THEN 'Y' ELSE 'N' END AS is_unique,
+    CASE WHEN x.indisprimary THEN 'Y' ELSE 'N' END AS is_primary,
+    k.ord AS col_no,
+    a.attname AS column_name
+FROM pg_catalog.pg_index x
+JOIN pg_catalog.pg_class c
+  ON c.oid = x.indrelid
+JOIN pg_catalog.pg_namespace n
+  ON n.oid = c.relnamespace
+JOIN pg_catalog.pg_class ic
+  ON ic.oid = x.indexrelid
+JOIN pg_catalog.pg_am am
+  ON am.oid = ic.relam
+CROSS JOIN LATERAL unnest(x.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+LEFT JOIN pg_catalog.pg_attribute a
+  ON a.attrelid = x.indrelid
+ AND a.attnum = k.attnum
+WHERE n.nspname = %s
+  AND c.relkind IN ('r', 'p')
+  AND k.ord <= x.{key_count}
+ORDER BY c.relname, ic.relname, k.ord
+"""
+
+# 테이블 범위 배치 경계용
+_SQL_TABLES = """
+SELECT c.relname AS table_name
+FROM pg_catalog.pg_class c
+JOIN pg_catalog.pg_namespace n
+  ON n.oid = c.relnamespace
+WHERE n.nspname = %s
+  AND c.relkind IN ('r', 'p')
+ORDER BY c.relname
+"""
+
+_CATALOG_QUERIES = (
+    CatalogQuery(
+        'columns', 'pg_catalog_10',
+        _SQL_COLUMNS.format(
+            extra="CASE WHEN a.attidentity <> '' THEN 'identity' ELSE '' END",
+            relkinds="'r', 'p'",
+            partition_filter='AND NOT c.relispartition',
+        ),
+        min_version=(10, 0),
+        range_column='c.relname',
+    ),
+    CatalogQuery(
+        'columns', 'pg_catalog',
+        _SQL_COLUMNS.format(extra="''", relkinds="'r'", partition_filter=''),
+        range_column='c.relname',
+    ),
+    CatalogQuery('tables', 'pg_class', _SQL_TABLES),
+    CatalogQuery('fks', 'pg_catalog', _SQL_FKS, min_version=(9, 4)),
+    CatalogQuery('stats', 'pg_class', _SQL_STATS),
+    CatalogQuery('indexes', 'pg_index_11', _SQL_INDEXES.format(key_count='indnkeyatts'), min_version=(11, 0)),
+    CatalogQuery('indexes', 'pg_index', _SQL_INDEXES.format(key_count='indnatts'), min_version=(9, 4)),
+)
+
+# SQLSTATE -> 사용자 메시지 매핑
+_PG_ERROR_MAP: dict[str, tuple[str, str]] = {
+    '28P01': ('인증 실패: 사용자명 또는 비밀번호를 확인해주세요.', 'AUTH_FAILED'),
+    '28000': ('인증 실패: 접속이 허용되지 않은 사용자입니다.', 'AUTH_FAILED'),
+    '3D000': ('DB가 존재하지 않습니다.', 'CONNECTION_REFUSED'),
+    '42501': ('권한 부족: 해당 DB 접근 권한이 없습니다.', 'PERMISSION_DENIED'),
+    '57014': ('쿼리 시간이 초과되었습니다.', 'TIMEOUT'),
+}
+
+# 쿼리 도중 연결이 끊긴 경우 (재연결 후 재시도 대상): 08xxx connection exception,
+# 관리자/장애 종료 57P01~57P03, sqlstate 없는 OperationalError(소켓 끊김)
+_PG_TRANSIENT_SQLSTATES = {'57P01', '57P02', '57P03'}
+
+
+class PostgresConnector(BaseConnector):
+
+    catalog_queries = _CATALOG_QUERIES
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        database: str,
+        username: str,
+        password: str,
+        connect_timeout: int = CONNECT_TIMEOUT,
+        query_timeout: int = QUERY_TIMEOUT,
+        server_side_cursor: bool = True,
+    ) -> None:
+        super().__init__()
+        self._cfg: dict[str, Any] = {
+            'host': host,
+            'port': port,
+            'dbname': database,
+            'user': username,
+            'password': password,
+            'connect_timeout': connect_timeout,
+            'options': f'-c statement_timeout={query_timeout * 1000}',
+            'application_name': 'erdai-worker',
+        }
+        self._database = database
+        self._server_side_cursor = server_side_cursor
+
+    @contextmanager
+    def connection(self) -> Generator[Any, None, None]:
+        conn = None
+        try:
+            conn = self._connect()
+            yield conn
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _connect(self) -> Any:
+        try:
+            conn = psycopg.connect(**self._cfg)
+        except psycopg.Error as e:
+            sqlstate = getattr(e, 'sqlstate', None) or ''
+            if sqlstate in _PG_ERROR_MAP:
+                msg, err_code = _PG_ERROR_MAP[sqlstate]
+            elif 'timeout' in str(e).lower():
+                msg, err_code = '연결 시간이 초과되었습니다.', 'TIMEOUT'
+            else:
+                msg, err_code = '연결 실패: 호스트 또는 포트를 확인해주세요.', 'CONNECTION_REFUSED'
+            raise ConnectorError(msg, err_code) from e
+        except Exception as e:
+            raise ConnectorError(f'연결 중 오류: {e}', 'UNKNOWN') from e
+        conn.read_only = True
+        return conn
+
+    def get_db_version(self, conn: Any) -> str:
+        cur = conn.cursor()
+        cur.execute('SHOW server_version')
+        row = cur.fetchone()
+        return f"PostgreSQL {row[0]}" if row else 'PostgreSQL'
+
+    def server_version(self, conn: Any) -> tuple[int, ...]:
+        if self._server_version is None:
+            # server_version_num: 160002 -> (16, 2), 90624 -> (9, 6, 24)
+            num = conn.info.server_version
+            major = num // 10000
+            if major >= 10:
+                self._server_version = (major, num % 10000)
+            else:
+                self._server_version = (major, num // 100 % 100, num % 100)
+        return self._server_version
+
+    def test(self) -> dict:
+        try:
+            with self.connection() as conn:
+                version = self.get_db_version(conn)
+            return {'success': True, 'message': '연결 성공', 'db_version': version}
+        except ConnectorError as e:
+            return {'success': False, 'message': e.message, 'error_code': e.error_code}
+        except Exception as e:
+            return {'success': False, 'message': f'연결 실패: {e}', 'error_code': 'CONNECTION_REFUSED'}
+
+    def transient_error(self, exc: BaseException) -> ConnectorError | None:
+        if isinstance(exc, psycopg.OperationalError):
+            sqlstate = getattr(exc, 'sqlstate', None) or ''
+            if not sqlstate or sqlstate.startswith('08') or sqlstate in _PG_TRANSIENT_SQLSTATES:
+                return ConnectorError('연결이 끊어졌습니다.', 'CONNECTION_REFUSED')
+        return None
+
+    def _fetch(self, conn: Any, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
+        if not self._server_side_cursor:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(sql, (schema, *params))
+                return cur.fetchall()
+
+        # named cursor: 결과를 서버에 두고 PG_FETCH_SIZE 행씩 가져온다
+        rows: list[dict] = []
+        with conn.cursor(name='erdai_catalog', row_factory=dict_row) as cur:
+            cur.execute(sql, (schema, *params))
+            while True:
+                batch = cur.fetchmany(PG_FETCH_SIZE)
+                if not batch:
+                    break
+                rows.extend(batch)
+        return rows
+
+    def extract_columns_raw(self, conn: Any, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'columns', schema)
+
+    def extract_fks_raw(self, conn: Any, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'fks', schema)
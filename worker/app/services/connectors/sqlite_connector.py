@@ -0,0 +1,233 @@
+﻿"""
+SQLite 커넥터 (표준 라이브러리 sqlite3, 네트워크 없음)
+
+로컬 .sqlite/.db 파일을 읽기 전용(mode=ro)으로 열어 메타데이터를 추출한다.
+SQLite 3.16+는 테이블 값 PRAGMA 함수(pragma_table_info 등)를 sqlite_master와
+조인해 스키마 전체를 쿼리 1건으로 가져오고, 그 이전 버전은 테이블별 PRAGMA로 대체한다.
+
+SQLite에는 테이블/컬럼 코멘트가 없으므로 코멘트는 빈 문자열.
+"""
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Generator
+
+from .base import (
+    QUERY_TIMEOUT,
+    BaseConnector,
+    CatalogQuery,
+    ConnectorError,
+)
+
+_SQL_TABLES = """
+SELECT name
+FROM sqlite_master
+WHERE type = 'table'
+  AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+ORDER BY name
+"""
+
+# schema(?)는 결과 라벨로만 사용 (SQLite 파일 = 스키마 1개)
+_SQL_COLUMNS = """
+SELECT
+    ? AS schema_name,
+    m.name AS table_name,
+    '' AS table_comment,
+    p.cid + 1 AS col_no,
+    p.name AS column_name,
+    p.type AS data_type,
+    CASE WHEN p."notnull" OR p.pk > 0 THEN 'N' ELSE 'Y' END AS nullable_yn,
+    CASE WHEN p.pk > 0 THEN 'PRI' ELSE '' END AS key_type,
+    CASE WHEN p.pk > 0 THEN 'Y' ELSE 'N' END AS pk_yn,
+    p.dflt_value AS default_value,
+    '' AS extra_info,
+    '' AS column_comment
+FROM sqlite_master m
+JOIN pragma_table_info(m.name) p
+WHERE m.type = 'table'
+  AND m.name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+ORDER BY m.name, p.cid
+"""
+
+# "to"가 NULL이면 참조 테이블 PK(seq 순서)를 참조
+_SQL_FKS = """
+SELECT
+    m.name AS table_name,
+    f."from" AS column_name,
+    'fk_' || m.name || '_' || f.id AS constraint_name,
+    f."table" AS referenced_table_name,
+    COALESCE(
+        f."to",
+        (SELECT rp.name FROM pragma_table_info(f."table") rp WHERE rp.pk = f.seq + 1)
+    ) AS referenced_column_name,
+    f.on_update AS update_rule,
+    f.on_delete AS delete_rule
+FROM sqlite_master m
+JOIN pragma_foreign_key_list(m.name) f
+WHERE m.type = 'table'
+ORDER BY m.name, f.id, f.seq
+"""
+
+# INTEGER PRIMARY KEY(rowid 별칭)는 별도 인덱스가 없어 목록에 나오지 않는다.
+_SQL_INDEXES = """
+SELECT
+    m.name AS table_name,
+    il.name AS index_name,
+    'BTREE' AS index_type,
+    CASE WHEN il."unique" THEN 'Y' ELSE 'N' END AS is_unique,
+    CASE WHEN il.origin = 'pk' THEN 'Y' ELSE 'N' END AS is_primary,
+    ii.seqno + 1 AS col_no,
+    ii.name AS column_name
+FROM sqlite_master m
+JOIN pragma_index_list(m.name) il
+JOIN pragma_index_info(il.name) ii
+WHERE m.type = 'table'
+  AND m.name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+ORDER BY m.name, il.name, ii.seqno
+"""
+
+_CATALOG_QUERIES = (
+    CatalogQuery('columns', 'pragma_functions', _SQL_COLUMNS, min_version=(3, 16)),
+    CatalogQuery('columns', 'pragma_per_table', 'PRAGMA table_info'),
+    CatalogQuery('fks', 'pragma_functions', _SQL_FKS, min_version=(3, 16)),
+    CatalogQuery('fks', 'pragma_per_table', 'PRAGMA foreign_key_list'),
+    CatalogQuery('indexes', 'pragma_functions', _SQL_INDEXES, min_version=(3, 16)),
+)
+
+
+class SQLiteConnector(BaseConnector):
+
+    catalog_queries = _CATALOG_QUERIES
+
+    def __init__(self, path: str, query_timeout: int = QUERY_TIMEOUT) -> None:
+        super().__init__()
+        self._path = Path(path)
+        self._query_timeout = query_timeout
+
+    @contextmanager
+    def connection(self) -> Generator[Any, None, None]:
+        conn = None
+        try:
+            conn = self._connect()
+            yield conn
+        finally:
+            if conn:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._path.is_file():
+            raise ConnectorError(f'파일이 존재하지 않습니다: {self._path.name}', 'CONNECTION_REFUSED')
+        try:
+            conn = sqlite3.connect(
+                f'{self._path.resolve().as_uri()}?mode=ro',
+                uri=True,
+                timeout=self._query_timeout,
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            # 헤더 검증: SQLite 파일이 아니면 여기서 DatabaseError
+            conn.execute('SELECT count(*) FROM sqlite_master').fetchone()
+            return conn
+        except sqlite3.DatabaseError as e:
+            raise ConnectorError(f'SQLite 파일을 열 수 없습니다: {e}', 'CONNECTION_REFUSED') from e
+
+    def get_db_version(self, conn: Any) -> str:
+        row = conn.execute('SELECT sqlite_version()').fetchone()
+        return f'SQLite {row[0]}'
+
+    def test(self) -> dict:
+        try:
+            with self.connection() as conn:
+                version = self.get_db_version(conn)
+            return {'success': True, 'message': '연결 성공', 'db_version': version}
+        except ConnectorError as e:
+            return {'success': False, 'message': e.message, 'error_code': e.error_code}
+        except Exception as e:
+            return {'success': False, 'message': f'연결 실패: {e}', 'error_code': 'UNKNOWN'}
+
+    def _fetch(self, conn: Any, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
+        binds = (schema, *params) if '?' in sql else params
+        return [dict(r) for r in conn.execute(sql, binds).fetchall()]
+
+    def _run_query(
+        self,
+        conn: Any,
+        query: CatalogQuery,
+        schema: str,
+        table_range: tuple[str | None, str | None] | None = None,
+    ) -> list[dict]:
+        if query.variant != 'pragma_per_table':
+            return super()._run_query(conn, query, schema, table_range)
+
+        # SQLite < 3.16: 테이블별 PRAGMA (식별자 바인딩 불가 -> 따옴표 escape)
+        tables = [r['name'] for r in conn.execute(_SQL_TABLES).fetchall()]
+        if query.kind == 'columns':
+            return [
+                row
+                for table in tables
+                for row in self._pragma_columns(conn, schema, table)
+            ]
+        pks = {
+            table: [
+                r['name']
+                for r in sorted(self._pragma(conn, 'table_info', table), key=lambda r: r['pk'])
+                if r['pk']
+            ]
+            for table in tables
+        }
+        return [
+            row
+            for table in tables
+            for row in self._pragma_fks(conn, table, pks)
+        ]
+
+    @staticmethod
+    def _pragma(conn: Any, pragma: str, table: str) -> list[sqlite3.Row]:
+        quoted = '"' + table.replace('"', '""') + '"'
+        return conn.execute(f'PRAGMA {pragma}({quoted})').fetchall()
+
+    def _pragma_columns(self, conn: Any, schema: str, table: str) -> list[dict]:
+        return [
+            {
+                'schema_name':    schema,
+                'table_name':     table,
+                'table_comment':  '',
+                'col_no':         r['cid'] + 1,
+                'column_name':    r['name'],
+                'data_type':      r['type'],
+                'nullable_yn':    'N' if r['notnull'] or r['pk'] else 'Y',
+                'key_type':       'PRI' if r['pk'] else '',
+                'pk_yn':          'Y' if r['pk'] else 'N',
+                'default_value':  r['dflt_value'],
+                'extra_info':     '',
+                'column_comment': '',
+            }
+            for r in self._pragma(conn, 'table_info', table)
+        ]
+
+    def _pragma_fks(self, conn: Any, table: str, pks: dict[str, list[str]]) -> list[dict]:
+        rows = []
+        for r in self._pragma(conn, 'foreign_key_list', table):
+            ref_col = r['to']
+            if ref_col is None:
+                ref_pks = pks.get(r['table'], [])
+                ref_col = ref_pks[r['seq']] if r['seq'] < len(ref_pks) else None
+            rows.append({
+                'table_name':             table,
+                'column_name':            r['from'],
+                'constraint_name':        f"fk_{table}_{r['id']}",
+                'referenced_table_name':  r['table'],
+                'referenced_column_name': ref_col,
+                'update_rule':            r['on_update'],
+                'delete_rule':            r['on_delete'],
+            })
+        return rows
+
+    def extract_columns_raw(self, conn: Any, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'columns', schema)
+
+    def extract_fks_raw(self, conn: Any, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'fks', schema)
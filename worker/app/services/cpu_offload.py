@@ -0,0 +1,84 @@
+﻿"""
+CPU 바운드 단계(관계 추론 · export · ERD 빌드) 프로세스 풀 오프로드
+
+큰 스키마에서 순수 Python 연산이 GIL을 오래 점유하면 같은 워커의 다른 요청이
+느려진다. 테이블 수가 CPU_OFFLOAD_MIN_TABLES 이상이면 테이블 shard 단위로
+프로세스 풀에 분산 실행한다.
+
+- shard는 Pydantic 트리 대신 tuple 기반 compact 형태로 전달한다.
+- 호출 스레드는 future 대기 중 GIL을 놓으므로 이벤트 루프/I/O 엔드포인트는 응답 유지.
+- fork 대신 spawn을 기본으로 사용 (스레드풀이 떠 있는 프로세스에서 fork는 위험).
+
+환경 변수:
+  CPU_OFFLOAD_MIN_TABLES   오프로드 시작 테이블 수 (기본 2000, 0 이하면 비활성)
+  CPU_OFFLOAD_WORKERS      프로세스 수 (기본 os.cpu_count())
+  CPU_OFFLOAD_START_METHOD multiprocessing start method (기본 spawn)
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Sequence
+
+logger = logging.getLogger(__name__)
+
+CPU_OFFLOAD_MIN_TABLES = int(os.getenv('CPU_OFFLOAD_MIN_TABLES', '2000'))
+CPU_OFFLOAD_WORKERS    = int(os.getenv('CPU_OFFLOAD_WORKERS', '0')) or (os.cpu_count() or 1)
+CPU_OFFLOAD_START_METHOD = os.getenv('CPU_OFFLOAD_START_METHOD', 'spawn')
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def should_offload(table_count: int) -> bool:
+    """스키마 크기 기준 오프로드 여부"""
+    if CPU_OFFLOAD_MIN_TABLES <= 0 or CPU_OFFLOAD_WORKERS <= 1:
+        return False
+    return table_count >= CPU_OFFLOAD_MIN_TABLES
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """프로세스 풀 (최초 사용 시 생성)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            logger.info(
+                'cpu offload pool start: workers=%d method=%s',
+                CPU_OFFLOAD_WORKERS, CPU_OFFLOAD_START_METHOD,
+            )
+            _pool = ProcessPoolExecutor(
+                max_workers=CPU_OFFLOAD_WORKERS,
+                mp_context=multiprocessing.get_context(CPU_OFFLOAD_START_METHOD),
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def split_shards(items: Sequence[Any], n: int | None = None) -> list[tuple[int, Sequence[Any]]]:
+    """
+    items를 연속 구간 n개로 분할한다.
+    반환: [(시작 인덱스, 구간), ...] — 시작 인덱스로 원래 순서를 복원할 수 있다.
+    """
+    n = max(1, min(n or CPU_OFFLOAD_WORKERS, len(items)))
+    size = -(-len(items) // n) if items else 0
+    return [(i, items[i:i + size]) for i in range(0, len(items), size)] if size else []
+
+
+def run_sharded(fn: Callable[..., Any], common: Any, shards: list[Any]) -> list[Any]:
+    """
+    fn(common, shard)를 shard별로 프로세스 풀에서 실행하고 shard 순서대로 결과 반환.
+    fn은 모듈 최상위 함수여야 한다 (pickle 가능).
+    """
+    if not shards:
+        return []
+    pool = get_pool()
+    futures = [pool.submit(fn, common, shard) for shard in shards]
+    return [f.result() for f in futures]
@@ -0,0 +1,327 @@
+﻿"""
+도메인 클러스터링 (테이블명 prefix + 관계 연결성)
+
+테이블명 첫 1~2개 '_' 구간만 보는 prefix 분류는 prefix 관례가 없는 스키마
+(customer, orders, order_item ...)나 모든 테이블이 tb_로 시작하는 스키마에서
+전체가 도메인 하나(또는 ETC)로 뭉친다. 여기서는 관계 그래프에서 커뮤니티를 찾아
+도메인을 나누고, 의미 있는 prefix는 같은 그래프의 신호로 함께 넣는다.
+
+그래프 (무방향, 가중치, 희소 인접 dict):
+  - 관계 간선: 실제 FK + DOMAIN_MIN_CONFIDENCE 이상 추론 관계
+  - prefix 간선: prefix마다 가상 허브 노드 1개 + 구성 테이블 간선 (clique 대신 star, O(V))
+    관례 prefix(tb_, v_ ...)는 떼고 보며, 2개 미만인 prefix는 넣지 않는다.
+    관계 간선이 있을 때 큰 스키마의 거의 전부(90% 이상)를 덮는 prefix도 구분 정보가 없어
+    빼고 관계로 나눈다. 관계가 없으면 prefix를 그대로 두어 prefix 도메인이 된다.
+커뮤니티: Louvain (modularity 지역 이동 + 커뮤니티 축약 반복). 지역 이동 1회가 O(E)이고
+  단계마다 그래프가 줄어 전체가 거의 선형이다. 순회 순서를 고정해 결과는 결정적이다.
+이름: 구성 테이블의 과반 prefix, 없으면 연결이 가장 많은 테이블명 (중복 시 _2, _3 ...)
+      관계도 prefix도 없는 단독 테이블은 ETC.
+
+결과는 클러스터링 입력(테이블명, FK, 관계) 해시로 캐시한다. 도메인 값 자체는 키에
+들어가지 않으므로 도메인을 채운 메타데이터로 다시 렌더링해도 캐시를 그대로 쓴다.
+
+환경 변수:
+  DOMAIN_MIN_CONFIDENCE      클러스터링에 쓰는 추론 관계 최소 신뢰도 (기본 MEDIUM)
+  DOMAIN_CLUSTER_RESOLUTION  modularity 해상도, 클수록 도메인이 잘게 나뉜다 (기본 1.0)
+  DOMAIN_CACHE_SIZE          캐시할 스키마 수 (기본 128, 0이면 비활성)
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Sequence
+
+from app.models.erd import InferredRelation
+from app.models.metadata import SchemaMetadata
+from app.services.name_matching import to_snake
+
+DOMAIN_MIN_CONFIDENCE     = os.getenv('DOMAIN_MIN_CONFIDENCE', 'MEDIUM').upper()
+DOMAIN_CLUSTER_RESOLUTION = float(os.getenv('DOMAIN_CLUSTER_RESOLUTION', '1.0'))
+DOMAIN_CACHE_SIZE         = int(os.getenv('DOMAIN_CACHE_SIZE', '128'))
+
+_CONFIDENCE_RANK = {'FK': 3, 'HIGH': 2, 'MEDIUM': 1, 'LOW': 0}
+_RELATION_WEIGHT = {'FK': 1.0, 'HIGH': 1.0, 'MEDIUM': 0.5, 'LOW': 0.25}
+_PREFIX_WEIGHT   = 2.0      # 허브 간선: 관계 1~2개로는 prefix 그룹에서 떨어지지 않는다
+
+# 도메인이 아니라 객체 종류/관례를 나타내는 prefix
+_CONVENTION_PREFIXES = {'tb', 'tbl', 't', 'v', 'vw', 'tmp', 'bak'}
+
+# 이 크기 이상 스키마에서 테이블의 _DOMINANT_SHARE 이상을 덮는 prefix는 구분 정보가 없다
+_DOMINANT_MIN_TABLES = 20
+_DOMINANT_SHARE      = 0.9
+
+_MAX_PASSES = 10            # 단계별 지역 이동 최대 반복
+
+
+def prefix_domain(table_name: str) -> str:
+    """
+    테이블명 prefix(첫 번째 '_' 기준)를 대문자로 변환해 도메인 분류.
+    예: r_indicatorinfo -> R, st_tr_sales -> ST_TR
+    """
+    parts = table_name.lower().split('_')
+    # 복합 prefix (st_tr_ 등) 처리
+    if len(parts) >= 3 and len(parts[0]) <= 4 and len(parts[1]) <= 4:
+        return f'{parts[0]}_{parts[1]}'.upper()
+    if len(parts) >= 2:
+        return parts[0].upper()
+    return 'ETC'
+
+
+def _tokens(table_name: str) -> list[str]:
+    """관례 prefix를 뗀 snake_case 토큰 (tb_cust_order -> [cust, order])"""
+    tokens = [t for t in to_snake(table_name).split('_') if t]
+    while len(tokens) > 1 and tokens[0] in _CONVENTION_PREFIXES:
+        tokens = tokens[1:]
+    return tokens
+
+
+def _name_prefix(table_name: str) -> str | None:
+    tokens = _tokens(table_name)
+    if len(tokens) < 2:
+        return None
+    return prefix_domain('_'.join(tokens))
+
+
+@dataclass
+class DomainClusters:
+    domains:    dict[str, str]                # 테이블명 -> 도메인
+    groups:     list[tuple[str, list[str]]]   # (도메인, 테이블명 목록) 큰 순, ETC는 마지막
+    modularity: float
+
+
+def _local_move(
+    adj: list[dict[int, float]], loops: list[float], comm: list[int], resolution: float,
+) -> bool:
+    """modularity가 오르는 이웃 커뮤니티로 노드를 옮긴다. 한 번이라도 옮겼으면 True."""
+    n = len(adj)
+    degree = [sum(adj[i].values()) + loops[i] for i in range(n)]
+    m2 = sum(degree)
+    if m2 == 0:
+        return False
+    total = [0.0] * n
+    for i in range(n):
+        total[comm[i]] += degree[i]
+
+    moved_any = False
+    for _ in range(_MAX_PASSES):
+        moved = 0
+        for i in range(n):
+            k = degree[i]
+            if k == 0:
+                continue
+            own = comm[i]
+            links: dict[int, float] = {}
+            for j, w in adj[i].items():
+                c = comm[j]
+                links[c] = links.get(c, 0.0) + w
+            total[own] -= k
+            scale = resolution * k / m2
+            best, best_gain = own, links.get(own, 0.0) - total[own] * scale
+            for c, w in links.items():
+                gain = w - total[c] * scale
+                if gain > best_gain + 1e-12:
+                    best, best_gain = c, gain
+            total[best] += k
+            if best != own:
+                comm[i] = best
+                moved += 1
+        if not moved:
+            break
+        moved_any = True
+    return moved_any
+
+
+def _louvain(adj: list[dict[int, float]], resolution: float) -> list[int]:
+    """노드 -> 커뮤니티 번호 (0부터 연속)"""
+    n = len(adj)
+    membership = list(range(n))
+    loops = [0.0] * n
+    while True:
+        comm = list(range(len(adj)))
+        if not _local_move(adj, loops, comm, resolution):
+            break
+        # 커뮤니티를 노드 하나로 축약 (내부 간선은 self-loop 가중치로)
+        renumber: dict[int, int] = {}
+        for c in comm:
+            renumber.setdefault(c, len(renumber))
+        size = len(renumber)
+        new_adj: list[dict[int, float]] = [{} for _ in range(size)]
+        new_loops = [0.0] * size
+        for i, neighbors in enumerate(adj):
+            ci = renumber[comm[i]]
+            new_loops[ci] += loops[i]
+            for j, w in neighbors.items():
+                cj = renumber[comm[j]]
+                if ci == cj:
+                    new_loops[ci] += w
+                else:
+                    new_adj[ci][cj] = new_adj[ci].get(cj, 0.0) + w
+        membership = [renumber[comm[c]] for c in membership]
+        if size == len(adj):
+            break
+        adj, loops = new_adj, new_loops
+    return membership
+
+
+def _modularity(adj: list[dict[int, float]], membership: list[int], resolution: float) -> float:
+    degree = [sum(neighbors.values()) for neighbors in adj]
+    m2 = sum(degree)
+    if m2 == 0:
+        return 0.0
+    internal: dict[int, float] = {}
+    total: dict[int, float] = {}
+    for i, neighbors in enumerate(adj):
+        c = membership[i]
+        total[c] = total.get(c, 0.0) + degree[i]
+        internal[c] = internal.get(c, 0.0) + sum(w for j, w in neighbors.items() if membership[j] == c)
+    return sum(internal[c] / m2 - resolution * (total[c] / m2) ** 2 for c in total)
+
+
+def _cluster(
+    names: list[str],
+    edges: dict[tuple[int, int], float],
+    resolution: float,
+) -> DomainClusters:
+    n = len(names)
+
+    # prefix 허브 (구분 정보가 있는 prefix만)
+    prefixes = [_name_prefix(name) for name in names]
+    counts: dict[str, int] = {}
+    for p in prefixes:
+        if p is not None:
+            counts[p] = counts.get(p, 0) + 1
+    # 거의 모든 테이블을 덮는 prefix는 관계로 나눌 수 있을 때만 뺀다
+    split_dominant = bool(edges) and n >= _DOMINANT_MIN_TABLES
+    informative = {
+        p for p, count in counts.items()
+        if count >= 2 and not (split_dominant and count >= n * _DOMINANT_SHARE)
+    }
+    hubs = {p: n + i for i, p in enumerate(sorted(informative))}
+
+    adj: list[dict[int, float]] = [{} for _ in range(n + len(hubs))]
+    for (s, t), w in edges.items():
+        adj[s][t] = adj[s].get(t, 0.0) + w
+        adj[t][s] = adj[t].get(s, 0.0) + w
+    for i, p in enumerate(prefixes):
+        if p in hubs:
+            adj[i][hubs[p]] = _PREFIX_WEIGHT
+            adj[hubs[p]][i] = _PREFIX_WEIGHT
+
+    membership = _louvain(adj, resolution)
+    modularity = _modularity(adj, membership, resolution)
+
+    members: dict[int, list[int]] = {}
+    for i in range(n):
+        members.setdefault(membership[i], []).append(i)
+    # 도메인 이름은 큰 커뮤니티부터 정한다 (중복 접미사가 작은 쪽에 붙도록)
+    ordered = sorted(members.values(), key=lambda m: (-len(m), names[m[0]].lower()))
+
+    domains: dict[str, str] = {}
+    groups: list[tuple[str, list[str]]] = []
+    used: set[str] = set()
+    etc: list[str] = []
+    for group in ordered:
+        if len(group) == 1 and not adj[group[0]]:
+            etc.append(names[group[0]])
+            continue
+        group_prefixes: dict[str, int] = {}
+        for i in group:
+            if prefixes[i] in informative:
+                group_prefixes[prefixes[i]] = group_prefixes.get(prefixes[i], 0) + 1
+        top = max(sorted(group_prefixes), key=group_prefixes.__getitem__, default=None)
+        if top is not None and group_prefixes[top] * 2 >= len(group):
+            label = top
+        else:
+            # 커뮤니티 안에서 가중 연결이 가장 많은 테이블 이름
+            in_group = set(group)
+            hub = max(group, key=lambda i: (
+                sum(w for j, w in adj[i].items() if j in in_group), -i,
+            ))
+            label = '_'.join(_tokens(names[hub])).upper() or names[hub].upper()
+        base, suffix = label, 2
+        while label in used or label == 'ETC':
+            label = f'{base}_{suffix}'
+            suffix += 1
+        used.add(label)
+        tables = sorted((names[i] for i in group), key=str.lower)
+        groups.append((label, tables))
+        for name in tables:
+            domains[name] = label
+    if etc:
+        groups.append(('ETC', sorted(etc, key=str.lower)))
+        for name in etc:
+            domains[name] = 'ETC'
+    return DomainClusters(domains=domains, groups=groups, modularity=round(modularity, 4))
+
+
+def _graph_inputs(
+    metadata: SchemaMetadata,
+    relations: Sequence[InferredRelation],
+    min_confidence: str,
+) -> tuple[list[str], dict[tuple[int, int], float]]:
+    """(테이블명, 무방향 간선 (작은 idx, 큰 idx) -> 가중치). self-loop와 스키마 밖 테이블은 제외."""
+    names = [t.name for t in metadata.tables]
+    index = {name.lower(): i for i, name in reversed(list(enumerate(names)))}
+    threshold = _CONFIDENCE_RANK.get(min_confidence, 1)
+
+    # 같은 테이블 쌍은 가장 강한 근거 하나만 센다 (FK와 추론 관계가 겹치는 경우)
+    edges: dict[tuple[int, int], float] = {}
+
+    def add(src: str, tgt: str, weight: float) -> None:
+        s, t = index.get(src.lower()), index.get(tgt.lower())
+        if s is None or t is None or s == t:
+            return
+        key = (s, t) if s < t else (t, s)
+        edges[key] = max(edges.get(key, 0.0), weight)
+
+    for table in metadata.tables:
+        for fk in table.fk_refs:
+            add(table.name, fk.ref_table, _RELATION_WEIGHT['FK'])
+    for r in relations:
+        if _CONFIDENCE_RANK.get(r.confidence, 0) >= threshold:
+            add(r.source_table, r.target_table, _RELATION_WEIGHT.get(r.confidence, 0.0))
+    return names, edges
+
+
+def _cache_key(
+    names: list[str], edges: dict[tuple[int, int], float], resolution: float,
+) -> str:
+    h = hashlib.sha256(repr(resolution).encode())
+    h.update('\x1e'.join(names).encode('utf-8'))
+    h.update(repr(sorted(edges.items())).encode())
+    return h.hexdigest()
+
+
+_cache: OrderedDict[str, DomainClusters] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def cluster_domains(
+    metadata: SchemaMetadata,
+    relations: Sequence[InferredRelation] = (),
+    min_confidence: str = DOMAIN_MIN_CONFIDENCE,
+) -> DomainClusters:
+    """테이블 -> 도메인 (FK + 추론 관계 + prefix). 같은 입력은 캐시된 결과를 돌려준다."""
+    names, edges = _graph_inputs(metadata, relations, min_confidence)
+    resolution = DOMAIN_CLUSTER_RESOLUTION
+    key = _cache_key(names, edges, resolution)
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            return hit
+
+    result = _cluster(names, edges, resolution)
+    if DOMAIN_CACHE_SIZE > 0:
+        with _cache_lock:
+            _cache[key] = result
+            while len(_cache) > DOMAIN_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return result
+
+
+def clear_cache() -> None:
+    """캐시 초기화 (테스트용)"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,72 @@
+﻿"""
+ERD 빌드 서비스 (agent/erd-engine.md 5단계)
+
+SchemaMetadata + 관계 목록 -> ErdGraph (+ graph_service 그래프 분석).
+테이블 도메인은 추론 관계까지 반영해 domain_service에서 다시 클러스터링한다 (입력 해시별 캐시).
+큰 스키마는 테이블 shard 단위로 프로세스 풀에서 컬럼 변환을 수행한다.
+"""
+from app.models.erd import ErdGraph, InferredRelation
+from app.models.metadata import SchemaMetadata, TableMeta
+from app.services.cpu_offload import run_sharded, should_offload, split_shards
+from app.services.domain_service import cluster_domains
+from app.services.graph_service import analyze_graph
+
+
+def _pack_tables(tables: list[TableMeta], domains: dict[str, str]) -> tuple:
+    """
+    ((name, comment, domain, ((col_name, data_type, nullable, is_pk, comment), ...),
+      (fk_column, ...), row_count, data_bytes), ...)
+    """
+    return tuple(
+        (
+            t.name,
+            t.comment or '',
+            domains.get(t.name) or t.domain or '',
+            tuple((c.name, c.data_type, c.nullable, c.is_pk, c.comment or '') for c in t.columns),
+            tuple(fk.column_name for fk in t.fk_refs),
+            t.row_count,
+            t.data_bytes,
+        )
+        for t in tables
+    )
+
+
+def _erd_tables(_: None, tables: tuple) -> list[dict]:
+    out = []
+    for name, comment, domain, columns, fk_columns, row_count, data_bytes in tables:
+        fk_cols = set(fk_columns)
+        out.append({
+            'name': name,
+            'comment': comment,
+            'domain': domain,
+            'columns': [
+                {
+                    'name': col_name,
+                    'data_type': data_type,
+                    'nullable': nullable,
+                    'is_pk': is_pk,
+                    'is_fk': col_name in fk_cols,
+                    'comment': col_comment,
+                }
+                for col_name, data_type, nullable, is_pk, col_comment in columns
+            ],
+            'row_count': row_count,
+            'data_bytes': data_bytes,
+        })
+    return out
+
+
+def build_erd_graph(metadata: SchemaMetadata, relations: list[InferredRelation]) -> ErdGraph:
+    domains = cluster_domains(metadata, relations).domains
+    if should_offload(len(metadata.tables)):
+        shards = [_pack_tables(chunk, domains) for _, chunk in split_shards(metadata.tables)]
+        tables = [t for part in run_sharded(_erd_tables, None, shards) for t in part]
+    else:
+        tables = _erd_tables(None, _pack_tables(metadata.tables, domains))
+
+    return ErdGraph(
+        tables=tables,
+        relations=relations,
+        extracted_at=metadata.extracted_at,
+        analysis=analyze_graph(metadata, relations),
+    )
@@ -1,35 +1,86 @@
-﻿from __future__ import annotations
+﻿"""
+스키마 export (DBML / Mermaid / PlantUML / GraphViz DOT / CREATE TABLE DDL / JSON-LD)
 
-from app.models.metadata import SchemaMetadata
+메타데이터는 한 번만 순회한다. 테이블마다 요청된 모든 writer에 같은 compact tuple을
+넘기고(fan-out), 관계 목록도 한 번 돌며 각 writer의 관계 줄을 만든다.
+큰 스키마는 테이블 shard 단위로 프로세스 풀에서 모든 형식을 함께 렌더링한다.
+
+형식별 출력 = head + 테이블 블록 + 테이블 뒤 블록(DDL FK 제약) + 관계 줄 + foot
+
+DDL은 원본 DB 타입을 대상 DB 타입으로 옮긴다 (_convert_type, 모르는 타입은 그대로).
+기본값(default_value)은 DB별 식이라 옮기지 않는다.
+"""
+from __future__ import annotations
+
+import hashlib
+import html
+import io
+import json
+import re
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+from app.models.metadata import SchemaMetadata, TableMeta
 from app.models.erd import InferredRelation
+from app.services.cpu_offload import run_sharded, should_offload, split_shards
 
+# 형식 -> 묶음(zip) 안 파일명
+EXPORT_FILES = {
+    'dbml':       'schema.dbml',
+    'mermaid':    'schema.mmd',
+    'plantuml':   'schema.puml',
+    'dot':        'schema.dot',
+    'ddl_mysql':  'ddl/mysql.sql',
+    'ddl_mssql':  'ddl/mssql.sql',
+    'ddl_oracle': 'ddl/oracle.sql',
+    'jsonld':     'schema.jsonld',
+}
 
-def build_dbml(metadata: SchemaMetadata, relations: list[InferredRelation]) -> str:
-    lines: list[str] = []
-    for table in metadata.tables:
-        lines.append(f"Table {table.name} {{")
-        for col in table.columns:
-            attrs = []
-            if col.is_pk:
-                attrs.append('pk')
-            if not col.nullable:
-                attrs.append('not null')
-            if col.comment:
-                attrs.append(f"note: '{col.comment.replace("'", "")}'")
-            attr_str = f" [{', '.join(attrs)}]" if attrs else ''
-            lines.append(f"  {col.name} {col.data_type}{attr_str}")
-        lines.append('}')
-        lines.append('')
 
-    for rel in relations:
-        lines.append(
-            f"Ref: {rel.source_table}.{rel.source_column} > {rel.target_table}.{rel.target_column}"
+# ── compact 표현 ──────────────────────────────────────────────────────────────
+# ((table_name, table_comment,
+#   ((col_name, data_type, is_pk, nullable, comment), ...),
+#   (pk_column, ...),
+#   ((fk_col, constraint, ref_table, ref_col, update_rule, delete_rule), ...),
+#   ((src_col, target_table, target_col, confidence, reason), ...)),   # JSON-LD용 나가는 관계
+#  ...)
+
+def _pack_tables(
+    tables: list[TableMeta],
+    outgoing: dict[str, list[InferredRelation]] | None = None,
+) -> tuple:
+    return tuple(
+        (
+            t.name,
+            t.comment or '',
+            tuple((c.name, c.data_type, c.is_pk, c.nullable, c.comment or '') for c in t.columns),
+            tuple(t.pk_columns),
+            tuple(
+                (fk.column_name, fk.constraint_name, fk.ref_table, fk.ref_column, fk.update_rule, fk.delete_rule)
+                for fk in t.fk_refs
+            ),
+            tuple(
+                (r.source_column, r.target_table, r.target_column, r.confidence, r.reason or '')
+                for r in outgoing.get(t.name, ())
+            ) if outgoing else (),
         )
+        for t in tables
+    )
+
 
-    return '\n'.join(lines).strip() + '\n'
+def _constraints(fks: tuple) -> list[tuple[str, list[str], str, list[str], str, str]]:
+    """FK 컬럼 row -> 제약 단위 (이름, 컬럼, 참조 테이블, 참조 컬럼, update, delete)"""
+    grouped: dict[str, tuple] = {}
+    for fk_col, name, ref_table, ref_col, update_rule, delete_rule in fks:
+        entry = grouped.setdefault(name, (name, [], ref_table, [], update_rule, delete_rule))
+        entry[1].append(fk_col)
+        entry[3].append(ref_col)
+    return list(grouped.values())
 
 
-def _mermaid_cardinality(rel: InferredRelation) -> str:
+def _crow_foot(rel: InferredRelation) -> str:
+    """Mermaid / PlantUML 공통 crow's foot 표기"""
     if rel.cardinality == '1:1':
         return '||--||'
     if rel.cardinality == '1:N':
@@ -39,21 +90,604 @@ def _mermaid_cardinality(rel: InferredRelation) -> str:
     return '}o--o{'
 
 
-def build_mermaid(metadata: SchemaMetadata, relations: list[InferredRelation]) -> str:
-    lines: list[str] = ['erDiagram']
+# ── writer ────────────────────────────────────────────────────────────────────
+
+class _Writer(ABC):
+    """
+    형식 1개. table()은 shard 프로세스에서도 호출되므로 상태를 두지 않는다.
+    """
+    relation_title: tuple[str, ...] = ()
+
+    def head(self, metadata: SchemaMetadata) -> list[str]:
+        return []
+
+    @abstractmethod
+    def table(self, table: tuple) -> tuple[list[str], list[str]]:
+        """(테이블 블록, 모든 테이블 뒤에 둘 줄)"""
+        ...
+
+    def relation(self, rel: InferredRelation, fk_keys: set[tuple]) -> list[str]:
+        return []
+
+    def foot(self) -> list[str]:
+        return []
+
+    def assemble(self, head: list[str], body: list[str], tail: list[str], rels: list[str], foot: list[str]) -> str:
+        lines = head + body + tail
+        if rels:
+            lines.extend(self.relation_title)
+            lines.extend(rels)
+        lines.extend(foot)
+        return '\n'.join(lines).strip() + '\n'
+
+
+class _Dbml(_Writer):
+    def table(self, table: tuple) -> tuple[list[str], list[str]]:
+        name, _, columns, _, _, _ = table
+        lines = [f"Table {name} {{"]
+        for col_name, data_type, is_pk, nullable, comment in columns:
+            attrs = []
+            if is_pk:
+                attrs.append('pk')
+            if not nullable:
+                attrs.append('not null')
+            if comment:
+                attrs.append(f"note: '{comment.replace("'", "")}'")
+            attr_str = f" [{', '.join(attrs)}]" if attrs else ''
+            lines.append(f"  {col_name} {data_type}{attr_str}")
+        lines.append('}')
+        lines.append('')
+        return lines, []
 
-    for table in metadata.tables:
-        lines.append(f"  {table.name} {{")
-        for col in table.columns:
-            nullable = '' if col.nullable else ' not null'
-            lines.append(f"    {col.data_type} {col.name}{nullable}")
+    def relation(self, rel: InferredRelation, fk_keys: set[tuple]) -> list[str]:
+        return [f"Ref: {rel.source_table}.{rel.source_column} > {rel.target_table}.{rel.target_column}"]
+
+
+class _Mermaid(_Writer):
+    def head(self, metadata: SchemaMetadata) -> list[str]:
+        return ['erDiagram']
+
+    def table(self, table: tuple) -> tuple[list[str], list[str]]:
+        name, _, columns, _, _, _ = table
+        lines = [f"  {name} {{"]
+        for col_name, data_type, _, nullable, _ in columns:
+            not_null = '' if nullable else ' not null'
+            lines.append(f"    {data_type} {col_name}{not_null}")
         lines.append('  }')
+        return lines, []
+
+    def relation(self, rel: InferredRelation, fk_keys: set[tuple]) -> list[str]:
+        return [f"  {rel.source_table} {_crow_foot(rel)} {rel.target_table} : {rel.confidence}"]
+
+
+_PLAIN_ID_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+
+def _alias(name: str) -> str:
+    """PlantUML entity alias (식별자로 쓸 수 없는 이름은 이름 해시)"""
+    if _PLAIN_ID_RE.fullmatch(name):
+        return name
+    return 't_' + hashlib.md5(name.encode('utf-8')).hexdigest()[:10]
+
+
+class _PlantUml(_Writer):
+    def head(self, metadata: SchemaMetadata) -> list[str]:
+        return ['@startuml', 'hide circle', 'skinparam linetype ortho', '']
+
+    def table(self, table: tuple) -> tuple[list[str], list[str]]:
+        name, comment, columns, pks, _, _ = table
+        title = name.replace('"', "'")
+        if comment:
+            title += '\\n' + comment.replace('"', "'").replace('\n', ' ')
+        pk_set = set(pks)
+        lines = [f'entity "{title}" as {_alias(name)} {{']
+        key_cols = [c for c in columns if c[0] in pk_set or c[2]]
+        other_cols = [c for c in columns if not (c[0] in pk_set or c[2])]
+        for col_name, data_type, _, _, _ in key_cols:
+            lines.append(f"  * {col_name} : {data_type} <<PK>>")
+        if key_cols:
+            lines.append('  --')
+        for col_name, data_type, _, nullable, _ in other_cols:
+            lines.append(f"  {'' if nullable else '* '}{col_name} : {data_type}")
+        lines.append('}')
+        lines.append('')
+        return lines, []
+
+    def relation(self, rel: InferredRelation, fk_keys: set[tuple]) -> list[str]:
+        # 추론 관계는 점선
+        arrow = _crow_foot(rel) if rel.confidence == 'FK' else _crow_foot(rel).replace('--', '..')
+        return [f"{_alias(rel.source_table)} {arrow} {_alias(rel.target_table)} : {rel.confidence}"]
+
+    def foot(self) -> list[str]:
+        return ['', '@enduml']
+
+
+def _dot_id(value: str) -> str:
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class _Dot(_Writer):
+    def head(self, metadata: SchemaMetadata) -> list[str]:
+        return [
+            f"digraph {_dot_id(metadata.schema_name)} {{",
+            '  graph [rankdir=LR];',
+            '  node [shape=plaintext fontname="Helvetica" fontsize=10];',
+            '  edge [fontname="Helvetica" fontsize=9];',
+            '',
+        ]
+
+    def table(self, table: tuple) -> tuple[list[str], list[str]]:
+        name, comment, columns, pks, _, _ = table
+        pk_set = set(pks)
+        header = f"<B>{html.escape(name)}</B>"
+        if comment:
+            header += f"<BR/>{html.escape(comment)}"
+        rows = [f'<TR><TD BGCOLOR="lightgrey">{header}</TD></TR>']
+        for col_name, data_type, is_pk, _, _ in columns:
+            key = ' PK' if is_pk or col_name in pk_set else ''
+            rows.append(
+                f'<TR><TD PORT="{html.escape(col_name)}" ALIGN="LEFT">'
+                f'{html.escape(col_name)} : {html.escape(data_type)}{key}</TD></TR>'
+            )
+        label = '<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0">' + ''.join(rows) + '</TABLE>'
+        return [f"  {_dot_id(name)} [label=<{label}>];"], []
+
+    def relation(self, rel: InferredRelation, fk_keys: set[tuple]) -> list[str]:
+        style = '' if rel.confidence == 'FK' else ' style=dashed'
+        return [
+            f"  {_dot_id(rel.source_table)}:{_dot_id(rel.source_column)} -> "
+            f"{_dot_id(rel.target_table)}:{_dot_id(rel.target_column)} "
+            f"[label={_dot_id(rel.confidence)}{style}];"
+        ]
+
+    def foot(self) -> list[str]:
+        return ['}']
+
+
+# ── DDL 타입 변환 ─────────────────────────────────────────────────────────────
+
+_TYPE_RE = re.compile(r'([a-z][a-z0-9_ ]*?)\s*(?:\(([^()]*)\))?')
+
+# 정수 타입 -> 값 범위 등급
+_INT_CLASS = {
+    'tinyint': 'tinyint', 'smallint': 'smallint', 'int2': 'smallint', 'smallserial': 'smallint',
+    'mediumint': 'mediumint', 'int': 'int', 'integer': 'int', 'int4': 'int', 'serial': 'int',
+    'bigint': 'bigint', 'int8': 'bigint', 'bigserial': 'bigint',
+}
+# (등급, unsigned) -> (MySQL, MSSQL, Oracle): 원본 값 범위를 모두 담는 가장 작은 타입
+# (MySQL tinyint는 부호 있음, MSSQL TINYINT는 0~255)
+_INT_TARGETS = {
+    ('tinyint', False):   ('TINYINT', 'SMALLINT', 'NUMBER(3)'),
+    ('tinyint', True):    ('TINYINT UNSIGNED', 'TINYINT', 'NUMBER(3)'),
+    ('smallint', False):  ('SMALLINT', 'SMALLINT', 'NUMBER(5)'),
+    ('smallint', True):   ('SMALLINT UNSIGNED', 'INT', 'NUMBER(5)'),
+    ('mediumint', False): ('MEDIUMINT', 'INT', 'NUMBER(7)'),
+    ('mediumint', True):  ('MEDIUMINT UNSIGNED', 'INT', 'NUMBER(8)'),
+    ('int', False):       ('INT', 'INT', 'NUMBER(10)'),
+    ('int', True):        ('INT UNSIGNED', 'BIGINT', 'NUMBER(10)'),
+    ('bigint', False):    ('BIGINT', 'BIGINT', 'NUMBER(19)'),
+    ('bigint', True):     ('BIGINT UNSIGNED', 'DECIMAL(20)', 'NUMBER(20)'),
+}
+_DIALECT_COLUMN = {'ddl_mysql': 0, 'ddl_mssql': 1, 'ddl_oracle': 2}
+
+_FAMILIES = {
+    **{t: 'int' for t in _INT_CLASS},
+    'decimal': 'decimal', 'numeric': 'decimal', 'number': 'decimal', 'dec': 'decimal',
+    'money': 'money', 'smallmoney': 'money',
+    'double': 'double', 'double precision': 'double', 'float8': 'double', 'binary_double': 'double',
+    'float': 'double', 'real': 'real', 'float4': 'real', 'binary_float': 'real',
+    'char': 'char', 'character': 'char', 'nchar': 'char', 'bpchar': 'char',
+    'varchar': 'varchar', 'nvarchar': 'varchar', 'varchar2': 'varchar', 'nvarchar2': 'varchar',
+    'character varying': 'varchar', 'national character varying': 'varchar',
+    'text': 'text', 'tinytext': 'text', 'mediumtext': 'text', 'longtext': 'text', 'ntext': 'text',
+    'clob': 'text', 'nclob': 'text', 'long': 'text', 'citext': 'text',
+    'date': 'date',
+    'datetime': 'datetime', 'datetime2': 'datetime', 'smalldatetime': 'datetime', 'timestamp': 'datetime',
+    'timestamptz': 'timestamptz', 'datetimeoffset': 'timestamptz',
+    'time': 'time',
+    'boolean': 'bool', 'bool': 'bool', 'bit': 'bool',
+    'binary': 'binary', 'varbinary': 'binary', 'raw': 'binary', 'bytea': 'binary', 'image': 'binary',
+    'blob': 'binary', 'tinyblob': 'binary', 'mediumblob': 'binary', 'longblob': 'binary', 'long raw': 'binary',
+    'json': 'json', 'jsonb': 'json',
+    'uuid': 'uuid', 'uniqueidentifier': 'uuid',
+    'year': 'year',
+}
+# 가변 길이 상한 (초과 / MAX는 LOB 타입)
+_MAX_VARCHAR = {'ddl_mysql': 16383, 'ddl_mssql': 4000, 'ddl_oracle': 4000}
+_MAX_BINARY  = {'ddl_mysql': 65535, 'ddl_mssql': 8000, 'ddl_oracle': 2000}
+# DECIMAL / NUMBER 최대 자릿수
+_MAX_PRECISION = {'ddl_mysql': 65, 'ddl_mssql': 38, 'ddl_oracle': 38}
+# PK/FK 컬럼의 LOB 문자열 타입 대신 쓰는 길이 (LOB은 키/인덱스 불가)
+_KEY_VARCHAR = 255
+
+_ENUM_RE  = re.compile(r'(enum|set)\s*\((.*)\)', re.S)
+_ENUM_VAL = re.compile(r"'((?:[^'\\]|\\.|'')*)'")
 
+
+def _type_size(args: list[str], i: int = 0) -> int | None:
+    """'100' -> 100, 'max' / '-1' / '100 char' 앞 숫자 외 -> None"""
+    if len(args) <= i:
+        return None
+    m = re.match(r'\d+', args[i])
+    return int(m.group(0)) if m and int(m.group(0)) > 0 else None
+
+
+def _convert_type(data_type: str, dialect: str, key: bool = False) -> str:
+    """원본 DB 타입 문자열 -> 대상 DDL 타입 (모르는 타입은 원문 그대로). key: PK/FK 컬럼"""
+    t = ' '.join(data_type.lower().split())
+    m = _ENUM_RE.fullmatch(t)
+    if m is not None:
+        # MySQL enum/set: MySQL은 그대로, 다른 DB는 가장 긴 값(set은 전체 조합) 길이의 문자열
+        if dialect == 'ddl_mysql':
+            return data_type
+        values = [v.replace("''", "'") for v in _ENUM_VAL.findall(data_type)]
+        lengths = [len(v) for v in values]
+        size = (max(lengths) if m.group(1) == 'enum' else sum(lengths) + len(values) - 1) if values else 255
+        return _convert_type(f'varchar({max(size, 1)})', dialect, key)
+
+    unsigned = ' unsigned' in t
+    with_tz = 'with time zone' in t or 'with local time zone' in t
+    for word in (' unsigned', ' zerofill', ' with local time zone', ' with time zone', ' without time zone'):
+        t = t.replace(word, '')
+    m = _TYPE_RE.fullmatch(t.strip())
+    family = _FAMILIES.get(m.group(1)) if m else None
+    if family is None:
+        return data_type
+    base = m.group(1)
+    args = [a.strip() for a in m.group(2).split(',')] if m.group(2) else []
+
+    if family == 'decimal':
+        limit = _MAX_PRECISION[dialect]
+        # Oracle NUMBER(*,s): 최대 자릿수에 선언된 소수 자릿수
+        precision = limit if args and args[0] == '*' else _type_size(args)
+        scale = _type_size(args, 1) or 0
+        if precision is None:
+            return {'ddl_mysql': 'DECIMAL(38,10)', 'ddl_mssql': 'DECIMAL(38,10)', 'ddl_oracle': 'NUMBER'}[dialect]
+        if precision > limit:
+            # 자릿수를 줄일 때는 정수 자리보다 소수 자리를 먼저 줄인다
+            scale = min(scale, max(limit - (precision - scale), 0))
+            precision = limit
+        if dialect == 'ddl_oracle':
+            return f"NUMBER({precision})" if scale == 0 and base == 'number' else f"NUMBER({precision},{scale})"
+        # Oracle NUMBER(p,0)은 정수 컬럼: 9자리까지 INT, 18자리까지 BIGINT
+        if scale == 0 and base == 'number' and precision <= 18:
+            return 'INT' if precision <= 9 else 'BIGINT'
+        return f"DECIMAL({precision},{scale})"
+    if family == 'int':
+        # MSSQL 카탈로그의 int(10,0) 같은 (precision,scale)은 무시
+        return _INT_TARGETS[(_INT_CLASS[base], unsigned)][_DIALECT_COLUMN[dialect]]
+    if base == 'bit' and (_type_size(args) or 1) > 1:
+        # MySQL bit(n): 비트열 (boolean 아님)
+        bits = _type_size(args) or 1
+        return {'ddl_mysql': f'BIT({bits})', 'ddl_mssql': f'BINARY({(bits + 7) // 8})',
+                'ddl_oracle': f'RAW({(bits + 7) // 8})'}[dialect]
+
+    if family == 'money':
+        return 'NUMBER(19,4)' if dialect == 'ddl_oracle' else 'DECIMAL(19,4)'
+    if family in ('double', 'real'):
+        # MSSQL float(n): n <= 24는 단정도
+        single = family == 'real' or (base == 'float' and (_type_size(args) or 53) <= 24)
+        return {
+            'ddl_mysql': 'FLOAT' if single else 'DOUBLE',
+            'ddl_mssql': 'REAL' if single else 'FLOAT',
+            'ddl_oracle': 'BINARY_FLOAT' if single else 'BINARY_DOUBLE',
+        }[dialect]
+    if family in ('char', 'varchar'):
+        size = _type_size(args)
+        if family == 'char' and size is None:
+            size = 1
+        if family == 'varchar' and size is None and not args:
+            size = 255
+        if size is None or size > _MAX_VARCHAR[dialect]:
+            family = 'text'
+        elif dialect == 'ddl_mysql':
+            return f"{'CHAR' if family == 'char' else 'VARCHAR'}({size})"
+        elif dialect == 'ddl_mssql':
+            return f"{'NCHAR' if family == 'char' else 'NVARCHAR'}({size})"
+        else:
+            return f"{'CHAR' if family == 'char' else 'VARCHAR2'}({size} CHAR)"
+    if family == 'text':
+        if key:
+            return _convert_type(f'varchar({_KEY_VARCHAR})', dialect)
+        return {'ddl_mysql': 'LONGTEXT', 'ddl_mssql': 'NVARCHAR(MAX)', 'ddl_oracle': 'CLOB'}[dialect]
+    if family == 'binary':
+        size = _type_size(args) if base in ('binary', 'varbinary', 'raw') else None
+        if size is None or size > _MAX_BINARY[dialect]:
+            return {'ddl_mysql': 'LONGBLOB', 'ddl_mssql': 'VARBINARY(MAX)', 'ddl_oracle': 'BLOB'}[dialect]
+        return {'ddl_mysql': f'VARBINARY({size})', 'ddl_mssql': f'VARBINARY({size})', 'ddl_oracle': f'RAW({size})'}[dialect]
+    if family == 'datetime' and with_tz:
+        family = 'timestamptz'
+    return {
+        'date':        {'ddl_mysql': 'DATE', 'ddl_mssql': 'DATE', 'ddl_oracle': 'DATE'},
+        'datetime':    {'ddl_mysql': 'DATETIME', 'ddl_mssql': 'DATETIME2', 'ddl_oracle': 'TIMESTAMP'},
+        'timestamptz': {'ddl_mysql': 'DATETIME', 'ddl_mssql': 'DATETIMEOFFSET', 'ddl_oracle': 'TIMESTAMP WITH TIME ZONE'},
+        'time':        {'ddl_mysql': 'TIME', 'ddl_mssql': 'TIME', 'ddl_oracle': 'INTERVAL DAY(0) TO SECOND'},
+        'bool':        {'ddl_mysql': 'TINYINT(1)', 'ddl_mssql': 'BIT', 'ddl_oracle': 'NUMBER(1)'},
+        'json':        {'ddl_mysql': 'JSON', 'ddl_mssql': 'NVARCHAR(MAX)', 'ddl_oracle': 'CLOB'},
+        'uuid':        {'ddl_mysql': 'CHAR(36)', 'ddl_mssql': 'UNIQUEIDENTIFIER', 'ddl_oracle': 'RAW(16)'},
+        'year':        {'ddl_mysql': 'YEAR', 'ddl_mssql': 'SMALLINT', 'ddl_oracle': 'NUMBER(4)'},
+    }[family][dialect]
+
+
+# ── DDL writer ────────────────────────────────────────────────────────────────
+
+class _Ddl(_Writer):
+    relation_title = ('', '-- 추론 관계 (제약 미생성, 검토 후 적용)')
+
+    def __init__(self, dialect: str) -> None:
+        self.dialect = dialect
+
+    def quote(self, name: str) -> str:
+        if self.dialect == 'ddl_mysql':
+            return '`' + name.replace('`', '``') + '`'
+        if self.dialect == 'ddl_mssql':
+            return '[' + name.replace(']', ']]') + ']'
+        return '"' + name.replace('"', '""') + '"'
+
+    def literal(self, value: str) -> str:
+        if self.dialect == 'ddl_mysql':
+            return "'" + value.replace('\\', '\\\\').replace("'", "''") + "'"
+        prefix = 'N' if self.dialect == 'ddl_mssql' else ''
+        return prefix + "'" + value.replace("'", "''") + "'"
+
+    def cols(self, names: Iterable[str]) -> str:
+        return ', '.join(self.quote(n) for n in names)
+
+    def head(self, metadata: SchemaMetadata) -> list[str]:
+        return [f"-- schema: {metadata.schema_name} (extracted_at {metadata.extracted_at})", '']
+
+    def _mssql_comment(self, value: str, table: str, column: str | None = None) -> str:
+        target = f", N'TABLE', {self.literal(table)}"
+        if column is not None:
+            target += f", N'COLUMN', {self.literal(column)}"
+        return f"EXEC sp_addextendedproperty N'MS_Description', {self.literal(value)}, N'SCHEMA', N'dbo'{target};"
+
+    def table(self, table: tuple) -> tuple[list[str], list[str]]:
+        name, comment, columns, pks, fks, _ = table
+        q = self.quote
+        keys = {*pks, *(fk[0] for fk in fks)}
+        defs = []
+        for col_name, data_type, is_pk, nullable, col_comment in columns:
+            col_type = _convert_type(data_type, self.dialect, key=is_pk or col_name in keys)
+            line = f"  {q(col_name)} {col_type}"
+            if not nullable:
+                line += ' NOT NULL'
+            if col_comment and self.dialect == 'ddl_mysql':
+                line += f" COMMENT {self.literal(col_comment)}"
+            defs.append(line)
+        if pks:
+            if self.dialect == 'ddl_mysql':
+                defs.append(f"  PRIMARY KEY ({self.cols(pks)})")
+            else:
+                defs.append(f"  CONSTRAINT {q(f'pk_{name}')} PRIMARY KEY ({self.cols(pks)})")
+
+        lines = [f"CREATE TABLE {q(name)} ("]
+        lines.append(',\n'.join(defs))
+        if self.dialect == 'ddl_mysql' and comment:
+            lines.append(f") COMMENT={self.literal(comment)};")
+        else:
+            lines.append(');')
+
+        if self.dialect == 'ddl_oracle':
+            if comment:
+                lines.append(f"COMMENT ON TABLE {q(name)} IS {self.literal(comment)};")
+            for col_name, _, _, _, col_comment in columns:
+                if col_comment:
+                    lines.append(f"COMMENT ON COLUMN {q(name)}.{q(col_name)} IS {self.literal(col_comment)};")
+        elif self.dialect == 'ddl_mssql':
+            if comment:
+                lines.append(self._mssql_comment(comment, name))
+            for col_name, _, _, _, col_comment in columns:
+                if col_comment:
+                    lines.append(self._mssql_comment(col_comment, name, col_name))
+        lines.append('')
+
+        # FK 제약은 모든 테이블 생성 뒤 (선언 순서와 무관하게 참조 테이블이 존재)
+        tail = []
+        for fk_name, fk_cols, ref_table, ref_cols, update_rule, delete_rule in _constraints(fks):
+            stmt = (
+                f"ALTER TABLE {q(name)} ADD CONSTRAINT {q(fk_name)} FOREIGN KEY ({self.cols(fk_cols)}) "
+                f"REFERENCES {q(ref_table)} ({self.cols(ref_cols)})"
+            )
+            stmt += self._fk_actions(update_rule, delete_rule)
+            tail.append(stmt + ';')
+        return lines, tail
+
+    def _fk_actions(self, update_rule: str, delete_rule: str) -> str:
+        out = ''
+        rules = [('DELETE', delete_rule)]
+        if self.dialect != 'ddl_oracle':   # Oracle은 ON UPDATE 미지원
+            rules.append(('UPDATE', update_rule))
+        for event, rule in rules:
+            rule = (rule or '').upper()
+            if rule in ('CASCADE', 'SET NULL') or (rule == 'SET DEFAULT' and self.dialect != 'ddl_oracle'):
+                out += f" ON {event} {rule}"
+        return out
+
+    def relation(self, rel: InferredRelation, fk_keys: set[tuple]) -> list[str]:
+        if (rel.source_table, rel.source_column, rel.target_table, rel.target_column) in fk_keys:
+            return []
+        q = self.quote
+        return [
+            f"-- ALTER TABLE {q(rel.source_table)} ADD CONSTRAINT {q(f'fk_{rel.source_table}_{rel.source_column}')} "
+            f"FOREIGN KEY ({q(rel.source_column)}) REFERENCES {q(rel.target_table)} ({q(rel.target_column)});"
+            f"  -- {rel.confidence}"
+        ]
+
+
+class _JsonLd(_Writer):
+    """
+    W3C CSV on the Web(CSVW) 메타데이터 어휘의 JSON-LD.
+    테이블 1개 = tables 항목 1줄, 관계는 source 테이블의 foreignKeys (추론 관계는 rdfs:comment에 신뢰도).
+    """
+
+    def head(self, metadata: SchemaMetadata) -> list[str]:
+        return [
+            '{',
+            '  "@context": "http://www.w3.org/ns/csvw",',
+            f'  "dc:title": {json.dumps(metadata.schema_name, ensure_ascii=False)},',
+            f'  "dc:created": {json.dumps(metadata.extracted_at)},',
+            '  "tables": [',
+        ]
+
+    def table(self, table: tuple) -> tuple[list[str], list[str]]:
+        name, comment, columns, pks, fks, outgoing = table
+        columns_ld = []
+        for col_name, data_type, _, nullable, col_comment in columns:
+            col = {'name': col_name, 'datatype': {'base': 'string', 'dc:format': data_type}, 'required': not nullable}
+            if col_comment:
+                col['dc:description'] = col_comment
+            columns_ld.append(col)
+
+        foreign_keys = []
+        actual = set()
+        for _, fk_cols, ref_table, ref_cols, _, _ in _constraints(fks):
+            actual.update((c, ref_table, r) for c, r in zip(fk_cols, ref_cols))
+            foreign_keys.append({
+                'columnReference': fk_cols if len(fk_cols) > 1 else fk_cols[0],
+                'reference': {
+                    'resource': f"{ref_table}.csv",
+                    'columnReference': ref_cols if len(ref_cols) > 1 else ref_cols[0],
+                },
+            })
+        for src_col, target, target_col, confidence, reason in outgoing:
+            if (src_col, target, target_col) in actual:
+                continue
+            foreign_keys.append({
+                'columnReference': src_col,
+                'reference': {'resource': f"{target}.csv", 'columnReference': target_col},
+                'rdfs:comment': f"inferred {confidence}: {reason}",
+            })
+
+        schema: dict = {'columns': columns_ld}
+        if pks:
+            schema['primaryKey'] = list(pks) if len(pks) > 1 else pks[0]
+        if foreign_keys:
+            schema['foreignKeys'] = foreign_keys
+        entry: dict = {'url': f"{name}.csv", 'dc:title': name}
+        if comment:
+            entry['dc:description'] = comment
+        entry['tableSchema'] = schema
+        return ['    ' + json.dumps(entry, ensure_ascii=False)], []
+
+    def foot(self) -> list[str]:
+        return ['  ]', '}']
+
+    def assemble(self, head: list[str], body: list[str], tail: list[str], rels: list[str], foot: list[str]) -> str:
+        return '\n'.join(head + [',\n'.join(body)] + foot) + '\n'
+
+
+_WRITERS: dict[str, _Writer] = {
+    'dbml':       _Dbml(),
+    'mermaid':    _Mermaid(),
+    'plantuml':   _PlantUml(),
+    'dot':        _Dot(),
+    'ddl_mysql':  _Ddl('ddl_mysql'),
+    'ddl_mssql':  _Ddl('ddl_mssql'),
+    'ddl_oracle': _Ddl('ddl_oracle'),
+    'jsonld':     _JsonLd(),
+}
+
+
+# ── 단일 순회 렌더링 ───────────────────────────────────────────────────────────
+
+def _render_shard(formats: tuple[str, ...], tables: tuple) -> dict[str, tuple[list[str], list[str]]]:
+    """shard 테이블을 한 번 돌며 모든 형식의 (테이블 블록, 뒤 블록)을 만든다"""
+    writers = [(fmt, _WRITERS[fmt]) for fmt in formats]
+    out = {fmt: ([], []) for fmt in formats}
+    for table in tables:
+        for fmt, writer in writers:
+            body, tail = writer.table(table)
+            out[fmt][0].extend(body)
+            out[fmt][1].extend(tail)
+    return out
+
+
+def render_exports(
+    metadata: SchemaMetadata,
+    relations: list[InferredRelation],
+    formats: Iterable[str],
+) -> dict[str, str]:
+    """메타데이터/관계를 한 번씩만 순회해 요청 형식 전체를 만든다 (형식 -> 텍스트)"""
+    formats = tuple(dict.fromkeys(formats))
+    unknown = [f for f in formats if f not in _WRITERS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 export 형식: {', '.join(unknown)}")
+
+    outgoing: dict[str, list[InferredRelation]] | None = None
+    if 'jsonld' in formats:
+        outgoing = {}
+        for rel in relations:
+            outgoing.setdefault(rel.source_table, []).append(rel)
+
+    if should_offload(len(metadata.tables)):
+        shards = [_pack_tables(chunk, outgoing) for _, chunk in split_shards(metadata.tables)]
+        parts = run_sharded(_render_shard, formats, shards)
+    else:
+        parts = [_render_shard(formats, _pack_tables(metadata.tables, outgoing))]
+
+    fk_keys = {
+        (t.name, fk.column_name, fk.ref_table, fk.ref_column)
+        for t in metadata.tables for fk in t.fk_refs
+    } if any(f.startswith('ddl_') for f in formats) else set()
+    writers = [(fmt, _WRITERS[fmt]) for fmt in formats]
+    rel_lines: dict[str, list[str]] = {fmt: [] for fmt in formats}
     for rel in relations:
-        card = _mermaid_cardinality(rel)
-        label = rel.confidence
-        lines.append(
-            f"  {rel.source_table} {card} {rel.target_table} : {label}"
-        )
+        for fmt, writer in writers:
+            rel_lines[fmt].extend(writer.relation(rel, fk_keys))
+
+    out = {}
+    for fmt, writer in writers:
+        body = [line for part in parts for line in part[fmt][0]]
+        tail = [line for part in parts for line in part[fmt][1]]
+        out[fmt] = writer.assemble(writer.head(metadata), body, tail, rel_lines[fmt], writer.foot())
+    return out
+
+
+def build_dbml(metadata: SchemaMetadata, relations: list[InferredRelation]) -> str:
+    return render_exports(metadata, relations, ('dbml',))['dbml']
+
+
+def build_mermaid(metadata: SchemaMetadata, relations: list[InferredRelation]) -> str:
+    return render_exports(metadata, relations, ('mermaid',))['mermaid']
+
+
+# ── zip 묶음 ──────────────────────────────────────────────────────────────────
+
+class _ChunkSink(io.RawIOBase):
+    """zipfile 출력 버퍼 (seek 불가 스트림 -> 항목마다 data descriptor 사용)"""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
 
-    return '\n'.join(lines).strip() + '\n'
+def stream_export_bundle(
+    metadata: SchemaMetadata,
+    relations: list[InferredRelation],
+    formats: Iterable[str] = EXPORT_FILES,
+) -> Iterator[bytes]:
+    """
+    모든 형식을 한 번의 순회로 만든 뒤 zip 항목 단위로 압축하면서 내보낸다.
+    (전체 zip을 메모리에 모으지 않음)
+    """
+    rendered = render_exports(metadata, relations, formats)
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for fmt, text in rendered.items():
+            with zf.open(EXPORT_FILES[fmt], 'w') as entry:
+                entry.write(text.encode('utf-8'))
+            rendered[fmt] = ''
+            yield sink.drain()
+    yield sink.drain()
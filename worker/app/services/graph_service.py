@@ -0,0 +1,250 @@
+﻿"""
+관계 그래프 분석 서비스
+
+InferredRelation 목록을 테이블 정수 인덱스 기반 CSR(offsets/targets 배열)로 만들고
+O(V + E)로 그래프 수준 정보를 계산한다.
+
+- junction 테이블: 복합 PK 컬럼에서 서로 다른 테이블 2개 이상으로 N:1 관계
+                   (대상이 정확히 2개면 두 테이블 사이 N:M 관계를 만든다)
+- FK 순환:        크기 2 이상 강한 연결 요소(SCC)마다 대표 순환 경로 1개
+- 자기 참조:      self-loop 테이블
+- 고립 테이블:    들어오고 나가는 관계가 모두 없는 테이블
+- 클러스터:       크기 2 이상 SCC
+
+분석 대상 관계는 GRAPH_MIN_CONFIDENCE 이상 (기본 HIGH: FK + HIGH).
+PK 컬럼명 일치 같은 약한 추론까지 넣으면 그래프 전체가 하나로 엉키기 때문.
+"""
+import os
+from array import array
+from collections import deque
+
+from app.models.erd import GraphAnalysis, InferredRelation, JunctionTable
+from app.models.metadata import SchemaMetadata
+
+_CONFIDENCE_RANK = {'FK': 3, 'HIGH': 2, 'MEDIUM': 1, 'LOW': 0}
+
+GRAPH_MIN_CONFIDENCE = os.getenv('GRAPH_MIN_CONFIDENCE', 'HIGH').upper()
+
+
+class RelationGraph:
+    """테이블 방향 그래프 (CSR). 간선 src -> tgt는 'src가 tgt를 참조'."""
+
+    def __init__(self, names: list[str], edges: set[tuple[int, int]]) -> None:
+        n = len(names)
+        self.names = names
+        self.n = n
+        self.index = {name.lower(): i for i, name in reversed(list(enumerate(names)))}
+
+        out_deg = [0] * n
+        for s, _ in edges:
+            out_deg[s] += 1
+        self.offsets = array('i', [0] * (n + 1))
+        for i in range(n):
+            self.offsets[i + 1] = self.offsets[i] + out_deg[i]
+
+        self.targets = array('i', [0] * len(edges))
+        self.in_degree = array('i', [0] * n)
+        fill = array('i', self.offsets[:n])
+        for s, t in sorted(edges):
+            self.targets[fill[s]] = t
+            fill[s] += 1
+            self.in_degree[t] += 1
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def successors(self, v: int):
+        return self.targets[self.offsets[v]:self.offsets[v + 1]]
+
+    def out_degree(self, v: int) -> int:
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def strongly_connected(self) -> list[list[int]]:
+        """Tarjan SCC (반복 구현, 재귀 한도 없음). 크기 1 포함 전체 반환."""
+        n = self.n
+        offsets, targets = self.offsets, self.targets
+        index = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: list[int] = []
+        comps: list[list[int]] = []
+        counter = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, offsets[root])]
+
+            while work:
+                v, pos = work[-1]
+                if pos < offsets[v + 1]:
+                    work[-1] = (v, pos + 1)
+                    w = targets[pos]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, offsets[w]))
+                    elif on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+                if low[v] == index[v]:
+                    comp = []
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp.append(w)
+                        if w == v:
+                            break
+                    comps.append(sorted(comp))
+        return comps
+
+    def cycle_in(self, comp: list[int]) -> list[int]:
+        """SCC 내부에서 comp[0]으로 돌아오는 최단 순환 경로 (BFS)"""
+        members = set(comp)
+        start = comp[0]
+        parent = {start: -1}
+        queue = deque([start])
+        while queue:
+            v = queue.popleft()
+            for w in self.successors(v):
+                if w == start and v != start:   # self-loop는 self_references로 별도 보고
+                    path = [v]
+                    while parent[path[-1]] != -1:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return path + [start]
+                if w in members and w not in parent:
+                    parent[w] = v
+                    queue.append(w)
+        return []
+
+
+def build_relation_graph(
+    metadata: SchemaMetadata,
+    relations: list[InferredRelation],
+    min_confidence: str = GRAPH_MIN_CONFIDENCE,
+) -> tuple[RelationGraph, dict[int, list[InferredRelation]]]:
+    """
+    (그래프, source 테이블 idx -> 분석 대상 관계 목록).
+    테이블명은 대소문자 무시로 매칭하고, 스키마에 없는 테이블 관계는 제외한다.
+    """
+    graph_names = [t.name for t in metadata.tables]
+    index = {name.lower(): i for i, name in reversed(list(enumerate(graph_names)))}
+    threshold = _CONFIDENCE_RANK.get(min_confidence, 2)
+
+    edges: set[tuple[int, int]] = set()
+    by_source: dict[int, list[InferredRelation]] = {}
+    for r in relations:
+        if _CONFIDENCE_RANK.get(r.confidence, 0) < threshold:
+            continue
+        s = index.get(r.source_table.lower())
+        t = index.get(r.target_table.lower())
+        if s is None or t is None:
+            continue
+        edges.add((s, t))
+        by_source.setdefault(s, []).append(r)
+    return RelationGraph(graph_names, edges), by_source
+
+
+def _junctions(
+    metadata: SchemaMetadata,
+    graph: RelationGraph,
+    by_source: dict[int, list[InferredRelation]],
+) -> tuple[list[JunctionTable], list[InferredRelation]]:
+    junctions: list[JunctionTable] = []
+    many_to_many: list[InferredRelation] = []
+
+    for idx, table in enumerate(metadata.tables):
+        if len(table.pk_columns) < 2 or idx not in by_source:
+            continue
+        pk = {c.lower() for c in table.pk_columns}
+
+        # PK 컬럼에서 나가는 관계: 대상 테이블별 첫 관계
+        targets: dict[str, InferredRelation] = {}
+        for r in by_source[idx]:
+            if r.source_column.lower() not in pk or r.target_table.lower() == table.name.lower():
+                continue
+            targets.setdefault(r.target_table.lower(), r)
+        if len(targets) < 2:
+            continue
+
+        refs = list(targets.values())
+        target_names = [graph.names[graph.index[r.target_table.lower()]] for r in refs]
+        junctions.append(JunctionTable(
+            table=table.name,
+            targets=target_names,
+            columns=[r.source_column for r in refs],
+        ))
+        if len(refs) == 2:
+            left, right = refs
+            many_to_many.append(InferredRelation(
+                source_table=target_names[0],
+                source_column=left.target_column,
+                target_table=target_names[1],
+                target_column=right.target_column,
+                confidence=min((left.confidence, right.confidence), key=lambda c: _CONFIDENCE_RANK[c]),
+                cardinality='N:M',
+                reason=f'연결 테이블 {table.name}',
+                evidence=(
+                    f"{table.name}.{left.source_column} -> {left.target_table}.{left.target_column}; "
+                    f"{table.name}.{right.source_column} -> {right.target_table}.{right.target_column}"
+                ),
+                score=min(left.score or 0.0, right.score or 0.0),
+            ))
+    return junctions, many_to_many
+
+
+def analyze_graph(
+    metadata: SchemaMetadata,
+    relations: list[InferredRelation],
+    min_confidence: str = GRAPH_MIN_CONFIDENCE,
+) -> GraphAnalysis:
+    graph, by_source = build_relation_graph(metadata, relations, min_confidence)
+    names = graph.names
+
+    self_refs = [
+        names[v] for v in range(graph.n)
+        if v in set(graph.successors(v))
+    ]
+    orphans = [
+        names[v] for v in range(graph.n)
+        if graph.out_degree(v) == 0 and graph.in_degree[v] == 0
+    ]
+
+    clusters: list[list[str]] = []
+    cycles: list[list[str]] = []
+    for comp in graph.strongly_connected():
+        if len(comp) < 2:
+            continue
+        clusters.append([names[v] for v in comp])
+        cycles.append([names[v] for v in graph.cycle_in(comp)])
+    order = sorted(range(len(clusters)), key=lambda i: (-len(clusters[i]), clusters[i][0]))
+    clusters = [clusters[i] for i in order]
+    cycles = [cycles[i] for i in order]
+
+    junctions, many_to_many = _junctions(metadata, graph, by_source)
+
+    return GraphAnalysis(
+        min_confidence=min_confidence,
+        table_count=graph.n,
+        edge_count=graph.edge_count,
+        junction_tables=junctions,
+        many_to_many=many_to_many,
+        cycles=cycles,
+        self_references=self_refs,
+        orphan_tables=orphans,
+        clusters=clusters,
+    )
@@ -0,0 +1,193 @@
+﻿"""
+인덱스 분석 서비스 (성능 리뷰용, 메타데이터만 사용)
+
+include_indexes로 수집한 TableMeta.indexes를 기준으로
+
+- 인덱스 없는 조인: FK(실제 + 추론) 컬럼 집합이 어떤 인덱스의 선두 컬럼과도 맞지 않음
+                    (PK는 항상 인덱스가 있으므로 PK 선두 컬럼도 인정)
+- 중복 인덱스:     키가 같은 인덱스가 2개 이상 (PK > UNIQUE > 이름 순으로 하나만 남김)
+- prefix 인덱스:   키가 다른 인덱스 키의 선두 부분인 비고유 인덱스
+
+테이블별로 인덱스 선두 컬럼 집합(prefix)을 미리 만들어 FK 1건은 O(1)로 확인하고,
+중복/prefix는 키 tuple 정렬 후 인접한 인덱스만 비교한다 (정렬 순서상 A의 키로
+시작하는 인덱스는 A 바로 뒤에 모인다).
+
+분석 대상 추론 관계는 INDEX_FK_MIN_CONFIDENCE 이상 (기본 MEDIUM).
+"""
+import os
+
+from app.models.erd import (
+    IndexReport,
+    InferredRelation,
+    RedundantIndex,
+    UnindexedForeignKey,
+)
+from app.models.metadata import IndexMeta, SchemaMetadata, TableMeta
+
+_CONFIDENCE_RANK = {'FK': 3, 'HIGH': 2, 'MEDIUM': 1, 'LOW': 0}
+
+INDEX_FK_MIN_CONFIDENCE = os.getenv('INDEX_FK_MIN_CONFIDENCE', 'MEDIUM').upper()
+
+# 키 선두 컬럼 조회에 쓸 수 없는 인덱스 종류 (index_type 부분 문자열)
+_NON_KEY_TYPES = ('FULLTEXT', 'SPATIAL', 'GIN', 'GIST', 'BRIN', 'XML', 'COLUMNSTORE', 'DOMAIN')
+
+_EXPRESSION = '(expression)'
+
+
+def _index_kind(index: IndexMeta) -> str | None:
+    """'btree' | 'bitmap' | 'hash' (키 전체 일치만) | None (분석 제외)"""
+    t = index.index_type.upper()
+    if any(x in t for x in _NON_KEY_TYPES):
+        return None
+    if 'HASH' in t:
+        return 'hash'
+    if 'BITMAP' in t:
+        return 'bitmap'
+    return 'btree'
+
+
+def _key(index: IndexMeta) -> tuple[str, ...]:
+    return tuple(c.lower() for c in index.columns)
+
+
+def _lookup_prefixes(table: TableMeta) -> set[frozenset[str]]:
+    """FK 컬럼 집합이 이 중 하나와 같으면 인덱스로 조인 가능"""
+    keys = [tuple(c.lower() for c in table.pk_columns)]
+    full_only = []
+    for index in table.indexes:
+        kind = _index_kind(index)
+        if kind == 'hash':
+            full_only.append(_key(index))
+        elif kind is not None:
+            keys.append(_key(index))
+
+    prefixes: set[frozenset[str]] = {frozenset(k) for k in full_only if _EXPRESSION not in k}
+    for key in keys:
+        for n in range(1, len(key) + 1):
+            if key[n - 1] == _EXPRESSION:
+                break
+            prefixes.add(frozenset(key[:n]))
+    return prefixes
+
+
+def _join_candidates(
+    metadata: SchemaMetadata,
+    relations: list[InferredRelation],
+    min_confidence: str,
+) -> list[tuple[TableMeta, list[str], str, list[str], str, str]]:
+    """(테이블, 컬럼, 참조 테이블, 참조 컬럼, source, confidence) - 테이블/컬럼 집합 기준 중복 제거"""
+    by_name = {t.name.lower(): t for t in metadata.tables}
+    threshold = _CONFIDENCE_RANK.get(min_confidence, 1)
+    seen: set[tuple[str, frozenset[str]]] = set()
+    out = []
+
+    def add(table, cols, ref_table, ref_cols, source, confidence):
+        key = (table.name.lower(), frozenset(c.lower() for c in cols))
+        if key in seen:
+            return
+        seen.add(key)
+        out.append((table, cols, ref_table, ref_cols, source, confidence))
+
+    for table in metadata.tables:
+        constraints: dict[str, tuple[list[str], str, list[str]]] = {}
+        for fk in table.fk_refs:
+            cols, _, ref_cols = constraints.setdefault(fk.constraint_name, ([], fk.ref_table, []))
+            cols.append(fk.column_name)
+            ref_cols.append(fk.ref_column)
+        for cols, ref_table, ref_cols in constraints.values():
+            add(table, cols, ref_table, ref_cols, 'FK', 'FK')
+
+    for r in relations:
+        if r.confidence == 'FK' or _CONFIDENCE_RANK.get(r.confidence, 0) < threshold:
+            continue
+        table = by_name.get(r.source_table.lower())
+        if table is None:
+            continue
+        add(table, [r.source_column], r.target_table, [r.target_column], 'INFERRED', r.confidence)
+    return out
+
+
+def _redundant(table: TableMeta) -> list[RedundantIndex]:
+    groups: dict[str, list[IndexMeta]] = {}
+    for index in table.indexes:
+        kind = _index_kind(index)
+        if kind is None or _EXPRESSION in index.columns:
+            continue
+        groups.setdefault(kind, []).append(index)
+
+    out: list[RedundantIndex] = []
+    for kind, indexes in groups.items():
+        # 같은 키 안에서는 남길 인덱스(PK > UNIQUE > 이름)가 맨 앞
+        indexes.sort(key=lambda i: (_key(i), not i.primary, not i.unique, i.name))
+        runs: list[list[IndexMeta]] = []
+        for index in indexes:
+            if runs and _key(runs[-1][0]) == _key(index):
+                runs[-1].append(index)
+            else:
+                runs.append([index])
+
+        for run in runs:
+            keeper = run[0]
+            for other in run[1:]:
+                out.append(RedundantIndex(
+                    table=table.name, index=other.name, columns=other.columns,
+                    covered_by=keeper.name, reason='DUPLICATE',
+                ))
+
+        if kind == 'hash':
+            continue
+        for cur, nxt in zip(runs, runs[1:]):
+            head, longer = cur[0], nxt[0]
+            a, b = _key(head), _key(longer)
+            if head.unique or head.primary or len(a) >= len(b) or b[:len(a)] != a:
+                continue
+            out.append(RedundantIndex(
+                table=table.name, index=head.name, columns=head.columns,
+                covered_by=longer.name, reason='PREFIX',
+            ))
+    return out
+
+
+def analyze_indexes(
+    metadata: SchemaMetadata,
+    relations: list[InferredRelation],
+    min_confidence: str = INDEX_FK_MIN_CONFIDENCE,
+) -> IndexReport:
+    """
+    인덱스 없는 조인 / 중복·prefix 인덱스 리포트.
+    인덱스를 수집하지 않은 메타데이터(indexes_collected=False)는 빈 리포트.
+    """
+    if not metadata.indexes_collected:
+        return IndexReport(indexes_collected=False, min_confidence=min_confidence)
+
+    prefixes: dict[str, set[frozenset[str]]] = {}
+    unindexed: list[UnindexedForeignKey] = []
+    for table, cols, ref_table, ref_cols, source, confidence in _join_candidates(
+        metadata, relations, min_confidence,
+    ):
+        lookup = prefixes.get(table.name)
+        if lookup is None:
+            lookup = prefixes[table.name] = _lookup_prefixes(table)
+        if frozenset(c.lower() for c in cols) in lookup:
+            continue
+        unindexed.append(UnindexedForeignKey(
+            table=table.name,
+            columns=cols,
+            ref_table=ref_table,
+            ref_columns=ref_cols,
+            source=source,
+            confidence=confidence,
+            row_count=table.row_count,
+            suggested_ddl=f"CREATE INDEX ix_{table.name}_{'_'.join(cols)} ON {table.name} ({', '.join(cols)});",
+        ))
+    unindexed.sort(key=lambda u: (u.row_count is None, -(u.row_count or 0), u.table, u.columns))
+
+    redundant = [r for table in metadata.tables for r in _redundant(table)]
+
+    return IndexReport(
+        indexes_collected=True,
+        index_count=sum(len(t.indexes) for t in metadata.tables),
+        min_confidence=min_confidence,
+        unindexed_foreign_keys=unindexed,
+        redundant_indexes=redundant,
+    )
@@ -1,9 +1,27 @@
 ﻿from __future__ import annotations
 
+import os
 from typing import Iterable
 
-from app.models.metadata import SchemaMetadata
-from app.models.erd import InferredRelation
+from app.models.metadata import SchemaMetadata, TableMeta
+from app.models.erd import IncrementalInferResponse, InferredRelation, RelationDelta
+from app.services.comment_matching import COMMENT_MATCH_MIN_SIMILARITY, CommentIndex
+from app.services.cpu_offload import run_sharded, should_offload, split_shards
+from app.services.name_matching import (
+    NAME_MATCH_MIN_SIMILARITY,
+    NameIndex,
+    name_grams,
+    name_similarity,
+    to_snake,
+)
+
+# 증분 추론: 다시 추론할 테이블이 이 비율을 넘으면 전체 재추론 (shard 오프로드 사용)
+INFER_INCREMENTAL_MAX_RATIO = float(os.getenv('INFER_INCREMENTAL_MAX_RATIO', '0.5'))
+
+# 추론 결과 row (compact): 프로세스 간 전달 및 정렬/중복 제거용
+# (sort_key, source_table, source_column, target_table, target_column,
+#  confidence, cardinality, reason, evidence, score)
+RelationRow = tuple
 
 
 def _norm(name: str) -> str:
@@ -29,156 +47,495 @@ def _confidence_from_score(score: float) -> str:
     return 'LOW'
 
 
-def infer_relations(metadata: SchemaMetadata) -> list[InferredRelation]:
-    relations: list[InferredRelation] = []
-    seen = set()
+# ── compact 표현 ──────────────────────────────────────────────────────────────
+
+def _pack_context(metadata: SchemaMetadata) -> tuple:
+    """
+    모든 shard가 공유하는 스키마 전역 정보.
+    ((table_name, table_comment, pk_columns), ...)
+    """
+    return tuple(
+        (t.name, t.comment or '', tuple(t.pk_columns))
+        for t in metadata.tables
+    )
 
-    table_names = {_norm(t.name) for t in metadata.tables}
-    table_comment_map = { _norm(t.name): (t.comment or '') for t in metadata.tables }
 
-    def add(rel: InferredRelation) -> None:
-        key = (
-            rel.source_table,
-            rel.source_column,
-            rel.target_table,
-            rel.target_column,
-            rel.confidence,
+def _pack_tables(tables: list[TableMeta]) -> tuple:
+    """
+    shard 단위 테이블 정보.
+    ((table_name, ((col_name, col_comment), ...), ((fk_col, ref_table, ref_col), ...)), ...)
+    """
+    return tuple(
+        (
+            t.name,
+            tuple((c.name, c.comment or '') for c in t.columns),
+            tuple((fk.column_name, fk.ref_table, fk.ref_column) for fk in t.fk_refs),
         )
+        for t in tables
+    )
+
+
+# row reason (증분 추론에서 이전 결과의 규칙 단계를 구분하는 데도 사용)
+_FK_REASON      = 'FK constraint'
+_PK_NAME_REASON = 'PK 컬럼명 직접 일치'
+_COMMENT_HINT   = '컬럼 코멘트 일치'
+_COMMENT_RULE   = '컬럼 코멘트 의미 일치'
+
+# 컬럼명 접미사 규칙: (패턴 순서, 기본 점수, 규칙명, 대상 컬럼)
+_SUFFIX_RULES = (
+    (0, 0.8,  '컬럼명 _id 규칙',       'id'),
+    (1, 0.6,  '컬럼명 _cd/_code 규칙', 'code'),
+    (2, 0.45, '컬럼명 _no 규칙',       'no'),
+)
+
+
+def _suffix_base(pattern: int, name: str) -> str | None:
+    if pattern == 0:
+        return name[:-3] if name.endswith('_id') else None
+    if pattern == 1:
+        if name.endswith('_cd') or name.endswith('_code'):
+            return name.replace('_code', '').replace('_cd', '')
+        return None
+    return name[:-3] if name.endswith('_no') else None
+
+
+class _Context:
+    """shard마다 1회 만드는 스키마 전역 조회 구조"""
+
+    def __init__(self, ctx: tuple) -> None:
+        self.table_names = {_norm(name) for name, _, _ in ctx}
+        self.table_pk_map = {_norm(name): pks for name, _, pks in ctx}
+        self.name_index = NameIndex(_norm(name) for name, _, _ in ctx)
+        self.comment_index = CommentIndex((_norm(name), comment) for name, comment, _ in ctx)
+        self.pk_index: dict[str, list[tuple[int, int, str, str]]] = {}
+        for t_idx, (name, _, pks) in enumerate(ctx):
+            for pk_idx, pk in enumerate(pks):
+                self.pk_index.setdefault(_norm(pk), []).append((t_idx, pk_idx, name, pk))
+
+    def comment_hint(self, target: str, comment: str) -> bool:
+        """코멘트에 테이블명 포함, 또는 테이블 코멘트와 토큰 유사도 충분"""
+        if target in comment.lower():
+            return True
+        if not comment:
+            return False
+        return self.comment_index.similarity(comment, target) >= COMMENT_MATCH_MIN_SIMILARITY
+
+    def comment_rule(self, tname: str, comment: str) -> tuple[str, str, float] | None:
+        """이름으로 대상을 못 찾은 키 컬럼의 코멘트 의미 일치 대상 (테이블, PK, 유사도)"""
+        best = self.comment_index.best(comment, exclude=_norm(tname))
+        if best and best[1] >= COMMENT_MATCH_MIN_SIMILARITY:
+            target, sim = best
+            pks = self.table_pk_map.get(target, ())
+            if len(pks) == 1:
+                return target, pks[0], sim
+        return None
+
+
+def _key_bases(col_name: str) -> list[tuple[int, float, str, str, str]]:
+    """키 컬럼 접미사 규칙 적용 결과 [(pattern, 기본 점수, 규칙명, 대상 컬럼, 기준 이름)]"""
+    snake = to_snake(col_name)
+    out = []
+    for pattern, base_score, rule, target_col in _SUFFIX_RULES:
+        base = _suffix_base(pattern, snake)
+        if base is not None:
+            out.append((pattern, base_score, rule, target_col, base))
+    return out
+
+
+def _table_rows(c: _Context, src: int, table: tuple) -> list[RelationRow]:
+    """
+    테이블 1개(전체 스키마 기준 위치 src)를 source로 하는 관계 후보 row.
+    sort_key는 전체 스키마를 한 번에 돌렸을 때의 출력 순서를 재현한다.
+      1) 실제 FK:        (0, src, fk)
+      2) 컬럼명 규칙:    (1, src, col, pattern, candidate)  — 정확 후보 다음 유사도 후보
+      3) PK 컬럼명 일치: (2, tgt, pk, src, col)
+    """
+    tname, columns, fks = table
+    rows: list[RelationRow] = []
+
+    # 1) 실제 FK
+    for fk_idx, (fk_col, ref_table, ref_col) in enumerate(fks):
+        rows.append((
+            (0, src, fk_idx),
+            tname, fk_col, ref_table, ref_col, 'FK', 'N:1',
+            _FK_REASON,
+            f"{tname}.{fk_col} -> {ref_table}.{ref_col}",
+            1.0,
+        ))
+
+    for col_idx, (col_name, comment) in enumerate(columns):
+        name = _norm(col_name)
+
+        key_like = False
+        matched = False
+        # 2) 컬럼명 규칙 + 코멘트 힌트 (camelCase 컬럼은 snake_case로 보고 판단)
+        for pattern, base_score, rule, target_col, base in _key_bases(col_name):
+            key_like = True
+            exact = _candidate_tables(c.table_names, base)
+            matched = matched or bool(exact)
+            for cand_idx, target in enumerate(exact):
+                score = base_score
+                reason = [rule]
+                evidence = [f"{tname}.{col_name} -> {target}.{target_col}"]
+
+                if c.comment_hint(target, comment):
+                    score += 0.1
+                    reason.append(_COMMENT_HINT)
+                    evidence.append(f"comment: {comment}")
+
+                rows.append((
+                    (1, src, col_idx, pattern, cand_idx),
+                    tname, col_name, target, target_col,
+                    _confidence_from_score(score), 'N:1',
+                    ' + '.join(reason), '; '.join(evidence), score,
+                ))
+
+            # 2-1) 이름 유사도 (prefix/복수형/약어가 다른 테이블명)
+            fuzzy = c.name_index.lookup(base, exclude=_norm(tname))
+            for fz_idx, (target, sim) in enumerate(fuzzy):
+                if target in exact:
+                    continue
+                matched = True
+                pks = c.table_pk_map.get(target, ())
+                ref_col = pks[0] if len(pks) == 1 else target_col
+                score = round(base_score * sim, 3)
+                reason = [rule, f'테이블명 유사도 {sim:.2f}']
+                evidence = [f"{tname}.{col_name} -> {target}.{ref_col}"]
+
+                if c.comment_hint(target, comment):
+                    score = round(score + 0.1, 3)
+                    reason.append(_COMMENT_HINT)
+                    evidence.append(f"comment: {comment}")
+
+                rows.append((
+                    (1, src, col_idx, pattern, len(exact) + fz_idx),
+                    tname, col_name, target, ref_col,
+                    _confidence_from_score(score), 'N:1',
+                    ' + '.join(reason), '; '.join(evidence), score,
+                ))
+
+        # 2-2) 이름으로 대상을 못 찾은 키 컬럼: 코멘트 의미가 가장 가까운 테이블
+        if key_like and not matched and comment:
+            found = c.comment_rule(tname, comment)
+            if found:
+                target, pk, sim = found
+                score = round(0.4 + 0.2 * sim, 3)
+                rows.append((
+                    (1, src, col_idx, len(_SUFFIX_RULES), 0),
+                    tname, col_name, target, pk,
+                    _confidence_from_score(score), 'N:1',
+                    f'{_COMMENT_RULE} {sim:.2f}',
+                    f"{tname}.{col_name} -> {target}.{pk}; comment: {comment}",
+                    score,
+                ))
+
+        # 3) PK 컬럼명 직접 매칭 (보수적)
+        for t_idx, pk_idx, target, pk in c.pk_index.get(name, ()):
+            if target == tname:
+                continue
+            score = 0.55
+            rows.append((
+                (2, t_idx, pk_idx, src, col_idx),
+                tname, col_name, target, pk,
+                _confidence_from_score(score), 'N:1',
+                _PK_NAME_REASON,
+                f"{tname}.{col_name} == {target}.{pk}",
+                score,
+            ))
+
+    return rows
+
+
+def _infer_shard(ctx: tuple, shard: tuple[int, tuple]) -> list[RelationRow]:
+    """shard(연속 테이블 구간)를 source로 하는 관계 후보 row"""
+    start, tables = shard
+    c = _Context(ctx)
+    rows: list[RelationRow] = []
+    for offset, table in enumerate(tables):
+        rows.extend(_table_rows(c, start + offset, table))
+    return rows
+
+
+def _relation(row: RelationRow) -> InferredRelation:
+    return InferredRelation(
+        source_table=row[1],
+        source_column=row[2],
+        target_table=row[3],
+        target_column=row[4],
+        confidence=row[5],
+        cardinality=row[6],
+        reason=row[7],
+        evidence=row[8],
+        score=row[9],
+    )
+
+
+def _assemble(rows: list[RelationRow]) -> list[InferredRelation]:
+    """sort_key 순으로 정렬 후 (source, target, confidence) 기준 중복 제거"""
+    relations: list[InferredRelation] = []
+    seen = set()
+    for row in sorted(rows, key=lambda r: r[0]):
+        key = row[1:6]
         if key in seen:
-            return
+            continue
         seen.add(key)
-        relations.append(rel)
+        relations.append(_relation(row))
+    return relations
 
-    # 1) 실제 FK
-    for table in metadata.tables:
-        for fk in table.fk_refs:
-            add(
-                InferredRelation(
-                    source_table=table.name,
-                    source_column=fk.column_name,
-                    target_table=fk.ref_table,
-                    target_column=fk.ref_column,
-                    confidence='FK',
-                    cardinality='N:1',
-                    reason='FK constraint',
-                    evidence=f"{table.name}.{fk.column_name} -> {fk.ref_table}.{fk.ref_column}",
-                    score=1.0,
-                )
+
+def infer_relations(metadata: SchemaMetadata, offload: bool = True) -> list[InferredRelation]:
+    """offload=False: 테이블 수와 관계없이 호출 프로세스에서 추론 (풀 프로세스 안에서 호출할 때)"""
+    ctx = _pack_context(metadata)
+
+    if offload and should_offload(len(metadata.tables)):
+        shards = [
+            (start, _pack_tables(chunk))
+            for start, chunk in split_shards(metadata.tables)
+        ]
+        rows = [row for part in run_sharded(_infer_shard, ctx, shards) for row in part]
+    else:
+        rows = _infer_shard(ctx, (0, _pack_tables(metadata.tables)))
+
+    return _assemble(rows)
+
+
+# ── 증분 추론 ─────────────────────────────────────────────────────────────────
+#
+# 변경 테이블(추가/변경/삭제)과 무관한 source 테이블은 이전 결과 row를 그대로 쓰고
+# 정렬 키만 새 위치로 다시 매긴다. 중복 제거 키에 source 테이블이 들어 있어
+# 테이블 단위로 결과를 바꿔 끼워도 전체 재추론과 같은 출력이 된다.
+#
+# 다시 추론하는 source 테이블:
+#   - 추가/변경 테이블 자신
+#   - 이전 결과에서 변경 테이블을 대상으로 하는 관계가 있는 테이블
+#   - 키 컬럼 기준 이름이 변경 테이블명과 정확/유사 일치할 수 있는 테이블 (역방향 매칭)
+#   - 컬럼명이 추가/변경 테이블 PK와 같은 테이블
+#   - 테이블명 trigram의 후보 생성 상태(희소/흔함)가 바뀐 기준 이름을 쓰는 테이블
+#   - 코멘트 TF-IDF는 테이블 수가 바뀌면 전체 가중치가 달라지므로, 코멘트 힌트/의미 일치
+#     판정을 새 인덱스로 다시 계산해 이전 row와 다른 테이블
+
+
+def _relation_key(r: InferredRelation) -> tuple:
+    return (r.source_table, r.source_column, r.target_table, r.target_column, r.confidence)
+
+
+def _comment_holds(
+    c: _Context,
+    tname: str,
+    comment: str,
+    bases: list[tuple],
+    rows: Iterable[InferredRelation],
+) -> bool:
+    """키 컬럼 1개의 코멘트 기반 판정이 새 인덱스에서도 이전 결과 row와 같은지"""
+    name_rows, fk_rows, rule_row = [], [], None
+    for r in rows:
+        if r.reason == _FK_REASON:
+            fk_rows.append(r)
+        elif r.reason == _PK_NAME_REASON:
+            continue
+        elif (r.reason or '').startswith(_COMMENT_RULE):
+            rule_row = r
+        else:
+            name_rows.append(r)
+
+    for r in name_rows:
+        hinted = _COMMENT_HINT in (r.reason or '').split(' + ')
+        if c.comment_hint(r.target_table, comment) != hinted:
+            return False
+
+    # 코멘트 힌트로 FK 신뢰도가 된 _id 규칙 row는 실제 FK row와 같아 출력에서 빠진다.
+    # 힌트가 유지되어야 계속 빠지므로 보이지 않는 후보도 확인한다.
+    shown = {(r.target_table, r.target_column) for r in name_rows}
+    if any(pattern == 0 for pattern, *_ in bases):
+        for r in fk_rows:
+            if r.target_table != _norm(r.target_table) or (r.target_table, r.target_column) in shown:
+                continue
+            if not c.comment_hint(r.target_table, comment):
+                return False
+
+    if name_rows:
+        return True
+    found = c.comment_rule(tname, comment)
+    if found is None:
+        return rule_row is None
+    target, pk, sim = found
+    return (
+        rule_row is not None
+        and (rule_row.target_table, rule_row.target_column, rule_row.reason)
+        == (target, pk, f'{_COMMENT_RULE} {sim:.2f}')
+        and rule_row.score == round(0.4 + 0.2 * sim, 3)
+    )
+
+
+def _reused_rows(
+    src: int,
+    table: TableMeta,
+    prior: list[InferredRelation],
+    positions: dict[str, tuple[int, tuple]],
+) -> list[tuple[tuple, InferredRelation]] | None:
+    """이전 결과 row에 새 정렬 키 부여 (대상 위치를 못 찾으면 None = 다시 추론)"""
+    col_positions: dict[str, int] = {}
+    for col_idx, col in enumerate(table.columns):
+        col_positions.setdefault(col.name, col_idx)
+
+    out = []
+    fk_seq = rule_seq = 0
+    for r in prior:
+        if r.reason == _FK_REASON:
+            key = (0, src, fk_seq)
+            fk_seq += 1
+        elif r.reason == _PK_NAME_REASON:
+            target = positions.get(r.target_table)
+            col_idx = col_positions.get(r.source_column)
+            if target is None or col_idx is None or r.target_column not in target[1]:
+                return None
+            key = (2, target[0], target[1].index(r.target_column), src, col_idx)
+        else:
+            key = (1, src, rule_seq)
+            rule_seq += 1
+        out.append((key, r))
+    return out
+
+
+def _relation_delta(
+    previous: list[InferredRelation],
+    relations: list[InferredRelation],
+) -> RelationDelta:
+    before = {_relation_key(r): r for r in previous}
+    after = {_relation_key(r): r for r in relations}
+    delta = RelationDelta()
+    for key, r in after.items():
+        old = before.get(key)
+        if old is None:
+            delta.added.append(r)
+        elif old is not r and old != r:
+            delta.updated.append(r)
+    delta.removed = [r for key, r in before.items() if key not in after]
+    return delta
+
+
+def infer_relations_incremental(
+    metadata: SchemaMetadata,
+    previous: list[InferredRelation],
+    added: Iterable[str] = (),
+    changed: Iterable[str] = (),
+    removed: Iterable[str] = (),
+) -> IncrementalInferResponse:
+    """
+    직전 추론 결과(previous)에 테이블 변경분을 반영한다.
+    metadata는 변경 후 전체 스키마, 결과는 infer_relations(metadata)와 같다.
+    """
+    added, changed, removed = (list(dict.fromkeys(_norm(n) for n in names)) for names in (added, changed, removed))
+    names = [_norm(t.name) for t in metadata.tables]
+    present = set(names)
+    missing = [n for n in added + changed if n not in present]
+    stale = [n for n in removed if n in present]
+    if missing:
+        raise ValueError(f"메타데이터에 없는 추가/변경 테이블: {', '.join(missing)}")
+    if stale:
+        raise ValueError(f"메타데이터에 남아 있는 삭제 테이블: {', '.join(stale)}")
+
+    def full() -> IncrementalInferResponse:
+        relations = infer_relations(metadata)
+        return IncrementalInferResponse(
+            relations=relations,
+            delta=_relation_delta(previous, relations),
+            recomputed_tables=len(metadata.tables),
+            full_recompute=True,
+        )
+
+    # 대소문자만 다른 테이블명은 이름 기준 조회가 겹쳐 변경 범위를 좁힐 수 없다
+    if len(present) != len(names):
+        return full()
+
+    ctx = _pack_context(metadata)
+    c = _Context(ctx)
+    touched = set(added + changed + removed)
+    flipped = c.name_index.changed_grams(added, removed)
+    changed_pks = {
+        _norm(pk) for t in metadata.tables if _norm(t.name) in touched for pk in t.pk_columns
+    }
+    positions: dict[str, tuple[int, tuple]] = {}
+    for t_idx, (name, _, pks) in enumerate(ctx):
+        positions.setdefault(name, (t_idx, pks))
+
+    prior_by_table: dict[str, list[InferredRelation]] = {}
+    for r in previous:
+        prior_by_table.setdefault(r.source_table, []).append(r)
+
+    base_memo: dict[str, bool] = {}
+
+    def base_touched(base: str) -> bool:
+        """기준 이름의 정확/유사 후보 집합이 변경 테이블 때문에 달라질 수 있는지"""
+        hit = base_memo.get(base)
+        if hit is None:
+            hit = (
+                any(cand in touched for cand in (base, f"{base}s", base.rstrip('s')))
+                or any(name_similarity(base, t) >= NAME_MATCH_MIN_SIMILARITY for t in touched)
+                or bool(flipped and name_grams(base) & flipped)
             )
+            base_memo[base] = hit
+        return hit
 
-    # 2) 컬럼명 규칙 + 코멘트 힌트
-    for table in metadata.tables:
+    def needs_recompute(table: TableMeta, prior: list[InferredRelation]) -> bool:
+        if _norm(table.name) in touched:
+            return True
+        if any(_norm(r.target_table) in touched for r in prior):
+            return True
+        by_column: dict[str, list[InferredRelation]] = {}
+        for r in prior:
+            by_column.setdefault(r.source_column, []).append(r)
         for col in table.columns:
-            name = _norm(col.name)
-            col_comment = (col.comment or '').lower()
-
-            # _id 패턴
-            if name.endswith('_id'):
-                base = name[:-3]
-                for target in _candidate_tables(table_names, base):
-                    score = 0.8
-                    reason = ['컬럼명 _id 규칙']
-                    evidence = [f"{table.name}.{col.name} -> {target}.id"]
-
-                    # 코멘트에 테이블명/코멘트 포함
-                    t_comment = table_comment_map.get(target, '').lower()
-                    if target in col_comment or (t_comment and t_comment in col_comment):
-                        score += 0.1
-                        reason.append('컬럼 코멘트 일치')
-                        evidence.append(f"comment: {col.comment}")
-
-                    add(
-                        InferredRelation(
-                            source_table=table.name,
-                            source_column=col.name,
-                            target_table=target,
-                            target_column='id',
-                            confidence=_confidence_from_score(score),
-                            cardinality='N:1',
-                            reason=' + '.join(reason),
-                            evidence='; '.join(evidence),
-                            score=score,
-                        )
-                    )
-
-            # _cd / _code 패턴
-            if name.endswith('_cd') or name.endswith('_code'):
-                base = name.replace('_code', '').replace('_cd', '')
-                for target in _candidate_tables(table_names, base):
-                    score = 0.6
-                    reason = ['컬럼명 _cd/_code 규칙']
-                    evidence = [f"{table.name}.{col.name} -> {target}.code"]
-
-                    t_comment = table_comment_map.get(target, '').lower()
-                    if target in col_comment or (t_comment and t_comment in col_comment):
-                        score += 0.1
-                        reason.append('컬럼 코멘트 일치')
-                        evidence.append(f"comment: {col.comment}")
-
-                    add(
-                        InferredRelation(
-                            source_table=table.name,
-                            source_column=col.name,
-                            target_table=target,
-                            target_column='code',
-                            confidence=_confidence_from_score(score),
-                            cardinality='N:1',
-                            reason=' + '.join(reason),
-                            evidence='; '.join(evidence),
-                            score=score,
-                        )
-                    )
-
-            # _no 패턴
-            if name.endswith('_no'):
-                base = name[:-3]
-                for target in _candidate_tables(table_names, base):
-                    score = 0.45
-                    reason = ['컬럼명 _no 규칙']
-                    evidence = [f"{table.name}.{col.name} -> {target}.no"]
-
-                    t_comment = table_comment_map.get(target, '').lower()
-                    if target in col_comment or (t_comment and t_comment in col_comment):
-                        score += 0.1
-                        reason.append('컬럼 코멘트 일치')
-                        evidence.append(f"comment: {col.comment}")
-
-                    add(
-                        InferredRelation(
-                            source_table=table.name,
-                            source_column=col.name,
-                            target_table=target,
-                            target_column='no',
-                            confidence=_confidence_from_score(score),
-                            cardinality='N:1',
-                            reason=' + '.join(reason),
-                            evidence='; '.join(evidence),
-                            score=score,
-                        )
-                    )
-
-    # 3) PK 컬럼명 직접 매칭 (보수적)
-    for table in metadata.tables:
-        for pk in table.pk_columns:
-            pk_norm = _norm(pk)
-            for t in metadata.tables:
-                if t.name == table.name:
-                    continue
-                for col in t.columns:
-                    if _norm(col.name) == pk_norm:
-                        score = 0.55
-                        add(
-                            InferredRelation(
-                                source_table=t.name,
-                                source_column=col.name,
-                                target_table=table.name,
-                                target_column=pk,
-                                confidence=_confidence_from_score(score),
-                                cardinality='N:1',
-                                reason='PK 컬럼명 직접 일치',
-                                evidence=f"{t.name}.{col.name} == {table.name}.{pk}",
-                                score=score,
-                            )
-                        )
+            if _norm(col.name) in changed_pks:
+                return True
+            bases = _key_bases(col.name)
+            if any(base_touched(base) for *_, base in bases):
+                return True
+            comment = col.comment or ''
+            if bases and comment and not _comment_holds(
+                c, table.name, comment, bases, by_column.get(col.name, ()),
+            ):
+                return True
+        return False
 
-    return relations
+    limit = len(metadata.tables) * INFER_INCREMENTAL_MAX_RATIO
+    recompute: list[int] = []
+    reused: list[tuple[tuple, InferredRelation]] = []
+    for src, table in enumerate(metadata.tables):
+        prior = prior_by_table.get(table.name, [])
+        if not needs_recompute(table, prior):
+            keyed = _reused_rows(src, table, prior, positions)
+            if keyed is not None:
+                reused.extend(keyed)
+                continue
+        recompute.append(src)
+        if len(recompute) > limit:
+            return full()
+
+    rows: list[RelationRow] = []
+    packed = _pack_tables([metadata.tables[src] for src in recompute])
+    for src, table in zip(recompute, packed):
+        rows.extend(_table_rows(c, src, table))
+
+    # 다시 추론한 row는 중복 제거 후 이전 row와 정렬 키 순으로 합친다
+    merged: list[tuple[tuple, InferredRelation | RelationRow]] = [(row[0], row) for row in rows]
+    merged.extend(reused)
+    merged.sort(key=lambda x: x[0])
+    relations: list[InferredRelation] = []
+    seen = set()
+    for _, item in merged:
+        if isinstance(item, InferredRelation):
+            relations.append(item)
+            continue
+        key = item[1:6]
+        if key in seen:
+            continue
+        seen.add(key)
+        relations.append(_relation(item))
+
+    return IncrementalInferResponse(
+        relations=relations,
+        delta=_relation_delta(previous, relations),
+        recomputed_tables=len(recompute),
+        full_recompute=False,
+    )
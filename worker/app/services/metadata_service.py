@@ -2,47 +2,87 @@
 메타데이터 추출 서비스 (agent/erd-engine.md 1~3단계)
 
 1. 메타 수집: connector.extract_columns_raw / extract_fks_raw
+   (ResumableExtraction: 테이블 범위 배치 + 체크포인트 + 연결 끊김 재시도)
+   (+ include_stats: extract_stats_raw 근사 통계, 실패해도 추출은 계속)
+   (+ include_indexes: extract_indexes_raw 인덱스 키 컬럼, 실패해도 추출은 계속)
 2. 스키마 변환: raw dict -> Pydantic 모델
 3. FK 반영: FkMeta -> TableMeta.fk_refs
+4. 도메인: domain_service.cluster_domains (prefix + FK 연결성)
 """
 import logging
 from datetime import datetime, timezone
 
-from app.models.metadata import ColumnMeta, FkMeta, SchemaMetadata, TableMeta
+from app.models.metadata import (
+    CatalogQueryTiming,
+    CatalogReport,
+    ColumnMeta,
+    FkMeta,
+    IndexMeta,
+    SchemaMetadata,
+    TableMeta,
+)
 from app.services.connectors.base import BaseConnector
+from app.services.domain_service import cluster_domains
+from app.services.resumable_extraction import ResumableExtraction
 
 logger = logging.getLogger(__name__)
 
-# 도메인 추론 (테이블 prefix 기반)
-
-def _infer_domain(table_name: str) -> str:
-    """
-    테이블명 prefix(첫 번째 '_' 기준)를 대문자로 변환해 도메인 분류.
-    예: r_indicatorinfo -> R, st_tr_sales -> ST_TR
-    """
-    parts = table_name.lower().split('_')
-    # 복합 prefix (st_tr_ 등) 처리
-    if len(parts) >= 3 and len(parts[0]) <= 4 and len(parts[1]) <= 4:
-        return f'{parts[0]}_{parts[1]}'.upper()
-    if len(parts) >= 2:
-        return parts[0].upper()
-    return 'ETC'
-
-
-def extract_metadata(connector: BaseConnector, schema: str) -> SchemaMetadata:
+def _to_int(value) -> int | None:
+    """드라이버별 숫자 타입(Decimal/float/None) -> int"""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _collect_optional(session: ResumableExtraction, step: str, extract, schema: str) -> list[dict] | None:
+    """선택 수집(통계/인덱스) 실패(권한 등)는 메타데이터 추출을 막지 않는다"""
+    try:
+        return session.run(step, lambda conn: extract(conn, schema))
+    except Exception as e:
+        logger.warning('%s skipped: %s', extract.__name__, e)
+        session.rollback()
+        return None
+
+
+def extract_metadata(
+    connector: BaseConnector,
+    schema: str,
+    include_stats: bool = False,
+    include_indexes: bool = False,
+    checkpoint_key: str | None = None,
+) -> SchemaMetadata:
     """
     connector를 통해 raw SQL 결과를 수집한 뒤 SchemaMetadata로 변환한다.
 
     - connection() 컨텍스트 매니저가 open/close 보장
+    - 수집은 ResumableExtraction 단계별 실행: 컬럼은 테이블 범위 배치, 연결 끊김은 재연결 후 재시도,
+      checkpoint_key가 있으면 끝난 단계를 로컬 디스크에 저장해 같은 키로 다시 요청하면 이어서 추출
     - 비밀번호는 connector 내부에만 존재
+    - include_stats: 카탈로그 근사 행 수/크기 (COUNT(*) 없음, 스키마당 쿼리 1건)
+    - include_indexes: 인덱스 키 컬럼 (스키마당 쿼리 1건)
     """
-    logger.info('extract_metadata: schema=%s', schema)
+    logger.info(
+        'extract_metadata: schema=%s include_stats=%s include_indexes=%s',
+        schema, include_stats, include_indexes,
+    )
 
-    with connector.connection() as conn:
-        raw_cols = connector.extract_columns_raw(conn, schema)
-        raw_fks  = connector.extract_fks_raw(conn, schema)
+    raw_stats: list[dict] | None = None
+    raw_indexes: list[dict] | None = None
+    with ResumableExtraction(connector, schema, checkpoint_key) as session:
+        raw_cols = session.columns()
+        raw_fks  = session.run('fks', lambda conn: connector.extract_fks_raw(conn, schema))
+        if include_stats:
+            raw_stats = _collect_optional(session, 'stats', connector.extract_stats_raw, schema)
+        if include_indexes:
+            raw_indexes = _collect_optional(session, 'indexes', connector.extract_indexes_raw, schema)
 
-    logger.info('raw rows: columns=%d, fks=%d', len(raw_cols), len(raw_fks))
+    logger.info(
+        'raw rows: columns=%d, fks=%d (resumed steps=%d, retries=%d)',
+        len(raw_cols), len(raw_fks), session.resumed_steps, session.retries,
+    )
 
     # 컬럼/테이블 빌드
     tables: dict[str, TableMeta] = {}
@@ -54,7 +94,6 @@ def extract_metadata(connector: BaseConnector, schema: str) -> SchemaMetadata:
             tables[tname] = TableMeta(
                 name=tname,
                 comment=row.get('table_comment') or '',
-                domain=_infer_domain(tname),
             )
 
         col = ColumnMeta(
@@ -89,10 +128,46 @@ def extract_metadata(connector: BaseConnector, schema: str) -> SchemaMetadata:
         )
         tables[tname].fk_refs.append(fk)
 
+    # 통계 반영
+    stats_collected = bool(raw_stats)
+    if raw_stats:
+        for row in raw_stats:
+            table = tables.get(row['table_name'])
+            if table is None:
+                continue
+            table.row_count   = _to_int(row.get('row_count'))
+            table.data_bytes  = _to_int(row.get('data_bytes'))
+            table.index_bytes = _to_int(row.get('index_bytes'))
+
+    # 인덱스 반영 (raw row: 인덱스 x 키 컬럼, col_no 순)
+    indexes_collected = bool(raw_indexes)
+    if raw_indexes:
+        built: dict[tuple[str, str], IndexMeta] = {}
+        for row in sorted(raw_indexes, key=lambda r: (r['table_name'], r['index_name'], r['col_no'])):
+            table = tables.get(row['table_name'])
+            if table is None:
+                continue
+            key = (row['table_name'], row['index_name'])
+            index = built.get(key)
+            if index is None:
+                index = built[key] = IndexMeta(
+                    name=row['index_name'],
+                    unique=(row.get('is_unique') == 'Y'),
+                    primary=(row.get('is_primary') == 'Y'),
+                    index_type=(row.get('index_type') or '').upper(),
+                )
+                table.indexes.append(index)
+            index.columns.append(row.get('column_name') or '(expression)')
+
     # 집계
     table_list   = sorted(tables.values(), key=lambda t: t.name)
     column_count = sum(len(t.columns) for t in table_list)
 
+    total_rows = total_bytes = None
+    if stats_collected:
+        total_rows  = sum(t.row_count or 0 for t in table_list)
+        total_bytes = sum((t.data_bytes or 0) + (t.index_bytes or 0) for t in table_list)
+
     result = SchemaMetadata(
         schema_name=schema,
         table_count=len(table_list),
@@ -100,10 +175,60 @@ def extract_metadata(connector: BaseConnector, schema: str) -> SchemaMetadata:
         fk_count=len(raw_fks),
         tables=table_list,
         extracted_at=datetime.now(timezone.utc).isoformat(),
+        stats_collected=stats_collected,
+        total_rows=total_rows,
+        total_bytes=total_bytes,
+        indexes_collected=indexes_collected,
     )
 
+    # 도메인: 테이블 prefix + FK 연결성 클러스터링 (추론 관계는 build-erd에서 반영)
+    domains = cluster_domains(result).domains
+    for table in result.tables:
+        table.domain = domains[table.name]
+
     logger.info(
         'extract_metadata done: tables=%d columns=%d fks=%d',
         result.table_count, result.column_count, result.fk_count,
     )
     return result
+
+
+def catalog_report(connector: BaseConnector, schema: str) -> CatalogReport:
+    """
+    현재 서버에서 사용 가능한 모든 카탈로그 쿼리 변형을 실행해 소요 시간을 비교한다.
+    extract_metadata가 선택하는 변형은 selected=True.
+    """
+    timings: list[CatalogQueryTiming] = []
+
+    with connector.connection() as conn:
+        db_version = connector.get_db_version(conn)
+        version    = connector.server_version(conn)
+
+        kinds = dict.fromkeys(q.kind for q in connector.catalog_queries)
+        for kind in kinds:
+            selected = connector.select_query(conn, kind)
+            for query in connector.applicable_queries(conn, kind):
+                try:
+                    connector.run_catalog_query(conn, kind, schema, query)
+                    last = connector.catalog_timings[-1]
+                    timings.append(CatalogQueryTiming(
+                        kind=kind,
+                        variant=query.variant,
+                        selected=query is selected,
+                        rows=last['rows'],
+                        elapsed_ms=last['elapsed_ms'],
+                    ))
+                except Exception as e:
+                    logger.warning('catalog variant failed: %s (%s)', query.variant, e)
+                    timings.append(CatalogQueryTiming(
+                        kind=kind,
+                        variant=query.variant,
+                        selected=query is selected,
+                        error=str(e),
+                    ))
+
+    return CatalogReport(
+        db_version=db_version,
+        server_version='.'.join(str(p) for p in version),
+        timings=timings,
+    )
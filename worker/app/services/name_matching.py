@@ -0,0 +1,208 @@
+﻿"""
+테이블명 유사도 인덱스 (관계 추론 보조)
+
+컬럼명에서 얻은 기준 이름(cust_id -> cust)과 테이블명을 같은 규칙으로 정규화한 뒤
+trigram 역색인으로 가장 가까운 테이블을 찾는다.
+
+정규화: camelCase 분리 -> 소문자 토큰 -> 도메인 prefix 제거(tb_, r_, st_tr_ ...)
+        -> 약어 확장(cust -> customer) -> 단수화(orders -> order) -> 이어 붙인 key
+조회:   key 완전 일치 O(1), 그 외에는 희소 trigram posting만 모아 후보를 만들고
+        후보에 대해서만 Dice 계수를 계산한다 (전체 테이블 순회 없음).
+
+환경 변수:
+  NAME_MATCH_MIN_SIMILARITY  후보로 채택할 최소 유사도 (기본 0.7)
+  NAME_MATCH_TOP_K           컬럼 1개당 최대 후보 수 (기본 2)
+"""
+import os
+import re
+from typing import Iterable
+
+NAME_MATCH_MIN_SIMILARITY = float(os.getenv('NAME_MATCH_MIN_SIMILARITY', '0.7'))
+NAME_MATCH_TOP_K          = int(os.getenv('NAME_MATCH_TOP_K', '2'))
+
+# 테이블명 앞 도메인/관례 prefix (domain_service.prefix_domain 분류와 같은 계열)
+_DOMAIN_PREFIXES = {
+    'tb', 'tbl', 't', 'r', 'st', 'tr', 'm', 'mst', 'h', 'his', 'hst',
+    'c', 'cm', 'cmn', 'com', 'v', 'vw', 'if', 'tmp', 'bak',
+}
+_MAX_PREFIX_STRIP = 2
+
+# 레거시 스키마에서 자주 쓰는 약어
+_ABBREVIATIONS = {
+    'cust': 'customer', 'cst': 'customer', 'emp': 'employee', 'empl': 'employee',
+    'dept': 'department', 'prod': 'product', 'prd': 'product', 'org': 'organization',
+    'acct': 'account', 'acc': 'account', 'addr': 'address', 'txn': 'transaction',
+    'trx': 'transaction', 'usr': 'user', 'mbr': 'member', 'mem': 'member',
+    'ord': 'order', 'inv': 'invoice', 'pay': 'payment', 'pmt': 'payment',
+    'cat': 'category', 'ctg': 'category', 'mgr': 'manager', 'sup': 'supplier',
+    'supp': 'supplier', 'vnd': 'vendor', 'whs': 'warehouse', 'wh': 'warehouse',
+    'loc': 'location', 'itm': 'item', 'grp': 'group', 'comp': 'company',
+    'co': 'company', 'corp': 'corporation', 'brch': 'branch', 'br': 'branch',
+    'ctr': 'contract', 'cntr': 'contract', 'shp': 'shipment', 'ship': 'shipment',
+}
+
+_CAMEL_RE = re.compile(r'(?<=[a-z0-9])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+_SPLIT_RE = re.compile(r'[^0-9A-Za-z가-힣]+')
+
+
+def to_snake(name: str) -> str:
+    """camelCase/PascalCase -> snake_case (이미 snake_case면 소문자화만)"""
+    return _CAMEL_RE.sub('_', name).lower()
+
+
+def _singular(token: str) -> str:
+    if len(token) <= 3:
+        return token
+    if token.endswith('ies'):
+        return token[:-3] + 'y'
+    if token.endswith(('ses', 'xes', 'zes', 'ches', 'shes')):
+        return token[:-2]
+    if token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def name_tokens(name: str, strip_prefix: bool = True) -> list[str]:
+    """이름 -> 정규화 토큰 목록"""
+    tokens = [t for t in _SPLIT_RE.split(to_snake(name)) if t]
+    if strip_prefix:
+        stripped = 0
+        while (
+            len(tokens) > 1
+            and stripped < _MAX_PREFIX_STRIP
+            and tokens[0] in _DOMAIN_PREFIXES
+        ):
+            tokens = tokens[1:]
+            stripped += 1
+    return [_singular(_ABBREVIATIONS.get(t, t)) for t in tokens]
+
+
+def name_key(name: str, strip_prefix: bool = True) -> str:
+    return ''.join(name_tokens(name, strip_prefix))
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def name_grams(name: str) -> set[str]:
+    """컬럼 기준 이름의 trigram (NameIndex.lookup과 같은 정규화)"""
+    return _trigrams(name_key(name, strip_prefix=False))
+
+
+def name_similarity(name: str, table: str) -> float:
+    """컬럼 기준 이름과 테이블명 1개의 유사도 (NameIndex.lookup 점수와 같은 규칙)"""
+    key = name_key(name, strip_prefix=False)
+    if not key:
+        return 0.0
+    table_key = name_key(table)
+    if key == table_key:
+        return 1.0
+    grams, target = _trigrams(key), _trigrams(table_key)
+    return 2 * len(grams & target) / (len(grams) + len(target))
+
+
+class NameIndex:
+    """테이블명 trigram 역색인"""
+
+    # posting이 이 비율보다 긴 trigram은 후보 생성에 쓰지 않는다 (유사도 계산에는 사용)
+    _COMMON_RATIO = 0.2
+    _COMMON_MIN   = 32
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names: list[str] = list(names)
+        self._exact: dict[str, list[int]] = {}
+        self._grams: list[set[str]] = []
+        self._postings: dict[str, list[int]] = {}
+        self._memo: dict[tuple[str, float], list[tuple[int, float]]] = {}
+
+        for idx, name in enumerate(self.names):
+            key = name_key(name)
+            self._exact.setdefault(key, []).append(idx)
+            grams = _trigrams(key)
+            self._grams.append(grams)
+            for g in grams:
+                self._postings.setdefault(g, []).append(idx)
+
+        self._common_limit = self._limit(len(self.names))
+
+    @classmethod
+    def _limit(cls, size: int) -> int:
+        return max(cls._COMMON_MIN, int(size * cls._COMMON_RATIO))
+
+    def changed_grams(self, added: Iterable[str], removed: Iterable[str]) -> set[str]:
+        """
+        이 인덱스에서 added를 빼고 removed를 더한 이전 인덱스와 비교해
+        후보 생성 상태(없음 / 희소 / 흔함)가 달라진 trigram.
+        이 trigram을 쓰지 않는 이름은 후보 집합이 added/removed 테이블만큼만 달라진다.
+        """
+        delta: dict[str, int] = {}
+        added, removed = list(added), list(removed)
+        for name in added:
+            for g in _trigrams(name_key(name)):
+                delta[g] = delta.get(g, 0) - 1
+        for name in removed:
+            for g in _trigrams(name_key(name)):
+                delta[g] = delta.get(g, 0) + 1
+
+        new_limit = self._common_limit
+        old_limit = self._limit(len(self.names) - len(added) + len(removed))
+
+        def status(count: int, limit: int) -> int:
+            return 0 if count <= 0 else 1 if count <= limit else 2
+
+        grams = set(delta)
+        if old_limit != new_limit:
+            grams.update(self._postings)
+        changed = set()
+        for g in grams:
+            count = len(self._postings.get(g, ()))
+            if status(count, new_limit) != status(count + delta.get(g, 0), old_limit):
+                changed.add(g)
+        return changed
+
+    def lookup(
+        self,
+        name: str,
+        min_similarity: float = NAME_MATCH_MIN_SIMILARITY,
+        limit: int = NAME_MATCH_TOP_K,
+        exclude: str | None = None,
+    ) -> list[tuple[str, float]]:
+        """
+        name(컬럼 기준 이름)과 가까운 테이블 (테이블명, 유사도) 목록.
+        유사도 내림차순, 동률은 테이블 선언 순서.
+        """
+        # 컬럼 기준 이름은 prefix 제거 없이 (cd_type 같은 이름 보존)
+        key = name_key(name, strip_prefix=False)
+        if not key:
+            return []
+
+        scored = self._memo.get((key, min_similarity))
+        if scored is None:
+            scored = self._score(key, min_similarity)
+            self._memo[(key, min_similarity)] = scored
+
+        out = [
+            (self.names[idx], round(sim, 3)) for idx, sim in scored
+            if exclude is None or self.names[idx] != exclude
+        ]
+        return out[:limit]
+
+    def _score(self, key: str, min_similarity: float) -> list[tuple[int, float]]:
+        scored: dict[int, float] = {idx: 1.0 for idx in self._exact.get(key, ())}
+
+        grams = _trigrams(key)
+        postings = [self._postings[g] for g in grams if g in self._postings]
+        rare = [p for p in postings if len(p) <= self._common_limit] or postings
+        candidates = {idx for p in rare for idx in p}
+
+        for idx in candidates:
+            if idx in scored:
+                continue
+            target = self._grams[idx]
+            sim = 2 * len(grams & target) / (len(grams) + len(target))
+            if sim >= min_similarity:
+                scored[idx] = sim
+
+        return sorted(scored.items(), key=lambda x: (-x[1], x[0]))
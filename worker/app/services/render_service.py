@@ -0,0 +1,654 @@
+﻿"""
+ERD 이미지 렌더링 (SVG / PNG 타일)
+
+브라우저 없이 ErdGraph + 화면 좌표를 SVG 또는 PNG로 그린다. 큰 다이어그램은
+지도 타일처럼 zoom 단계별 {z}/{x}/{y} 타일로 잘라 클라이언트가 보이는 영역만 받는다.
+
+- 좌표: 요청의 positions (클라이언트 레이아웃). 좌표가 없는 테이블은 프론트엔드
+  ErdStudioPage의 도메인 격자 배치(computeDomainPositions)와 같은 규칙으로 놓는다.
+- zoom: max_zoom이 원본 크기(scale 1), 한 단계 내려갈 때마다 1/2. zoom 0은 타일 1장.
+- 상세도(LOD): scale에 따라 컬럼까지 / 테이블명만 / 도메인 색 박스만 그리고,
+  아주 작은 scale에서는 관계선을 생략한다.
+- PNG는 표준 라이브러리(zlib)만으로 래스터화한다. 글꼴이 없으므로 글자는 길이에
+  비례한 막대(greeking)로 표시한다. 읽을 수 있는 글자가 필요하면 SVG 타일을 쓴다.
+- 캐시: 장면(배치 + 타일 격자 색인)은 graph_hash별 LRU, 렌더된 타일은 바이트 상한 LRU.
+  graph_hash는 그리는 내용(테이블/컬럼/관계/좌표/tile_size)의 해시라 입력이 같으면 같다.
+
+환경 변수:
+  ERD_RENDER_MAX_SCENES  장면 캐시 개수 (기본 8)
+  ERD_TILE_CACHE_MB      타일 캐시 상한 MB (기본 64, 0이면 비활성)
+  ERD_RENDER_MAX_CANVAS  원본 좌표계 캔버스 한 변 상한 px (기본 262144, 넘으면 413)
+"""
+import hashlib
+import json
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Literal
+from xml.sax.saxutils import escape
+
+from app.models.erd import ErdGraph, NodePosition, RenderManifest, TileLevel
+
+ERD_RENDER_MAX_SCENES = int(os.getenv('ERD_RENDER_MAX_SCENES', '8'))
+ERD_TILE_CACHE_MB     = float(os.getenv('ERD_TILE_CACHE_MB', '64'))
+ERD_RENDER_MAX_CANVAS = int(os.getenv('ERD_RENDER_MAX_CANVAS', '262144'))
+
+TILE_SIZE_MIN, TILE_SIZE_MAX = 128, 2048
+FULL_PNG_MAX_PIXELS = 16 * 1024 * 1024     # 타일이 아닌 전체 PNG 1장의 픽셀 상한
+MAX_INDEX_CELLS     = 4 * 1024 * 1024      # 장면 격자 색인 항목(테이블/관계선 x 타일 칸) 상한
+
+# 프론트엔드 ErdStudioPage 도메인 배치 상수
+NODE_W, NODE_H = 280, 260
+GAP_X, GAP_Y = 40, 40
+CLUSTER_GAP_X, CLUSTER_GAP_Y = 100, 160
+LABEL_H = 60
+
+HEADER_H = 28
+ROW_H    = 18
+MARGIN   = 40
+MAX_ROWS = (NODE_H - HEADER_H) // ROW_H     # 넘치면 마지막 줄은 '+N'
+
+# 상세도 경계 (scale)
+LOD_FULL_SCALE  = 0.5
+LOD_LABEL_SCALE = 0.2
+LOD_EDGE_SCALE  = 0.08
+
+_PALETTE = (
+    '#3b82f6', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6',
+    '#06b6d4', '#ec4899', '#84cc16', '#f97316', '#6366f1',
+)
+_EDGE_COLOR = {'FK': '#334155', 'HIGH': '#2563eb', 'MEDIUM': '#d97706', 'LOW': '#9ca3af'}
+_BORDER  = '#cbd5e1'
+_TEXT    = '#1e293b'
+_SUBTEXT = '#64748b'
+_PK_MARK = '#f59e0b'
+_FK_MARK = '#3b82f6'
+
+Detail = Literal['full', 'label', 'box']
+
+
+class RenderError(Exception):
+    """렌더링 에러: 라우터에서 HTTP 응답으로 변환"""
+    def __init__(self, message: str, error_code: str = 'UNKNOWN'):
+        self.message    = message
+        self.error_code = error_code
+        super().__init__(message)
+
+
+# ── 도메인 격자 배치 (ErdStudioPage와 같은 규칙) ─────────────────────────────────
+def _domain_cols(count: int) -> int:
+    if count <= 1:
+        return 1
+    return max(2, min(50, math.ceil(math.sqrt(count * 4))))
+
+
+def _canvas_ratio(domain_count: int) -> float:
+    if domain_count <= 5:
+        return 2.0
+    if domain_count <= 15:
+        return 2.5
+    if domain_count <= 30:
+        return 3.0
+    return 4.0
+
+
+def _refine_etc(names: list[str], domains: list[str]) -> list[str]:
+    """ETC 도메인 테이블 중 같은 prefix가 2개 이상이면 prefix 도메인으로 승격"""
+    prefix_count: dict[str, int] = {}
+    for name, domain in zip(names, domains):
+        if domain == 'ETC' and name.find('_') > 0:
+            prefix = name[:name.index('_')].upper()
+            prefix_count[prefix] = prefix_count.get(prefix, 0) + 1
+    out = []
+    for name, domain in zip(names, domains):
+        if domain == 'ETC' and name.find('_') > 0:
+            prefix = name[:name.index('_')].upper()
+            domain = prefix if prefix_count[prefix] >= 2 else domain
+        out.append(domain)
+    return out
+
+
+def domain_layout(
+    names: list[str], domains: list[str],
+) -> tuple[dict[str, tuple[float, float]], list[tuple[str, float, float, float]]]:
+    """
+    테이블명 -> 좌상단 좌표, 도메인 라벨 [(domain, x, y, width)]
+    도메인을 이름순 클러스터로 묶어 캔버스 가로:세로 목표 비율에 맞춰 행을 채운다.
+    """
+    groups: dict[str, list[str]] = {}
+    for name, domain in zip(names, _refine_etc(names, domains)):
+        groups.setdefault(domain, []).append(name)
+    if not groups:
+        return {}, []
+
+    dims = []
+    for domain in sorted(groups):
+        members = groups[domain]
+        cols = _domain_cols(len(members))
+        rows = math.ceil(len(members) / cols)
+        dims.append((
+            domain, members, cols,
+            cols * NODE_W + (cols - 1) * GAP_X,
+            LABEL_H + rows * NODE_H + (rows - 1) * GAP_Y,
+        ))
+
+    n = len(dims)
+    avg_w = sum(d[3] + CLUSTER_GAP_X for d in dims) / n
+    avg_h = sum(d[4] + CLUSTER_GAP_Y for d in dims) / n
+    per_row = max(1, min(n, round(math.sqrt(n * _canvas_ratio(n) * avg_h / avg_w))))
+
+    positions: dict[str, tuple[float, float]] = {}
+    labels: list[tuple[str, float, float, float]] = []
+    row_x = row_y = row_max_h = 0.0
+    domain_col = 0
+    for domain, members, cols, cluster_w, cluster_h in dims:
+        labels.append((domain, row_x, row_y, cluster_w))
+        for i, name in enumerate(members):
+            positions[name] = (
+                row_x + (i % cols) * (NODE_W + GAP_X),
+                row_y + LABEL_H + (i // cols) * (NODE_H + GAP_Y),
+            )
+        row_max_h = max(row_max_h, cluster_h)
+        row_x += cluster_w + CLUSTER_GAP_X
+        domain_col += 1
+        if domain_col >= per_row:
+            domain_col = 0
+            row_x = 0.0
+            row_y += row_max_h + CLUSTER_GAP_Y
+            row_max_h = 0.0
+    return positions, labels
+
+
+# ── 장면 ──────────────────────────────────────────────────────────────────────
+def _domain_color(domain: str) -> str:
+    return _PALETTE[int(hashlib.md5(domain.encode('utf-8')).hexdigest()[:8], 16) % len(_PALETTE)]
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+def _num(v: float) -> str:
+    return f'{v:.1f}'.rstrip('0').rstrip('.')
+
+
+class _Scene:
+    """
+    원본 좌표계(scale 1, 여백 포함 0 기준)의 그릴 항목 + tile_size 격자 색인
+      tables: (x, y, w, h, name, color, rows, overflow)  rows = ((col, type, is_pk, is_fk), ...)
+      edges:  (points, color, dashed)  직교 경로 꼭짓점
+      labels: (domain, x, y, width, color)
+    """
+
+    def __init__(self, graph_hash: str, tile_size: int, tables: list, edges: list, labels: list,
+                 width: int, height: int) -> None:
+        self.graph_hash = graph_hash
+        self.tile_size  = tile_size
+        self.tables     = tables
+        self.edges      = edges
+        self.labels     = labels
+        self.width      = width
+        self.height     = height
+        self.max_zoom   = max(0, math.ceil(math.log2(max(width, height) / tile_size)))
+        self._table_cells: dict[tuple[int, int], list[int]] = {}
+        self._edge_cells:  dict[tuple[int, int], list[int]] = {}
+        self._cell_count = 0
+        for i, (x, y, w, h, *_) in enumerate(tables):
+            self._register(self._table_cells, i, x, y, x + w, y + h)
+        for i, (points, _, _) in enumerate(edges):
+            for (ax, ay), (bx, by) in zip(points, points[1:]):
+                self._register(self._edge_cells, i, min(ax, bx), min(ay, by), max(ax, bx), max(ay, by))
+
+    def _register(self, cells: dict, idx: int, x0: float, y0: float, x1: float, y1: float) -> None:
+        size = self.tile_size
+        # 멀리 떨어진 테이블을 잇는 긴 관계선이 많으면 칸 수가 폭증한다: 색인 전에 상한 확인
+        self._cell_count += (int(x1 // size) - int(x0 // size) + 1) * (int(y1 // size) - int(y0 // size) + 1)
+        if self._cell_count > MAX_INDEX_CELLS:
+            raise RenderError('다이어그램이 너무 큽니다. 테이블 좌표 범위를 줄이거나 tile_size를 키워주세요.', 'TOO_LARGE')
+        for cx in range(int(x0 // size), int(x1 // size) + 1):
+            for cy in range(int(y0 // size), int(y1 // size) + 1):
+                cells.setdefault((cx, cy), []).append(idx)
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> tuple[list[int], list[int]]:
+        """영역과 겹칠 수 있는 (테이블, 관계선) 번호 (그리는 순서 = 번호 순)"""
+        size = self.tile_size
+        cells = [
+            (cx, cy)
+            for cx in range(max(0, int(x0 // size)), int(x1 // size) + 1)
+            for cy in range(max(0, int(y0 // size)), int(y1 // size) + 1)
+        ]
+        tables = {i for c in cells for i in self._table_cells.get(c, ())}
+        edges  = {i for c in cells for i in self._edge_cells.get(c, ())}
+        return sorted(tables), sorted(edges)
+
+    def level(self, zoom: int) -> TileLevel:
+        scale = 2.0 ** (zoom - self.max_zoom)
+        return TileLevel(
+            zoom=zoom,
+            scale=scale,
+            columns=max(1, math.ceil(self.width * scale / self.tile_size)),
+            rows=max(1, math.ceil(self.height * scale / self.tile_size)),
+            detail=_detail(scale),
+        )
+
+    def manifest(self) -> RenderManifest:
+        return RenderManifest(
+            graph_hash=self.graph_hash,
+            width=self.width,
+            height=self.height,
+            tile_size=self.tile_size,
+            max_zoom=self.max_zoom,
+            table_count=len(self.tables),
+            levels=[self.level(z) for z in range(self.max_zoom + 1)],
+        )
+
+
+def _detail(scale: float) -> Detail:
+    if scale >= LOD_FULL_SCALE:
+        return 'full'
+    if scale >= LOD_LABEL_SCALE:
+        return 'label'
+    return 'box'
+
+
+def _pack_graph(
+    graph: ErdGraph, positions: dict[str, NodePosition],
+) -> tuple[list[tuple], list[tuple], list[tuple]]:
+    """
+    (테이블, 관계, 라벨) - 그리는 데 쓰는 값만 (graph_hash 입력)
+    좌표가 없는 테이블은 도메인 격자로 배치하고, 일부만 좌표가 있으면 그 아래에 놓는다.
+    """
+    placed = {t.name: (positions[t.name].x, positions[t.name].y) for t in graph.tables if t.name in positions}
+    missing = [t for t in graph.tables if t.name not in placed]
+    labels: list[tuple] = []
+    if missing:
+        grid, grid_labels = domain_layout([t.name for t in missing], [t.domain for t in missing])
+        dy = max((y + NODE_H for _, y in placed.values()), default=-CLUSTER_GAP_Y) + CLUSTER_GAP_Y
+        placed.update({name: (x, y + dy) for name, (x, y) in grid.items()})
+        labels = [(domain, x, y + dy, w) for domain, x, y, w in grid_labels]
+
+    tables = [
+        (
+            t.name, t.domain, placed[t.name],
+            tuple((c.name, c.data_type, c.is_pk, c.is_fk) for c in t.columns),
+        )
+        for t in graph.tables
+    ]
+    relations = [
+        (r.source_table, r.source_column, r.target_table, r.target_column, r.confidence)
+        for r in graph.relations
+    ]
+    return tables, relations, labels
+
+
+def graph_hash(packed: tuple, tile_size: int) -> str:
+    raw = json.dumps([packed, tile_size], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+
+def _anchor_y(table: tuple, column: str, col_index: dict[str, int]) -> float:
+    """컬럼 행의 세로 중앙 (표시되지 않은 컬럼은 헤더 중앙)"""
+    x, y, w, h, name, color, rows, overflow = table
+    i = col_index.get(column)
+    if i is None or i >= len(rows):
+        return y + HEADER_H / 2
+    return y + HEADER_H + i * ROW_H + ROW_H / 2
+
+
+def _route(src: tuple, y1: float, dst: tuple, y2: float) -> tuple[tuple[float, float], ...]:
+    """직교 3구간 경로: 가로 -> 세로 -> 가로"""
+    sx, _, sw = src[0], src[1], src[2]
+    tx, _, tw = dst[0], dst[1], dst[2]
+    if src is dst:
+        x = sx + sw
+        if y1 == y2:
+            y2 = src[1] + HEADER_H / 2
+        return ((x, y1), (x + 20, y1), (x + 20, y2), (x, y2))
+    if tx >= sx + sw:
+        x1, x2 = sx + sw, tx
+        mid = (x1 + x2) / 2
+    elif tx + tw <= sx:
+        x1, x2 = sx, tx + tw
+        mid = (x1 + x2) / 2
+    else:
+        # 세로로 겹침 -> 양쪽 오른편에서 바깥으로 돌아간다
+        x1, x2 = sx + sw, tx + tw
+        mid = max(x1, x2) + 20
+    return ((x1, y1), (mid, y1), (mid, y2), (x2, y2))
+
+
+def _build_scene(packed: tuple, tile_size: int, key: str) -> _Scene:
+    tables_in, relations_in, labels_in = packed
+    xs = [p[0] for _, _, p, _ in tables_in] + [x for _, x, _, _ in labels_in]
+    ys = [p[1] for _, _, p, _ in tables_in] + [y for _, _, y, _ in labels_in]
+    ox = MARGIN - min(xs, default=0.0)
+    oy = MARGIN - min(ys, default=0.0)
+
+    tables: list[tuple] = []
+    by_name: dict[str, int] = {}
+    col_indexes: list[dict[str, int]] = []
+    for name, domain, (x, y), columns in tables_in:
+        if len(columns) > MAX_ROWS:
+            rows, overflow = columns[:MAX_ROWS - 1], len(columns) - (MAX_ROWS - 1)
+        else:
+            rows, overflow = columns, 0
+        h = HEADER_H + (len(rows) + (1 if overflow else 0)) * ROW_H + 6
+        by_name[name] = len(tables)
+        col_indexes.append({c[0]: i for i, c in enumerate(columns)})
+        tables.append((x + ox, y + oy, NODE_W, h, name, _domain_color(domain), rows, overflow))
+
+    edges: list[tuple] = []
+    for src_t, src_c, dst_t, dst_c, confidence in relations_in:
+        si, di = by_name.get(src_t), by_name.get(dst_t)
+        if si is None or di is None:
+            continue
+        src, dst = tables[si], tables[di]
+        points = _route(
+            src, _anchor_y(src, src_c, col_indexes[si]),
+            dst, _anchor_y(dst, dst_c, col_indexes[di]),
+        )
+        edges.append((points, _EDGE_COLOR.get(confidence, _BORDER), confidence != 'FK'))
+
+    labels = [(domain, x + ox, y + oy, w, _domain_color(domain)) for domain, x, y, w in labels_in]
+
+    right  = max([t[0] + t[2] for t in tables] + [x + w for _, x, _, w, _ in labels], default=0.0)
+    bottom = max([t[1] + t[3] for t in tables] + [y + LABEL_H for _, _, y, _, _ in labels], default=0.0)
+    if max(right, bottom) + MARGIN > ERD_RENDER_MAX_CANVAS:
+        raise RenderError(
+            f'다이어그램 캔버스가 너무 큽니다 (한 변 {ERD_RENDER_MAX_CANVAS}px 초과). 테이블 좌표 범위를 줄여주세요.',
+            'TOO_LARGE',
+        )
+    return _Scene(
+        key, tile_size, tables, edges, labels,
+        width=max(1, math.ceil(right + MARGIN)), height=max(1, math.ceil(bottom + MARGIN)),
+    )
+
+
+# ── SVG ───────────────────────────────────────────────────────────────────────
+def _svg(scene: _Scene, x0: float, y0: float, w: float, h: float, scale: float) -> bytes:
+    detail = _detail(scale)
+    table_ids, edge_ids = scene.query(x0, y0, x0 + w, y0 + h)
+    px_w, px_h = max(1, round(w * scale)), max(1, round(h * scale))
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{px_w}" height="{px_h}" '
+        f'viewBox="{_num(x0)} {_num(y0)} {_num(w)} {_num(h)}" font-family="sans-serif" font-size="12">',
+        '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" markerHeight="8" '
+        'orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" fill="context-stroke"/></marker></defs>',
+        f'<rect x="{_num(x0)}" y="{_num(y0)}" width="{_num(w)}" height="{_num(h)}" fill="#ffffff"/>',
+    ]
+
+    for domain, lx, ly, lw, color in scene.labels:
+        if lx > x0 + w or lx + lw < x0 or ly > y0 + h or ly + LABEL_H < y0:
+            continue
+        out.append(f'<rect x="{_num(lx)}" y="{_num(ly + LABEL_H - 16)}" width="{_num(lw)}" height="4" fill="{color}"/>')
+        if detail != 'box':
+            out.append(
+                f'<text x="{_num(lx)}" y="{_num(ly + LABEL_H - 24)}" font-size="22" font-weight="bold" '
+                f'fill="{color}">{escape(domain or "-")}</text>'
+            )
+
+    if scale >= LOD_EDGE_SCALE:
+        marker = ' marker-end="url(#arrow)"' if detail == 'full' else ''
+        for i in edge_ids:
+            points, color, dashed = scene.edges[i]
+            dash = ' stroke-dasharray="6 4"' if dashed else ''
+            pts = ' '.join(f'{_num(px)},{_num(py)}' for px, py in points)
+            out.append(
+                f'<polyline points="{pts}" fill="none" stroke="{color}" stroke-width="1.2" '
+                f'vector-effect="non-scaling-stroke"{dash}{marker}/>'
+            )
+
+    for i in table_ids:
+        tx, ty, tw, th, name, color, rows, overflow = scene.tables[i]
+        if detail == 'box':
+            out.append(f'<rect x="{_num(tx)}" y="{_num(ty)}" width="{tw}" height="{th}" fill="{color}"/>')
+            continue
+        out.append(
+            f'<rect x="{_num(tx)}" y="{_num(ty)}" width="{tw}" height="{th}" rx="6" '
+            f'fill="#ffffff" stroke="{_BORDER}" vector-effect="non-scaling-stroke"/>'
+        )
+        out.append(f'<rect x="{_num(tx)}" y="{_num(ty)}" width="{tw}" height="{HEADER_H}" rx="6" fill="{color}"/>')
+        if detail == 'label':
+            # 화면에서 약 11px로 보이도록 확대, 박스 폭을 넘지 않게 제한
+            size = min(11 / scale, 1.6 * tw / max(len(name), 1))
+            out.append(
+                f'<text x="{_num(tx + tw / 2)}" y="{_num(ty + th / 2 + size / 3)}" text-anchor="middle" '
+                f'font-size="{_num(size)}" font-weight="bold" fill="{_TEXT}">{escape(name)}</text>'
+            )
+        elif detail == 'full':
+            out.append(
+                f'<text x="{_num(tx + 10)}" y="{_num(ty + 19)}" font-weight="bold" '
+                f'fill="#ffffff">{escape(_clip(name, 34))}</text>'
+            )
+            for r, (col, data_type, is_pk, is_fk) in enumerate(rows):
+                ry = ty + HEADER_H + r * ROW_H + 13
+                mark = 'PK' if is_pk else 'FK' if is_fk else ''
+                if mark:
+                    out.append(
+                        f'<text x="{_num(tx + 6)}" y="{_num(ry)}" font-size="9" font-weight="bold" '
+                        f'fill="{_PK_MARK if is_pk else _FK_MARK}">{mark}</text>'
+                    )
+                out.append(f'<text x="{_num(tx + 26)}" y="{_num(ry)}" fill="{_TEXT}">{escape(_clip(col, 24))}</text>')
+                out.append(
+                    f'<text x="{_num(tx + tw - 8)}" y="{_num(ry)}" text-anchor="end" font-size="10" '
+                    f'fill="{_SUBTEXT}">{escape(_clip(data_type, 16))}</text>'
+                )
+            if overflow:
+                ry = ty + HEADER_H + len(rows) * ROW_H + 13
+                out.append(f'<text x="{_num(tx + 26)}" y="{_num(ry)}" fill="{_SUBTEXT}">+{overflow} more</text>')
+
+    out.append('</svg>')
+    return '\n'.join(out).encode('utf-8')
+
+
+# ── PNG ───────────────────────────────────────────────────────────────────────
+def _rgb(color: str) -> bytes:
+    return bytes.fromhex(color[1:])
+
+
+class _Canvas:
+    """RGB 8bit 캔버스 (사각형 채우기 + 가로/세로 선만)"""
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width  = width
+        self.height = height
+        self.pixels = bytearray(b'\xff' * (width * height * 3))
+
+    def fill(self, x0: float, y0: float, x1: float, y1: float, rgb: bytes) -> None:
+        ix0, iy0 = max(0, int(x0)), max(0, int(y0))
+        ix1 = min(self.width, max(int(x1), int(x0) + 1))
+        iy1 = min(self.height, max(int(y1), int(y0) + 1))
+        if ix0 >= ix1 or iy0 >= iy1:
+            return
+        run = rgb * (ix1 - ix0)
+        stride = self.width * 3
+        for row in range(iy0, iy1):
+            start = row * stride + ix0 * 3
+            self.pixels[start:start + len(run)] = run
+
+    def segment(self, ax: float, ay: float, bx: float, by: float, rgb: bytes, dashed: bool) -> None:
+        """가로 또는 세로 1px 선 (점선은 6px 그림 / 4px 비움, 캔버스 밖 구간은 건너뜀)"""
+        horizontal = ay == by
+        lo, hi = sorted((ax, bx) if horizontal else (ay, by))
+        fixed, limit = (ay, self.width) if horizontal else (ax, self.height)
+        if not 0 <= fixed < (self.height if horizontal else self.width):
+            return
+        if dashed:
+            # 점선 위상 유지: 캔버스 앞부분은 10px 단위로 건너뛴다
+            start = lo + max(0, (-lo) // 10 * 10)
+            runs = [(p, min(hi, p + 6)) for p in range(int(start), int(min(hi, limit)) + 1, 10)]
+        else:
+            runs = [(max(lo, 0), min(hi, limit))]
+        for a, b in runs:
+            if a > b:
+                continue
+            if horizontal:
+                self.fill(a, fixed, b + 1, fixed + 1, rgb)
+            else:
+                self.fill(fixed, a, fixed + 1, b + 1, rgb)
+
+    def png(self) -> bytes:
+        stride = self.width * 3
+        raw = b''.join(
+            b'\x00' + self.pixels[row * stride:(row + 1) * stride] for row in range(self.height)
+        )
+
+        def chunk(tag: bytes, data: bytes) -> bytes:
+            return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+        return (
+            b'\x89PNG\r\n\x1a\n'
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', self.width, self.height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 6))
+            + chunk(b'IEND', b'')
+        )
+
+
+def _png(scene: _Scene, x0: float, y0: float, w: float, h: float, scale: float) -> bytes:
+    detail = _detail(scale)
+    table_ids, edge_ids = scene.query(x0, y0, x0 + w, y0 + h)
+    canvas = _Canvas(max(1, round(w * scale)), max(1, round(h * scale)))
+
+    def px(x: float, y: float) -> tuple[float, float]:
+        return (x - x0) * scale, (y - y0) * scale
+
+    for _, lx, ly, lw, color in scene.labels:
+        ax, ay = px(lx, ly + LABEL_H - 16)
+        canvas.fill(ax, ay, ax + lw * scale, ay + max(1.0, 4 * scale), _rgb(color))
+
+    if scale >= LOD_EDGE_SCALE:
+        for i in edge_ids:
+            points, color, dashed = scene.edges[i]
+            rgb = _rgb(color)
+            for (ax, ay), (bx, by) in zip(points, points[1:]):
+                (pax, pay), (pbx, pby) = px(ax, ay), px(bx, by)
+                canvas.segment(round(pax), round(pay), round(pbx), round(pby), rgb, dashed)
+
+    border, white = _rgb(_BORDER), b'\xff\xff\xff'
+    for i in table_ids:
+        tx, ty, tw, th, name, color, rows, overflow = scene.tables[i]
+        ax, ay = px(tx, ty)
+        bx, by = ax + tw * scale, ay + th * scale
+        if detail == 'box':
+            canvas.fill(ax, ay, bx, by, _rgb(color))
+            continue
+        canvas.fill(ax, ay, bx, by, border)
+        canvas.fill(ax + 1, ay + 1, bx - 1, by - 1, white)
+        canvas.fill(ax, ay, bx, ay + HEADER_H * scale, _rgb(color))
+        # 글자 대신 길이에 비례한 막대
+        bar_h = max(1.0, 8 * scale)
+        mid = ay + HEADER_H * scale / 2
+        canvas.fill(ax + 8 * scale, mid - bar_h / 2,
+                    ax + min(len(name) * 7, tw - 16) * scale + 8 * scale, mid + bar_h / 2, white)
+        if detail != 'full':
+            continue
+        subtext = _rgb(_SUBTEXT)
+        for r, (col, data_type, is_pk, is_fk) in enumerate(rows):
+            ry = ay + (HEADER_H + r * ROW_H + ROW_H / 2) * scale
+            if is_pk or is_fk:
+                canvas.fill(ax + 8 * scale, ry - 3 * scale, ax + 14 * scale, ry + 3 * scale,
+                            _rgb(_PK_MARK if is_pk else _FK_MARK))
+            canvas.fill(ax + 26 * scale, ry - 3 * scale,
+                        ax + (26 + min(len(col) * 6.5, 150)) * scale, ry + 3 * scale, subtext)
+            type_w = min(len(data_type) * 5.5, 80)
+            canvas.fill(bx - (8 + type_w) * scale, ry - 2.5 * scale, bx - 8 * scale, ry + 2.5 * scale, border)
+        if overflow:
+            ry = ay + (HEADER_H + len(rows) * ROW_H + ROW_H / 2) * scale
+            canvas.fill(ax + 26 * scale, ry - 3 * scale, ax + 80 * scale, ry + 3 * scale, subtext)
+    return canvas.png()
+
+
+# ── 캐시 + 공개 API ────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_scenes: OrderedDict[str, _Scene] = OrderedDict()
+_tiles: OrderedDict[tuple, bytes] = OrderedDict()
+_tile_bytes = 0
+
+
+def register_graph(graph: ErdGraph, positions: dict[str, NodePosition], tile_size: int) -> RenderManifest:
+    """그래프 + 좌표로 장면을 만들어 캐시하고 타일 목록(manifest)을 돌려준다."""
+    if not TILE_SIZE_MIN <= tile_size <= TILE_SIZE_MAX:
+        raise RenderError(f'tile_size는 {TILE_SIZE_MIN} ~ {TILE_SIZE_MAX} 사이여야 합니다.', 'INVALID_REQUEST')
+    packed = _pack_graph(graph, positions)
+    key = graph_hash(packed, tile_size)
+    with _lock:
+        scene = _scenes.get(key)
+        if scene is not None:
+            _scenes.move_to_end(key)
+            return scene.manifest()
+
+    scene = _build_scene(packed, tile_size, key)
+    with _lock:
+        _scenes[key] = scene
+        _scenes.move_to_end(key)
+        while len(_scenes) > max(1, ERD_RENDER_MAX_SCENES):
+            _scenes.popitem(last=False)
+    return scene.manifest()
+
+
+def _scene(key: str) -> _Scene:
+    with _lock:
+        scene = _scenes.get(key)
+        if scene is not None:
+            _scenes.move_to_end(key)
+    if scene is None:
+        raise RenderError('렌더 캐시에 없는 그래프입니다. 그래프를 다시 등록해주세요.', 'NOT_FOUND')
+    return scene
+
+
+def _cached(key: tuple, render) -> bytes:
+    global _tile_bytes
+    with _lock:
+        hit = _tiles.get(key)
+        if hit is not None:
+            _tiles.move_to_end(key)
+            return hit
+
+    data = render()
+    limit = int(ERD_TILE_CACHE_MB * 1024 * 1024)
+    if 0 < len(data) <= limit:
+        with _lock:
+            if key not in _tiles:
+                _tiles[key] = data
+                _tile_bytes += len(data)
+                while _tile_bytes > limit:
+                    _, old = _tiles.popitem(last=False)
+                    _tile_bytes -= len(old)
+    return data
+
+
+def render_tile(key: str, zoom: int, x: int, y: int, fmt: Literal['svg', 'png']) -> bytes:
+    """zoom 단계의 (x, y) 타일 (tile_size x tile_size 픽셀)"""
+    scene = _scene(key)
+    if not 0 <= zoom <= scene.max_zoom:
+        raise RenderError(f'zoom은 0 ~ {scene.max_zoom} 사이여야 합니다.', 'NOT_FOUND')
+    level = scene.level(zoom)
+    if not (0 <= x < level.columns and 0 <= y < level.rows):
+        raise RenderError('타일 범위를 벗어났습니다.', 'NOT_FOUND')
+
+    span = scene.tile_size / level.scale
+    draw = _svg if fmt == 'svg' else _png
+    return _cached(
+        (key, fmt, zoom, x, y),
+        lambda: draw(scene, x * span, y * span, span, span, level.scale),
+    )
+
+
+def render_image(key: str, fmt: Literal['svg', 'png'], zoom: int | None = None) -> bytes:
+    """다이어그램 전체 1장 (zoom 생략 시 SVG는 원본 크기, PNG는 zoom 0)"""
+    scene = _scene(key)
+    if zoom is None:
+        zoom = scene.max_zoom if fmt == 'svg' else 0
+    if not 0 <= zoom <= scene.max_zoom:
+        raise RenderError(f'zoom은 0 ~ {scene.max_zoom} 사이여야 합니다.', 'NOT_FOUND')
+    scale = scene.level(zoom).scale
+    if fmt == 'png' and scene.width * scene.height * scale * scale > FULL_PNG_MAX_PIXELS:
+        raise RenderError('PNG 전체 이미지가 너무 큽니다. 더 낮은 zoom이나 타일을 사용해주세요.', 'TOO_LARGE')
+    draw = _svg if fmt == 'svg' else _png
+    return _cached(
+        (key, fmt, zoom, None, None),
+        lambda: draw(scene, 0.0, 0.0, float(scene.width), float(scene.height), scale),
+    )
@@ -0,0 +1,265 @@
+﻿"""
+재개 가능한 메타데이터 추출 (테이블 범위 배치 + 로컬 체크포인트 + 재연결 재시도)
+
+컬럼 카탈로그를 쿼리 1건으로 읽으면 100만 컬럼 Oracle 스키마에서 90% 지점에 연결이
+끊겨도 전부 버리고 처음부터 다시 읽어야 한다. 여기서는
+
+- 컬럼 조회를 테이블명 범위 배치로 나눈다 (EXTRACT_BATCH_TABLES개씩, 커넥터가 지원할 때)
+    경계는 DB 정렬 순서의 테이블명 목록에서 정하고, 첫/마지막 배치는 열린 범위라
+    목록에 없는 테이블(그 사이 생성 등)도 빠지지 않는다.
+- 끝난 단계(컬럼 배치, fks, stats, indexes)는 EXTRACT_CHECKPOINT_DIR/<작업 키>/에 저장하고,
+  같은 작업을 다시 요청하면 남은 단계만 실행한다. 추출이 끝나면 체크포인트를 지운다.
+    작업 키: 자격증명 포함 해시 + 대상 스키마 + 수집 옵션 (single_flight.extraction_key)
+    배치 경계는 manifest에 남겨 재개 시 그대로 쓴다 (완료 배치와 어긋나지 않도록).
+    EXTRACT_CHECKPOINT_TTL 시간이 지난 체크포인트는 버린다 (오래된 스키마로 재개 방지).
+- 연결 끊김(커넥터 transient_error: MySQL 2006/2013, ORA-03113 등)은 재연결 후 같은 단계를
+  EXTRACT_MAX_RETRIES번까지 다시 시도한다 (EXTRACT_RETRY_BACKOFF초부터 2배씩 대기).
+  재연결 자체가 거부/시간 초과여도 같은 횟수 안에서 다시 시도한다.
+  처음 연결 실패는 재시도하지 않는다 (인증 실패 등은 바로 알리고 breaker가 집계).
+
+체크포인트 디렉터리를 비우면 배치/재시도만 동작한다 (같은 요청 안에서의 재개).
+
+환경 변수:
+  EXTRACT_CHECKPOINT_DIR  체크포인트 저장 디렉터리 (기본 비활성)
+  EXTRACT_CHECKPOINT_TTL  체크포인트 유효 시간(시간, 기본 24)
+  EXTRACT_BATCH_TABLES    컬럼 조회 배치당 테이블 수 (기본 500, 0이면 배치 없음)
+  EXTRACT_MAX_RETRIES     연결 끊김 시 단계별 최대 재시도 (기본 3)
+  EXTRACT_RETRY_BACKOFF   첫 재시도 대기 초 (기본 1, 이후 2배씩)
+"""
+import json
+import logging
+import os
+import shutil
+import time
+import zlib
+from contextlib import ExitStack
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+from app.services.connectors.base import BaseConnector, ConnectorError
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_CHECKPOINT_DIR = os.getenv('EXTRACT_CHECKPOINT_DIR', '')
+EXTRACT_CHECKPOINT_TTL = float(os.getenv('EXTRACT_CHECKPOINT_TTL', '24'))
+EXTRACT_BATCH_TABLES   = int(os.getenv('EXTRACT_BATCH_TABLES', '500'))
+EXTRACT_MAX_RETRIES    = int(os.getenv('EXTRACT_MAX_RETRIES', '3'))
+EXTRACT_RETRY_BACKOFF  = float(os.getenv('EXTRACT_RETRY_BACKOFF', '1'))
+
+# 재연결 실패 중 다시 시도할 error_code (네트워크 수준)
+_RECONNECT_RETRY_CODES = {'CONNECTION_REFUSED', 'TIMEOUT'}
+
+T = TypeVar('T')
+TableRange = tuple[str | None, str | None]     # (after, upto]
+
+
+def _json_default(value: Any) -> Any:
+    # 드라이버별 숫자 타입(Decimal) / 날짜 등
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return str(value)
+
+
+class CheckpointStore:
+    """작업 키별 디렉터리: manifest.json + 단계별 raw row (zlib JSON)"""
+
+    def __init__(self, root: Path, job_key: str) -> None:
+        self._dir = root / job_key
+        self._prune(root)
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _prune(root: Path) -> None:
+        if not root.is_dir():
+            return
+        cutoff = time.time() - EXTRACT_CHECKPOINT_TTL * 3600
+        for path in root.iterdir():
+            try:
+                if path.is_dir() and path.stat().st_mtime < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    logger.info('checkpoint expired: %s', path.name[:12])
+            except OSError:
+                pass
+
+    def _write(self, name: str, data: bytes) -> None:
+        # 임시 파일에 쓴 뒤 교체 (쓰는 도중 죽어도 반쯤 쓴 체크포인트가 남지 않음)
+        tmp = self._dir / f'.{name}.tmp'
+        tmp.write_bytes(data)
+        os.replace(tmp, self._dir / name)
+
+    def load_manifest(self) -> dict | None:
+        try:
+            return json.loads((self._dir / 'manifest.json').read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def save_manifest(self, manifest: dict) -> None:
+        self._write('manifest.json', json.dumps(manifest, ensure_ascii=False).encode('utf-8'))
+
+    def load(self, step: str) -> list[dict] | None:
+        try:
+            return json.loads(zlib.decompress((self._dir / f'{step}.json.z').read_bytes()))
+        except (OSError, ValueError, zlib.error):
+            return None
+
+    def save(self, step: str, rows: list[dict]) -> None:
+        data = json.dumps(rows, ensure_ascii=False, default=_json_default).encode('utf-8')
+        self._write(f'{step}.json.z', zlib.compress(data, 6))
+
+    def clear(self) -> None:
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+
+class ResumableExtraction:
+    """
+    연결 1개를 유지하며 단계별로 실행/체크포인트하는 추출 세션.
+
+        with ResumableExtraction(connector, schema, job_key) as session:
+            raw_cols = session.columns()
+            raw_fks  = session.run('fks', lambda conn: connector.extract_fks_raw(conn, schema))
+    """
+
+    def __init__(self, connector: BaseConnector, schema: str, job_key: str | None = None) -> None:
+        self._connector = connector
+        self._schema = schema
+        self._store = (
+            CheckpointStore(Path(EXTRACT_CHECKPOINT_DIR), job_key)
+            if EXTRACT_CHECKPOINT_DIR and job_key else None
+        )
+        self._manifest: dict = {}
+        self._stack: ExitStack | None = None
+        self._conn: Any = None
+        self.resumed_steps = 0
+        self.retries = 0
+
+    # ── 연결 ────────────────────────────────────────────────────────────────
+
+    def _open(self) -> None:
+        stack = ExitStack()
+        try:
+            self._conn = stack.enter_context(self._connector.connection())
+        except BaseException:
+            stack.close()
+            raise
+        self._stack = stack
+
+    def _close(self) -> None:
+        stack, self._stack, self._conn = self._stack, None, None
+        if stack is not None:
+            try:
+                stack.close()
+            except Exception:
+                pass    # 이미 끊긴 연결의 close 실패는 무시
+
+    def __enter__(self) -> 'ResumableExtraction':
+        if self._store is not None:
+            self._manifest = self._store.load_manifest() or {}
+        if not self._manifest.get('steps'):
+            # 재개할 단계가 없으면 처음 연결 실패는 그대로 알린다 (재시도 없음)
+            self._open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._close()
+        if exc_type is None and self._store is not None:
+            self._store.clear()
+
+    @property
+    def conn(self) -> Any:
+        if self._conn is None:
+            self._open()
+        return self._conn
+
+    def rollback(self) -> None:
+        """실패한 선택 단계 뒤 트랜잭션 정리 (열린 연결이 있을 때만)"""
+        if self._conn is not None:
+            try:
+                self._conn.rollback()
+            except Exception:
+                pass
+
+    # ── 단계 실행 ───────────────────────────────────────────────────────────
+
+    def _retryable(self, exc: BaseException) -> ConnectorError | None:
+        if isinstance(exc, ConnectorError):
+            return exc if exc.error_code in _RECONNECT_RETRY_CODES else None
+        return self._connector.transient_error(exc)
+
+    def _call(self, step: str, fn: Callable[[Any], T]) -> T:
+        """연결 끊김이면 재연결 후 같은 단계를 다시 실행 (EXTRACT_MAX_RETRIES번까지)"""
+        attempt = 0
+        while True:
+            try:
+                return fn(self.conn)
+            except Exception as e:
+                transient = self._retryable(e)
+                if transient is None:
+                    raise
+                self._close()
+                if attempt >= EXTRACT_MAX_RETRIES:
+                    done = len(self._manifest.get('steps', {}))
+                    hint = ' 완료된 단계는 저장되어 다시 요청하면 이어서 추출합니다.' if self._store and done else ''
+                    raise ConnectorError(
+                        f'{transient.message} (재시도 {attempt}회 실패){hint}', transient.error_code,
+                    ) from e
+                delay = EXTRACT_RETRY_BACKOFF * (2 ** attempt)
+                attempt += 1
+                self.retries += 1
+                logger.warning(
+                    'extract step %s: %s, %.1fs 후 재연결 (%d/%d)',
+                    step, transient.message, delay, attempt, EXTRACT_MAX_RETRIES,
+                )
+                time.sleep(delay)
+
+    def _checkpoint(self, step: str, rows: list[dict]) -> None:
+        if self._store is None:
+            return
+        self._store.save(step, rows)
+        self._manifest.setdefault('steps', {})[step] = len(rows)
+        self._store.save_manifest(self._manifest)
+
+    def run(self, step: str, fn: Callable[[Any], list[dict]]) -> list[dict]:
+        """단계 실행 (체크포인트가 있으면 DB 조회 없이 저장된 결과)"""
+        if self._store is not None and step in self._manifest.get('steps', {}):
+            rows = self._store.load(step)
+            if rows is not None:
+                self.resumed_steps += 1
+                return rows
+        rows = self._call(step, fn)
+        self._checkpoint(step, rows)
+        return rows
+
+    def _batches(self) -> list[TableRange]:
+        if 'batches' in self._manifest:
+            return [tuple(b) for b in self._manifest['batches']]   # type: ignore[misc]
+
+        batches: list[TableRange] = [(None, None)]
+        size = EXTRACT_BATCH_TABLES
+        if size > 0 and self._call('tables', self._connector.supports_table_ranges):
+            names = self._call('tables', lambda conn: self._connector.extract_table_names(conn, self._schema))
+            if len(names) > size:
+                # 배치별 마지막 테이블명 (마지막 배치는 열린 끝)
+                bounds = names[size - 1:len(names) - 1:size]
+                batches = list(zip([None, *bounds], [*bounds, None]))
+                logger.info('extract columns: tables=%d batches=%d', len(names), len(batches))
+        self._manifest['batches'] = batches
+        if self._store is not None:
+            self._store.save_manifest(self._manifest)
+        return batches
+
+    def columns(self) -> list[dict]:
+        """컬럼 raw row (테이블 범위 배치별로 실행/체크포인트)"""
+        batches = self._batches()
+        if batches == [(None, None)]:
+            return self.run('columns', lambda conn: self._connector.extract_columns_raw(conn, self._schema))
+
+        rows: list[dict] = []
+        for i, (after, upto) in enumerate(batches):
+            rows.extend(self.run(
+                f'columns-{i:05d}',
+                lambda conn, after=after, upto=upto: self._connector.extract_columns_range_raw(
+                    conn, self._schema, after, upto,
+                ),
+            ))
+        return rows
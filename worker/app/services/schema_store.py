@@ -0,0 +1,532 @@
+﻿"""
+스키마 저장소 (로컬 SQLite 파일)
+
+SchemaMetadata와 추론 관계를 테이블/컬럼/관계 행으로 정규화해 저장한다.
+조회는 모두 (schema_key, 소문자 이름) 인덱스를 타므로 스키마 크기와 무관하게
+결과 행 수만큼만 읽는다.
+
+  schema_tables     PK (schema_key, name_lc)
+  schema_columns    PK (schema_key, table_lc, col_no) + ix (schema_key, name_lc)
+  schema_relations  ix (schema_key, source_lc) / ix (schema_key, target_lc)
+  schema_docs       PK (schema_key, doc_id)     검색 문서 (테이블/컬럼)
+  schema_terms      PK (schema_key, term)       검색 역색인 (df + posting BLOB, search_service)
+  schema_snapshots  PK (schema_key) + ix (metadata_hash)  원본 메타데이터 (zlib JSON, 배치 추론 재사용)
+
+같은 schema_key로 다시 저장하면 트랜잭션 1건 안에서 기존 행을 지우고 교체한다.
+테이블은 소문자 이름으로 식별하므로 대소문자만 다른 테이블(Users / users)이 있는
+스키마는 저장하지 않는다 (SchemaStoreError DUPLICATE_TABLE).
+실제 FK(TableMeta.fk_refs)는 relations에 없으면 confidence 'FK'로 함께 저장한다.
+
+환경 변수:
+  SCHEMA_STORE_PATH  저장소 SQLite 파일 경로 (비우면 비활성)
+"""
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Generator
+
+from app.models.erd import InferredRelation
+from app.models.metadata import ColumnMeta, SchemaMetadata
+from app.models.store import ColumnHit, SearchHit, SearchResult, StoredSchema, StoredTable
+from app.services import search_service
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_STORE_PATH = os.getenv('SCHEMA_STORE_PATH', '')
+
+_CONFIDENCE_RANK = {'FK': 3, 'HIGH': 2, 'MEDIUM': 1, 'LOW': 0}
+
+_DDL = """
+CREATE TABLE IF NOT EXISTS schemas (
+    schema_key     TEXT PRIMARY KEY,
+    schema_name    TEXT NOT NULL,
+    extracted_at   TEXT NOT NULL,
+    stored_at      TEXT NOT NULL,
+    table_count    INTEGER NOT NULL,
+    column_count   INTEGER NOT NULL,
+    relation_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schema_tables (
+    schema_key TEXT NOT NULL,
+    name_lc    TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    comment    TEXT NOT NULL,
+    domain     TEXT NOT NULL,
+    row_count  INTEGER,
+    PRIMARY KEY (schema_key, name_lc)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS schema_columns (
+    schema_key    TEXT NOT NULL,
+    table_lc      TEXT NOT NULL,
+    col_no        INTEGER NOT NULL,
+    name          TEXT NOT NULL,
+    name_lc       TEXT NOT NULL,
+    data_type     TEXT NOT NULL,
+    nullable      INTEGER NOT NULL,
+    key_type      TEXT NOT NULL,
+    is_pk         INTEGER NOT NULL,
+    default_value TEXT,
+    extra         TEXT NOT NULL,
+    comment       TEXT NOT NULL,
+    PRIMARY KEY (schema_key, table_lc, col_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_schema_columns_name ON schema_columns (schema_key, name_lc);
+CREATE TABLE IF NOT EXISTS schema_relations (
+    schema_key    TEXT NOT NULL,
+    source_lc     TEXT NOT NULL,
+    source_table  TEXT NOT NULL,
+    source_column TEXT NOT NULL,
+    target_lc     TEXT NOT NULL,
+    target_table  TEXT NOT NULL,
+    target_column TEXT NOT NULL,
+    confidence    TEXT NOT NULL,
+    rank          INTEGER NOT NULL,
+    cardinality   TEXT NOT NULL,
+    reason        TEXT,
+    evidence      TEXT,
+    score         REAL
+);
+CREATE INDEX IF NOT EXISTS ix_schema_relations_source ON schema_relations (schema_key, source_lc);
+CREATE INDEX IF NOT EXISTS ix_schema_relations_target ON schema_relations (schema_key, target_lc);
+CREATE TABLE IF NOT EXISTS schema_docs (
+    schema_key TEXT NOT NULL,
+    doc_id     INTEGER NOT NULL,
+    table_lc   TEXT NOT NULL,
+    col_no     INTEGER NOT NULL,     -- 0 = 테이블 문서
+    PRIMARY KEY (schema_key, doc_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS schema_terms (
+    schema_key TEXT NOT NULL,
+    term       TEXT NOT NULL,
+    df         INTEGER NOT NULL,
+    postings   BLOB NOT NULL,
+    PRIMARY KEY (schema_key, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS schema_snapshots (
+    schema_key    TEXT PRIMARY KEY,
+    metadata_hash TEXT NOT NULL,
+    metadata      BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_schema_snapshots_hash ON schema_snapshots (metadata_hash);
+"""
+
+_RELATION_COLUMNS = (
+    'source_table, source_column, target_table, target_column, '
+    'confidence, cardinality, reason, evidence, score'
+)
+
+
+def metadata_hash(metadata: SchemaMetadata) -> str:
+    """메타데이터 내용 해시 (JSON sha256) - 같은 추출 결과면 같은 값"""
+    return hashlib.sha256(metadata.model_dump_json().encode('utf-8')).hexdigest()
+
+
+class SchemaStoreError(Exception):
+    """저장소 에러: 라우터에서 HTTP 응답으로 변환"""
+    def __init__(self, message: str, error_code: str = 'UNKNOWN'):
+        self.message    = message
+        self.error_code = error_code
+        super().__init__(message)
+
+
+def _like_escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _relation(row: sqlite3.Row) -> InferredRelation:
+    return InferredRelation(
+        source_table=row['source_table'],
+        source_column=row['source_column'],
+        target_table=row['target_table'],
+        target_column=row['target_column'],
+        confidence=row['confidence'],
+        cardinality=row['cardinality'],
+        reason=row['reason'],
+        evidence=row['evidence'],
+        score=row['score'],
+    )
+
+
+class SchemaStore:
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = sqlite3.connect(self._path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._initialized:
+                self._init_schema(conn)
+            yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self, conn: sqlite3.Connection) -> None:
+        with self._init_lock:
+            if self._initialized:
+                return
+            # WAL: 저장(쓰기) 중에도 조회(읽기)가 막히지 않음
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.executescript(_DDL)
+            self._initialized = True
+
+    # ── 저장/삭제 ────────────────────────────────────────────────────────────
+
+    def save(
+        self,
+        metadata: SchemaMetadata,
+        relations: list[InferredRelation],
+        schema_key: str | None = None,
+    ) -> StoredSchema:
+        key = schema_key or metadata.schema_name
+        table_rows = []
+        column_rows = []
+        names: dict[str, str] = {}
+        for t in metadata.tables:
+            tlc = t.name.lower()
+            if tlc in names:
+                raise SchemaStoreError(
+                    f'대소문자만 다른 테이블명은 함께 저장할 수 없습니다: {names[tlc]}, {t.name}',
+                    'DUPLICATE_TABLE',
+                )
+            names[tlc] = t.name
+            table_rows.append((key, tlc, t.name, t.comment, t.domain, t.row_count))
+            column_rows.extend(
+                (
+                    key, tlc, c.col_no, c.name, c.name.lower(), c.data_type, int(c.nullable),
+                    c.key_type, int(c.is_pk), c.default_value, c.extra, c.comment,
+                )
+                for c in t.columns
+            )
+
+        relation_rows = []
+        seen: set[tuple[str, str, str, str]] = set()
+
+        def add(r: InferredRelation) -> None:
+            ident = (
+                r.source_table.lower(), r.source_column.lower(),
+                r.target_table.lower(), r.target_column.lower(),
+            )
+            if ident in seen:
+                return
+            seen.add(ident)
+            relation_rows.append((
+                key, ident[0], r.source_table, r.source_column, ident[2], r.target_table,
+                r.target_column, r.confidence, _CONFIDENCE_RANK.get(r.confidence, 0),
+                r.cardinality, r.reason, r.evidence, r.score,
+            ))
+
+        for r in relations:
+            add(r)
+        for t in metadata.tables:
+            for fk in t.fk_refs:
+                add(InferredRelation(
+                    source_table=t.name, source_column=fk.column_name,
+                    target_table=fk.ref_table, target_column=fk.ref_column,
+                    confidence='FK', cardinality='N:1', reason='FK constraint',
+                    evidence=f'{t.name}.{fk.column_name} -> {fk.ref_table}.{fk.ref_column}',
+                    score=1.0,
+                ))
+
+        doc_rows, term_rows = search_service.index_rows(key, metadata)
+        raw = metadata.model_dump_json().encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+
+        stored = StoredSchema(
+            schema_key=key,
+            schema_name=metadata.schema_name,
+            extracted_at=metadata.extracted_at,
+            stored_at=datetime.now(timezone.utc).isoformat(),
+            table_count=len(table_rows),
+            column_count=len(column_rows),
+            relation_count=len(relation_rows),
+            metadata_hash=digest,
+        )
+
+        try:
+            with self._connect() as conn, conn:
+                self._delete_rows(conn, key)
+                conn.execute(
+                    'INSERT INTO schemas VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        key, stored.schema_name, stored.extracted_at, stored.stored_at,
+                        stored.table_count, stored.column_count, stored.relation_count,
+                    ),
+                )
+                conn.executemany('INSERT INTO schema_tables VALUES (?, ?, ?, ?, ?, ?)', table_rows)
+                conn.executemany(
+                    'INSERT INTO schema_columns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', column_rows,
+                )
+                conn.executemany(
+                    'INSERT INTO schema_relations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    relation_rows,
+                )
+                conn.executemany('INSERT INTO schema_docs VALUES (?, ?, ?, ?)', doc_rows)
+                conn.executemany('INSERT INTO schema_terms VALUES (?, ?, ?, ?)', term_rows)
+                conn.execute(
+                    'INSERT INTO schema_snapshots VALUES (?, ?, ?)', (key, digest, zlib.compress(raw, 6)),
+                )
+        except sqlite3.IntegrityError as e:
+            # 같은 테이블 안 중복 col_no 등: 500 대신 요청 에러로
+            raise SchemaStoreError(f'메타데이터를 저장할 수 없습니다: {e}', 'INVALID_METADATA') from e
+
+        logger.info(
+            'schema stored: key=%s tables=%d columns=%d relations=%d terms=%d',
+            key, stored.table_count, stored.column_count, stored.relation_count, len(term_rows),
+        )
+        return stored
+
+    @staticmethod
+    def _delete_rows(conn: sqlite3.Connection, key: str) -> int:
+        for table in (
+            'schema_snapshots', 'schema_terms', 'schema_docs', 'schema_relations',
+            'schema_columns', 'schema_tables',
+        ):
+            conn.execute(f'DELETE FROM {table} WHERE schema_key = ?', (key,))
+        return conn.execute('DELETE FROM schemas WHERE schema_key = ?', (key,)).rowcount
+
+    def delete(self, schema_key: str) -> None:
+        with self._connect() as conn, conn:
+            if not self._delete_rows(conn, schema_key):
+                raise SchemaStoreError(f'저장된 스키마가 없습니다: {schema_key}', 'NOT_FOUND')
+
+    # ── 조회 ─────────────────────────────────────────────────────────────────
+
+    def list_schemas(self) -> list[StoredSchema]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT s.*, p.metadata_hash FROM schemas s '
+                'LEFT JOIN schema_snapshots p USING (schema_key) ORDER BY s.schema_key'
+            ).fetchall()
+        return [StoredSchema(**dict(r)) for r in rows]
+
+    @staticmethod
+    def _require(conn: sqlite3.Connection, schema_key: str) -> sqlite3.Row:
+        row = conn.execute('SELECT * FROM schemas WHERE schema_key = ?', (schema_key,)).fetchone()
+        if row is None:
+            raise SchemaStoreError(f'저장된 스키마가 없습니다: {schema_key}', 'NOT_FOUND')
+        return row
+
+    def _column_hits(self, conn: sqlite3.Connection, where: str, params: tuple) -> list[ColumnHit]:
+        rows = conn.execute(
+            f"""
+            SELECT t.name AS table_name, c.name, c.data_type, c.nullable, c.is_pk, c.comment
+            FROM schema_columns c
+            JOIN schema_tables t
+              ON t.schema_key = c.schema_key
+             AND t.name_lc = c.table_lc
+            WHERE {where}
+            ORDER BY c.table_lc, c.col_no
+            LIMIT ? OFFSET ?
+            """,
+            params,
+        ).fetchall()
+        return [
+            ColumnHit(
+                table=r['table_name'], column=r['name'], data_type=r['data_type'],
+                nullable=bool(r['nullable']), is_pk=bool(r['is_pk']), comment=r['comment'],
+            )
+            for r in rows
+        ]
+
+    def tables_with_column(
+        self, schema_key: str, column: str, limit: int = 100, offset: int = 0,
+    ) -> list[ColumnHit]:
+        """컬럼명이 column인 컬럼 (대소문자 무시, 인덱스 조회)"""
+        with self._connect() as conn:
+            self._require(conn, schema_key)
+            return self._column_hits(
+                conn, 'c.schema_key = ? AND c.name_lc = ?',
+                (schema_key, column.lower(), limit, offset),
+            )
+
+    def columns_by_comment(
+        self, schema_key: str, text: str, limit: int = 100, offset: int = 0,
+    ) -> list[ColumnHit]:
+        """코멘트에 text가 포함된 컬럼 (해당 스키마 행 범위만 스캔)"""
+        with self._connect() as conn:
+            self._require(conn, schema_key)
+            return self._column_hits(
+                conn, "c.schema_key = ? AND c.comment LIKE ? ESCAPE '\\'",
+                (schema_key, f'%{_like_escape(text)}%', limit, offset),
+            )
+
+    def referencing(
+        self, schema_key: str, table: str, min_confidence: str = 'LOW',
+    ) -> list[InferredRelation]:
+        """table을 참조하는 관계 (신뢰도 높은 순)"""
+        with self._connect() as conn:
+            self._require(conn, schema_key)
+            rows = conn.execute(
+                f"""
+                SELECT {_RELATION_COLUMNS}
+                FROM schema_relations
+                WHERE schema_key = ? AND target_lc = ? AND rank >= ?
+                ORDER BY rank DESC, source_lc, source_column
+                """,
+                (schema_key, table.lower(), _CONFIDENCE_RANK.get(min_confidence.upper(), 0)),
+            ).fetchall()
+        return [_relation(r) for r in rows]
+
+    def search(self, schema_key: str, query: str, page: int = 1, size: int = 20) -> SearchResult:
+        """테이블/컬럼 전문 검색 (점수 내림차순, 동점은 테이블 -> 컬럼 순서)"""
+        groups = search_service.query_groups(query)
+        exact = search_service.exact_name_term(query)
+
+        with self._connect() as conn:
+            info = self._require(conn, schema_key)
+            if not groups:
+                return SearchResult(query=query, total=0, page=page, size=size, hits=[])
+            n_docs = info['table_count'] + info['column_count']
+
+            df: dict[str, int] = {}
+            blobs: dict[str, bytes] = {}
+
+            def expand(term: str, prefix: bool) -> dict:
+                if prefix:
+                    rows = conn.execute(
+                        # '_' 포함 term은 이름 전체 색인 -> 선두 토큰 일치와 중복이므로 확장 제외
+                        'SELECT term, df, postings FROM schema_terms '
+                        "WHERE schema_key = ? AND term >= ? AND term < ? AND instr(term, '_') = 0 "
+                        'ORDER BY term LIMIT ?',
+                        (schema_key, term, search_service.prefix_upper_bound(term),
+                         search_service.PREFIX_MAX_TERMS),
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        'SELECT term, df, postings FROM schema_terms WHERE schema_key = ? AND term = ?',
+                        (schema_key, term),
+                    ).fetchall()
+                out = {}
+                for term_, n, blob in rows:
+                    df[term_] = n
+                    out[term_] = search_service.decode_postings(blob)
+                return out
+
+            group_postings = []
+            for g in groups:
+                by_term: dict = {}
+                for q in g.terms:
+                    by_term.update(expand(q, g.prefix))
+                group_postings.append(by_term)
+            exact_postings = expand(exact, False).get(exact, ()) if exact else ()
+
+            idf = {t: math.log(1 + n_docs / n) for t, n in df.items()}
+            scores, field_mask = search_service.score_documents(
+                groups, group_postings, idf, exact_postings, exact,
+            )
+            page_docs = search_service.top_documents(scores, page, size)
+
+            hits = []
+            for doc_id, score in page_docs:
+                table_lc, col_no = conn.execute(
+                    'SELECT table_lc, col_no FROM schema_docs WHERE schema_key = ? AND doc_id = ?',
+                    (schema_key, doc_id),
+                ).fetchone()
+                t = conn.execute(
+                    'SELECT name, comment FROM schema_tables WHERE schema_key = ? AND name_lc = ?',
+                    (schema_key, table_lc),
+                ).fetchone()
+                fields = search_service.field_labels(field_mask.get(doc_id, 0))
+                if col_no == 0:
+                    hits.append(SearchHit(
+                        kind='table', table=t['name'], comment=t['comment'],
+                        score=round(score, 3), matched_fields=fields,
+                    ))
+                    continue
+                c = conn.execute(
+                    'SELECT name, data_type, comment FROM schema_columns '
+                    'WHERE schema_key = ? AND table_lc = ? AND col_no = ?',
+                    (schema_key, table_lc, col_no),
+                ).fetchone()
+                hits.append(SearchHit(
+                    kind='column', table=t['name'], column=c['name'], data_type=c['data_type'],
+                    comment=c['comment'], score=round(score, 3), matched_fields=fields,
+                ))
+
+        return SearchResult(query=query, total=len(scores), page=page, size=size, hits=hits)
+
+    def load_metadata(self, schema_key: str | None = None, digest: str | None = None) -> SchemaMetadata:
+        """저장된 원본 메타데이터 (schema_key 또는 metadata_hash로 조회)"""
+        with self._connect() as conn:
+            if schema_key is not None:
+                row = conn.execute(
+                    'SELECT metadata FROM schema_snapshots WHERE schema_key = ?', (schema_key,),
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    'SELECT metadata FROM schema_snapshots WHERE metadata_hash = ? LIMIT 1', (digest,),
+                ).fetchone()
+        if row is None:
+            ident = schema_key if schema_key is not None else digest
+            raise SchemaStoreError(f'저장된 메타데이터가 없습니다: {ident}', 'NOT_FOUND')
+        return SchemaMetadata.model_validate_json(zlib.decompress(row['metadata']))
+
+    def table(self, schema_key: str, table: str) -> StoredTable:
+        """테이블 1개와 컬럼, 들어오고 나가는 관계"""
+        tlc = table.lower()
+        with self._connect() as conn:
+            self._require(conn, schema_key)
+            row = conn.execute(
+                'SELECT * FROM schema_tables WHERE schema_key = ? AND name_lc = ?', (schema_key, tlc),
+            ).fetchone()
+            if row is None:
+                raise SchemaStoreError(f'테이블이 없습니다: {table}', 'NOT_FOUND')
+            columns = conn.execute(
+                'SELECT * FROM schema_columns WHERE schema_key = ? AND table_lc = ? ORDER BY col_no',
+                (schema_key, tlc),
+            ).fetchall()
+            outgoing = conn.execute(
+                f'SELECT {_RELATION_COLUMNS} FROM schema_relations '
+                'WHERE schema_key = ? AND source_lc = ? ORDER BY rank DESC, source_column',
+                (schema_key, tlc),
+            ).fetchall()
+            incoming = conn.execute(
+                f'SELECT {_RELATION_COLUMNS} FROM schema_relations '
+                'WHERE schema_key = ? AND target_lc = ? ORDER BY rank DESC, source_lc, source_column',
+                (schema_key, tlc),
+            ).fetchall()
+
+        return StoredTable(
+            name=row['name'],
+            comment=row['comment'],
+            domain=row['domain'],
+            row_count=row['row_count'],
+            columns=[
+                ColumnMeta(
+                    col_no=c['col_no'], name=c['name'], data_type=c['data_type'],
+                    nullable=bool(c['nullable']), key_type=c['key_type'], is_pk=bool(c['is_pk']),
+                    default_value=c['default_value'], extra=c['extra'], comment=c['comment'],
+                )
+                for c in columns
+            ],
+            outgoing=[_relation(r) for r in outgoing],
+            incoming=[_relation(r) for r in incoming],
+        )
+
+
+_store: SchemaStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> SchemaStore:
+    """SCHEMA_STORE_PATH 기준 프로세스 공용 저장소"""
+    global _store
+    if not SCHEMA_STORE_PATH:
+        raise SchemaStoreError('스키마 저장소가 비활성화되어 있습니다 (SCHEMA_STORE_PATH).', 'STORE_DISABLED')
+    with _store_lock:
+        if _store is None:
+            Path(SCHEMA_STORE_PATH).parent.mkdir(parents=True, exist_ok=True)
+            _store = SchemaStore(SCHEMA_STORE_PATH)
+        return _store
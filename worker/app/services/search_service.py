@@ -0,0 +1,225 @@
+﻿"""
+스키마 전문 검색 (테이블/컬럼명, 데이터 타입, 코멘트)
+
+스키마 저장 시점에 문서(테이블 1개, 컬럼 1개)마다 검색어를 뽑아
+schema_store의 역색인(schema_docs, schema_terms)에 넣고,
+검색은 질의어 posting만 읽어 점수를 계산한다.
+
+posting은 term마다 BLOB 1개 (uint32 배열, 항목 = doc_id << 8 | field << 6 | tf)로
+저장해 흔한 term도 행 1건 조회 + array 복원으로 끝난다.
+
+토큰화 (comment_matching.comment_tokens와 같은 규칙):
+  - 한글 연속 구간: 2-gram + 3자 이상이면 구간 전체 ('주문번호' -> 주문, 문번, 번호, 주문번호)
+  - 영문/숫자: camelCase/snake_case 분리, 약어 확장, 단수화 (custId -> customer, id)
+  - 이름 필드는 소문자 전체 이름('order_no')도 색인해 정확 일치를 우대한다.
+
+매칭:
+  - 질의 영문 토큰은 각각 필수 (토큰 일치 또는 prefix 일치, prefix는 점수 절반)
+  - 질의 한글 구간은 2-gram의 60% 이상 일치하면 충족 (띄어쓰기 차이 허용)
+  - 점수: 필드 가중치(이름 3 / 코멘트 2 / 타입 1) x IDF 합, 이름 전체 일치 가산
+"""
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable
+
+from app.models.metadata import SchemaMetadata
+from app.services.comment_matching import comment_tokens
+from app.services.name_matching import name_tokens
+
+FIELD_NAME, FIELD_COMMENT, FIELD_TYPE = 0, 1, 2
+FIELD_WEIGHT = {FIELD_NAME: 3.0, FIELD_COMMENT: 2.0, FIELD_TYPE: 1.0}
+FIELD_LABEL = {FIELD_NAME: 'name', FIELD_COMMENT: 'comment', FIELD_TYPE: 'type'}
+
+# prefix 확장: 2자 이상 질의어만, 확장 term 수 상한
+PREFIX_MIN_LENGTH = 2
+PREFIX_MAX_TERMS  = 64
+PREFIX_FACTOR     = 0.5
+EXACT_NAME_BONUS  = 2.0
+HANGUL_MIN_MATCH  = 0.6
+
+_TF_MAX = 63
+_LOG_TF = [0.0] + [1 + math.log(tf) for tf in range(1, _TF_MAX + 1)]
+
+_HANGUL_RE = re.compile(r'[가-힣]+')
+_LATIN_RE  = re.compile(r'[0-9A-Za-z]+')
+_TYPE_RE   = re.compile(r'[A-Za-z][A-Za-z0-9 ]*')
+
+
+def _type_terms(data_type: str) -> list[str]:
+    """'varchar(100)' -> ['varchar'], 'double precision' -> ['double precision']"""
+    m = _TYPE_RE.match(data_type.strip())
+    return [m.group(0).strip().lower()] if m else []
+
+
+@lru_cache(maxsize=1 << 16)
+def field_terms(text: str, field: int) -> tuple[tuple[str, int], ...]:
+    """
+    필드 값 1개 -> ((term, field << 6 | tf), ...)
+    컬럼명/코멘트/타입은 스키마 안에서 반복이 많아 값 단위로 캐시한다.
+    """
+    if field == FIELD_TYPE:
+        tokens = _type_terms(text)
+    else:
+        tokens = comment_tokens(text)
+        if field == FIELD_NAME:
+            tokens.append(text.lower())
+    return tuple((t, field << 6 | min(tf, _TF_MAX)) for t, tf in Counter(tokens).items())
+
+
+def index_rows(schema_key: str, metadata: SchemaMetadata) -> tuple[list[tuple], list[tuple]]:
+    """
+    (문서 행, term 행)
+    문서: (schema_key, doc_id, table_lc, col_no)  - col_no 0 = 테이블 문서
+    term: (schema_key, term, df, posting BLOB)
+    """
+    docs: list[tuple] = []
+    postings: dict[str, array] = {}
+    df: Counter = Counter()
+    last_doc: dict[str, int] = {}   # 같은 문서의 이름/코멘트에 모두 나와도 df는 1
+
+    def add(table_lc: str, col_no: int, fields: tuple[tuple[str, int], ...]) -> None:
+        doc_id = len(docs)
+        docs.append((schema_key, doc_id, table_lc, col_no))
+        base = doc_id << 8
+        for text, field in fields:
+            if not text:
+                continue
+            for term, code in field_terms(text, field):
+                entries = postings.get(term)
+                if entries is None:
+                    entries = postings[term] = array('I')
+                entries.append(base | code)
+                if last_doc.get(term) != doc_id:
+                    last_doc[term] = doc_id
+                    df[term] += 1
+
+    for t in metadata.tables:
+        tlc = t.name.lower()
+        add(tlc, 0, ((t.name, FIELD_NAME), (t.comment, FIELD_COMMENT)))
+        for c in t.columns:
+            add(tlc, c.col_no, ((c.name, FIELD_NAME), (c.comment, FIELD_COMMENT), (c.data_type, FIELD_TYPE)))
+
+    term_rows = [(schema_key, term, df[term], entries.tobytes()) for term, entries in postings.items()]
+    return docs, term_rows
+
+
+def decode_postings(blob: bytes) -> array:
+    entries = array('I')
+    entries.frombytes(blob)
+    return entries
+
+
+class QueryGroup:
+    """질의 단위 1개 (영문 토큰 1개 또는 한글 구간 1개)"""
+
+    def __init__(self, terms: list[str], required: int, prefix: bool) -> None:
+        self.terms = terms
+        self.required = required
+        self.prefix = prefix
+
+
+def query_groups(query: str) -> list[QueryGroup]:
+    groups: list[QueryGroup] = []
+    for run in _HANGUL_RE.findall(query):
+        terms = list(dict.fromkeys(comment_tokens(run)))
+        bigrams = len(run) - 1 if len(run) > 1 else 1
+        groups.append(QueryGroup(
+            terms,
+            required=max(1, math.ceil(bigrams * HANGUL_MIN_MATCH)),
+            prefix=len(run) <= 2,
+        ))
+    for word in _LATIN_RE.findall(query):
+        for t in name_tokens(word, strip_prefix=False):
+            groups.append(QueryGroup([t], required=1, prefix=len(t) >= PREFIX_MIN_LENGTH))
+    return groups
+
+
+def exact_name_term(query: str) -> str | None:
+    """공백 없는 질의는 이름 전체 일치 가산 대상"""
+    q = query.strip().lower()
+    return q if q and not any(ch.isspace() for ch in q) else None
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """term >= prefix AND term < bound 범위 스캔용 상한"""
+    return prefix + '\U0010ffff'
+
+
+def score_documents(
+    groups: list[QueryGroup],
+    group_postings: list[dict[str, array]],
+    idf: dict[str, float],
+    exact_postings: Iterable[int] = (),
+    exact_term: str | None = None,
+) -> tuple[dict[int, float], dict[int, int]]:
+    """
+    group_postings[i]: term -> posting 항목 (prefix 확장 term 포함, 질의 term과 다르면 prefix 일치)
+    반환: (모든 질의 단위를 충족한 doc_id -> 점수, doc_id -> 일치 필드 bitmask)
+
+    posting이 짧은 질의 단위부터 처리하고, 이후 단위는 앞에서 남은 후보 문서만 본다.
+    """
+    total: dict[int, float] = {}
+    field_mask: dict[int, int] = {}
+    candidates: set[int] | None = None
+    weights = [FIELD_WEIGHT[f] for f in (FIELD_NAME, FIELD_COMMENT, FIELD_TYPE)]
+
+    order = sorted(
+        range(len(groups)), key=lambda i: sum(len(e) for e in group_postings[i].values()),
+    )
+    for i in order:
+        group, by_term = groups[i], group_postings[i]
+        matched: dict[int, set[str]] = {}
+        scores: dict[int, float] = {}
+        for term, entries in by_term.items():
+            base = term if term in group.terms else next(
+                (q for q in group.terms if term.startswith(q)), term,
+            )
+            weight = idf.get(term, 0.0) * (1.0 if base == term else PREFIX_FACTOR)
+            best: dict[int, float] = {}
+            for e in entries:
+                doc = e >> 8
+                if candidates is not None and doc not in candidates:
+                    continue
+                field = (e >> 6) & 3
+                s = weight * weights[field] * _LOG_TF[e & _TF_MAX]
+                if s > best.get(doc, 0.0):
+                    best[doc] = s
+                field_mask[doc] = field_mask.get(doc, 0) | (1 << field)
+            for doc, s in best.items():
+                bases = matched.get(doc)
+                if bases is None:
+                    matched[doc] = {base}
+                else:
+                    bases.add(base)
+                scores[doc] = scores.get(doc, 0.0) + s
+
+        satisfied = {doc for doc, bases in matched.items() if len(bases) >= group.required}
+        candidates = satisfied if candidates is None else candidates & satisfied
+        if not candidates:
+            return {}, {}
+        for doc in satisfied:
+            total[doc] = total.get(doc, 0.0) + scores[doc]
+
+    if candidates is None:
+        return {}, {}
+    if exact_term:
+        bonus = EXACT_NAME_BONUS * idf.get(exact_term, 1.0)
+        for e in exact_postings:
+            doc = e >> 8
+            if (e >> 6) & 3 == FIELD_NAME and doc in candidates:
+                total[doc] += bonus
+    return {doc: total[doc] for doc in candidates}, field_mask
+
+
+def field_labels(mask: int) -> list[str]:
+    return [FIELD_LABEL[f] for f in (FIELD_NAME, FIELD_COMMENT, FIELD_TYPE) if mask & (1 << f)]
+
+
+def top_documents(scores: dict[int, float], page: int, size: int) -> list[tuple[int, float]]:
+    """점수 내림차순 page (동점은 doc_id = 선언 순서). 전체 정렬 없이 상위 page*size만."""
+    top = heapq.nsmallest(page * size, scores.items(), key=lambda x: (-x[1], x[0]))
+    return top[(page - 1) * size:]
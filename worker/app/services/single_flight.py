@@ -0,0 +1,96 @@
+﻿"""
+동시 동일 요청 합치기 (single-flight)
+
+같은 키의 호출이 진행 중이면 새로 실행하지 않고, 진행 중인 호출이 끝나기를 기다려
+그 결과(또는 예외)를 함께 받는다. 결과를 보관하지는 않으므로 호출이 끝난 뒤 들어온
+요청은 다시 실행한다 (캐시가 아니라 중복 실행 제거).
+
+여러 사용자가 같은 프로젝트를 동시에 열면 Node 서버가 같은 extract-metadata를
+사용자 수만큼 보내고, 요청마다 연결을 열어 카탈로그를 다시 읽는다 (Oracle 운영 DB 부하).
+
+- extract-metadata 키: 자격증명 포함 해시 + 대상 스키마 + 수집 옵션
+  (다른 계정의 요청은 결과를 공유하지 않고, 평문 비밀번호는 키에 남지 않는다)
+- infer-relations 키: 메타데이터 JSON 해시
+"""
+import hashlib
+import logging
+import threading
+from typing import Callable, TypeVar
+
+from app.models.connection import ExtractMetadataRequest
+from app.models.metadata import SchemaMetadata
+from app.services.connection_guard import credential_hash
+from app.services.schema_store import metadata_hash
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self) -> None:
+        self.done    = threading.Event()
+        self.result  = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별 진행 중 호출 1건 (threadpool에서 실행되는 동기 엔드포인트용)"""
+
+    def __init__(self) -> None:
+        self._calls: dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            logger.info('single-flight: 진행 중인 호출에 합류 (key=%s)', key[:12])
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+_flight = SingleFlight()
+
+
+def extraction_key(req: ExtractMetadataRequest) -> str:
+    raw = '\x1f'.join([
+        'extract', credential_hash(req), req.target_schema or '',
+        str(req.include_stats), str(req.include_indexes),
+    ])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def metadata_key(metadata: SchemaMetadata) -> str:
+    return 'infer:' + metadata_hash(metadata)
+
+
+def coalesce(key: str, fn: Callable[[], T]) -> T:
+    """같은 키의 진행 중 호출이 있으면 그 결과를 공유, 없으면 fn 실행"""
+    return _flight.do(key, fn)
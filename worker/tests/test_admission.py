@@ -0,0 +1,62 @@
+﻿import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.admission import BULK, INTERACTIVE, AdmissionController, AdmissionRejectedError
+
+
+def _wait_queued(controller: AdmissionController, target: str, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while controller.stats()[0]['queued'] < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_interactive_overtakes_queued_bulk():
+    controller = AdmissionController(limit=1, max_wait=5)
+    controller.acquire('db:1433', BULK)
+    order = []
+
+    def enter(name: str, priority: int) -> None:
+        controller.acquire('db:1433', priority)
+        order.append(name)
+        controller.release('db:1433', 0.01)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        bulk = pool.submit(enter, 'bulk', BULK)
+        _wait_queued(controller, 'db:1433', 1)
+        test = pool.submit(enter, 'test', INTERACTIVE)
+        _wait_queued(controller, 'db:1433', 2)
+        controller.release('db:1433', 0.01)
+        bulk.result(), test.result()
+
+    assert order == ['test', 'bulk']
+    stats = controller.stats()[0]
+    assert stats['admitted'] == 3 and stats['active'] == 0 and stats['max_queue_ms'] > 0
+
+
+def test_rejects_when_estimated_wait_exceeds_deadline():
+    controller = AdmissionController(limit=1, max_wait=0.5)
+    controller.acquire('db:1433', BULK)
+    controller.release('db:1433', 2.0)          # 평균 점유 2초 학습
+    controller.acquire('db:1433', BULK)
+
+    started = time.monotonic()
+    with pytest.raises(AdmissionRejectedError) as exc:
+        controller.acquire('db:1433', BULK)
+    assert time.monotonic() - started < 0.1      # 기다리지 않고 즉시 거절
+    assert exc.value.error_code == 'TARGET_BUSY' and exc.value.retry_after >= 2.0
+    assert controller.stats()[0]['rejected'] == 1
+
+
+def test_times_out_and_leaves_queue():
+    controller = AdmissionController(limit=1, max_wait=0.1)
+    controller.acquire('db:1433', BULK)
+    with pytest.raises(AdmissionRejectedError):
+        controller.acquire('db:1433', INTERACTIVE)
+    assert controller.stats()[0]['queued'] == 0
+
+    # 다른 대상은 영향 없음
+    assert controller.acquire('other:1521', BULK) == 0.0
@@ -0,0 +1,74 @@
+﻿from contextlib import contextmanager
+
+from app.services.connectors.base import BaseConnector, CatalogQuery, parse_version
+
+
+class _FakeCursor:
+    def __init__(self, denied: set[str]):
+        self._denied = denied
+
+    def execute(self, sql: str, *args) -> None:
+        if sql in self._denied:
+            raise PermissionError(sql)
+
+    def fetchall(self) -> list:
+        return []
+
+
+class _FakeConn:
+    def __init__(self, denied: set[str]):
+        self._denied = denied
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self._denied)
+
+
+class _FakeConnector(BaseConnector):
+    catalog_queries = (
+        CatalogQuery('columns', 'privileged', 'SQL-A', probe_sql='PROBE'),
+        CatalogQuery('columns', 'modern', 'SQL-B', min_version=(8, 0)),
+        CatalogQuery('columns', 'legacy', 'SQL-C'),
+    )
+
+    def __init__(self, version: str):
+        super().__init__()
+        self._version = version
+
+    @contextmanager
+    def connection(self):
+        yield _FakeConn(set())
+
+    def get_db_version(self, conn) -> str:
+        return self._version
+
+    def test(self) -> dict:
+        return {'success': True, 'message': 'ok'}
+
+    def _fetch(self, conn, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
+        return [{'sql': sql, 'schema': schema}]
+
+    def extract_columns_raw(self, conn, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'columns', schema)
+
+    def extract_fks_raw(self, conn, schema: str) -> list[dict]:
+        return []
+
+
+def test_parse_version():
+    assert parse_version('MySQL 8.0.36') == (8, 0, 36)
+    assert parse_version('Oracle Database 19c Release 19.0.0.0.0') == (19, 0, 0, 0, 0)
+    assert parse_version('unknown') == ()
+
+
+def test_variant_selection_by_probe_and_version():
+    conn = _FakeConn({'PROBE'})
+
+    modern = _FakeConnector('MySQL 8.0.36')
+    assert modern.extract_columns_raw(conn, 'app')[0]['sql'] == 'SQL-B'
+    assert modern.catalog_timings[-1]['variant'] == 'modern'
+
+    legacy = _FakeConnector('MySQL 5.7.44')
+    assert legacy.extract_columns_raw(conn, 'app')[0]['sql'] == 'SQL-C'
+
+    privileged = _FakeConnector('MySQL 5.7.44')
+    assert privileged.extract_columns_raw(_FakeConn(set()), 'app')[0]['sql'] == 'SQL-A'
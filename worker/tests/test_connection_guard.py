@@ -0,0 +1,72 @@
+﻿import pytest
+
+from app.models.connection import DbConnectionRequest
+from app.services import admission, connection_guard
+from app.services.admission import AdmissionController
+from app.services.connection_guard import CircuitBreaker
+
+
+def _req(password: str = 'pw') -> DbConnectionRequest:
+    return DbConnectionRequest(
+        db_type='mysql', host='10.0.0.1', port=3306, database='app',
+        username='erd', password=password,
+    )
+
+
+@pytest.fixture
+def fresh_guard(monkeypatch):
+    # 테스트마다 빈 캐시 / breaker / 대기열
+    monkeypatch.setattr(connection_guard, '_cache', {})
+    monkeypatch.setattr(connection_guard, '_breaker', CircuitBreaker(
+        connection_guard.CIRCUIT_FAILURE_THRESHOLD, connection_guard.CIRCUIT_RESET_TIMEOUT,
+    ))
+    monkeypatch.setattr(admission, '_controller', AdmissionController(
+        admission.TARGET_MAX_CONCURRENCY, admission.ADMISSION_MAX_WAIT,
+    ))
+
+
+def test_guarded_test_caches_result(fresh_guard, monkeypatch):
+    monkeypatch.setattr(connection_guard, 'CONN_TEST_CACHE_TTL', 60)
+    calls = []
+
+    def run() -> dict:
+        calls.append(1)
+        return {'success': True, 'message': '연결 성공', 'db_version': 'MySQL 8.0'}
+
+    assert connection_guard.guarded_test(_req(), run)['success'] is True
+    assert connection_guard.guarded_test(_req(), run)['success'] is True
+    assert len(calls) == 1
+
+    # 다른 자격증명은 별도 캐시 키
+    connection_guard.guarded_test(_req('other'), run)
+    assert len(calls) == 2
+
+
+def test_guarded_test_does_not_cache_failure(fresh_guard, monkeypatch):
+    monkeypatch.setattr(connection_guard, 'CONN_TEST_CACHE_TTL', 60)
+    results = [
+        {'success': False, 'message': '인증 실패', 'error_code': 'AUTH_FAILED'},
+        {'success': True, 'message': '연결 성공'},
+    ]
+
+    # 실패 직후 설정을 고치면 TTL을 기다리지 않고 다시 시험한다
+    assert connection_guard.guarded_test(_req(), lambda: results.pop(0))['success'] is False
+    assert connection_guard.guarded_test(_req(), lambda: results.pop(0))['success'] is True
+    assert results == []
+
+
+def test_circuit_opens_after_consecutive_failures(fresh_guard, monkeypatch):
+    monkeypatch.setattr(connection_guard, 'CONN_TEST_CACHE_TTL', 0)
+    calls = []
+
+    def run() -> dict:
+        calls.append(1)
+        return {'success': False, 'message': '연결 실패', 'error_code': 'CONNECTION_REFUSED'}
+
+    for _ in range(connection_guard.CIRCUIT_FAILURE_THRESHOLD):
+        connection_guard.guarded_test(_req(), run)
+    result = connection_guard.guarded_test(_req(), run)
+
+    assert len(calls) == connection_guard.CIRCUIT_FAILURE_THRESHOLD
+    assert result['success'] is False
+    assert '차단' in result['message']
@@ -0,0 +1,146 @@
+﻿import io
+import json
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.metadata import ColumnMeta, FkMeta, SchemaMetadata, TableMeta
+from app.services import cpu_offload
+from app.services.export_service import EXPORT_FILES, _convert_type, build_dbml, render_exports
+from app.services.inference_service import infer_relations
+
+client = TestClient(app)
+
+
+def _col(no: int, name: str, data_type: str, is_pk: bool = False, comment: str = '') -> ColumnMeta:
+    return ColumnMeta(
+        col_no=no, name=name, data_type=data_type, nullable=not is_pk,
+        key_type='PRI' if is_pk else '', is_pk=is_pk, comment=comment,
+    )
+
+
+def _schema() -> SchemaMetadata:
+    tables = [
+        TableMeta(
+            name='orders', comment="주문 '헤더'",
+            columns=[
+                _col(1, 'order_no', 'NUMBER(10,0)', True),
+                _col(2, 'customer_id', 'int(11) unsigned', comment='고객'),
+                _col(3, 'memo', 'nvarchar(-1)'),
+            ],
+            pk_columns=['order_no'],
+            fk_refs=[FkMeta(column_name='customer_id', constraint_name='fk_orders_customer',
+                            ref_table='customer', ref_column='id', delete_rule='CASCADE')],
+        ),
+        TableMeta(
+            name='customer', comment='고객',
+            columns=[_col(1, 'id', 'integer', True), _col(2, 'grade_cd', 'character varying(10)')],
+            pk_columns=['id'],
+        ),
+        TableMeta(name='grade', columns=[_col(1, 'code', 'char(2)', True)], pk_columns=['code']),
+    ]
+    return SchemaMetadata(
+        schema_name='샘플', table_count=len(tables), column_count=6, fk_count=1,
+        tables=tables, extracted_at='2026-01-01T00:00:00+00:00',
+    )
+
+
+def test_render_exports_all_formats():
+    metadata = _schema()
+    relations = infer_relations(metadata)
+    out = render_exports(metadata, relations, EXPORT_FILES)
+
+    assert out['dbml'] == build_dbml(metadata, relations)
+    assert out['plantuml'].startswith('@startuml') and 'customer_id' in out['plantuml']
+    assert '"orders":"customer_id" -> "customer":"id"' in out['dot']
+
+    mysql = out['ddl_mysql']
+    assert '`order_no` BIGINT NOT NULL' in mysql
+    assert "`customer_id` INT UNSIGNED COMMENT '고객'" in mysql
+    assert ") COMMENT='주문 ''헤더''';" in mysql
+    # FK 제약은 모든 CREATE TABLE 뒤
+    fk = 'ALTER TABLE `orders` ADD CONSTRAINT `fk_orders_customer` FOREIGN KEY (`customer_id`) REFERENCES `customer` (`id`) ON DELETE CASCADE;'
+    assert mysql.index(fk) > mysql.index('CREATE TABLE `grade`')
+    # 실제 FK는 추론 관계 주석으로 중복 출력하지 않음
+    assert '-- ALTER TABLE `orders` ADD CONSTRAINT `fk_orders_customer_id`' not in mysql
+    assert '-- ALTER TABLE `customer` ADD CONSTRAINT `fk_customer_grade_cd`' in mysql
+
+    assert '[memo] NVARCHAR(MAX)' in out['ddl_mssql']
+    assert "N'MS_Description', N'고객', N'SCHEMA', N'dbo', N'TABLE', N'orders', N'COLUMN', N'customer_id'" in out['ddl_mssql']
+    oracle = out['ddl_oracle']
+    assert '"grade_cd" VARCHAR2(10 CHAR)' in oracle
+    assert 'CONSTRAINT "pk_orders" PRIMARY KEY ("order_no")' in oracle
+    assert 'ON DELETE CASCADE' in oracle and 'ON UPDATE' not in oracle
+
+    doc = json.loads(out['jsonld'])
+    assert doc['@context'] == 'http://www.w3.org/ns/csvw'
+    orders = doc['tables'][0]['tableSchema']
+    assert orders['primaryKey'] == 'order_no'
+    assert orders['foreignKeys'][0]['reference'] == {'resource': 'customer.csv', 'columnReference': 'id'}
+
+
+def test_ddl_type_conversion_keeps_value_range():
+    cases = {
+        # 원본 타입: (MySQL, MSSQL, Oracle)
+        'NUMBER(9,0)':         ('INT', 'INT', 'NUMBER(9)'),
+        'NUMBER(18)':          ('BIGINT', 'BIGINT', 'NUMBER(18)'),
+        'NUMBER(20,0)':        ('DECIMAL(20,0)', 'DECIMAL(20,0)', 'NUMBER(20)'),
+        'NUMBER(*,0)':         ('DECIMAL(65,0)', 'DECIMAL(38,0)', 'NUMBER(38)'),
+        'NUMBER(*,2)':         ('DECIMAL(65,2)', 'DECIMAL(38,2)', 'NUMBER(38,2)'),
+        'decimal(65,30)':      ('DECIMAL(65,30)', 'DECIMAL(38,3)', 'NUMBER(38,3)'),
+        'decimal(50,0)':       ('DECIMAL(50,0)', 'DECIMAL(38,0)', 'NUMBER(38,0)'),
+        'tinyint':             ('TINYINT', 'SMALLINT', 'NUMBER(3)'),
+        'tinyint unsigned':    ('TINYINT UNSIGNED', 'TINYINT', 'NUMBER(3)'),
+        'int(10) unsigned':    ('INT UNSIGNED', 'BIGINT', 'NUMBER(10)'),
+        'bigint unsigned':     ('BIGINT UNSIGNED', 'DECIMAL(20)', 'NUMBER(20)'),
+        'bit(1)':              ('TINYINT(1)', 'BIT', 'NUMBER(1)'),
+        'bit(12)':             ('BIT(12)', 'BINARY(2)', 'RAW(2)'),
+        "enum('y','no','it''s')": ("enum('y','no','it''s')", 'NVARCHAR(4)', 'VARCHAR2(4 CHAR)'),
+        'year':                ('YEAR', 'SMALLINT', 'NUMBER(4)'),
+    }
+    for source, expected in cases.items():
+        actual = tuple(_convert_type(source, d) for d in ('ddl_mysql', 'ddl_mssql', 'ddl_oracle'))
+        assert actual == expected, source
+
+    # LOB 문자열은 키 컬럼이 될 수 없어 길이 제한 문자열로
+    assert _convert_type('text', 'ddl_mysql') == 'LONGTEXT'
+    assert _convert_type('text', 'ddl_mysql', key=True) == 'VARCHAR(255)'
+    assert _convert_type('clob', 'ddl_mssql', key=True) == 'NVARCHAR(255)'
+
+
+def test_render_exports_offload_matches_inline(monkeypatch):
+    metadata = _schema()
+    relations = infer_relations(metadata)
+    inline = render_exports(metadata, relations, EXPORT_FILES)
+
+    monkeypatch.setattr(cpu_offload, 'CPU_OFFLOAD_MIN_TABLES', 1)
+    monkeypatch.setattr(cpu_offload, 'CPU_OFFLOAD_WORKERS', 2)
+    try:
+        offloaded = render_exports(metadata, relations, EXPORT_FILES)
+    finally:
+        cpu_offload.shutdown_pool()
+
+    assert offloaded == inline
+
+
+def test_export_bundle_endpoint():
+    metadata = _schema()
+    relations = infer_relations(metadata)
+    res = client.post('/worker/export/bundle', json={
+        'metadata': metadata.model_dump(),
+        'relations': [r.model_dump() for r in relations],
+        'formats': ['dbml', 'ddl_oracle'],
+    })
+    assert res.status_code == 200
+    assert res.headers['content-type'] == 'application/zip'
+
+    bundle = zipfile.ZipFile(io.BytesIO(res.content))
+    assert bundle.namelist() == ['schema.dbml', 'ddl/oracle.sql']
+    assert bundle.read('schema.dbml').decode('utf-8') == build_dbml(metadata, relations)
+
+    res = client.post('/worker/export/plantuml', json={
+        'metadata': metadata.model_dump(), 'relations': [],
+    })
+    assert res.status_code == 200
+    assert res.text.strip().endswith('@enduml')
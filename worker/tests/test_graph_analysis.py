@@ -0,0 +1,115 @@
+﻿from app.models.erd import InferredRelation
+from app.models.metadata import ColumnMeta, SchemaMetadata, TableMeta
+from app.services import domain_service
+from app.services.domain_service import cluster_domains
+from app.services.erd_service import build_erd_graph
+from app.services.graph_service import analyze_graph
+
+
+def _table(name: str, pks: list[str], cols: list[str] = ()) -> TableMeta:
+    columns = [
+        ColumnMeta(col_no=i + 1, name=c, data_type='int', nullable=c not in pks,
+                   key_type='PRI' if c in pks else '', is_pk=c in pks)
+        for i, c in enumerate([*pks, *cols])
+    ]
+    return TableMeta(name=name, columns=columns, pk_columns=list(pks))
+
+
+def _rel(src: str, col: str, tgt: str, tcol: str, confidence: str = 'FK') -> InferredRelation:
+    return InferredRelation(
+        source_table=src, source_column=col, target_table=tgt, target_column=tcol,
+        confidence=confidence, cardinality='N:1', score=1.0,
+    )
+
+
+def test_analyze_graph():
+    tables = [
+        _table('student', ['student_id']),
+        _table('course', ['course_id']),
+        _table('enrollment', ['student_id', 'course_id'], ['grade']),
+        _table('emp', ['emp_id'], ['manager_id', 'dept_id']),
+        _table('dept', ['dept_id'], ['head_emp_id']),
+        _table('audit_log', ['log_id']),
+    ]
+    metadata = SchemaMetadata(
+        schema_name='s', table_count=len(tables), column_count=0, fk_count=0,
+        tables=tables, extracted_at='2026-01-01T00:00:00+00:00',
+    )
+    relations = [
+        _rel('enrollment', 'student_id', 'student', 'student_id'),
+        _rel('enrollment', 'course_id', 'course', 'course_id', 'HIGH'),
+        _rel('emp', 'manager_id', 'emp', 'emp_id'),
+        _rel('emp', 'dept_id', 'dept', 'dept_id'),
+        _rel('dept', 'head_emp_id', 'emp', 'emp_id'),
+        _rel('audit_log', 'log_id', 'student', 'student_id', 'MEDIUM'),   # 분석 제외
+    ]
+
+    result = analyze_graph(metadata, relations)
+
+    assert result.edge_count == 5
+    assert [(j.table, j.targets) for j in result.junction_tables] == [
+        ('enrollment', ['student', 'course']),
+    ]
+    m2m = result.many_to_many[0]
+    assert (m2m.source_table, m2m.target_table, m2m.cardinality) == ('student', 'course', 'N:M')
+    assert result.clusters == [['emp', 'dept']]
+    assert result.cycles == [['emp', 'dept', 'emp']]
+    assert result.self_references == ['emp']
+    assert result.orphan_tables == ['audit_log']
+
+
+def _schema(tables: list[TableMeta]) -> SchemaMetadata:
+    return SchemaMetadata(
+        schema_name='s', table_count=len(tables), column_count=0, fk_count=0,
+        tables=tables, extracted_at='2026-01-01T00:00:00+00:00',
+    )
+
+
+def test_cluster_domains_prefix_and_relations():
+    domain_service.clear_cache()
+
+    # prefix 관례가 있는 스키마: 기존 prefix 도메인 유지, 짝 없는 단독 테이블은 ETC
+    prefixed = _schema([_table(name, ['id']) for name in (
+        'hr_emp', 'hr_dept', 'sales_order', 'sales_item', 'st_tr_a', 'st_tr_b', 'lonely',
+    )])
+    assert cluster_domains(prefixed).groups == [
+        ('HR', ['hr_dept', 'hr_emp']),
+        ('SALES', ['sales_item', 'sales_order']),
+        ('ST_TR', ['st_tr_a', 'st_tr_b']),
+        ('ETC', ['lonely']),
+    ]
+
+    # 절반을 넘는 prefix라도 관계가 없으면 prefix 도메인을 유지한다
+    split = _schema([_table(f'sales_t{i:02d}', ['id']) for i in range(16)]
+                    + [_table(f'hr_t{i:02d}', ['id']) for i in range(14)])
+    assert [(label, len(names)) for label, names in cluster_domains(split).groups] == [
+        ('SALES', 16), ('HR', 14),
+    ]
+
+    # prefix 없이 관례 prefix(tb_)만 있는 스키마: 관계 연결성으로 나뉜다
+    tables = [_table(f'tb_{name}', ['id']) for name in (
+        'customer', 'orders', 'order_item', 'product', 'employee', 'department', 'salary', 'audit_log',
+    )]
+    relations = [
+        _rel('tb_orders', 'customer_id', 'tb_customer', 'id'),
+        _rel('tb_order_item', 'order_id', 'tb_orders', 'id'),
+        _rel('tb_order_item', 'product_id', 'tb_product', 'id', 'MEDIUM'),
+        _rel('tb_employee', 'department_id', 'tb_department', 'id', 'HIGH'),
+        _rel('tb_salary', 'employee_id', 'tb_employee', 'id'),
+        _rel('tb_audit_log', 'user_id', 'tb_customer', 'id', 'LOW'),   # 제외
+    ]
+    result = cluster_domains(_schema(tables), relations)
+    assert result.groups == [
+        ('ORDERS', ['tb_customer', 'tb_order_item', 'tb_orders', 'tb_product']),
+        ('EMPLOYEE', ['tb_department', 'tb_employee', 'tb_salary']),
+        ('ETC', ['tb_audit_log']),
+    ]
+    assert result.modularity > 0.3
+
+    # 도메인을 채운 메타데이터로 다시 요청해도 같은 캐시 결과
+    filled = _schema([t.model_copy(update={'domain': result.domains[t.name]}) for t in tables])
+    assert cluster_domains(filled, relations) is result
+
+    # build-erd는 추론 관계까지 반영한 도메인을 채운다
+    graph = build_erd_graph(_schema(tables), relations)
+    assert {t.name: t.domain for t in graph.tables} == result.domains
@@ -0,0 +1,104 @@
+﻿import io
+import sqlite3
+
+from app.models.erd import InferredRelation
+from app.services.connectors.ddl_connector import DdlFileConnector
+from app.services.connectors.ddl_parser import parse_ddl
+from app.services.connectors.sqlite_connector import SQLiteConnector
+from app.services.index_service import analyze_indexes
+from app.services.metadata_service import extract_metadata
+
+_DUMP = """
+CREATE TABLE `tb_dept` (
+  `dept_cd` varchar(10) NOT NULL,
+  PRIMARY KEY (`dept_cd`)
+);
+CREATE TABLE `tb_user` (
+  `user_id` bigint NOT NULL,
+  `dept_cd` varchar(10) DEFAULT NULL,
+  `boss_id` bigint DEFAULT NULL,
+  `email` varchar(200) NOT NULL,
+  `name` varchar(100) DEFAULT NULL,
+  PRIMARY KEY (`user_id`),
+  UNIQUE KEY `uq_email` (`email`),
+  KEY `idx_email` (`email`),
+  KEY `idx_name` (`name`),
+  KEY `idx_name_dept` (`name`, `dept_cd`),
+  KEY `idx_lower` ((lower(`name`))),
+  FULLTEXT KEY `ft_name` (`name`),
+  CONSTRAINT `fk_user_dept` FOREIGN KEY (`dept_cd`) REFERENCES `tb_dept` (`dept_cd`)
+);
+CREATE TABLE `tb_user_role` (
+  `user_id` bigint NOT NULL,
+  `role_cd` varchar(10) NOT NULL,
+  PRIMARY KEY (`user_id`, `role_cd`),
+  CONSTRAINT `fk_ur_user` FOREIGN KEY (`user_id`) REFERENCES `tb_user` (`user_id`)
+);
+CREATE INDEX ix_ur_role ON tb_user_role (role_cd);
+"""
+
+
+def test_ddl_index_parsing():
+    schema = parse_ddl(io.StringIO(_DUMP), 'mysql')
+    user = {i.name: i for i in schema.tables['tb_user'].indexes}
+    assert user['PRIMARY'].primary and user['PRIMARY'].columns == ['user_id']
+    assert user['uq_email'].unique and not user['idx_email'].unique
+    assert user['idx_name_dept'].columns == ['name', 'dept_cd']
+    assert user['idx_lower'].columns == [None]
+    assert user['ft_name'].index_type == 'FULLTEXT'
+    assert [i.name for i in schema.tables['tb_user_role'].indexes] == ['PRIMARY', 'ix_ur_role']
+
+
+def test_unindexed_joins_and_redundant_indexes(tmp_path):
+    path = tmp_path / 'hr.sql'
+    path.write_text(_DUMP, encoding='utf-8')
+    meta = extract_metadata(DdlFileConnector(str(path), 'mysql'), 'hr', include_indexes=True)
+    assert meta.indexes_collected
+
+    relations = [
+        InferredRelation(source_table='tb_user', source_column='boss_id', target_table='tb_user',
+                         target_column='user_id', confidence='MEDIUM', cardinality='N:1'),
+        InferredRelation(source_table='tb_user_role', source_column='role_cd', target_table='tb_role',
+                         target_column='role_cd', confidence='HIGH', cardinality='N:1'),
+        InferredRelation(source_table='tb_user', source_column='name', target_table='tb_dept',
+                         target_column='dept_cd', confidence='LOW', cardinality='N:1'),
+    ]
+    report = analyze_indexes(meta, relations)
+
+    # fk_user_dept: idx_name_dept는 선두가 name이라 dept_cd 조인에 못 씀
+    # fk_ur_user / role_cd: PK 선두, ix_ur_role로 커버 / LOW 관계는 제외
+    assert [(u.table, u.columns, u.source) for u in report.unindexed_foreign_keys] == [
+        ('tb_user', ['boss_id'], 'INFERRED'),
+        ('tb_user', ['dept_cd'], 'FK'),
+    ]
+    assert report.unindexed_foreign_keys[1].suggested_ddl == \
+        'CREATE INDEX ix_tb_user_dept_cd ON tb_user (dept_cd);'
+
+    assert sorted((r.index, r.covered_by, r.reason) for r in report.redundant_indexes) == [
+        ('idx_email', 'uq_email', 'DUPLICATE'),
+        ('idx_name', 'idx_name_dept', 'PREFIX'),
+    ]
+
+    plain = extract_metadata(DdlFileConnector(str(path), 'mysql'), 'hr')
+    assert not analyze_indexes(plain, relations).indexes_collected
+
+
+def test_sqlite_index_extraction(tmp_path):
+    db_path = tmp_path / 'shop.db'
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript("""
+            CREATE TABLE item (sku TEXT PRIMARY KEY, name TEXT);
+            CREATE TABLE line (order_no INTEGER, sku TEXT REFERENCES item, qty INTEGER,
+                               PRIMARY KEY (order_no, sku));
+            CREATE INDEX ix_line_sku_qty ON line (sku, qty);
+        """)
+    conn.close()
+
+    meta = extract_metadata(SQLiteConnector(str(db_path)), 'shop', include_indexes=True)
+    line = next(t for t in meta.tables if t.name == 'line')
+    by_name = {i.name: i for i in line.indexes}
+    assert by_name['ix_line_sku_qty'].columns == ['sku', 'qty']
+    assert any(i.primary and i.columns == ['order_no', 'sku'] for i in line.indexes)
+
+    report = analyze_indexes(meta, [])
+    assert report.unindexed_foreign_keys == []
@@ -0,0 +1,162 @@
+﻿import pytest
+
+from app.models.metadata import ColumnMeta, FkMeta, SchemaMetadata, TableMeta
+from app.services import cpu_offload, inference_service
+from app.services.inference_service import infer_relations, infer_relations_incremental
+
+
+def _col(no: int, name: str, is_pk: bool = False, comment: str = '') -> ColumnMeta:
+    return ColumnMeta(
+        col_no=no, name=name, data_type='int', nullable=not is_pk,
+        key_type='PRI' if is_pk else '', is_pk=is_pk, comment=comment,
+    )
+
+
+def _schema() -> SchemaMetadata:
+    tables = [
+        TableMeta(
+            name='customer', comment='고객',
+            columns=[_col(1, 'id', True), _col(2, 'dept_cd')],
+            pk_columns=['id'],
+        ),
+        TableMeta(
+            name='orders', comment='주문',
+            columns=[_col(1, 'order_no', True), _col(2, 'customer_id', comment='고객 번호')],
+            pk_columns=['order_no'],
+            fk_refs=[FkMeta(column_name='customer_id', constraint_name='fk_1',
+                            ref_table='customer', ref_column='id')],
+        ),
+        TableMeta(
+            name='order_item',
+            columns=[_col(1, 'order_no', True), _col(2, 'seq', True)],
+            pk_columns=['order_no', 'seq'],
+        ),
+        TableMeta(name='dept', columns=[_col(1, 'code', True)], pk_columns=['code']),
+    ]
+    return SchemaMetadata(
+        schema_name='test', table_count=len(tables), column_count=7, fk_count=1,
+        tables=tables, extracted_at='2026-01-01T00:00:00+00:00',
+    )
+
+
+def _keys(relations) -> list[tuple]:
+    return [
+        (r.source_table, r.source_column, r.target_table, r.target_column, r.confidence)
+        for r in relations
+    ]
+
+
+def test_infer_relations_rules():
+    keys = _keys(infer_relations(_schema()))
+    assert ('orders', 'customer_id', 'customer', 'id', 'FK') in keys
+    assert ('customer', 'dept_cd', 'dept', 'code', 'MEDIUM') in keys
+    assert ('order_item', 'order_no', 'orders', 'order_no', 'MEDIUM') in keys
+    assert len(keys) == len(set(keys))
+
+
+def test_infer_relations_offload_matches_inline(monkeypatch):
+    inline = infer_relations(_schema())
+
+    monkeypatch.setattr(cpu_offload, 'CPU_OFFLOAD_MIN_TABLES', 1)
+    monkeypatch.setattr(cpu_offload, 'CPU_OFFLOAD_WORKERS', 2)
+    try:
+        offloaded = infer_relations(_schema())
+    finally:
+        cpu_offload.shutdown_pool()
+
+    assert [r.model_dump() for r in offloaded] == [r.model_dump() for r in inline]
+
+
+def test_infer_relations_fuzzy_table_names():
+    tables = [
+        TableMeta(name='tb_customer', columns=[_col(1, 'customer_no', True)], pk_columns=['customer_no']),
+        TableMeta(name='r_product', columns=[_col(1, 'prod_seq', True)], pk_columns=['prod_seq']),
+        TableMeta(
+            name='tb_order',
+            columns=[_col(1, 'order_no', True), _col(2, 'cust_id'), _col(3, 'productId')],
+            pk_columns=['order_no'],
+        ),
+    ]
+    metadata = SchemaMetadata(
+        schema_name='test', table_count=len(tables), column_count=5, fk_count=0,
+        tables=tables, extracted_at='2026-01-01T00:00:00+00:00',
+    )
+    relations = {(r.source_column, r.target_table): r for r in infer_relations(metadata)}
+
+    # 약어(cust) + prefix(tb_) -> 대상 테이블 단일 PK로 연결
+    cust = relations[('cust_id', 'tb_customer')]
+    assert cust.target_column == 'customer_no'
+    assert cust.confidence == 'HIGH'
+    assert relations[('productId', 'r_product')].target_column == 'prod_seq'
+    # 자기 자신은 후보에서 제외
+    assert ('order_no', 'tb_order') not in relations
+
+
+def test_infer_relations_comment_semantics():
+    tables = [
+        TableMeta(name='tb_admin', comment='관리자 정보', columns=[_col(1, 'admin_id', True)], pk_columns=['admin_id']),
+        TableMeta(name='tb_notice', comment='공지사항', columns=[_col(1, 'notice_id', True)], pk_columns=['notice_id']),
+        TableMeta(
+            name='tb_board',
+            columns=[_col(1, 'board_id', True), _col(2, 'mng_no', comment='관리자번호')],
+            pk_columns=['board_id'],
+        ),
+    ]
+    metadata = SchemaMetadata(
+        schema_name='test', table_count=len(tables), column_count=4, fk_count=0,
+        tables=tables, extracted_at='2026-01-01T00:00:00+00:00',
+    )
+    relations = [r for r in infer_relations(metadata) if r.source_column == 'mng_no']
+
+    # 이름으로는 대상이 없지만 '관리자번호' ~ '관리자 정보' (띄어쓰기 무관)
+    assert [(r.target_table, r.target_column) for r in relations] == [('tb_admin', 'admin_id')]
+
+
+def _with_tables(tables: list[TableMeta]) -> SchemaMetadata:
+    return SchemaMetadata(
+        schema_name='test', table_count=len(tables), column_count=0, fk_count=0,
+        tables=tables, extracted_at='2026-01-01T00:00:00+00:00',
+    )
+
+
+def test_infer_relations_incremental_matches_full(monkeypatch):
+    # 작은 스키마라 대부분 다시 추론 대상 -> 전체 재추론 전환 비율을 높여 증분 경로 확인
+    monkeypatch.setattr(inference_service, 'INFER_INCREMENTAL_MAX_RATIO', 1.0)
+    base = _schema()
+    base.tables.append(TableMeta(
+        name='tb_review', comment='상품 후기',
+        columns=[_col(1, 'review_id', True), _col(2, 'prod_id', comment='상품 번호'), _col(3, 'mng_no', comment='관리자')],
+        pk_columns=['review_id'],
+    ))
+    previous = infer_relations(base)
+
+    # 추가: 기존 prod_id / mng_no가 새 테이블을 가리키게 됨 (역방향), 삭제: dept, 변경: customer PK
+    tables = [t.model_copy(deep=True) for t in base.tables if t.name != 'dept']
+    tables.insert(1, TableMeta(
+        name='product', comment='상품', columns=[_col(1, 'id', True)], pk_columns=['id'],
+    ))
+    tables.append(TableMeta(
+        name='tb_admin', comment='관리자 정보', columns=[_col(1, 'admin_id', True)], pk_columns=['admin_id'],
+    ))
+    tables[0].pk_columns = ['customer_id']
+    metadata = _with_tables(tables)
+
+    result = infer_relations_incremental(
+        metadata, previous, added=['product', 'tb_admin'], changed=['customer'], removed=['dept'],
+    )
+    full = infer_relations(metadata)
+
+    assert not result.full_recompute
+    assert result.recomputed_tables < len(tables)
+    assert [r.model_dump() for r in result.relations] == [r.model_dump() for r in full]
+    added = _keys(result.delta.added)
+    assert ('tb_review', 'prod_id', 'product', 'id', 'FK') in added   # 약어 + 코멘트 힌트
+    assert ('tb_review', 'mng_no', 'tb_admin', 'admin_id', 'MEDIUM') in added
+    assert ('customer', 'dept_cd', 'dept', 'code', 'MEDIUM') in _keys(result.delta.removed)
+
+
+def test_infer_relations_incremental_rejects_inconsistent_delta():
+    metadata = _schema()
+    # 삭제 테이블이 메타데이터에 남아 있으면 거부
+    with pytest.raises(ValueError, match='dept'):
+        infer_relations_incremental(metadata, infer_relations(metadata), removed=['dept'])
@@ -0,0 +1,212 @@
+﻿import io
+import sqlite3
+
+from app.services.connectors.ddl_connector import DdlFileConnector
+from app.services.connectors.ddl_parser import iter_statements, parse_ddl
+from app.services.connectors.sqlite_connector import SQLiteConnector
+from app.services.metadata_service import extract_metadata
+
+_MYSQL_DUMP = """-- MySQL dump
+/*!40101 SET NAMES utf8mb4 */;
+CREATE TABLE `tb_dept` (
+  `dept_cd` varchar(10) NOT NULL COMMENT '부서 코드',
+  `dept_nm` varchar(100) DEFAULT NULL,
+  PRIMARY KEY (`dept_cd`)
+) ENGINE=InnoDB COMMENT='부서';
+INSERT INTO `tb_dept` VALUES ('D1','a;b \\'CREATE TABLE x (y int);'),('D2',NULL);
+CREATE TABLE `tb_user` (
+  `user_id` bigint NOT NULL AUTO_INCREMENT,
+  `dept_cd` varchar(10) DEFAULT NULL COMMENT '소속;부서',
+  PRIMARY KEY (`user_id`),
+  KEY `idx_dept` (`dept_cd`),
+  CONSTRAINT `fk_user_dept` FOREIGN KEY (`dept_cd`) REFERENCES `tb_dept` (`dept_cd`) ON DELETE SET NULL
+) ENGINE=InnoDB;
+"""
+
+
+def test_statement_split_is_chunk_independent():
+    whole = list(iter_statements(io.StringIO(_MYSQL_DUMP), 'mysql'))
+    tiny  = list(iter_statements(io.StringIO(_MYSQL_DUMP), 'mysql', chunk_size=3))
+    assert whole == tiny
+    assert [s.split()[0] for s in whole] == ['CREATE', 'CREATE']   # INSERT은 버퍼링하지 않음
+
+
+def test_long_line_split_is_chunk_independent():
+    # 개행 없는 한 줄: 청크 경계가 --, /* */, $tag$, 문자열 안에 걸려도 결과가 같아야 한다
+    script = (
+        "CREATE FUNCTION f() RETURNS int AS $body$ SELECT 1; -- x; $body$ LANGUAGE sql; "
+        "/* c; */ CREATE TABLE a (x int /* y; */, z text DEFAULT 'p;q'); "
+        "INSERT INTO a VALUES (1,'x;y'),(2,'$$'); CREATE INDEX i ON a (x);"
+    )
+    whole = list(iter_statements(io.StringIO(script), 'postgresql'))
+    assert len(whole) == 3
+    for chunk_size in range(1, 40):
+        assert list(iter_statements(io.StringIO(script), 'postgresql', chunk_size=chunk_size)) == whole
+
+
+def test_ddl_mysql_dump():
+    schema = parse_ddl(io.StringIO(_MYSQL_DUMP), 'mysql')
+    assert sorted(schema.tables) == ['tb_dept', 'tb_user']
+
+    user = schema.tables['tb_user']
+    assert [c.name for c in user.columns] == ['user_id', 'dept_cd']
+    assert user.columns[0].is_pk and user.columns[0].extra == 'auto_increment'
+    assert user.columns[1].comment == '소속;부서'
+    assert schema.tables['tb_dept'].comment == '부서'
+
+    assert schema.fk_rows() == [{
+        'table_name': 'tb_user',
+        'column_name': 'dept_cd',
+        'constraint_name': 'fk_user_dept',
+        'referenced_table_name': 'tb_dept',
+        'referenced_column_name': 'dept_cd',
+        'update_rule': 'NO ACTION',
+        'delete_rule': 'SET NULL',
+    }]
+
+
+def test_ddl_alter_and_comment_on():
+    script = """
+    CREATE TABLE public.customers (customer_id integer NOT NULL, name text);
+    CREATE TABLE public.orders (order_no integer NOT NULL, customer_id integer, amount numeric(12, 2));
+    CREATE FUNCTION f() RETURNS void AS $$ BEGIN CREATE TABLE bogus (x int); END $$ LANGUAGE plpgsql;
+    COMMENT ON TABLE public.orders IS '주문';
+    COMMENT ON COLUMN public.orders.amount IS '주문 금액';
+    ALTER TABLE ONLY public.customers ADD CONSTRAINT customers_pkey PRIMARY KEY (customer_id);
+    ALTER TABLE ONLY public.orders ADD CONSTRAINT orders_customer_fk FOREIGN KEY (customer_id)
+        REFERENCES public.customers(customer_id) ON DELETE CASCADE;
+    """
+    schema = parse_ddl(io.StringIO(script), 'postgresql')
+    assert sorted(schema.tables) == ['customers', 'orders']
+
+    rows = {(r['table_name'], r['column_name']): r for r in schema.column_rows('public')}
+    assert rows[('customers', 'customer_id')]['pk_yn'] == 'Y'
+    assert rows[('orders', 'amount')]['data_type'] == 'numeric(12,2)'
+    assert rows[('orders', 'amount')]['column_comment'] == '주문 금액'
+    assert rows[('orders', 'amount')]['table_comment'] == '주문'
+    assert schema.fk_rows()[0]['delete_rule'] == 'CASCADE'
+
+
+_PG_DUMP = r"""--
+-- PostgreSQL database dump
+--
+CREATE TABLE public.customers (
+    customer_id integer NOT NULL,
+    name text
+);
+CREATE TABLE public.orders (
+    order_no integer NOT NULL,
+    customer_id integer
+);
+COPY public.customers (customer_id, name) FROM stdin;
+1	O'Brien; CREATE TABLE ghost (x int);
+2	\N
+\.
+COPY public.orders (order_no, customer_id) FROM stdin;
+10	1
+\.
+ALTER TABLE ONLY public.customers
+    ADD CONSTRAINT customers_pkey PRIMARY KEY (customer_id);
+ALTER TABLE ONLY public.orders
+    ADD CONSTRAINT orders_customer_fk FOREIGN KEY (customer_id) REFERENCES public.customers(customer_id);
+"""
+
+
+def test_pg_dump_copy_data_is_skipped():
+    for chunk_size in (3, 64, 1 << 20):
+        schema = parse_ddl(io.StringIO(_PG_DUMP), 'postgresql', chunk_size=chunk_size)
+        assert sorted(schema.tables) == ['customers', 'orders']
+        assert schema.tables['customers'].columns[0].is_pk
+        assert [(r['table_name'], r['referenced_table_name']) for r in schema.fk_rows()] == [
+            ('orders', 'customers'),
+        ]
+
+
+def test_columns_named_like_constraint_keywords():
+    script = """
+    CREATE TABLE parent (id int PRIMARY KEY);
+    CREATE TABLE kv (
+        key varchar(64) NOT NULL,
+        period int,
+        like varchar(10),
+        note nvarchar(max),
+        PRIMARY KEY (key),
+        KEY ix_kv_period (period),
+        INDEX ix_kv_like NONCLUSTERED (like)
+    );
+    CREATE TABLE kv_copy (LIKE parent, extra int);
+    """
+    schema = parse_ddl(io.StringIO(script), 'generic')
+    kv = schema.tables['kv']
+    assert [c.name for c in kv.columns] == ['key', 'period', 'like', 'note']
+    assert kv.column('key').is_pk
+    assert [(ix.name, ix.columns) for ix in kv.indexes] == [
+        ('pk_kv', ['key']), ('ix_kv_period', ['period']), ('ix_kv_like', ['like']),
+    ]
+    assert [c.name for c in schema.tables['kv_copy'].columns] == ['extra']
+
+
+def test_sqlite_and_ddl_produce_same_metadata(tmp_path):
+    ddl = """
+    CREATE TABLE dept (dept_id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+    CREATE TABLE emp (
+        emp_id INTEGER PRIMARY KEY,
+        dept_id INTEGER REFERENCES dept,
+        boss_id INTEGER,
+        FOREIGN KEY (boss_id) REFERENCES emp (emp_id) ON DELETE SET NULL
+    );
+    """
+    db_path = tmp_path / 'hr.db'
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(ddl)
+    conn.close()
+    ddl_path = tmp_path / 'hr.sql'
+    ddl_path.write_text(ddl, encoding='utf-8')
+
+    from_db  = extract_metadata(SQLiteConnector(str(db_path)), 'hr')
+    from_ddl = extract_metadata(DdlFileConnector(str(ddl_path)), 'hr')
+
+    def shape(meta):
+        return [
+            (
+                t.name,
+                [(c.name, c.data_type, c.nullable, c.is_pk) for c in t.columns],
+                sorted((fk.column_name, fk.ref_table, fk.ref_column, fk.delete_rule) for fk in t.fk_refs),
+            )
+            for t in meta.tables
+        ]
+
+    assert shape(from_db) == shape(from_ddl)
+    emp = next(t for t in from_db.tables if t.name == 'emp')
+    assert ('dept_id', 'dept', 'dept_id', 'NO ACTION') in [
+        (fk.column_name, fk.ref_table, fk.ref_column, fk.delete_rule) for fk in emp.fk_refs
+    ]
+
+
+def test_extract_metadata_with_stats(tmp_path):
+    db_path = tmp_path / 'shop.db'
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript('CREATE TABLE a (id INTEGER PRIMARY KEY); CREATE TABLE b (id INTEGER PRIMARY KEY);')
+    conn.close()
+
+    class StatsConnector(SQLiteConnector):
+        def extract_stats_raw(self, conn, schema):
+            return [
+                {'table_name': 'a', 'row_count': 1200.0, 'data_bytes': 65536, 'index_bytes': None},
+                {'table_name': 'missing', 'row_count': 1, 'data_bytes': 1, 'index_bytes': 1},
+            ]
+
+    class BrokenStatsConnector(SQLiteConnector):
+        def extract_stats_raw(self, conn, schema):
+            raise RuntimeError('permission denied')
+
+    meta = extract_metadata(StatsConnector(str(db_path)), 'shop', include_stats=True)
+    a, b = meta.tables
+    assert (a.row_count, a.data_bytes, a.index_bytes) == (1200, 65536, None)
+    assert b.row_count is None
+    assert meta.stats_collected and (meta.total_rows, meta.total_bytes) == (1200, 65536)
+
+    # 통계 실패는 추출을 막지 않는다
+    meta = extract_metadata(BrokenStatsConnector(str(db_path)), 'shop', include_stats=True)
+    assert not meta.stats_collected and meta.total_rows is None
+    assert extract_metadata(StatsConnector(str(db_path)), 'shop').tables[0].row_count is None
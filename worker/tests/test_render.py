@@ -0,0 +1,103 @@
+﻿import json
+import struct
+import xml.etree.ElementTree as ET
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.erd import ErdGraph, NodePosition
+from app.services.render_service import register_graph, render_tile
+
+client = TestClient(app)
+
+
+def _graph(n: int = 40) -> ErdGraph:
+    tables = [
+        {
+            'name': f'tb_{i}', 'domain': 'SALES' if i % 2 else 'HR',
+            'columns': [
+                {'name': f'col_{j}', 'data_type': 'varchar(20)', 'nullable': j > 0, 'is_pk': j == 0, 'is_fk': j == 1}
+                for j in range(2 + i % 15)
+            ],
+        }
+        for i in range(n)
+    ]
+    relations = [
+        {
+            'source_table': f'tb_{i}', 'source_column': 'col_1',
+            'target_table': f'tb_{(i * 7) % n}', 'target_column': 'col_0',
+            'confidence': 'FK' if i % 3 else 'HIGH', 'cardinality': 'N:1',
+        }
+        for i in range(n)
+    ]
+    return ErdGraph(tables=tables, relations=relations, extracted_at='2026-01-01T00:00:00+00:00')
+
+
+def test_manifest_levels_and_hash():
+    graph = _graph()
+    manifest = register_graph(graph, {}, 256)
+    assert manifest.table_count == 40
+    assert manifest.levels[0].columns == manifest.levels[0].rows == 1
+    assert manifest.levels[-1].scale == 1.0 and manifest.levels[-1].detail == 'full'
+    assert manifest.levels[0].detail == 'box'
+    # 같은 입력 -> 같은 해시, 좌표가 바뀌면 다른 해시
+    assert register_graph(graph, {}, 256).graph_hash == manifest.graph_hash
+    moved = register_graph(graph, {'tb_0': NodePosition(x=-500, y=0)}, 256)
+    assert moved.graph_hash != manifest.graph_hash
+
+
+def test_tiles_svg_and_png():
+    manifest = register_graph(_graph(), {}, 256)
+    top = manifest.levels[-1]
+
+    svg = render_tile(manifest.graph_hash, top.zoom, 0, 0, 'svg')
+    root = ET.fromstring(svg)
+    assert root.get('width') == '256'
+    assert b'tb_' in svg and b'col_0' in svg
+
+    overview = render_tile(manifest.graph_hash, 0, 0, 0, 'svg')
+    assert b'col_0' not in overview           # 축소 단계는 컬럼 생략
+
+    png = render_tile(manifest.graph_hash, top.zoom, 0, 0, 'png')
+    assert png[:8] == b'\x89PNG\r\n\x1a\n'
+    assert struct.unpack('>II', png[16:24]) == (256, 256)
+    assert render_tile(manifest.graph_hash, top.zoom, 0, 0, 'png') is png   # 캐시
+
+
+def test_render_endpoints():
+    res = client.post('/worker/render/erd', json={'graph': _graph().model_dump(), 'tile_size': 256})
+    assert res.status_code == 200
+    manifest = res.json()
+    key = manifest['graph_hash']
+
+    res = client.get(f'/worker/render/erd/{key}/tiles/0/0/0.png')
+    assert res.status_code == 200
+    assert res.headers['content-type'] == 'image/png'
+    assert res.headers['etag'] == f'"{key}-0-0-0"'
+
+    res = client.get(f'/worker/render/erd/{key}/image.svg')
+    assert res.status_code == 200 and res.headers['content-type'] == 'image/svg+xml'
+
+    assert client.get(f'/worker/render/erd/{key}/tiles/0/5/5.svg').status_code == 404
+    assert client.get('/worker/render/erd/unknown/tiles/0/0/0.svg').status_code == 404
+    assert client.post('/worker/render/erd', json={'graph': _graph().model_dump(), 'tile_size': 10}).status_code == 400
+
+
+def test_render_rejects_invalid_or_huge_positions():
+    body = {'graph': _graph(4).model_dump(), 'tile_size': 128}
+
+    # NaN / 범위 밖 좌표는 검증 단계에서 422
+    raw = json.dumps({**body, 'positions': {'tb_0': {'x': float('nan'), 'y': 0}}})
+    res = client.post('/worker/render/erd', content=raw, headers={'content-type': 'application/json'})
+    assert res.status_code == 422
+    # 다른 오류(y 누락)의 input 안에 중첩된 NaN도 500이 아니라 422
+    raw = json.dumps({**body, 'positions': {'tb_0': {'x': float('nan')}}})
+    res = client.post('/worker/render/erd', content=raw, headers={'content-type': 'application/json'})
+    assert res.status_code == 422 and res.json()['detail']
+    res = client.post('/worker/render/erd', json={**body, 'positions': {'tb_0': {'x': 1e300, 'y': 0}}})
+    assert res.status_code == 422
+
+    # 허용 범위 안이라도 캔버스가 상한을 넘게 퍼지면 색인을 만들지 않고 바로 413
+    far = {f'tb_{i}': {'x': (-1) ** i * 900_000.0, 'y': (-1) ** (i // 2) * 900_000.0} for i in range(4)}
+    res = client.post('/worker/render/erd', json={**body, 'positions': far})
+    assert res.status_code == 413 and res.json()['detail']['errorCode'] == 'TOO_LARGE'
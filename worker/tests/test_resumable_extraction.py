@@ -0,0 +1,126 @@
+﻿from contextlib import contextmanager
+
+import pytest
+
+from app.services import resumable_extraction
+from app.services.connectors.base import BaseConnector, CatalogQuery, ConnectorError
+from app.services.metadata_service import extract_metadata
+
+_TABLES = [f't{i:02d}' for i in range(12)]
+
+
+class _Dropped(Exception):
+    """테스트용 연결 끊김"""
+
+
+class _FakeConn:
+    def rollback(self) -> None:
+        pass
+
+
+class _FakeConnector(BaseConnector):
+    """테이블마다 컬럼 2개. drop_at: 연결 끊김으로 실패시킬 컬럼 쿼리 순번(1부터, 재시도 포함)"""
+
+    catalog_queries = (
+        CatalogQuery('columns', 'ranged', 'COLUMNS WHERE 1 = 1 ORDER BY t', range_column='t'),
+        CatalogQuery('tables', 'list', 'TABLES'),
+    )
+
+    def __init__(self, drop_at: dict[int, int] | None = None) -> None:
+        super().__init__()
+        self.drop_at = dict(drop_at or {})
+        self.opened = 0
+        self.column_queries: list[str] = []
+
+    @contextmanager
+    def connection(self):
+        self.opened += 1
+        yield _FakeConn()
+
+    def get_db_version(self, conn) -> str:
+        return 'Fake 1.0'
+
+    def test(self) -> dict:
+        return {'success': True, 'message': 'ok'}
+
+    def transient_error(self, exc: BaseException) -> ConnectorError | None:
+        return ConnectorError('연결이 끊어졌습니다.', 'CONNECTION_REFUSED') if isinstance(exc, _Dropped) else None
+
+    def _fetch(self, conn, sql: str, schema: str, params: tuple[str, ...] = ()) -> list[dict]:
+        if sql == 'TABLES':
+            return [{'table_name': t} for t in _TABLES]
+        self.column_queries.append(sql)
+        n = len(self.column_queries)
+        if self.drop_at.get(n, 0) > 0:
+            self.drop_at[n] -= 1
+            raise _Dropped()
+        values = list(params)
+        after = values.pop(0) if 't > %s' in sql else None
+        upto = values.pop(0) if 't <= %s' in sql else None
+        return [
+            {'table_name': t, 'col_no': c, 'column_name': f'c{c}', 'data_type': 'int',
+             'nullable_yn': 'Y', 'pk_yn': 'Y' if c == 1 else 'N'}
+            for t in _TABLES
+            if (after is None or t > after) and (upto is None or t <= upto)
+            for c in (1, 2)
+        ]
+
+    def extract_columns_raw(self, conn, schema: str) -> list[dict]:
+        return self.run_catalog_query(conn, 'columns', schema)
+
+    def extract_fks_raw(self, conn, schema: str) -> list[dict]:
+        return []
+
+
+def _tables(metadata) -> list[tuple]:
+    return [(t.name, [c.name for c in t.columns], t.pk_columns) for t in metadata.tables]
+
+
+@pytest.fixture
+def fast_retry(monkeypatch):
+    monkeypatch.setattr(resumable_extraction, 'EXTRACT_RETRY_BACKOFF', 0.0)
+    monkeypatch.setattr(resumable_extraction, 'EXTRACT_BATCH_TABLES', 5)
+
+
+def test_batches_reconnect_after_dropped_connection(fast_retry, monkeypatch):
+    monkeypatch.setattr(resumable_extraction, 'EXTRACT_BATCH_TABLES', 0)
+    expected = _tables(extract_metadata(_FakeConnector(), 's'))
+    monkeypatch.setattr(resumable_extraction, 'EXTRACT_BATCH_TABLES', 5)
+
+    # 12개 테이블 -> (, t04] (t04, t09] (t09, ) 3개 배치, 두 번째 배치에서 한 번 끊김
+    connector = _FakeConnector(drop_at={2: 1})
+    result = extract_metadata(connector, 's')
+
+    assert _tables(result) == expected
+    assert connector.opened == 2
+    assert len(connector.column_queries) == 4
+    assert 't > %s' not in connector.column_queries[0] and 't <= %s' in connector.column_queries[0]
+    assert 't > %s' in connector.column_queries[2] and 't <= %s' in connector.column_queries[2]
+    assert 't <= %s' not in connector.column_queries[3]
+
+    # 재시도 한도를 넘으면 ConnectorError (breaker가 집계하는 네트워크 수준 코드)
+    monkeypatch.setattr(resumable_extraction, 'EXTRACT_MAX_RETRIES', 1)
+    with pytest.raises(ConnectorError) as exc_info:
+        extract_metadata(_FakeConnector(drop_at={1: 1, 2: 1}), 's')
+    assert exc_info.value.error_code == 'CONNECTION_REFUSED'
+
+
+def test_checkpoint_resumes_remaining_batches(fast_retry, monkeypatch, tmp_path):
+    monkeypatch.setattr(resumable_extraction, 'EXTRACT_CHECKPOINT_DIR', str(tmp_path))
+    monkeypatch.setattr(resumable_extraction, 'EXTRACT_MAX_RETRIES', 0)
+
+    # 세 번째 배치에서 끊겨 실패 -> 앞 두 배치는 체크포인트에 남는다
+    with pytest.raises(ConnectorError) as exc_info:
+        extract_metadata(_FakeConnector(drop_at={3: 1}), 's', checkpoint_key='job')
+    assert '이어서 추출' in exc_info.value.message
+    assert sorted(p.name for p in (tmp_path / 'job').iterdir()) == [
+        'columns-00000.json.z', 'columns-00001.json.z', 'manifest.json',
+    ]
+
+    # 같은 작업 키로 다시 요청하면 남은 배치만 조회하고, 끝나면 체크포인트를 지운다
+    connector = _FakeConnector()
+    result = extract_metadata(connector, 's', checkpoint_key='job')
+    assert len(connector.column_queries) == 1
+    assert [t.name for t in result.tables] == _TABLES
+    assert result.column_count == 24
+    assert not (tmp_path / 'job').exists()
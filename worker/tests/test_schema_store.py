@@ -0,0 +1,161 @@
+﻿import json
+import sqlite3
+import zlib
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.erd import InferredRelation
+from app.models.metadata import ColumnMeta, FkMeta, SchemaMetadata, TableMeta
+from app.services import cpu_offload, schema_store
+from app.services.inference_service import infer_relations
+from app.services.schema_store import SchemaStore
+
+
+def _metadata() -> SchemaMetadata:
+    def col(no, name, pk=False, comment=''):
+        return ColumnMeta(col_no=no, name=name, data_type='int', nullable=not pk,
+                          key_type='PRI' if pk else '', is_pk=pk, comment=comment)
+
+    tables = [
+        TableMeta(name='tb_customer', comment='고객', columns=[col(1, 'cust_id', True, '고객 번호')],
+                  pk_columns=['cust_id']),
+        TableMeta(name='tb_order', comment='주문', columns=[
+            col(1, 'order_no', True, '주문번호'), col(2, 'cust_id', comment='주문 고객 (100%)'),
+        ], pk_columns=['order_no'], fk_refs=[
+            FkMeta(column_name='cust_id', constraint_name='fk_order_cust',
+                   ref_table='tb_customer', ref_column='cust_id'),
+        ]),
+        TableMeta(name='tb_review', columns=[col(1, 'review_id', True), col(2, 'CUST_ID')],
+                  pk_columns=['review_id']),
+    ]
+    return SchemaMetadata(schema_name='shop', table_count=3, column_count=5, fk_count=1,
+                          tables=tables, extracted_at='2026-01-01T00:00:00+00:00')
+
+
+_INFERRED = [
+    InferredRelation(source_table='tb_review', source_column='CUST_ID', target_table='tb_customer',
+                     target_column='cust_id', confidence='HIGH', cardinality='N:1', score=0.8),
+]
+
+
+def test_store_queries(tmp_path):
+    store = SchemaStore(str(tmp_path / 'store.db'))
+    saved = store.save(_metadata(), _INFERRED)
+    assert (saved.schema_key, saved.relation_count) == ('shop', 2)   # 추론 1 + 실제 FK 1
+
+    assert [(h.table, h.column) for h in store.tables_with_column('shop', 'cust_id')] == [
+        ('tb_customer', 'cust_id'), ('tb_order', 'cust_id'), ('tb_review', 'CUST_ID'),
+    ]
+    assert [h.column for h in store.columns_by_comment('shop', '주문')] == ['order_no', 'cust_id']
+    assert [h.column for h in store.columns_by_comment('shop', '100%')] == ['cust_id']
+    assert store.columns_by_comment('shop', '_') == []
+
+    refs = store.referencing('shop', 'TB_CUSTOMER')
+    assert [(r.source_table, r.confidence) for r in refs] == [('tb_order', 'FK'), ('tb_review', 'HIGH')]
+    assert [r.source_table for r in store.referencing('shop', 'tb_customer', 'FK')] == ['tb_order']
+
+    customer = store.table('shop', 'tb_customer')
+    assert customer.comment == '고객' and len(customer.incoming) == 2 and customer.outgoing == []
+
+    # 같은 키로 다시 저장하면 교체
+    store.save(_metadata(), [])
+    assert [s.relation_count for s in store.list_schemas()] == [1]
+    store.delete('shop')
+    assert store.list_schemas() == []
+
+
+def test_store_endpoints(tmp_path, monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(schema_store, 'SCHEMA_STORE_PATH', '')
+    assert client.get('/worker/store/schemas').status_code == 503
+
+    monkeypatch.setattr(schema_store, 'SCHEMA_STORE_PATH', str(tmp_path / 'data' / 'store.db'))
+    monkeypatch.setattr(schema_store, '_store', None)
+    body = {'schema_key': 'snap-1', 'metadata': _metadata().model_dump(), 'relations': []}
+    assert client.post('/worker/store/schemas', json=body).json()['table_count'] == 3
+
+    res = client.get('/worker/store/schemas/snap-1/columns', params={'name': 'Cust_Id'})
+    assert [h['table'] for h in res.json()] == ['tb_customer', 'tb_order', 'tb_review']
+    assert client.get('/worker/store/schemas/snap-1/columns').status_code == 400
+    assert client.get('/worker/store/schemas/nope/tables/tb_order').status_code == 404
+    res = client.get('/worker/store/schemas/snap-1/tables/tb_customer/referenced-by')
+    assert [r['source_table'] for r in res.json()] == ['tb_order']
+
+    # 대소문자만 다른 테이블명: 500(IntegrityError)이 아니라 요청 에러, 기존 저장본은 그대로
+    dup = _metadata()
+    dup.tables.append(dup.tables[0].model_copy(update={'name': 'TB_CUSTOMER'}))
+    res = client.post('/worker/store/schemas', json={**body, 'metadata': dup.model_dump()})
+    assert res.status_code == 400 and res.json()['detail']['errorCode'] == 'DUPLICATE_TABLE'
+    assert client.get('/worker/store/schemas/snap-1/tables/tb_customer').status_code == 200
+
+
+def test_store_search(tmp_path):
+    store = SchemaStore(str(tmp_path / 'store.db'))
+    store.save(_metadata(), [])
+
+    def found(q, **kw):
+        res = store.search('shop', q, **kw)
+        return [(h.kind, h.table, h.column) for h in res.hits]
+
+    # 이름 전체 일치가 코멘트 일치보다 앞, 같은 이름 컬럼은 테이블 순서
+    assert found('order_no')[0] == ('column', 'tb_order', 'order_no')
+    # 한글 2-gram: '주문' -> 테이블 코멘트 '주문', 컬럼 코멘트 '주문번호', '주문 고객'
+    assert set(found('주문')) == {
+        ('table', 'tb_order', None), ('column', 'tb_order', 'order_no'), ('column', 'tb_order', 'cust_id'),
+    }
+    # 띄어쓰기 차이 / 약어 확장 / prefix
+    assert found('고객번호') == [('column', 'tb_customer', 'cust_id')]
+    assert ('column', 'tb_review', 'CUST_ID') in found('customer')
+    assert ('column', 'tb_order', 'order_no') in found('ord')
+    assert found('주문 고객') == [('column', 'tb_order', 'cust_id')]
+    assert found('없는단어') == []
+
+    res = store.search('shop', 'cust', page=2, size=2)
+    assert res.total == 4 and len(res.hits) == 2
+
+
+def test_batch_infer_streams_results(tmp_path, monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(schema_store, 'SCHEMA_STORE_PATH', str(tmp_path / 'store.db'))
+    monkeypatch.setattr(schema_store, '_store', None)
+    saved = schema_store.get_store().save(_metadata(), [], 'snap-1')
+    assert schema_store.get_store().load_metadata('snap-1') == _metadata()
+    assert saved.metadata_hash == schema_store.metadata_hash(_metadata())
+    # 손상된 스냅샷: 압축 해제 실패 / 모델 검증 실패
+    for key, blob in (('broken-zlib', b'not zlib'), ('broken-json', zlib.compress(b'{"tables": 1}'))):
+        schema_store.get_store().save(_metadata().model_copy(update={'schema_name': key}), [], key)
+        with sqlite3.connect(tmp_path / 'store.db') as conn:
+            conn.execute('UPDATE schema_snapshots SET metadata = ? WHERE schema_key = ?', (blob, key))
+
+    expected = [r.model_dump() for r in infer_relations(_metadata())]
+    body = {'items': [
+        {'key': 'inline', 'metadata': _metadata().model_dump()},
+        {'schema_key': 'snap-1'},
+        {'metadata_hash': saved.metadata_hash},
+        {'schema_key': 'missing'},
+        {'schema_key': 'broken-zlib'},
+        {'schema_key': 'broken-json'},
+    ]}
+
+    def run() -> list[dict]:
+        res = client.post('/worker/infer-relations/batch', json=body)
+        assert res.status_code == 200 and res.headers['content-type'] == 'application/x-ndjson'
+        return [json.loads(line) for line in res.text.splitlines()]
+
+    for workers in (1, 2):
+        monkeypatch.setattr(cpu_offload, 'CPU_OFFLOAD_WORKERS', workers)
+        try:
+            lines = run()
+        finally:
+            cpu_offload.shutdown_pool()
+        results = sorted((l for l in lines if l['type'] == 'result'), key=lambda l: l['index'])
+        assert [l['key'] for l in results] == ['inline', 'snap-1', saved.metadata_hash]
+        assert all(l['relations'] == expected and l['metadata_hash'] == saved.metadata_hash for l in results)
+        errors = sorted((l['index'], l['error_code']) for l in lines if l['type'] == 'error')
+        assert errors == [(3, 'NOT_FOUND'), (4, 'CORRUPT_SNAPSHOT'), (5, 'CORRUPT_SNAPSHOT')]
+        summary = lines[-1]
+        assert (summary['type'], summary['succeeded'], summary['failed']) == ('summary', 3, 3)
+
+    bad = {'items': [{'schema_key': 'a', 'metadata_hash': 'b'}]}
+    assert client.post('/worker/infer-relations/batch', json=bad).status_code == 422
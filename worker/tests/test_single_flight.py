@@ -0,0 +1,100 @@
+﻿import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.connection import ExtractMetadataRequest
+from app.models.metadata import SchemaMetadata
+from app.routers import worker
+from app.services import single_flight
+from app.services.single_flight import SingleFlight, extraction_key
+
+client = TestClient(app)
+
+
+def _wait_for_waiters(flight: SingleFlight, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while sum(c.waiters for c in list(flight._calls.values())) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def _req(**kw) -> ExtractMetadataRequest:
+    base = dict(db_type='oracle', host='10.0.0.2', port=1521, service_name='ORCL', username='erd', password='pw')
+    return ExtractMetadataRequest(**{**base, **kw})
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def run() -> str:
+        calls.append(1)
+        release.wait(5)
+        return 'meta'
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(flight.do, 'k', run) for _ in range(4)]
+        _wait_for_waiters(flight, 3)
+        release.set()
+        assert [f.result() for f in futures] == ['meta'] * 4
+    assert len(calls) == 1
+
+    # 끝난 호출은 보관하지 않음 -> 다음 요청은 다시 실행
+    assert flight.do('k', run) == 'meta'
+    assert len(calls) == 2
+
+
+def test_error_is_shared_and_not_retained():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail() -> None:
+        release.wait(5)
+        raise RuntimeError('boom')
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flight.do, 'k', fail) for _ in range(2)]
+        _wait_for_waiters(flight, 1)
+        release.set()
+        for f in futures:
+            with pytest.raises(RuntimeError):
+                f.result()
+    assert flight.in_flight() == 0
+
+
+def test_extraction_key_separates_credentials_and_options():
+    assert extraction_key(_req()) == extraction_key(_req())
+    assert extraction_key(_req()) != extraction_key(_req(password='other'))
+    assert extraction_key(_req()) != extraction_key(_req(include_stats=True))
+    assert 'pw' not in extraction_key(_req())
+
+
+def test_extract_endpoint_coalesces(monkeypatch):
+    calls = []
+    release = threading.Event()
+    meta = SchemaMetadata(schema_name='ORCL', table_count=0, column_count=0, fk_count=0,
+                          tables=[], extracted_at='2026-01-01T00:00:00+00:00')
+
+    def fake_extract(connector, schema, **kw) -> SchemaMetadata:
+        calls.append(schema)
+        release.wait(5)
+        return meta
+
+    monkeypatch.setattr(worker, 'make_connector', lambda req: object())
+    monkeypatch.setattr(worker, 'extract_metadata', fake_extract)
+    body = _req().model_dump()
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(client.post, '/worker/extract-metadata', json=body) for _ in range(3)]
+        _wait_for_waiters(single_flight._flight, 2)
+        release.set()
+        responses = [f.result() for f in futures]
+
+    assert [r.status_code for r in responses] == [200] * 3
+    assert all(r.json()['schema_name'] == 'ORCL' for r in responses)
+    assert calls == ['ORCL']
@@ -0,0 +1,70 @@
+﻿import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.services.connectors import factory
+from app.services.connectors.base import ConnectorError
+
+WORKER_DIR = Path(__file__).resolve().parents[1]
+DRIVERS = ('pymysql', 'pymssql', 'oracledb', 'psycopg')
+
+# 새 인터프리터에서 import -> 첫 /health 응답까지 시간과 로드된 드라이버
+# (eager: 예전처럼 기동 시 모든 커넥터/드라이버를 동기 import)
+_COLD_START = f'''
+import json, sys, time
+started = time.perf_counter()
+if {{eager}}:
+    from app.services.connectors import factory
+    factory.prewarm('all')
+from fastapi.testclient import TestClient
+from app.main import app
+ok = TestClient(app).get('/health').status_code == 200
+print(json.dumps({{{{
+    'ok': ok,
+    'seconds': time.perf_counter() - started,
+    'drivers': [m for m in {DRIVERS!r} if m in sys.modules],
+}}}}))
+'''
+
+
+def _cold_start(eager: bool = False) -> dict:
+    out = subprocess.run(
+        [sys.executable, '-c', _COLD_START.format(eager=eager)],
+        cwd=WORKER_DIR, capture_output=True, text=True, check=True, timeout=60,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_cold_start_loads_no_db_driver():
+    result = _cold_start()
+    assert result['ok'] is True
+    assert result['drivers'] == []
+
+
+def test_cold_start_faster_than_eager_driver_import(record_property):
+    # 번갈아 3회씩 재고 최솟값 비교 (디스크 캐시 / 부하 편차 완화)
+    runs = [(_cold_start(), _cold_start(eager=True)) for _ in range(3)]
+    if not runs[0][1]['drivers']:
+        pytest.skip('DB 드라이버 미설치: eager 기동과 차이 없음')
+    lazy = min(r['seconds'] for r, _ in runs)
+    eager = min(r['seconds'] for _, r in runs)
+    record_property('cold_start_lazy_seconds', lazy)
+    record_property('cold_start_eager_seconds', eager)
+    print(f'cold start: lazy {lazy:.3f}s, eager {eager:.3f}s ({", ".join(runs[0][1]["drivers"])})')
+    assert lazy < eager, f'lazy {lazy:.3f}s >= eager {eager:.3f}s'
+
+
+def test_connector_loaded_on_first_use(monkeypatch):
+    assert factory.connector_class('sqlite').__name__ == 'SQLiteConnector'
+    assert 'sqlite' in factory.loaded_connectors()
+
+    # 드라이버 로드 실패: prewarm은 건너뛰고, 요청 시에는 DRIVER_UNAVAILABLE
+    monkeypatch.setitem(factory._CONNECTOR_MODULES, 'mysql', ('app.services.connectors.no_such_driver', 'X'))
+    monkeypatch.delitem(factory._loaded, 'mysql', raising=False)
+    assert set(factory.prewarm('mysql,sqlite')) == {'sqlite'}
+    with pytest.raises(ConnectorError) as exc:
+        factory.connector_class('mysql')
+    assert exc.value.error_code == 'DRIVER_UNAVAILABLE'